@@ -0,0 +1,17 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Benchmark suite for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Launcher time-to-spawn and time-to-ready, warm and cold
+[+] Per-tick cost of each limiter sampling path
+[+] NetworkThrottler proxy latency and throughput
+[+] Network emulation accuracy against a replayed trace
+[+] JSON results with percentiles and a regression comparison mode
+
+Usage:
+    python -m benchmarks run [--suite startup,sampling,proxy,emulation] [--output results.json]
+    python -m benchmarks compare baseline.json results.json [--threshold 10]
+"""
@@ -0,0 +1,180 @@
+"""
+Benchmark command line for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.compare import compare
+from benchmarks.efficacy import CPU_ENFORCEMENT, ELECTRON, MAX_COST_PCT, PROFILES, bench_efficacy, print_report, run_efficacy
+from benchmarks.ipc import bench_ipc
+from benchmarks.sampling import bench_emulation, bench_proxy, bench_sampling
+from benchmarks.startup import bench_startup
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SUITES = ("startup", "sampling", "proxy", "emulation", "ipc", "efficacy")
+
+# Efficacy takes minutes per profile and a display, so it is opt-in
+DEFAULT_SUITES = SUITES[:-1]
+
+def _git_revision():
+    """Current commit, if this is a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def _node_version(node):
+    try:
+        return subprocess.run([node, "--version"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def run(args):
+    """Run the selected suites and write the JSON results"""
+    suites = [s.strip() for s in args.suite.split(",") if s.strip()]
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        print(f"[ERROR] Unknown suite(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    output = {
+        "meta": {
+            "timestamp": time.time(),
+            "revision": _git_revision(),
+            "platform": f"{platform.system()} {platform.release()}",
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "node": _node_version(args.node),
+            "suites": suites,
+        },
+        "results": {},
+        "errors": [],
+    }
+
+    for suite in suites:
+        print(f"[INFO] Running {suite} benchmarks...", file=sys.stderr)
+        if suite == "startup":
+            modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+            results = bench_startup(args.runs, modes, args.ready_timeout, args.drop_caches)
+        elif suite == "sampling":
+            results = bench_sampling(args.ticks, node=args.node)
+        elif suite == "proxy":
+            results = bench_proxy(args.requests, args.downloads, args.size_mb, node=args.node)
+        elif suite == "emulation":
+            results = bench_emulation(args.step_ms, args.probes, node=args.node)
+        elif suite == "ipc":
+            results = bench_ipc(args.ipc_runs, args.ipc_samples, node=args.node)
+        else:
+            results = bench_efficacy(_split(args.profiles), args.electron, _split(args.cpu_enforcement),
+                                     args.baseline_ms, args.enforce_ms)
+
+        error = results.pop("error", None)
+        if error:
+            print(f"[WARN] {error}", file=sys.stderr)
+            output["errors"].append(error)
+        output["results"].update(results)
+
+    text = json.dumps(output, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+        print(f"[+] Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+def efficacy(args):
+    """Pass/fail report of every limiter profile under synthetic load; exit status 1 on failure"""
+    report = run_efficacy(_split(args.profiles), args.electron, _split(args.cpu_enforcement),
+                          args.baseline_ms, args.enforce_ms, args.max_cost_pct)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"[+] Report written to {args.output}", file=sys.stderr)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0 if report["passed"] else 1
+
+def _split(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def _add_efficacy_arguments(parser):
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="Comma separated limiter profiles")
+    parser.add_argument("--cpu-enforcement", default=",".join(CPU_ENFORCEMENT),
+                        help="CPU enforcement modes to test: priority, duty-cycle (Linux)")
+    parser.add_argument("--electron", default=str(ELECTRON), help="Electron executable for the efficacy harness")
+    parser.add_argument("--baseline-ms", type=int, default=4000, help="Unlimited load before each limiter is enabled")
+    parser.add_argument("--enforce-ms", type=int, default=15000, help="Load with the limiter enabled (memory: twice this)")
+
+def compare_files(args):
+    """Print a comparison table; exit status 1 if anything regressed"""
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    rows, regressed, missing = compare(baseline, current, args.threshold, tuple(args.stats.split(",")))
+
+    if args.json:
+        print(json.dumps({"rows": rows, "regressed": regressed, "missing": missing}, indent=2))
+    else:
+        print(f"{'metric':44} {'stat':5} {'baseline':>12} {'current':>12} {'change':>9}  status")
+        for row in rows:
+            print(f"{row['metric']:44} {row['stat']:5} {row['baseline']:>12.3f} {row['current']:>12.3f} "
+                  f"{row['change_pct']:>+8.1f}%  {row['status']}")
+        for name in missing:
+            print(f"{name:44} missing from {args.current}")
+        print(f"\n{'REGRESSIONS FOUND' if regressed else 'No regressions'} (threshold {args.threshold:g}%)")
+    return 1 if regressed else 0
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Internet Server benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks and emit JSON results")
+    run_parser.add_argument("--suite", default=",".join(DEFAULT_SUITES),
+                            help="Comma separated suites: startup, sampling, proxy, emulation, ipc, efficacy (opt-in)")
+    run_parser.add_argument("--output", help="Write results to this file instead of stdout")
+    run_parser.add_argument("--node", default="node", help="Node.js executable for the JS benchmarks")
+    run_parser.add_argument("--runs", type=int, default=10, help="Launches per startup mode")
+    run_parser.add_argument("--modes", default="warm,cold", help="Startup modes: warm, cold")
+    run_parser.add_argument("--ready-timeout", type=float, default=60.0, help="Seconds to wait for each launch")
+    run_parser.add_argument("--drop-caches", action="store_true", help="Drop the page cache before cold launches (Linux, root)")
+    run_parser.add_argument("--ticks", type=int, default=50, help="Samples per limiter sampling path")
+    run_parser.add_argument("--requests", type=int, default=200, help="Small proxied requests")
+    run_parser.add_argument("--downloads", type=int, default=10, help="Large proxied downloads")
+    run_parser.add_argument("--size-mb", type=float, default=32, help="Size of each large download")
+    run_parser.add_argument("--step-ms", type=int, default=3000, help="Length of each network trace step")
+    run_parser.add_argument("--probes", type=int, default=5, help="Latency probes per network trace step")
+    run_parser.add_argument("--ipc-runs", type=int, default=5, help="Throughput runs per sampler IPC transport")
+    run_parser.add_argument("--ipc-samples", type=int, default=20000, help="Samples per sampler IPC throughput run")
+    _add_efficacy_arguments(run_parser)
+
+    efficacy_parser = commands.add_parser("efficacy", help="Check that each limiter profile holds its limits under load")
+    _add_efficacy_arguments(efficacy_parser)
+    efficacy_parser.add_argument("--max-cost-pct", type=float, default=MAX_COST_PCT,
+                                 help="Allowed extra main process CPU (percent of one core)")
+    efficacy_parser.add_argument("--output", help="Also write the JSON report to this file")
+    efficacy_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions between two result files")
+    compare_parser.add_argument("baseline", help="Baseline results JSON")
+    compare_parser.add_argument("current", help="New results JSON")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Allowed change in percent")
+    compare_parser.add_argument("--stats", default="p50,p90", help="Statistics to compare")
+    compare_parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        return run(args)
+    if args.command == "efficacy":
+        return efficacy(args)
+    return compare_files(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
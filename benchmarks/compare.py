@@ -0,0 +1,39 @@
+"""
+Regression comparison between two benchmark result files
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+"""
+
+def compare(baseline, current, threshold=10.0, stats=("p50", "p90")):
+    """Compare shared metrics; returns a list of rows and whether any regressed"""
+    rows = []
+    regressed = False
+    base_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+
+    for name in sorted(set(base_results) & set(current_results)):
+        before, after = base_results[name], current_results[name]
+        better = after.get("better", "lower")
+        for stat in stats:
+            old, new = before.get(stat), after.get(stat)
+            if old is None or new is None:
+                continue
+            if old:
+                change = (new - old) / abs(old) * 100
+            else:
+                # Zero baselines (failure counts): any change is a full step
+                change = 0.0 if new == old else (100.0 if new > old else -100.0)
+            worse = change > threshold if better == "lower" else change < -threshold
+            improved = change < -threshold if better == "lower" else change > threshold
+            regressed = regressed or worse
+            rows.append({
+                "metric": name,
+                "stat": stat,
+                "unit": after.get("unit", ""),
+                "baseline": old,
+                "current": new,
+                "change_pct": round(change, 2),
+                "status": "REGRESSION" if worse else ("improved" if improved else "ok"),
+            })
+
+    missing = sorted(set(base_results) - set(current_results))
+    return rows, regressed, missing
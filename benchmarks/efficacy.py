@@ -0,0 +1,182 @@
+"""
+Limiter efficacy harness for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Runs limiter-efficacy.js under Electron, one process per limiter profile
+[+] CPU burners, memory balloons and bulk transfers against each profile's limits
+[+] Judges time-to-clamp, steady-state error and enforcement cost: PASS / FAIL
+"""
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.stats import summarize
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+HARNESS = BENCH_DIR / "limiter-efficacy.js"
+IS_WINDOWS = platform.system() == "Windows"
+ELECTRON = BASE_DIR / "node_modules" / ".bin" / ("electron.cmd" if IS_WINDOWS else "electron")
+
+PROFILES = ("performance", "balanced", "efficiency", "gaming", "streaming")
+CPU_ENFORCEMENT = ("priority", "duty-cycle") if platform.system() == "Linux" else ("priority",)
+
+# ███████████████████████████████████████████████████████████████
+# █ PASS CRITERIA                                               █
+# ███████████████████████████████████████████████████████████████
+
+# Usage must be back within 10% of the target this soon after enabling;
+# memory is checked every 5 s and hibernation waits for the tab strip
+CLAMP_DEADLINE_MS = {"cpu": 10000, "memory": 20000, "network": 3000}
+
+# Steady state (second half of the enforced phase) may sit this far above target
+MAX_OVERSHOOT_PCT = {"cpu": 15, "memory": 10, "network": 10}
+
+# Rates may fall this far short of the limit (emulated latency and loss cost throughput)
+MAX_UNDERSHOOT_PCT = 50
+
+# Extra main process CPU, in percent of one core, enforcement may cost
+MAX_COST_PCT = 10
+
+# ███████████████████████████████████████████████████████████████
+# █ HARNESS                                                     █
+# ███████████████████████████████████████████████████████████████
+
+def _harness_command(electron, profile, cpu_enforcement, baseline_ms, enforce_ms):
+    cmd = [str(electron), str(HARNESS), "--profile", profile,
+           "--cpu-enforcement", ",".join(cpu_enforcement),
+           "--baseline-ms", str(baseline_ms), "--enforce-ms", str(enforce_ms)]
+    # Renderers need a display; a headless Linux box gets a virtual one
+    headless = platform.system() == "Linux" and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    if headless and shutil.which("xvfb-run"):
+        cmd = ["xvfb-run", "-a", *cmd]
+    return cmd
+
+def run_profile(profile, electron=ELECTRON, cpu_enforcement=CPU_ENFORCEMENT,
+                baseline_ms=4000, enforce_ms=15000, timeout=600):
+    """One harness run; returns its report or {"error": ...}"""
+    cmd = _harness_command(electron, profile, cpu_enforcement, baseline_ms, enforce_ms)
+    try:
+        completed = subprocess.run(cmd, cwd=BASE_DIR, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return {"error": f"{profile}: {str(e)} (is npm install done?)"}
+
+    # Limiter logging shares stdout; the report is the last line
+    for line in reversed(completed.stdout.strip().splitlines()):
+        if line.startswith('{"efficacy"'):
+            return json.loads(line)["efficacy"]
+
+    lines = completed.stderr.strip().splitlines() or ["no output"]
+    detail = next((line for line in lines if "Error" in line), lines[-1])
+    return {"error": f"{profile}: harness exited with {completed.returncode}: {detail.strip()}"}
+
+def judge(scenario, max_cost_pct=MAX_COST_PCT):
+    """PASS, FAIL, SKIP (load never reached the target) or OFF, with the reasons"""
+    limiter = scenario["limiter"]
+    if not scenario.get("enforced"):
+        return "OFF", ["not limited by this profile"]
+    if scenario.get("error"):
+        return "FAIL", [scenario["error"]]
+    if not scenario["loaded"]:
+        return "SKIP", [f"load peaked at {scenario['demand']:g} {scenario['unit']}, "
+                        f"under the {scenario['target']:g} {scenario['unit']} target"]
+
+    reasons = []
+    clamp_ms = scenario["timeToClampMs"]
+    if clamp_ms is None:
+        reasons.append("never clamped")
+    elif clamp_ms > CLAMP_DEADLINE_MS[limiter]:
+        reasons.append(f"clamped after {clamp_ms / 1000:.1f}s (limit {CLAMP_DEADLINE_MS[limiter] / 1000:g}s)")
+
+    error = scenario["steadyErrorPct"]
+    if error > MAX_OVERSHOOT_PCT[limiter]:
+        reasons.append(f"steady state {error:+.1f}% over target (limit {MAX_OVERSHOOT_PCT[limiter]}%)")
+    if limiter == "network" and error < -MAX_UNDERSHOOT_PCT:
+        reasons.append(f"steady state {error:+.1f}% under the limit (limit -{MAX_UNDERSHOOT_PCT}%)")
+
+    if scenario["costPct"] > max_cost_pct:
+        reasons.append(f"enforcement cost {scenario['costPct']:.1f}% of a core (limit {max_cost_pct:g}%)")
+
+    return ("FAIL" if reasons else "PASS"), reasons
+
+def run_efficacy(profiles=PROFILES, electron=ELECTRON, cpu_enforcement=CPU_ENFORCEMENT,
+                 baseline_ms=4000, enforce_ms=15000, max_cost_pct=MAX_COST_PCT):
+    """Run and judge every profile; returns the full report"""
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "platform": f"{platform.system()} {platform.release()}",
+            "cpu_enforcement": list(cpu_enforcement),
+            "baseline_ms": baseline_ms,
+            "enforce_ms": enforce_ms,
+        },
+        "profiles": {},
+        "passed": True,
+    }
+
+    for profile in profiles:
+        print(f"[INFO] Running limiter efficacy for the {profile} profile...", file=sys.stderr)
+        result = run_profile(profile, electron, cpu_enforcement, baseline_ms, enforce_ms)
+        if "error" in result:
+            report["profiles"][profile] = {"status": "FAIL", "error": result["error"], "scenarios": []}
+            report["passed"] = False
+            continue
+
+        for scenario in result["scenarios"]:
+            scenario["status"], scenario["reasons"] = judge(scenario, max_cost_pct)
+        statuses = [scenario["status"] for scenario in result["scenarios"]]
+        result["status"] = "FAIL" if "FAIL" in statuses else "PASS"
+        report["passed"] = report["passed"] and result["status"] == "PASS"
+        report["profiles"][profile] = result
+    return report
+
+def print_report(report):
+    """Pass/fail table per profile and scenario"""
+    blank = f"{'':13} {'':13} {'':8} {'':7} {'':6}"
+    print(f"{'profile':12} {'scenario':24} {'target':>13} {'steady':>13} {'error':>8} "
+          f"{'clamp':>7} {'cost':>6}  status")
+    for profile, result in report["profiles"].items():
+        if result.get("error"):
+            print(f"{profile:12} {'-':24} {blank}  FAIL  {result['error']}")
+            continue
+        for scenario in result["scenarios"]:
+            name = f"{scenario['limiter']} ({scenario['variant']})"
+            if not scenario.get("enforced") or scenario.get("error"):
+                detail = "; ".join(scenario["reasons"])
+                print(f"{profile:12} {name:24} {blank}  {scenario['status']:4}  {detail}")
+                continue
+            unit = scenario["unit"]
+            clamp = "never" if scenario["timeToClampMs"] is None else f"{scenario['timeToClampMs'] / 1000:.1f}s"
+            line = (f"{profile:12} {name:24} {scenario['target']:>8g} {unit:4} {scenario['steadyMean']:>8g} {unit:4} "
+                    f"{scenario['steadyErrorPct']:>+7.1f}% {clamp:>7} {scenario['costPct']:>5.1f}%  "
+                    f"{scenario['status']:4}  {'; '.join(scenario['reasons'])}")
+            print(line.rstrip())
+    print(f"\n{'All profiles hold their limits' if report['passed'] else 'LIMITS NOT HELD'}")
+
+def bench_efficacy(profiles=PROFILES, electron=ELECTRON, cpu_enforcement=CPU_ENFORCEMENT,
+                   baseline_ms=4000, enforce_ms=15000):
+    """Efficacy figures as benchmark metrics, so `compare` flags a profile that got worse"""
+    report = run_efficacy(profiles, electron, cpu_enforcement, baseline_ms, enforce_ms)
+    results = {}
+    errors = []
+    for profile, result in report["profiles"].items():
+        if result.get("error"):
+            errors.append(result["error"])
+        for scenario in result["scenarios"]:
+            if not scenario.get("enforced") or scenario.get("error") or not scenario["loaded"]:
+                continue
+            prefix = f"efficacy.{profile}.{scenario['limiter']}.{scenario['variant']}"
+            # A scenario that never clamps drops out, which compare reports as missing
+            if scenario["timeToClampMs"] is not None:
+                results[f"{prefix}.time_to_clamp_ms"] = summarize([scenario["timeToClampMs"]])
+            results[f"{prefix}.steady_error_pct"] = summarize([abs(scenario["steadyErrorPct"])], "%")
+            results[f"{prefix}.cost_pct"] = summarize([scenario["costPct"]], "%")
+    if errors:
+        results["error"] = "; ".join(errors)
+    return results
@@ -0,0 +1,136 @@
+"""
+Sampler IPC benchmark for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Sends sampler-shaped records to sampler-ipc.js as JSON lines over a pipe
+[+] And as binary records through a launcher.shm_ring channel with doorbells
+[+] Throughput flat out, latency at a steady rate, CPU per sample on both ends
+"""
+
+import json
+import subprocess
+import time
+
+from benchmarks.stats import summarize
+from benchmarks.sampling import BENCH_DIR, BASE_DIR, TREE_CHILDREN
+from launcher import shm_ring
+
+CONSUMER = BENCH_DIR / "sampler-ipc.js"
+TRANSPORTS = ("json", "shm")
+
+def _sample(seq):
+    """A record shaped like TreeSampler.sample() for a tree of TREE_CHILDREN + 1"""
+    procs = [[4000 + i, "renderer" if i else "main", 1.5 + i, 150_000_000 + i * 4096]
+             for i in range(TREE_CHILDREN + 1)]
+    return {"t": 0.0, "pid": 4000, "cpu": 12.5, "sys": 30.1, "rss": 1_400_000_000 + seq,
+            "ior": 1_000_000 + seq, "iow": 2_000_000 + seq, "thr": 180, "n": len(procs), "procs": procs}
+
+class _JsonProducer:
+    """What SamplerClient.queue did before the ring: one JSON line per record"""
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+
+    def send(self, record):
+        self.pipe.write((json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8"))
+        return True
+
+    def close(self):
+        pass
+
+class _ShmProducer:
+    """The sampler's binary path: TREE + PROC records, then a doorbell"""
+
+    def __init__(self, pipe, channel):
+        self.pipe = pipe
+        self.channel = channel
+
+    def send(self, record):
+        ring = self.channel.outbound
+        if ring.free() < 1 + record["n"]:
+            return False
+        ring.write_sample(record)
+        self.pipe.write(shm_ring.DOORBELL)
+        return True
+
+    def close(self):
+        self.channel.close()
+
+def _run(transport, count, rate_hz, node):
+    """One consumer process fed `count` samples, flat out (rate_hz 0) or paced"""
+    channel = shm_ring.ShmChannel.create("bench") if transport == "shm" else None
+    cmd = [node, str(CONSUMER), "--transport", transport]
+    if channel:
+        cmd += ["--path", channel.path]
+    try:
+        proc = subprocess.Popen(cmd, cwd=BASE_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, bufsize=0)
+    except OSError as e:
+        if channel:
+            channel.close()
+        return {"error": f"{CONSUMER.name}: {str(e)}"}
+
+    producer = _ShmProducer(proc.stdin, channel) if channel else _JsonProducer(proc.stdin)
+    producer_cpu = 0.0
+    try:
+        if json.loads(proc.stdout.readline() or "{}").get("ready"):
+            records = [_sample(i) for i in range(count)]
+            period = 1.0 / rate_hz if rate_hz else 0.0
+            cpu_start = time.process_time()
+            next_send = time.monotonic()
+            for record in records:
+                if period:
+                    while time.monotonic() < next_send:
+                        time.sleep(max(0.0, next_send - time.monotonic()))
+                    next_send += period
+                record["t"] = time.monotonic()
+                # A full ring waits for the reader instead of dropping benchmark records
+                while not producer.send(record):
+                    time.sleep(0)
+            producer_cpu = time.process_time() - cpu_start
+        # Closing stdin ends the run
+        stdout, stderr = proc.communicate(timeout=120)
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        proc.kill()
+        proc.wait()
+        return {"error": f"{CONSUMER.name} ({transport}): {str(e)}"}
+    finally:
+        producer.close()
+
+    lines = stdout.decode("utf-8", "replace").strip().splitlines()
+    if proc.returncode != 0 or not lines or not lines[-1].startswith('{"ipc"'):
+        detail = (stderr.decode("utf-8", "replace").strip().splitlines() or ["no output"])[-1]
+        return {"error": f"{CONSUMER.name} ({transport}) exited with {proc.returncode}: {detail.strip()}"}
+
+    report = json.loads(lines[-1])["ipc"]
+    report["producerCpuUs"] = producer_cpu * 1e6
+    return report
+
+def bench_ipc(runs=5, samples=20000, latency_samples=2000, rate_hz=1000, node="node"):
+    """Sampler records over JSON lines vs the shared memory ring"""
+    if not shm_ring.available():
+        return {"error": "no writable /dev/shm; skipping the IPC benchmark"}
+
+    results = {}
+    for transport in TRANSPORTS:
+        throughput, consumer_cpu, producer_cpu = [], [], []
+        for _ in range(runs):
+            report = _run(transport, samples, 0, node)
+            if "error" in report:
+                return {"error": report["error"]}
+            if report["samples"] != samples:
+                return {"error": f"{transport}: {report['samples']} of {samples} samples arrived"}
+            throughput.append(report["samples"] / max(report["elapsedMs"], 1e-3) * 1000)
+            consumer_cpu.append(report["cpuUs"] / report["samples"])
+            producer_cpu.append(report["producerCpuUs"] / report["samples"])
+
+        report = _run(transport, latency_samples, rate_hz, node)
+        if "error" in report:
+            return {"error": report["error"]}
+
+        prefix = f"ipc.{transport}"
+        results[f"{prefix}.throughput"] = summarize(throughput, "samples/s", "higher")
+        results[f"{prefix}.latency_us"] = summarize(report["latencyUs"], "us")
+        results[f"{prefix}.consumer_cpu_us"] = summarize(consumer_cpu, "us")
+        results[f"{prefix}.producer_cpu_us"] = summarize(producer_cpu, "us")
+    return results
@@ -0,0 +1,484 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Limiter Efficacy Harness
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Runs one limiter profile against controlled synthetic load   ║
+ * ║ Time-to-clamp, steady-state error and cost of enforcement    ║
+ * ║ Run by `python -m benchmarks efficacy` (one run per profile) ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * LOAD:
+ * - [+] CPU burners: hidden renderers spinning, one per core
+ * - [+] Memory balloons: hidden renderers inflating past the budget
+ * - [+] Bulk downloads and uploads to a local server via the proxy
+ *
+ * Runs under Electron, not plain Node.js: burners and balloons must be
+ * renderer processes for the limiters to see (and act on) them. Each
+ * scenario runs a baseline with the limiters off, then the profile on.
+ * Usage is measured with pidusage, independently of the limiters' own
+ * readings (getAppMetrics() deltas are shared with the duty cycler).
+ *
+ * Usage: electron benchmarks/limiter-efficacy.js --profile NAME
+ *            [--cpu-enforcement priority,duty-cycle]
+ *            [--baseline-ms N] [--enforce-ms N]
+ * Prints {"efficacy": {profile, scenarios}} as the last stdout line.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const { app, ipcMain, webContents, BrowserWindow } = require('electron');
+const fs = require('fs');
+const http = require('http');
+const os = require('os');
+const path = require('path');
+const pidusage = require('pidusage');
+
+// Throwaway userData: limiter config, hibernated tab state
+app.setPath('userData', fs.mkdtempSync(path.join(os.tmpdir(), 'internet-server-efficacy-')));
+
+const LimiterManager = require(path.join(__dirname, '..', 'src', 'limiters', 'limiter-manager'));
+
+// Usage is read this often
+const SAMPLE_MS = 500;
+
+// Within this share above the target counts as clamped, once held this long
+const CLAMP_BAND_FRACTION = 0.1;
+const CLAMP_HOLD_MS = 2000;
+
+// Balloons inflate to this multiple of the memory budget, split between them
+const BALLOON_FACTOR = 1.5;
+const BALLOON_COUNT = 4;
+
+// Hibernation leaves recently used tabs alone; balloons pose as long idle ones
+const BALLOON_IDLE_MS = 10 * 60 * 1000;
+
+// Memory enforcement runs on a 5 s check interval, so it gets a longer phase
+const MEMORY_PHASE_FACTOR = 2;
+
+// Body of every bulk transfer
+const BULK_BYTES = 4 * 1024 * 1024;
+
+// Spins in 50 ms slices so the renderer still answers IPC
+const BURNER_PAGE = `<script>
+(function burn() {
+    const end = Date.now() + 50;
+    while (Date.now() < end) {}
+    setTimeout(burn, 0);
+})();
+</script>`;
+
+// Touches every page it allocates, so the memory is resident
+const balloonPage = (targetMB) => `<script>
+const chunks = [];
+const timer = setInterval(() => {
+    if (chunks.length * 16 >= ${targetMB}) return clearInterval(timer);
+    chunks.push(new Uint8Array(16 * 1024 * 1024).fill(1));
+}, 100);
+</script>`;
+
+function parseArgs() {
+    const args = {
+        profile: 'balanced',
+        cpuEnforcement: process.platform === 'linux' ? ['priority', 'duty-cycle'] : ['priority'],
+        baselineMs: 4000,
+        enforceMs: 15000
+    };
+    const argv = process.argv.slice(2);
+    for (let i = 0; i < argv.length; i += 2) {
+        if (argv[i] === '--profile') args.profile = argv[i + 1];
+        if (argv[i] === '--cpu-enforcement') args.cpuEnforcement = argv[i + 1].split(',').filter(Boolean);
+        if (argv[i] === '--baseline-ms') args.baselineMs = parseInt(argv[i + 1], 10);
+        if (argv[i] === '--enforce-ms') args.enforceMs = parseInt(argv[i + 1], 10);
+    }
+    return args;
+}
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+function mean(values) {
+    return values.length ? values.reduce((sum, v) => sum + v, 0) / values.length : 0;
+}
+
+function round(value, digits = 1) {
+    const scale = 10 ** digits;
+    return Math.round(value * scale) / scale;
+}
+
+function hiddenWindow(html) {
+    const window = new BrowserWindow({ show: false, webPreferences: { backgroundThrottling: false } });
+    window.loadURL(`data:text/html;charset=utf-8,${encodeURIComponent(html)}`);
+    return window;
+}
+
+/**
+ * Browser, GPU and utility pids (fixed) plus every live renderer
+ */
+function browserPids(fixedPids) {
+    const pids = new Set(fixedPids);
+    for (const contents of webContents.getAllWebContents()) {
+        const pid = contents.getOSProcessId();
+        if (pid) pids.add(pid);
+    }
+    return Array.from(pids);
+}
+
+/**
+ * pidusage readings of every browser process; exited ones are skipped
+ */
+async function readTree(fixedPids) {
+    const stats = await Promise.all(browserPids(fixedPids).map(pid => pidusage(pid).catch(() => null)));
+    return stats.filter(Boolean);
+}
+
+/**
+ * Samples read() every SAMPLE_MS for durationMs
+ * Returns { samples: [[ms, value]], wallMs, cpuMs } (cpuMs: main process)
+ */
+async function observe(durationMs, read) {
+    await read(); // Primes pidusage deltas and transfer counters
+    const cpuStart = process.cpuUsage();
+    const start = Date.now();
+    const samples = [];
+    while (Date.now() - start < durationMs) {
+        await sleep(SAMPLE_MS);
+        samples.push([Date.now() - start, await read()]);
+    }
+    const used = process.cpuUsage(cpuStart);
+    return { samples, wallMs: Date.now() - start, cpuMs: (used.user + used.system) / 1000 };
+}
+
+/**
+ * Time of the first sample from which usage stays in the band for CLAMP_HOLD_MS
+ */
+function timeToClamp(samples, band) {
+    let since = null;
+    for (const [t, value] of samples) {
+        if (value > band) {
+            since = null;
+            continue;
+        }
+        if (since === null) since = t;
+        if (t - since >= CLAMP_HOLD_MS) return since;
+    }
+    return null;
+}
+
+/**
+ * Scenario result from a baseline (limiters off) and an enforced phase
+ */
+function summarize(baseline, enforced, target, unit) {
+    const secondHalf = (phase) => phase.samples.filter(([t]) => t >= phase.wallMs / 2).map(([, v]) => v);
+    const band = target * (1 + CLAMP_BAND_FRACTION);
+    const demand = mean(secondHalf(baseline));
+    const steady = secondHalf(enforced);
+    const steadyMean = mean(steady);
+    const baselineCpu = baseline.cpuMs / baseline.wallMs * 100;
+    const enforcedCpu = enforced.cpuMs / enforced.wallMs * 100;
+
+    return {
+        enforced: true,
+        unit,
+        target,
+        demand: round(demand),
+        loaded: demand > band,
+        timeToClampMs: timeToClamp(enforced.samples, band),
+        steadyMean: round(steadyMean),
+        steadyMax: round(Math.max(0, ...steady)),
+        steadyErrorPct: round((steadyMean - target) / target * 100),
+        mainCpuBaselinePct: round(baselineCpu),
+        mainCpuEnforcedPct: round(enforcedCpu),
+        costPct: round(enforcedCpu - baselineCpu),
+        durationMs: enforced.wallMs
+    };
+}
+
+/**
+ * Limiters off, or the profile on (with the CPU enforcement mode under test)
+ */
+function enforce(manager, profile, on, cpuEnforcement = 'priority') {
+    manager.settings.cpu.enforcement = cpuEnforcement;
+    manager.settings.enabled = on;
+    if (on) {
+        manager.setProfile(profile);
+    } else {
+        manager.applySettings();
+    }
+}
+
+/**
+ * Burners on every core: whole-tree CPU as a percentage of the machine
+ */
+async function cpuScenario(manager, profile, mode, args) {
+    const target = manager.profiles[profile].cpu.maxCpuPercent;
+    const cores = os.cpus().length;
+    const fixedPids = app.getAppMetrics().filter(m => m.type !== 'Tab').map(m => m.pid);
+    const read = async () => (await readTree(fixedPids)).reduce((sum, s) => sum + s.cpu, 0) / cores;
+
+    const burners = Array.from({ length: cores }, () => hiddenWindow(BURNER_PAGE));
+    try {
+        const baseline = await observe(args.baselineMs, read);
+        enforce(manager, profile, true, mode);
+        const enforced = await observe(args.enforceMs, read);
+        return { limiter: 'cpu', variant: mode, ...summarize(baseline, enforced, target, '%') };
+    } finally {
+        enforce(manager, profile, false);
+        burners.forEach(window => window.destroy());
+    }
+}
+
+/**
+ * Balloons registered as cold background tabs: whole-tree RSS in MB
+ */
+async function memoryScenario(manager, profile, args) {
+    const budget = manager.profiles[profile].memory.maxMemoryMB;
+    const hibernator = manager.memoryLimiter.hibernator;
+    const fixedPids = app.getAppMetrics().filter(m => m.type !== 'Tab').map(m => m.pid);
+    const read = async () => (await readTree(fixedPids)).reduce((sum, s) => sum + s.memory, 0) / (1024 * 1024);
+
+    // The harness plays the tab strip: a hibernated balloon is closed, then confirmed
+    const balloons = new Map();
+    manager.mainWindow.hibernate = (tabId) => {
+        const window = balloons.get(tabId);
+        if (window && !window.isDestroyed()) window.destroy();
+        ipcMain.emit('tab-hibernated', {}, { tabId, hibernated: Boolean(window) });
+    };
+
+    const perBalloonMB = Math.ceil(budget * BALLOON_FACTOR / BALLOON_COUNT);
+    for (let i = 0; i < BALLOON_COUNT; i++) {
+        const tabId = `balloon-${i}`;
+        const window = hiddenWindow(balloonPage(perBalloonMB));
+        balloons.set(tabId, window);
+        ipcMain.emit('register-tab', {}, { tabId, webContentsId: window.webContents.id });
+        hibernator.tabs.get(tabId).lastActive = Date.now() - BALLOON_IDLE_MS;
+    }
+
+    try {
+        const baseline = await observe(args.baselineMs, read);
+        enforce(manager, profile, true);
+        const enforced = await observe(args.enforceMs * MEMORY_PHASE_FACTOR, read);
+        return {
+            limiter: 'memory',
+            variant: 'hibernation',
+            ...summarize(baseline, enforced, budget, 'MB'),
+            hibernated: BALLOON_COUNT - Array.from(balloons.values()).filter(w => !w.isDestroyed()).length
+        };
+    } finally {
+        enforce(manager, profile, false);
+        manager.mainWindow.hibernate = null;
+        for (const [tabId, window] of balloons) {
+            ipcMain.emit('tab-closed', {}, tabId);
+            if (!window.isDestroyed()) window.destroy();
+        }
+    }
+}
+
+/**
+ * Repeats bulk transfers to the origin until stopped, direct or via the proxy
+ */
+class TransferLoop {
+    constructor(originPort, direction, body) {
+        this.originPort = originPort;
+        this.direction = direction;
+        this.body = body;
+        this.proxyPort = null;
+        this.request = null;
+        this.running = false;
+        this.bytes = 0; // Downloads only; the origin counts uploads
+    }
+
+    start() {
+        this.running = true;
+        this._next();
+    }
+
+    route(proxyPort) {
+        this.proxyPort = proxyPort;
+        // Switch now rather than after the transfer in flight
+        if (this.request) this.request.destroy();
+    }
+
+    stop() {
+        this.running = false;
+        if (this.request) this.request.destroy();
+    }
+
+    _next() {
+        if (!this.running) return;
+        const target = `http://127.0.0.1:${this.originPort}/bulk`;
+        const upload = this.direction === 'upload';
+        const options = this.proxyPort
+            ? { host: '127.0.0.1', port: this.proxyPort, path: target, headers: { host: `127.0.0.1:${this.originPort}` } }
+            : { host: '127.0.0.1', port: this.originPort, path: '/bulk', headers: {} };
+        options.agent = false;
+        options.method = upload ? 'POST' : 'GET';
+        if (upload) options.headers['content-length'] = this.body.length;
+
+        const req = http.request(options, (res) => {
+            res.on('data', (chunk) => {
+                if (!upload) this.bytes += chunk.length;
+            });
+            res.on('error', () => {});
+        });
+        req.on('error', () => {});
+        req.on('close', () => {
+            if (this.request === req) setTimeout(() => this._next(), 10);
+        });
+        this.request = req;
+        req.end(upload ? this.body : undefined);
+    }
+}
+
+/**
+ * Bulk transfers direct (baseline), then through the throttling proxy: kbps
+ */
+async function networkScenario(manager, profile, direction, idle, args) {
+    const body = Buffer.alloc(BULK_BYTES, 'b');
+    let uploaded = 0;
+    const origin = http.createServer((req, res) => {
+        req.on('data', (chunk) => { uploaded += chunk.length; });
+        req.on('end', () => {
+            if (req.method === 'POST') {
+                res.writeHead(204);
+                res.end();
+            } else {
+                res.writeHead(200, { 'content-type': 'application/octet-stream', 'content-length': body.length });
+                res.end(body);
+            }
+        });
+    });
+    await new Promise(resolve => origin.listen(0, '127.0.0.1', resolve));
+
+    const loop = new TransferLoop(origin.address().port, direction, body);
+    const transferred = () => (direction === 'download' ? loop.bytes : uploaded);
+    let last = { bytes: 0, time: Date.now() };
+    const read = async () => {
+        const now = { bytes: transferred(), time: Date.now() };
+        const kbps = (now.bytes - last.bytes) * 8 / 1024 / Math.max(1, now.time - last.time) * 1000;
+        last = now;
+        return kbps;
+    };
+
+    // The baseline moves far more bytes, so its cost is scaled per MB
+    const measure = async (durationMs) => {
+        const startBytes = transferred();
+        const phase = await observe(durationMs, read);
+        return { ...phase, mb: (transferred() - startBytes) / (1024 * 1024) };
+    };
+
+    const throttler = manager.networkThrottler;
+    try {
+        loop.start();
+        const baseline = await measure(args.baselineMs);
+
+        enforce(manager, profile, true);
+        if (!throttler.proxyServer.listening) {
+            await new Promise(resolve => throttler.proxyServer.once('listening', resolve));
+        }
+        loop.route(throttler.proxyServer.address().port);
+        const target = direction === 'download' ? throttler.settings.downloadKbps : throttler.settings.uploadKbps;
+        const enforced = await measure(args.enforceMs);
+
+        const result = { limiter: 'network', variant: direction, ...summarize(baseline, enforced, target, 'kbps') };
+        const idleMs = idle.cpuMs / idle.wallMs;
+        const transferMsPerMB = Math.max(0, baseline.cpuMs - idleMs * baseline.wallMs) / Math.max(baseline.mb, 1e-6);
+        const expectedMs = idleMs * enforced.wallMs + transferMsPerMB * enforced.mb;
+        result.costPct = round((enforced.cpuMs - expectedMs) / enforced.wallMs * 100);
+        return result;
+    } finally {
+        loop.stop();
+        enforce(manager, profile, false);
+        origin.close();
+    }
+}
+
+async function main() {
+    const args = parseArgs();
+
+    // Stands in for the browser window: limiter status updates are dropped,
+    // hibernation requests go to whichever scenario set hibernate()
+    const tabStrip = {
+        hibernate: null,
+        isDestroyed: () => false,
+        webContents: {
+            send: (channel, payload) => {
+                if (channel === 'hibernate-tab' && tabStrip.hibernate) {
+                    setImmediate(() => tabStrip.hibernate(payload.tabId));
+                }
+            }
+        }
+    };
+
+    const manager = new LimiterManager(tabStrip);
+    const profile = manager.profiles[args.profile];
+    if (!profile) {
+        throw new Error(`Unknown profile "${args.profile}"`);
+    }
+    manager.networkThrottler.settings.proxyPort = 0; // Never clash with a running browser
+    manager.init();
+
+    // Main process CPU with no load and the limiters off (harness timers only)
+    const idle = await observe(args.baselineMs, async () => 0);
+
+    const scenarios = [];
+    const skipped = (limiter, variant) => ({ limiter, variant, enforced: false });
+    const run = async (limiter, variant, scenario) => {
+        try {
+            scenarios.push(await scenario());
+        } catch (err) {
+            console.error(`❌ ${limiter} (${variant}) scenario failed:`, err);
+            scenarios.push({ limiter, variant, enforced: true, error: err.message });
+        }
+    };
+
+    for (const mode of args.cpuEnforcement) {
+        if (profile.cpu.enabled) {
+            await run('cpu', mode, () => cpuScenario(manager, args.profile, mode, args));
+        } else {
+            scenarios.push(skipped('cpu', mode));
+        }
+    }
+
+    if (profile.memory.enabled) {
+        await run('memory', 'hibernation', () => memoryScenario(manager, args.profile, args));
+    } else {
+        scenarios.push(skipped('memory', 'hibernation'));
+    }
+
+    for (const direction of ['download', 'upload']) {
+        if (profile.network.enabled) {
+            await run('network', direction, () => networkScenario(manager, args.profile, direction, idle, args));
+        } else {
+            scenarios.push(skipped('network', direction));
+        }
+    }
+
+    manager.dispose();
+    return {
+        profile: args.profile,
+        cores: os.cpus().length,
+        platform: process.platform,
+        idleMainCpuPct: round(idle.cpuMs / idle.wallMs * 100),
+        scenarios
+    };
+}
+
+function finish(code, line = '') {
+    fs.rmSync(app.getPath('userData'), { recursive: true, force: true });
+    process.stdout.write(line, () => app.exit(code));
+}
+
+// Burners and balloons come and go; the harness decides when to quit
+app.on('window-all-closed', () => {});
+
+app.whenReady()
+    .then(main)
+    .then(report => finish(0, JSON.stringify({ efficacy: report }) + '\n'))
+    .catch((err) => {
+        console.error('❌ Limiter efficacy harness failed:', err);
+        finish(1);
+    });
@@ -0,0 +1,77 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Limiter Sampling Benchmark
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Per-tick cost of the CpuLimiter's measurement paths          ║
+ * ║ top / PowerShell fork, busy-wait fallback, process.cpuUsage  ║
+ * ║ Run by `python -m benchmarks run --suite sampling`           ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * Runs under plain Node.js: the limiter is used without init(), so
+ * no Electron APIs are touched (npm install is still required).
+ *
+ * Usage: node benchmarks/limiter-sampling.js [--ticks N]
+ * Prints {"metrics": {name: {samples, unit, better}}} on stdout.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const path = require('path');
+
+const CpuLimiter = require(path.join(__dirname, '..', 'src', 'limiters', 'cpu-limiter'));
+
+function parseArgs() {
+    const args = { ticks: 50 };
+    const argv = process.argv.slice(2);
+    for (let i = 0; i < argv.length; i += 2) {
+        if (argv[i] === '--ticks') args.ticks = parseInt(argv[i + 1], 10);
+    }
+    return args;
+}
+
+/**
+ * Times fn() `ticks` times; wall and CPU milliseconds per call
+ */
+function measure(ticks, fn) {
+    const wall = [];
+    const cpu = [];
+    for (let i = 0; i < ticks; i++) {
+        const cpuStart = process.cpuUsage();
+        const start = process.hrtime.bigint();
+        fn();
+        wall.push(Number(process.hrtime.bigint() - start) / 1e6);
+        const used = process.cpuUsage(cpuStart);
+        cpu.push((used.user + used.system) / 1000);
+    }
+    return { wall, cpu };
+}
+
+function main() {
+    const args = parseArgs();
+    const limiter = new CpuLimiter();
+    const metrics = {};
+    const record = (name, result) => {
+        metrics[`sampling.${name}.tick_ms`] = { samples: result.wall, unit: 'ms', better: 'lower' };
+        metrics[`sampling.${name}.cpu_ms`] = { samples: result.cpu, unit: 'ms', better: 'lower' };
+    };
+
+    // The fork-per-tick path the limiter uses without a sampler sidecar
+    if (process.platform === 'linux') {
+        record('top', measure(args.ticks, () => limiter._getLinuxProcessCpu(process.pid)));
+    } else if (process.platform === 'win32') {
+        record('powershell', measure(args.ticks, () => limiter._getWindowsProcessCpu(process.pid)));
+    }
+
+    // The fallback path blocks the main process for its 100 ms window
+    record('busy_wait_fallback', measure(Math.min(args.ticks, 20), () => limiter._getFallbackProcessCpu()));
+
+    // A non-blocking delta reading for comparison
+    record('process_cpu_usage', measure(args.ticks * 100, () => process.cpuUsage()));
+
+    process.stdout.write(JSON.stringify({ metrics }) + '\n');
+}
+
+main();
@@ -0,0 +1,193 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Network Emulation Check
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Replays a two-step trace through the proxy to a local server ║
+ * ║ Compares achieved rate and latency with the trace per step   ║
+ * ║ Run by `python -m benchmarks run --suite emulation`          ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * Also checks that bodies arrive intact under emulated loss and that
+ * the same seed reproduces the same delays. Runs under plain Node.js
+ * (npm install is still required).
+ *
+ * Usage: node benchmarks/network-emulation.js [--step-ms N] [--probes N]
+ * Prints {"metrics": {name: {samples, unit, better}}} on stdout.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const http = require('http');
+const os = require('os');
+const path = require('path');
+
+const NetworkThrottler = require(path.join(__dirname, '..', 'src', 'limiters', 'network-throttler'));
+const NetworkEmulator = require(path.join(__dirname, '..', 'src', 'limiters', 'network-emulator'));
+
+// Measurements skip this much of each step while the rate changes over
+const SETTLE_MS = 500;
+
+function parseArgs() {
+    const args = { stepMs: 3000, probes: 5 };
+    const argv = process.argv.slice(2);
+    for (let i = 0; i < argv.length; i += 2) {
+        if (argv[i] === '--step-ms') args.stepMs = parseInt(argv[i + 1], 10);
+        if (argv[i] === '--probes') args.probes = parseInt(argv[i + 1], 10);
+    }
+    return args;
+}
+
+function listen(server) {
+    return new Promise((resolve) => {
+        server.once('listening', () => resolve(server.address().port));
+    });
+}
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+/**
+ * Fetches through the proxy; calls onData(bytes, now) per chunk
+ * Resolves { totalMs, body } (body only when keep is set); rejects if aborted
+ */
+function fetch(proxyPort, originPort, urlPath, { keep = false, onData = null, onRequest = null } = {}) {
+    return new Promise((resolve, reject) => {
+        const start = Date.now();
+        const chunks = [];
+        const req = http.get({
+            host: '127.0.0.1',
+            port: proxyPort,
+            path: `http://127.0.0.1:${originPort}${urlPath}`,
+            headers: { host: `127.0.0.1:${originPort}` },
+            agent: false
+        }, (res) => {
+            res.on('data', (chunk) => {
+                if (keep) chunks.push(chunk);
+                if (onData) onData(chunk.length, Date.now());
+            });
+            res.on('end', () => resolve({ totalMs: Date.now() - start, body: Buffer.concat(chunks) }));
+            res.on('error', reject);
+        });
+        req.on('error', reject);
+        if (onRequest) onRequest(req);
+    });
+}
+
+function sha256(buffer) {
+    return crypto.createHash('sha256').update(buffer).digest('hex');
+}
+
+/**
+ * Feeds the same chunk sizes through two emulators with one seed
+ * Returns how many delays differ (0 = reproducible)
+ */
+function determinismMismatches(trace) {
+    const delays = [1, 2].map(() => {
+        const emulator = new NetworkEmulator();
+        emulator.start(trace, { seed: 42 });
+        const values = [];
+        for (let i = 0; i < 500; i++) {
+            values.push(emulator._chunkDelay(i % 2 ? 'download' : 'upload', 1024 + (i * 977) % 65536));
+        }
+        emulator.stop();
+        return values;
+    });
+    return delays[0].filter((delay, i) => delay !== delays[1][i]).length;
+}
+
+async function main() {
+    const args = parseArgs();
+    const steps = [
+        { durationMs: args.stepMs, downloadKbps: 2000, uploadKbps: 1000, latencyMs: 100, jitterMs: 20, lossRate: 0.01 },
+        { durationMs: args.stepMs, downloadKbps: 500, uploadKbps: 250, latencyMs: 300, jitterMs: 40, lossRate: 0.02 }
+    ];
+
+    // Loaded from a file, the same way a captured trace would be
+    const traceFile = path.join(os.tmpdir(), `internet-server-trace-${process.pid}.json`);
+    fs.writeFileSync(traceFile, JSON.stringify({ name: 'check', loop: false, steps }));
+
+    const small = Buffer.alloc(1024, 'a');
+    const patterned = crypto.randomBytes(512 * 1024);
+    // Never finishes within the trace: sized at twice the fastest step
+    const bulk = Buffer.alloc(Math.ceil(steps[0].downloadKbps * 128 * args.stepMs / 1000 * 2 * steps.length), 'b');
+
+    const origin = http.createServer((req, res) => {
+        const body = req.url === '/bulk' ? bulk : req.url === '/patterned' ? patterned : small;
+        res.writeHead(200, { 'content-type': 'application/octet-stream', 'content-length': body.length });
+        res.end(body);
+    });
+    origin.listen(0, '127.0.0.1');
+    const originPort = await listen(origin);
+
+    const throttler = new NetworkThrottler();
+    throttler.settings.proxyPort = 0;
+    throttler.startProxy();
+    const proxyPort = await listen(throttler.proxyServer);
+
+    const metrics = {
+        'emulation.rate_error_pct': { samples: [], unit: '%', better: 'lower' },
+        'emulation.latency_error_ms': { samples: [], unit: 'ms', better: 'lower' },
+        'emulation.integrity_failures': { samples: [], unit: 'bodies', better: 'lower' },
+        'emulation.determinism_mismatches': { samples: [], unit: 'delays', better: 'lower' }
+    };
+
+    // Trace playback: one long download plus latency probes in each step
+    const received = [];
+    let bulkRequest = null;
+    const traceStart = Date.now();
+    throttler.setNetworkTrace(traceFile, 7);
+    const download = fetch(proxyPort, originPort, '/bulk', {
+        onData: (bytes, now) => received.push([now - traceStart, bytes]),
+        onRequest: (req) => { bulkRequest = req; }
+    });
+
+    for (let index = 0; index < steps.length; index++) {
+        const step = steps[index];
+        const stepStart = index * args.stepMs;
+        await sleep(Math.max(0, stepStart + SETTLE_MS - (Date.now() - traceStart)));
+        for (let i = 0; i < args.probes; i++) {
+            const probe = await fetch(proxyPort, originPort, '/small');
+            metrics['emulation.latency_error_ms'].samples.push(Math.abs(probe.totalMs - step.latencyMs));
+        }
+        await sleep(Math.max(0, stepStart + args.stepMs - (Date.now() - traceStart)));
+
+        const bytes = received
+            .filter(([t]) => t >= stepStart + SETTLE_MS && t < stepStart + args.stepMs)
+            .reduce((sum, [, n]) => sum + n, 0);
+        const rate = bytes / ((args.stepMs - SETTLE_MS) / 1000);
+        const expected = step.downloadKbps * 1024 / 8;
+        metrics['emulation.rate_error_pct'].samples.push(Math.abs(rate - expected) / expected * 100);
+    }
+
+    // Lossy, jittery static conditions: every body must arrive byte for byte
+    bulkRequest.destroy();
+    await download.catch(() => {});
+    throttler.setNetworkTrace(null);
+    throttler.updateSettings({ downloadKbps: 16000, uploadKbps: 16000, latencyMs: 50, jitterMs: 50, packetLossRate: 0.05 });
+    const expectedHash = sha256(patterned);
+    for (let i = 0; i < 3; i++) {
+        const result = await fetch(proxyPort, originPort, '/patterned', { keep: true });
+        metrics['emulation.integrity_failures'].samples.push(sha256(result.body) === expectedHash ? 0 : 1);
+    }
+
+    metrics['emulation.determinism_mismatches'].samples.push(
+        determinismMismatches(NetworkEmulator.normalizeTrace({ name: 'check', steps }))
+    );
+
+    throttler.dispose();
+    origin.close();
+    fs.unlinkSync(traceFile);
+    process.stdout.write(JSON.stringify({ metrics }) + '\n');
+    process.exit(0);
+}
+
+main().catch((err) => {
+    console.error('Network emulation check failed:', err);
+    process.exit(1);
+});
@@ -0,0 +1,179 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - NetworkThrottler Proxy Benchmark
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Local HTTP server, fetched directly and through the proxy    ║
+ * ║ Measures added latency and throughput of the proxy path      ║
+ * ║ and the cost of a domain rule lookup with thousands of rules ║
+ * ║ Run by `python -m benchmarks run --suite proxy`              ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * Runs under plain Node.js: the throttler is used without init(), so
+ * no Electron APIs are touched (npm install is still required).
+ *
+ * Usage: node benchmarks/proxy-throughput.js [--requests N] [--downloads N] [--size-mb N]
+ * Prints {"metrics": {name: {samples, unit, better}}} on stdout.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const http = require('http');
+const path = require('path');
+
+const NetworkThrottler = require(path.join(__dirname, '..', 'src', 'limiters', 'network-throttler'));
+const DomainPolicy = require(path.join(__dirname, '..', 'src', 'limiters', 'domain-policy'));
+
+// Rule set size and lookups per sample for the domain policy metrics
+const POLICY_RULES = 10000;
+const POLICY_LOOKUPS = 10000;
+
+/**
+ * Nanoseconds per lookup against POLICY_RULES rules: hosts that repeat
+ * (answered by the hot-host LRU) and hosts seen once (a trie walk each)
+ */
+function measurePolicy(metrics, samples) {
+    const rules = [];
+    for (let i = 0; i < POLICY_RULES; i++) {
+        rules.push(i % 2
+            ? { pattern: `*.cdn${i}.example.net`, downloadKbps: 1000 + i, priority: 'low' }
+            : { pattern: `game${i}.example.com`, exclude: true });
+    }
+    const policy = new DomainPolicy();
+    policy.configure({ rules });
+
+    const hotHosts = [];
+    for (let i = 0; i < 64; i++) {
+        hotHosts.push(`a.b.cdn${2 * i + 1}.example.net`);
+    }
+
+    let unique = 0;
+    for (let sample = 0; sample < samples; sample++) {
+        let start = process.hrtime.bigint();
+        for (let i = 0; i < POLICY_LOOKUPS; i++) {
+            policy.lookup(hotHosts[i % hotHosts.length]);
+        }
+        metrics['proxy.policy.hot_lookup_ns'].samples.push(Number(process.hrtime.bigint() - start) / POLICY_LOOKUPS);
+
+        start = process.hrtime.bigint();
+        for (let i = 0; i < POLICY_LOOKUPS; i++) {
+            policy.lookup(`host${unique++}.cdn${(i * 2 + 1) % POLICY_RULES}.example.net`);
+        }
+        metrics['proxy.policy.cold_lookup_ns'].samples.push(Number(process.hrtime.bigint() - start) / POLICY_LOOKUPS);
+    }
+}
+
+function parseArgs() {
+    const args = { requests: 200, downloads: 10, sizeMb: 32 };
+    const argv = process.argv.slice(2);
+    for (let i = 0; i < argv.length; i += 2) {
+        if (argv[i] === '--requests') args.requests = parseInt(argv[i + 1], 10);
+        if (argv[i] === '--downloads') args.downloads = parseInt(argv[i + 1], 10);
+        if (argv[i] === '--size-mb') args.sizeMb = parseFloat(argv[i + 1]);
+    }
+    return args;
+}
+
+function listen(server) {
+    return new Promise((resolve) => {
+        if (server.listening) {
+            resolve(server.address().port);
+        } else {
+            server.once('listening', () => resolve(server.address().port));
+        }
+    });
+}
+
+/**
+ * Fetches a URL, directly or through an HTTP proxy
+ * Resolves { firstByteMs, totalMs, bytes }
+ */
+function fetch(targetPort, urlPath, proxyPort) {
+    return new Promise((resolve, reject) => {
+        const start = process.hrtime.bigint();
+        const options = proxyPort
+            ? { host: '127.0.0.1', port: proxyPort, path: `http://127.0.0.1:${targetPort}${urlPath}`,
+                headers: { host: `127.0.0.1:${targetPort}` }, agent: false }
+            : { host: '127.0.0.1', port: targetPort, path: urlPath, agent: false };
+
+        const req = http.get(options, (res) => {
+            let firstByteMs = null;
+            let bytes = 0;
+            res.on('data', (chunk) => {
+                if (firstByteMs === null) {
+                    firstByteMs = Number(process.hrtime.bigint() - start) / 1e6;
+                }
+                bytes += chunk.length;
+            });
+            res.on('end', () => {
+                resolve({ firstByteMs, totalMs: Number(process.hrtime.bigint() - start) / 1e6, bytes });
+            });
+        });
+        req.on('error', reject);
+    });
+}
+
+async function main() {
+    const args = parseArgs();
+    const small = Buffer.alloc(1024, 'a');
+    const large = Buffer.alloc(Math.round(args.sizeMb * 1024 * 1024), 'b');
+
+    const origin = http.createServer((req, res) => {
+        const body = req.url === '/large' ? large : small;
+        res.writeHead(200, { 'content-type': 'application/octet-stream', 'content-length': body.length });
+        res.end(body);
+    });
+    origin.listen(0, '127.0.0.1');
+    const originPort = await listen(origin);
+
+    // Unlimited settings: measures the cost of the proxy path itself
+    const throttler = new NetworkThrottler();
+    throttler.settings.proxyPort = 0;
+    throttler.startProxy();
+    const proxyPort = await listen(throttler.proxyServer);
+
+    const metrics = {
+        'proxy.direct.latency_ms': { samples: [], unit: 'ms', better: 'lower' },
+        'proxy.proxied.latency_ms': { samples: [], unit: 'ms', better: 'lower' },
+        'proxy.added_latency_ms': { samples: [], unit: 'ms', better: 'lower' },
+        'proxy.direct.throughput_mbps': { samples: [], unit: 'MB/s', better: 'higher' },
+        'proxy.proxied.throughput_mbps': { samples: [], unit: 'MB/s', better: 'higher' },
+        'proxy.policy.hot_lookup_ns': { samples: [], unit: 'ns', better: 'lower' },
+        'proxy.policy.cold_lookup_ns': { samples: [], unit: 'ns', better: 'lower' }
+    };
+
+    // Warm up both paths
+    await fetch(originPort, '/small');
+    await fetch(originPort, '/small', proxyPort);
+
+    // Paired small requests: latency to the end of a 1 KB response
+    for (let i = 0; i < args.requests; i++) {
+        const direct = await fetch(originPort, '/small');
+        const proxied = await fetch(originPort, '/small', proxyPort);
+        metrics['proxy.direct.latency_ms'].samples.push(direct.totalMs);
+        metrics['proxy.proxied.latency_ms'].samples.push(proxied.totalMs);
+        metrics['proxy.added_latency_ms'].samples.push(proxied.totalMs - direct.totalMs);
+    }
+
+    // Bulk downloads: throughput of a large body
+    for (let i = 0; i < args.downloads; i++) {
+        const direct = await fetch(originPort, '/large');
+        const proxied = await fetch(originPort, '/large', proxyPort);
+        metrics['proxy.direct.throughput_mbps'].samples.push(direct.bytes / 1048576 / (direct.totalMs / 1000));
+        metrics['proxy.proxied.throughput_mbps'].samples.push(proxied.bytes / 1048576 / (proxied.totalMs / 1000));
+    }
+
+    measurePolicy(metrics, args.downloads);
+
+    throttler.dispose();
+    origin.close();
+    process.stdout.write(JSON.stringify({ metrics }) + '\n');
+    process.exit(0);
+}
+
+main().catch((err) => {
+    console.error('Proxy benchmark failed:', err);
+    process.exit(1);
+});
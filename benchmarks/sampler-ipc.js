@@ -0,0 +1,122 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Sampler IPC Benchmark Consumer
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Receiving end of `python -m benchmarks run --suite ipc`      ║
+ * ║ Reads sampler records as JSON lines or from a /dev/shm ring  ║
+ * ║ exactly as SamplerClient does, and times each of them        ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * Runs under plain Node.js; only the ring reader is loaded.
+ *
+ * Usage: node benchmarks/sampler-ipc.js --transport json|shm [--path FILE]
+ * Records come on stdin (JSON lines, or doorbell bytes for shm); each
+ * sample's `t` is the producer's monotonic clock in seconds.
+ * Prints {"ready": true} once listening, and at end of input
+ * {"ipc": {samples, elapsedMs, latencyUs, cpuUs}} on stdout.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const path = require('path');
+
+const ShmChannel = require(path.join(__dirname, '..', 'src', 'limiters', 'shm-ring'));
+
+const { KIND, PROCESS_TYPES } = ShmChannel;
+
+function parseArgs() {
+    const args = { transport: 'json', path: null };
+    const argv = process.argv.slice(2);
+    for (let i = 0; i < argv.length; i += 2) {
+        if (argv[i] === '--transport') args.transport = argv[i + 1];
+        if (argv[i] === '--path') args.path = argv[i + 1];
+    }
+    return args;
+}
+
+// Same clock as Python's time.monotonic() (CLOCK_MONOTONIC on Linux)
+function monotonicSeconds() {
+    return Number(process.hrtime.bigint()) / 1e9;
+}
+
+function main() {
+    const args = parseArgs();
+    const latencyUs = [];
+    let firstAt = 0;
+    let lastAt = 0;
+    let cpuStart = null;
+
+    const onSample = (sample) => {
+        const now = monotonicSeconds();
+        if (latencyUs.length === 0) {
+            firstAt = now;
+            cpuStart = process.cpuUsage();
+        }
+        lastAt = now;
+        latencyUs.push((now - sample.t) * 1e6);
+    };
+
+    let receive;
+    if (args.transport === 'shm') {
+        // Mirrors SamplerClient._drainChannel and _onRecord
+        const inbound = ShmChannel.attach(args.path).inbound;
+        let assembling = null;
+        const onRecord = (record) => {
+            const values = record.values;
+            if (record.kind === KIND.TREE) {
+                assembling = {
+                    t: record.t, pid: record.pid, cpu: values[0], sys: values[1], rss: values[2],
+                    ior: values[3], iow: values[4], thr: values[5], n: values[6], procs: []
+                };
+            } else if (record.kind === KIND.PROC && assembling) {
+                assembling.procs.push([record.pid, PROCESS_TYPES[record.code] || 'other', values[0], values[1]]);
+            } else {
+                return;
+            }
+            if (assembling.procs.length === assembling.n) {
+                onSample(assembling);
+                assembling = null;
+            }
+        };
+        receive = () => inbound.receive(onRecord);
+    } else {
+        // Mirrors SamplerClient._onData
+        process.stdin.setEncoding('utf8');
+        let buffer = '';
+        receive = (chunk) => {
+            buffer += chunk;
+            let newline;
+            while ((newline = buffer.indexOf('\n')) !== -1) {
+                const line = buffer.slice(0, newline);
+                buffer = buffer.slice(newline + 1);
+                if (line) {
+                    onSample(JSON.parse(line));
+                }
+            }
+        };
+    }
+
+    process.stdin.on('data', (chunk) => receive(chunk));
+    process.stdin.on('end', () => {
+        if (args.transport === 'shm') {
+            receive();
+        }
+        const cpu = cpuStart ? process.cpuUsage(cpuStart) : { user: 0, system: 0 };
+        process.stdout.write(JSON.stringify({
+            ipc: {
+                samples: latencyUs.length,
+                elapsedMs: (lastAt - firstAt) * 1000,
+                latencyUs,
+                cpuUs: cpu.user + cpu.system
+            }
+        }) + '\n', () => process.exit(0));
+    });
+
+    // The producer starts its clock once we can receive
+    process.stdout.write(JSON.stringify({ ready: true }) + '\n');
+}
+
+main();
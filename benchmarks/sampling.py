@@ -0,0 +1,88 @@
+"""
+Limiter sampling, proxy and emulation benchmarks for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] psutil tree sampler cost per tick, measured in-process
+[+] Node.js limiter paths, proxy and network emulation via the scripts in this directory
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.stats import summarize
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+
+# Idle children so the sampler walks a tree shaped like Electron's
+TREE_CHILDREN = 8
+
+def run_node_script(script, args=(), node="node", timeout=600):
+    """Run one of the Node.js benchmark scripts; returns {metric: summary}"""
+    cmd = [node, str(BENCH_DIR / script), *[str(a) for a in args]]
+    try:
+        completed = subprocess.run(cmd, cwd=BASE_DIR, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return {"error": f"{script}: {str(e)}"}
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines() or ["no output"]
+        detail = next((line for line in lines if "Error" in line), lines[-1])
+        return {"error": f"{script} exited with {completed.returncode}: {detail.strip()} (is npm install done?)"}
+
+    payload = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {name: summarize(metric["samples"], metric["unit"], metric["better"])
+            for name, metric in payload["metrics"].items()}
+
+def bench_psutil_sampler(ticks=200):
+    """Cost of one TreeSampler pass over a small process tree"""
+    try:
+        import psutil  # noqa: F401
+        from launcher.sampler import TreeSampler
+    except ImportError:
+        return {"error": "psutil is not installed; skipping the psutil sampler benchmark"}
+
+    children = [subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+                for _ in range(TREE_CHILDREN)]
+    try:
+        sampler = TreeSampler(os.getpid())
+        sampler.sample(0.0)  # First pass primes the per-process caches
+        wall, cpu = [], []
+        for _ in range(ticks):
+            cpu_start = time.process_time()
+            start = time.perf_counter()
+            sampler.sample(0.0)
+            wall.append((time.perf_counter() - start) * 1000)
+            cpu.append((time.process_time() - cpu_start) * 1000)
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+
+    return {
+        "sampling.psutil_tree.tick_ms": summarize(wall),
+        "sampling.psutil_tree.cpu_ms": summarize(cpu),
+    }
+
+def bench_sampling(ticks=50, node="node"):
+    """Per-tick cost of every limiter sampling path"""
+    results = {}
+    results.update(bench_psutil_sampler(ticks * 4))
+    node_results = run_node_script("limiter-sampling.js", ["--ticks", ticks], node=node)
+    if "error" in node_results and "error" in results:
+        results["error"] = f"{results['error']}; {node_results['error']}"
+    else:
+        results.update(node_results)
+    return results
+
+def bench_proxy(requests=200, downloads=10, size_mb=32, node="node"):
+    """NetworkThrottler added latency and throughput against a local server"""
+    return run_node_script("proxy-throughput.js",
+                           ["--requests", requests, "--downloads", downloads, "--size-mb", size_mb], node=node)
+
+def bench_emulation(step_ms=3000, probes=5, node="node"):
+    """Trace replay accuracy, body integrity under loss and seed determinism"""
+    return run_node_script("network-emulation.js", ["--step-ms", step_ms, "--probes", probes], node=node)
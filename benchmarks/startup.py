@@ -0,0 +1,136 @@
+"""
+Launcher startup benchmark for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Runs run_browser.py end to end, once per sample
+[+] Cold runs: --full-check, fresh user-data dir, optional page cache drop
+[+] Warm runs: unchanged launch manifest and a reused user-data dir
+[+] Reads spawn/ready timings from logs/startup-times.jsonl
+"""
+
+import json
+import os
+import platform
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.stats import summarize
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+RUN_BROWSER = BASE_DIR / "run_browser.py"
+STARTUP_LOG = BASE_DIR / "logs" / "startup-times.jsonl"
+IS_WINDOWS = platform.system() == "Windows"
+
+# ███████████████████████████████████████████████████████████████
+# █ HELPERS                                                     █
+# ███████████████████████████████████████████████████████████████
+
+def drop_page_cache():
+    """Drop the Linux page cache (root only); returns whether it worked"""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except (OSError, AttributeError):
+        return False
+
+def _startup_record(launcher_pid):
+    """The startup log line written by a given launcher process"""
+    try:
+        with open(STARTUP_LOG, "r") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    for line in reversed(lines):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if record.get("pid") == launcher_pid:
+            return record
+    return None
+
+def _stop_browser(browser_pid, timeout=10.0):
+    """Stop the browser's whole process group"""
+    if not browser_pid:
+        return
+    try:
+        if IS_WINDOWS:
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(browser_pid)], capture_output=True)
+            return
+        pgid = os.getpgid(browser_pid)
+        os.killpg(pgid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            os.killpg(pgid, 0)
+            time.sleep(0.1)
+        os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+# ███████████████████████████████████████████████████████████████
+# █ BENCHMARK                                                   █
+# ███████████████████████████████████████████████████████████████
+
+def run_once(cold, user_data_dir, ready_timeout, python):
+    """One end-to-end launch; returns (launcher wall ms, startup record)"""
+    cmd = [python, str(RUN_BROWSER), "--ready-timeout", str(ready_timeout)]
+    if cold:
+        cmd.append("--full-check")
+    env = os.environ.copy()
+    env["INTERNET_SERVER_USER_DATA"] = str(user_data_dir)
+
+    start = time.perf_counter()
+    process = subprocess.Popen(cmd, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    process.wait()
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    record = _startup_record(process.pid)
+    if record is not None:
+        _stop_browser(record.get("browser_pid"))
+    return wall_ms, record
+
+def bench_startup(runs=10, modes=("warm", "cold"), ready_timeout=60.0, drop_caches=False, python=None):
+    """Measure launcher time-to-spawn and time-to-ready; returns {metric: summary}"""
+    python = python or sys.executable
+    results = {}
+    for mode in modes:
+        cold = mode == "cold"
+        warm_dir = Path(tempfile.mkdtemp(prefix="internet-server-bench-"))
+        samples = {"launcher_wall_ms": [], "spawn_ms": [], "ready_ms": [], "preflight_ms": []}
+        failures = 0
+
+        # Warm runs start from a populated manifest and profile
+        if not cold:
+            run_once(False, warm_dir, ready_timeout, python)
+
+        for _ in range(runs):
+            user_data = Path(tempfile.mkdtemp(prefix="internet-server-bench-")) if cold else warm_dir
+            if cold and drop_caches and not drop_page_cache():
+                print("[WARN] Could not drop the page cache (needs root on Linux)", file=sys.stderr)
+                drop_caches = False
+
+            wall_ms, record = run_once(cold, user_data, ready_timeout, python)
+            if cold:
+                shutil.rmtree(user_data, ignore_errors=True)
+            if record is None or record.get("ready_ms") is None:
+                failures += 1
+                continue
+
+            samples["launcher_wall_ms"].append(wall_ms)
+            samples["spawn_ms"].append(record["spawn_ms"])
+            samples["ready_ms"].append(record["ready_ms"])
+            # Everything before the spawn: preflight, sidecars and imports
+            samples["preflight_ms"].append(wall_ms - record["ready_ms"])
+
+        shutil.rmtree(warm_dir, ignore_errors=True)
+        for name, values in samples.items():
+            results[f"startup.{mode}.{name}"] = summarize(values)
+        results[f"startup.{mode}.failures"] = {"unit": "runs", "better": "lower", "n": runs, "count": failures}
+    return results
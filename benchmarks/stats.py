@@ -0,0 +1,38 @@
+"""
+Percentile summaries for benchmark samples
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+"""
+
+import math
+
+PERCENTILES = (50, 90, 95, 99)
+
+def percentile(sorted_values, q):
+    """Linearly interpolated percentile of already sorted values"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(samples, unit="ms", better="lower"):
+    """Summary of a metric's samples; `better` says which direction is an improvement"""
+    values = sorted(v for v in samples if v is not None)
+    summary = {"unit": unit, "better": better, "n": len(values)}
+    if not values:
+        return summary
+
+    mean = sum(values) / len(values)
+    variance = sum((v - mean) ** 2 for v in values) / (len(values) - 1) if len(values) > 1 else 0.0
+    summary.update({
+        "min": round(values[0], 4),
+        "max": round(values[-1], 4),
+        "mean": round(mean, 4),
+        "stdev": round(math.sqrt(variance), 4),
+    })
+    for q in PERCENTILES:
+        summary[f"p{q}"] = round(percentile(values, q), 4)
+    return summary
@@ -17,6 +17,9 @@ Copyright (c) 2025 ZARI CORP - All Rights Reserved
 [+] Cross-platform support for Windows and Linux
 [+] Resource limiter integration verification
 [+] Development and packaging options
+[+] Streamed, rotated and searchable logs of every child process
+[+] Claims a pre-started browser from the standby pool daemon when one runs
+[+] Limiter efficacy check: each profile against synthetic CPU, memory and network load
 """
 
 import os
@@ -26,8 +29,20 @@ import subprocess
 import json
 import argparse
 from pathlib import Path
+import threading
 import time
 
+from launcher.console import Colors
+from launcher.manifest import LaunchManifest, MANIFEST_NAME, launch_fingerprints
+from launcher.preflight import Preflight
+from launcher.readiness import ReadinessListener, DEFAULT_READY_TIMEOUT, log_startup_time
+from launcher.runtime_config import RUNTIME_SETTINGS_NAME, ensure_ollama_settings
+from launcher.logpipe import LogPipeline, run_logged, logged_command, command_source
+from launcher.provision import ProvisionStore
+from launcher.daemon import claim_standby
+from launcher.plugin_index import build_plugin_index, PLUGIN_INDEX_NAME
+from benchmarks.efficacy import PROFILES as EFFICACY_PROFILES, print_report, run_efficacy
+
 # ███████████████████████████████████████████████████████████████
 # █ CONFIGURATION VARIABLES                                     █
 # █ Adjust these settings to match your environment             █
@@ -36,6 +51,12 @@ import time
 # Base directory is the script location
 BASE_DIR = Path(__file__).resolve().parent
 PACKAGE_JSON = BASE_DIR / "package.json"
+MANIFEST_PATH = BASE_DIR / MANIFEST_NAME
+RUNTIME_SETTINGS = BASE_DIR / RUNTIME_SETTINGS_NAME
+STARTUP_LOG = BASE_DIR / "logs" / "startup-times.jsonl"
+PROCESS_LOG_DIR = BASE_DIR / "logs" / "processes"
+PLUGINS_DIR = BASE_DIR / "src" / "plugins"
+PLUGIN_INDEX = BASE_DIR / PLUGIN_INDEX_NAME
 
 # OS detection
 IS_WINDOWS = platform.system() == "Windows"
@@ -44,22 +65,6 @@ IS_LINUX = platform.system() == "Linux"
 # Command prefixes
 NPM_CMD = "npm.cmd" if IS_WINDOWS else "npm"
 
-# ███████████████████████████████████████████████████████████████
-# █ CONSOLE COLORS                                              █
-# █ ANSI color codes for terminal output styling                █
-# ███████████████████████████████████████████████████████████████
-class Colors:
-    HEADER = '\033[95m'    # Purple
-    BLUE = '\033[94m'      # Blue
-    CYAN = '\033[96m'      # Cyan
-    GREEN = '\033[92m'     # Green
-    YELLOW = '\033[93m'    # Yellow
-    WARNING = '\033[93m'   # Yellow (same as YELLOW, for backwards compatibility)
-    RED = '\033[91m'       # Red
-    END = '\033[0m'        # Reset all formatting
-    BOLD = '\033[1m'       # Bold text
-    UNDERLINE = '\033[4m'  # Underlined text
-
 # ███████████████████████████████████████████████████████████████
 # █ HELPER FUNCTIONS                                            █
 # █ Utility functions for setup and configuration               █
@@ -76,8 +81,19 @@ def print_banner():
 """
     print(banner)
 
-def run_command(cmd, cwd=None, shell=False, env=None, capture_output=True):
-    """Execute a command and return the result"""
+_command_log = None
+_command_log_lock = threading.Lock()
+
+def command_log():
+    """Log pipeline shared by every command the launcher runs (preflight runs them in parallel)"""
+    global _command_log
+    with _command_log_lock:
+        if _command_log is None:
+            _command_log = LogPipeline("launch_alpha", PROCESS_LOG_DIR)
+        return _command_log
+
+def run_command(cmd, cwd=None, shell=False, env=None):
+    """Execute a command, streaming its output, and return the result"""
     print(f"{Colors.CYAN}[EXEC]{Colors.END} {' '.join(cmd) if isinstance(cmd, list) else cmd}")
     try:
         if isinstance(cmd, str) and not shell:
@@ -86,26 +102,16 @@ def run_command(cmd, cwd=None, shell=False, env=None, capture_output=True):
         if env is None:
             env = os.environ.copy()
 
-        if capture_output:
-            process = subprocess.run(
-                cmd, 
-                cwd=cwd or BASE_DIR,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                shell=shell,
-                env=env
-            )
-        else:
-            # Run without capturing output (directly to terminal)
-            process = subprocess.run(
-                cmd, 
-                cwd=cwd or BASE_DIR,
-                shell=shell,
-                env=env
-            )
+        # Output is shown as it arrives and logged; only the tail is kept in memory
+        pipeline = command_log()
+        returncode, _, _ = run_logged(cmd, pipeline, cwd=cwd or BASE_DIR, shell=shell, env=env)
+        
+        if returncode != 0:
+            report = pipeline.crash_report(command_source(cmd), cmd, returncode)
+            print(f"{Colors.RED}[ERROR]{Colors.END} Command failed with code {returncode}, "
+                  f"full output in {pipeline.path}, last lines in {report}")
         
-        return process.returncode == 0
+        return returncode == 0
     except Exception as e:
         print(f"{Colors.RED}[ERROR]{Colors.END} {str(e)}")
         return False
@@ -113,8 +119,13 @@ def run_command(cmd, cwd=None, shell=False, env=None, capture_output=True):
 def check_dependencies():
     """Check if Node.js dependencies are installed"""
     node_modules = BASE_DIR / "node_modules"
+    store = ProvisionStore()
     
-    if not node_modules.exists():
+    if not node_modules.exists() and store.has_node(BASE_DIR):
+        # Linked from the dependency store built by run_browser.py --build-store
+        linker = store.provision_node_modules(BASE_DIR)
+        print(f"{Colors.GREEN}[+]{Colors.END} Node.js dependencies provisioned from {store.root} ({linker.summary()})")
+    elif not node_modules.exists():
         print(f"{Colors.YELLOW}[WARN]{Colors.END} Node modules not found, installing dependencies...")
         if not run_command([NPM_CMD, "install"]):
             print(f"{Colors.RED}[ERROR]{Colors.END} Failed to install Node.js dependencies")
@@ -146,12 +157,7 @@ def verify_limiter_components():
             print(f"{Colors.YELLOW}[WARN]{Colors.END} Some resource limiter components are missing:")
             for file in missing_files:
                 print(f"{Colors.YELLOW}  - {file.relative_to(BASE_DIR)}{Colors.END}")
-            
-            # Install required packages even if files exist
-            print(f"{Colors.YELLOW}[ACTION]{Colors.END} Installing resource limiter dependencies...")
-            run_command([NPM_CMD, "install", "--save", "pidusage", "throttle", "http-proxy"])
-            
-            return len(missing_files) == 0
+            return False
         
         print(f"{Colors.GREEN}[+]{Colors.END} Resource limiter components verified")
         return True
@@ -159,42 +165,48 @@ def verify_limiter_components():
         print(f"{Colors.RED}[ERROR]{Colors.END} Failed to check resource limiter components: {str(e)}")
         return False
 
+def install_limiter_dependencies():
+    """Install the npm packages required by the resource limiters"""
+    print(f"{Colors.YELLOW}[ACTION]{Colors.END} Installing resource limiter dependencies...")
+    return run_command([NPM_CMD, "install", "--save", "pidusage", "throttle", "http-proxy"])
+
+def run_limiter_efficacy(profiles):
+    """Run each limiter profile against synthetic load and print a pass/fail report"""
+    profiles = [name.strip() for name in profiles.split(",") if name.strip()]
+    unknown = [name for name in profiles if name not in EFFICACY_PROFILES]
+    if unknown or not profiles:
+        problem = f"Unknown efficacy profile(s): {', '.join(unknown)}" if unknown else "No efficacy profiles given"
+        print(f"{Colors.RED}[ERROR]{Colors.END} {problem} (valid: {', '.join(EFFICACY_PROFILES)})")
+        return False
+
+    print(f"{Colors.BLUE}[INFO]{Colors.END} Running the limiter efficacy harness ({len(profiles)} profile(s), about two minutes each)...")
+    report = run_efficacy(profiles)
+    print_report(report)
+    
+    if report["passed"]:
+        print(f"{Colors.GREEN}[+]{Colors.END} Every enforced limiter held its target under load")
+    else:
+        print(f"{Colors.RED}[ERROR]{Colors.END} Some limiters did not hold their targets (see the report above)")
+    return report["passed"]
+
+def check_plugin_index():
+    """Validate plugin manifests and rebuild the index the browser starts from"""
+    try:
+        index = build_plugin_index(PLUGINS_DIR, PLUGIN_INDEX)
+        for error in index["errors"]:
+            print(f"{Colors.YELLOW}[WARN]{Colors.END} Plugin {error['directory']} skipped: {error['error']}")
+        print(f"{Colors.GREEN}[+]{Colors.END} Plugin index built: {len(index['plugins'])} plugin(s)")
+        return True
+    except Exception as e:
+        print(f"{Colors.RED}[ERROR]{Colors.END} Failed to build plugin index: {str(e)}")
+        return False
+
 def configure_ollama():
     """Configure Ollama integration with llama3.2 model"""
     try:
-        if not PACKAGE_JSON.exists():
-            print(f"{Colors.RED}[ERROR]{Colors.END} package.json not found!")
-            return False
-            
-        with open(PACKAGE_JSON, 'r') as f:
-            package_data = json.load(f)
-            
-        # Ensure config section exists
-        if 'config' not in package_data:
-            package_data['config'] = {}
-            
-        # Ensure ollama section exists
-        if 'ollama' not in package_data['config']:
-            package_data['config']['ollama'] = {}
-            
-        # Set defaults according to user rules
-        ollama_config = package_data['config']['ollama']
-        if 'model' not in ollama_config or ollama_config['model'] != 'llama3.2':
-            ollama_config['model'] = 'llama3.2'
-            
-        if 'ip' not in ollama_config:
-            ollama_config['ip'] = '127.0.0.1'
-            
-        if 'port' not in ollama_config:
-            ollama_config['port'] = '11434'
-            
-        if 'style' not in ollama_config:
-            ollama_config['style'] = 'default'
-            
-        # Write back any changes
-        with open(PACKAGE_JSON, 'w') as f:
-            json.dump(package_data, f, indent=2)
-            
+        ollama_config, written = ensure_ollama_settings(RUNTIME_SETTINGS, PACKAGE_JSON)
+        if written:
+            print(f"{Colors.GREEN}[+]{Colors.END} Updated {RUNTIME_SETTINGS.name}")
         print(f"{Colors.GREEN}[+]{Colors.END} Ollama configured: using {ollama_config['model']} model")
         return True
     except Exception as e:
@@ -206,7 +218,7 @@ def configure_ollama():
 # █ Core functionality for launching the application            █
 # ███████████████████████████████████████████████████████████████
 
-def start_browser(dev_mode=False):
+def start_browser(dev_mode=False, ready_timeout=DEFAULT_READY_TIMEOUT):
     """Start the Electron browser application"""
     # Set development flag to enable debugging tools if needed
     os.environ['BROWSER_DEV_MODE'] = '1' if dev_mode else '0'
@@ -220,13 +232,78 @@ def start_browser(dev_mode=False):
     # Notify user about alpha version
     print(f"{Colors.YELLOW}\n[ALPHA TEST VERSION]{Colors.END} Please report any issues or feedback")
     print(f"{Colors.YELLOW}[INFO]{Colors.END} Use the limiter settings panel to manage system resources\n")
-    time.sleep(1)  # Short pause for user to read the message
     
     # Command to run the browser
     cmd = [NPM_CMD, "run", "dev" if dev_mode else "start"]
+    print(f"{Colors.CYAN}[EXEC]{Colors.END} {' '.join(cmd)}")
+    
+    # Output still reaches the terminal, and logs/processes/browser.log
+    cmd = logged_command(cmd, "browser", PROCESS_LOG_DIR)
+    
+    # The main process reports back on this socket once it is ready
+    listener = ReadinessListener()
+    env = os.environ.copy()
+    env.update(listener.env())
     
-    # Execute in a subprocess, showing output directly in the terminal
-    return run_command(cmd, capture_output=False)
+    try:
+        # Execute in a subprocess, showing output in the terminal as it arrives
+        spawn_start = time.perf_counter()
+        process = subprocess.Popen(cmd, cwd=BASE_DIR, env=env)
+        
+        ready = listener.wait(process, timeout=ready_timeout)
+        if ready is not None:
+            ready_ms = (time.perf_counter() - spawn_start) * 1000
+            ready.close()
+            print(f"{Colors.BLUE}[TIME]{Colors.END} Browser ready in {ready_ms:.1f} ms")
+            log_startup_time(STARTUP_LOG, {
+                "launcher": "launch_alpha",
+                "mode": "dev" if dev_mode else "normal",
+                "ready_ms": round(ready_ms, 1),
+                "browser": ready.message.get("timings", {}),
+            })
+        elif process.poll() is None:
+            print(f"{Colors.YELLOW}[WARN]{Colors.END} Browser did not report ready within {ready_timeout:.0f}s")
+        listener.close()
+        
+        # Stay attached until the browser exits, like the terminal session expects
+        return process.wait() == 0
+    except KeyboardInterrupt:
+        return True
+    except Exception as e:
+        print(f"{Colors.RED}[ERROR]{Colors.END} {str(e)}")
+        return False
+    finally:
+        listener.close()
+
+def claim_browser(wait):
+    """Show a browser from the standby pool daemon and stay attached until it exits"""
+    start = time.perf_counter()
+    reply = claim_standby(wait=wait)
+    if reply is None or not reply.get("ok"):
+        reason = "no daemon running" if reply is None else reply.get("error")
+        print(f"{Colors.BLUE}[INFO]{Colors.END} No standby browser ({reason}), starting one")
+        return None
+    
+    claim_ms = (time.perf_counter() - start) * 1000
+    print(f"{Colors.BLUE}[TIME]{Colors.END} Standby browser (PID {reply['pid']}) shown in {claim_ms:.1f} ms")
+    log_startup_time(STARTUP_LOG, {
+        "launcher": "launch_alpha",
+        "mode": "claim",
+        "ready_ms": round(claim_ms, 1),
+        "browser_pid": reply["pid"],
+    })
+    
+    # The daemon owns the process; poll it like the terminal session expects
+    if IS_WINDOWS:
+        return True
+    try:
+        while True:
+            os.kill(reply["pid"], 0)
+            time.sleep(1.0)
+    except OSError:
+        return True
+    except KeyboardInterrupt:
+        return True
 
 def build_package(platform_name):
     """Build packages for specified platform"""
@@ -235,7 +312,7 @@ def build_package(platform_name):
         return False
         
     print(f"{Colors.GREEN}[+]{Colors.END} Building packages for {platform_name}...")
-    return run_command([NPM_CMD, "run", f"build:{platform_name}"], capture_output=False)
+    return run_command([NPM_CMD, "run", f"build:{platform_name}"])
 
 def main():
     """Main entry point for the launcher"""
@@ -244,21 +321,70 @@ def main():
     parser.add_argument("--dev", action="store_true", help="Start in development mode with DevTools")
     parser.add_argument("--build", choices=['win', 'linux'], help="Build packages for specified platform")
     parser.add_argument("--verify", action="store_true", help="Verify all components without starting the browser")
+    parser.add_argument("--full-check", action="store_true", help="Ignore the launch manifest and run every dependency check")
+    parser.add_argument("--ready-timeout", type=float, default=DEFAULT_READY_TIMEOUT,
+                        help="Seconds to wait for the browser to report ready")
+    parser.add_argument("--claim", action="store_true",
+                        help="Show a browser from the standby pool daemon (run_browser.py --daemon) if one runs")
+    parser.add_argument("--efficacy", nargs="?", const=",".join(EFFICACY_PROFILES), metavar="PROFILES",
+                        help="Check that the limiters hold each profile's targets under synthetic load, then exit")
     args = parser.parse_args()
     
+    # A claimed standby was started (and preflighted) by the daemon
+    if args.claim and claim_browser(args.ready_timeout) is not None:
+        return 0
+    
     print_banner()
     
-    # Check Node.js dependencies
-    if not check_dependencies():
+    # Only checks whose inputs changed since the last launch have to run
+    manifest = LaunchManifest(MANIFEST_PATH)
+    if args.full_check or args.verify:
+        manifest.clear()
+    
+    current = launch_fingerprints(BASE_DIR)
+    stale = manifest.stale_checks(current)
+    
+    if not stale:
+        print(f"{Colors.GREEN}[+]{Colors.END} Warm launch: launch manifest unchanged, skipping dependency checks")
+    
+    # npm, the limiter file check, the Ollama settings and the plugin index are
+    # independent; the limiter package install is ordered after npm
+    preflight = Preflight()
+    if "node" in stale:
+        preflight.add("node", check_dependencies, fatal=True, label="Node.js dependencies")
+    if "limiters" in stale:
+        preflight.add("limiters", verify_limiter_components, label="Limiter components")
+        preflight.add("limiter-deps", install_limiter_dependencies, depends_on=["node", "limiters"],
+                      when=lambda results: not results["limiters"].ok, label="Limiter dependencies")
+    if "ollama" in stale:
+        preflight.add("ollama", configure_ollama, label="Ollama configuration")
+    if "plugins" in stale:
+        preflight.add("plugins", check_plugin_index, label="Plugin index")
+    
+    preflight_ok = preflight.run()
+    preflight.report()
+    results = {name: preflight.results[name].ok for name in current if name in preflight.results}
+    
+    # Record the inputs the checks ran against (after any side effects),
+    # even on abort so finished checks are not repeated next time
+    if results:
+        fingerprints = launch_fingerprints(BASE_DIR)
+        for name, ok in results.items():
+            manifest.record(name, fingerprints[name], ok)
+        manifest.save()
+    
+    if not preflight_ok:
         print(f"{Colors.RED}[FATAL]{Colors.END} Failed to install Node.js dependencies")
         return 1
     
-    # Configure Ollama with llama3.2 model
-    if not configure_ollama():
+    if not results.get("ollama", True):
         print(f"{Colors.YELLOW}[WARN]{Colors.END} Ollama configuration issues detected")
     
-    # Verify resource limiter components
-    verify_limiter_components()
+    print(f"{Colors.BLUE}[INFO]{Colors.END} Preflight completed in {preflight.elapsed_ms:.1f} ms ({len(results)} of {len(current)} checks run)")
+    
+    # Limiters against synthetic load instead of starting the browser
+    if args.efficacy:
+        return 0 if run_limiter_efficacy(args.efficacy) else 1
     
     # If only verification was requested, exit here
     if args.verify:
@@ -275,7 +401,7 @@ def main():
             return 1
     
     # Start the browser
-    return 0 if start_browser(dev_mode=args.dev) else 1
+    return 0 if start_browser(dev_mode=args.dev, ready_timeout=args.ready_timeout) else 1
 
 # ███████████████████████████████████████████████████████████████
 # █ EXECUTION ENTRY POINT                                       █
@@ -0,0 +1,9 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Launcher support package for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+Shared helpers used by run_browser.py and launch_alpha.py
+"""
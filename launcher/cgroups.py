@@ -0,0 +1,215 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+cgroup v2 enforcement for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Creates a delegated cgroup v2 subtree for the browser session
+[+] Kernel-enforced cpu.max, memory.high and memory.max from a limiter profile
+[+] The whole Electron tree (renderers, GPU) is born inside the cgroup
+[+] Pressure stall information (PSI) readers
+[+] Works against any directory tree, so it can run on a fake cgroupfs
+"""
+
+import os
+import time
+from pathlib import Path
+
+# Default cgroup v2 mount point
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# Environment variable read by the LimiterManager
+CGROUP_ENV = "INTERNET_SERVER_CGROUP"
+
+# Controllers the browser cgroup needs
+CONTROLLERS = ("cpu", "memory")
+
+# cpu.max period in microseconds
+CPU_PERIOD_US = 100000
+
+# memory.high is set this far below memory.max so the kernel reclaims
+# (and reports pressure) before the OOM killer is involved
+MEMORY_HIGH_RATIO = 0.9
+
+# CPU and memory parts of the LimiterManager profiles (limiter-manager.js)
+LIMITER_PROFILES = {
+    "performance": {"cpu": {"enabled": False, "maxCpuPercent": 100}, "memory": {"enabled": False, "maxMemoryMB": 2048}},
+    "balanced": {"cpu": {"enabled": True, "maxCpuPercent": 70}, "memory": {"enabled": True, "maxMemoryMB": 1024}},
+    "efficiency": {"cpu": {"enabled": True, "maxCpuPercent": 50}, "memory": {"enabled": True, "maxMemoryMB": 768}},
+    "gaming": {"cpu": {"enabled": True, "maxCpuPercent": 30}, "memory": {"enabled": True, "maxMemoryMB": 512}},
+    "streaming": {"cpu": {"enabled": True, "maxCpuPercent": 40}, "memory": {"enabled": True, "maxMemoryMB": 768}},
+}
+
+# ███████████████████████████████████████████████████████████████
+# █ INTERFACE FILE HELPERS                                      █
+# █ Formatting and parsing of cgroup v2 control files           █
+# ███████████████████████████████████████████████████████████████
+
+def cpu_max_value(max_cpu_percent, cpu_count=None, period_us=CPU_PERIOD_US):
+    """cpu.max line for a share of the whole machine (all cores = 100%)"""
+    if max_cpu_percent is None or max_cpu_percent >= 100:
+        return f"max {period_us}"
+    cpu_count = cpu_count or os.cpu_count() or 1
+    quota = max(1000, int(period_us * cpu_count * max_cpu_percent / 100))
+    return f"{quota} {period_us}"
+
+def memory_values(max_memory_mb):
+    """(memory.high, memory.max) values for a limit in megabytes"""
+    if not max_memory_mb:
+        return "max", "max"
+    limit = int(max_memory_mb) * 1024 * 1024
+    return str(int(limit * MEMORY_HIGH_RATIO)), str(limit)
+
+def parse_pressure(text):
+    """Parse a PSI file into {"some": {...}, "full": {...}}"""
+    pressure = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        values = {}
+        for field in parts[1:]:
+            key, _, value = field.partition("=")
+            try:
+                values[key] = float(value) if key != "total" else int(value)
+            except ValueError:
+                continue
+        pressure[parts[0]] = values
+    return pressure
+
+def own_cgroup(proc_file="/proc/self/cgroup"):
+    """Relative path of the cgroup v2 this process lives in, or None"""
+    try:
+        with open(proc_file, "r") as f:
+            for line in f:
+                hierarchy, _, path = line.strip().split(":", 2)
+                if hierarchy == "0":
+                    return path.lstrip("/")
+    except (OSError, ValueError):
+        pass
+    return None
+
+# ███████████████████████████████████████████████████████████████
+# █ CGROUP CONTROLLER                                           █
+# █ Sets up and manages the browser's delegated subtree         █
+# ███████████████████████████████████████████████████████████████
+
+class CgroupController:
+    """A browser cgroup inside a delegated cgroup v2 subtree"""
+
+    def __init__(self, name="internet-server", root=CGROUP_ROOT, parent=None):
+        self.root = Path(root)
+        if parent is None:
+            parent = own_cgroup() or ""
+        self.parent = self.root / parent if not Path(parent).is_absolute() else Path(parent)
+        self.path = self.parent / name
+        self.error = None
+
+    def available(self):
+        """Whether cgroup v2 is mounted and the parent is writable by us"""
+        if not (self.root / "cgroup.controllers").exists():
+            self.error = f"no cgroup v2 hierarchy at {self.root}"
+            return False
+        controllers = self._read(self.parent / "cgroup.controllers").split()
+        missing = [c for c in CONTROLLERS if c not in controllers]
+        if missing:
+            self.error = f"controllers not delegated to {self.parent}: {', '.join(missing)}"
+            return False
+        if not os.access(self.parent, os.W_OK):
+            self.error = f"{self.parent} is not writable (delegate it, e.g. systemd-run --user -p Delegate=yes)"
+            return False
+        return True
+
+    def setup(self):
+        """Create the browser cgroup and enable its controllers"""
+        try:
+            # cgroup v2 forbids enabling controllers for children of a
+            # cgroup that still holds processes, so park them in a leaf
+            procs = self._read(self.parent / "cgroup.procs").split()
+            if procs:
+                leaf = self.parent / "launcher"
+                leaf.mkdir(exist_ok=True)
+                for pid in procs:
+                    try:
+                        self._write(leaf / "cgroup.procs", pid)
+                    except OSError:
+                        pass  # Processes we do not own stay where they are
+
+            enabled = self._read(self.parent / "cgroup.subtree_control").split()
+            wanted = [f"+{c}" for c in CONTROLLERS if c not in enabled]
+            if wanted:
+                self._write(self.parent / "cgroup.subtree_control", " ".join(wanted))
+
+            self.path.mkdir(exist_ok=True)
+            return True
+        except OSError as e:
+            self.error = str(e)
+            return False
+
+    def apply_profile(self, profile):
+        """Write cpu.max, memory.high and memory.max from a limiter profile"""
+        cpu = profile.get("cpu", {})
+        memory = profile.get("memory", {})
+        return self.apply_limits(
+            cpu.get("maxCpuPercent") if cpu.get("enabled") else None,
+            memory.get("maxMemoryMB") if memory.get("enabled") else None,
+        )
+
+    def apply_limits(self, max_cpu_percent=None, max_memory_mb=None):
+        """Write the limits; None removes a limit"""
+        try:
+            memory_high, memory_max = memory_values(max_memory_mb)
+            self._write(self.path / "cpu.max", cpu_max_value(max_cpu_percent))
+            # Lower memory.max last when shrinking so memory.high stays <= max
+            self._write(self.path / "memory.high", memory_high)
+            self._write(self.path / "memory.max", memory_max)
+            return True
+        except OSError as e:
+            self.error = str(e)
+            return False
+
+    def attach(self, pid=None):
+        """Move a process into the browser cgroup (default: the caller)"""
+        self._write(self.path / "cgroup.procs", str(pid or os.getpid()))
+
+    def pressure(self):
+        """PSI for cpu, memory and io of the browser cgroup"""
+        result = {}
+        for resource in ("cpu", "memory", "io"):
+            text = self._read(self.path / f"{resource}.pressure")
+            if text:
+                result[resource] = parse_pressure(text)
+        return result
+
+    def populated(self):
+        """Whether any process is still in the browser cgroup (or below it)"""
+        for line in self._read(self.path / "cgroup.events").splitlines():
+            key, _, value = line.partition(" ")
+            if key == "populated":
+                return value.strip() == "1"
+        return False
+
+    def remove(self, timeout=0.0):
+        """Remove the browser cgroup once it has no processes left, waiting up to timeout seconds"""
+        deadline = time.monotonic() + timeout
+        while self.populated() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        try:
+            self.path.rmdir()
+            return True
+        except OSError:
+            return False
+
+    def _read(self, path):
+        """Read an interface file, returning an empty string if absent"""
+        try:
+            with open(path, "r") as f:
+                return f.read()
+        except OSError:
+            return ""
+
+    def _write(self, path, value):
+        """Write an interface file in one write() call, as the kernel expects"""
+        with open(path, "w") as f:
+            f.write(value)
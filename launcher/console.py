@@ -0,0 +1,23 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Console styling shared by the launcher helper modules
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+"""
+
+# ███████████████████████████████████████████████████████████████
+# █ CONSOLE COLORS                                              █
+# █ ANSI color codes for terminal output styling                █
+# ███████████████████████████████████████████████████████████████
+class Colors:
+    HEADER = '\033[95m'    # Purple
+    BLUE = '\033[94m'      # Blue
+    CYAN = '\033[96m'      # Cyan
+    GREEN = '\033[92m'     # Green
+    YELLOW = '\033[93m'    # Yellow
+    WARNING = '\033[93m'   # Yellow (same as YELLOW, for backwards compatibility)
+    RED = '\033[91m'       # Red
+    END = '\033[0m'        # Reset all formatting
+    BOLD = '\033[1m'       # Bold text
+    UNDERLINE = '\033[4m'  # Underlined text
@@ -0,0 +1,613 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Standby pool daemon for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Keeps pre-started, fully initialised but hidden browsers waiting
+[+] A claim shows one of them: one loopback round trip instead of a cold start
+[+] Refills the pool in the background, one cold start at a time
+[+] Pool size follows the claim rate, bounded by free memory
+[+] Token-authenticated control socket advertised through a state file
+
+Usage:
+    python run_browser.py --daemon [--pool-min 1] [--pool-max 4]
+    python -m launcher.daemon claim [--wait SECONDS]
+    python -m launcher.daemon status
+
+Standbys run with their limiters, proxy and sidecar connections up and
+their window hidden. Claimed browsers belong to the user: they keep
+running when the daemon stops, and their slot (user-data directory and
+proxy port) is reused once they exit. Standbys quit by themselves if
+the daemon goes away.
+"""
+
+import argparse
+import json
+import math
+import os
+import secrets
+import select
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from launcher.console import Colors
+from launcher.fleet import FleetInstance, SHUTDOWN_TIMEOUT, BACKOFF_INITIAL, BACKOFF_MAX, _format_bytes
+
+# Environment variable read by main.js: stay hidden until told to show
+STANDBY_ENV = "INTERNET_SERVER_STANDBY"
+
+# Where clients find the daemon's control port and token
+DAEMON_STATE_ENV = "INTERNET_SERVER_DAEMON_STATE"
+DAEMON_STATE_NAME = "daemon.json"
+DEFAULT_DAEMON_DIR = Path(__file__).resolve().parent.parent / ".daemon"
+
+# Pool size bounds; the adaptive target moves between them
+MIN_STANDBY = 1
+MAX_STANDBY = 4
+
+# Standbys started at once (cold starts compete for the same CPU)
+MAX_WARMING = 1
+
+# Claim rate is a decayed average over roughly this many seconds
+CLAIM_RATE_HALF_LIFE = 300.0
+
+# Memory kept free for the claimed browsers and everything else (MB)
+MEMORY_RESERVE_MB = 1024
+
+# Estimates used until the first standby has been measured
+DEFAULT_STANDBY_RSS_MB = 400
+DEFAULT_REFILL_SECONDS = 10.0
+
+# Smoothing of the measured RSS and refill time
+ESTIMATE_WEIGHT = 0.3
+
+# A pool over target shrinks one standby per this many seconds (immediately under memory pressure)
+SHRINK_DELAY = 120.0
+
+# How long a standby gets to show its window once claimed
+SHOW_TIMEOUT = 5.0
+
+# How long a claim may wait for a standby by default
+DEFAULT_CLAIM_WAIT = 30.0
+
+# Seconds between RSS samples and stats lines
+SAMPLE_INTERVAL = 10.0
+STATS_INTERVAL = 60.0
+
+MB = 1024 * 1024
+
+def default_state_path():
+    """Daemon state file, from the environment or the repository default"""
+    return Path(os.environ.get(DAEMON_STATE_ENV) or DEFAULT_DAEMON_DIR / DAEMON_STATE_NAME)
+
+# ███████████████████████████████████████████████████████████████
+# █ CLAIM RATE                                                  █
+# █ Exponentially decayed claims per second                     █
+# ███████████████████████████████████████████████████████████████
+
+class ClaimRate:
+    """Decayed event rate: recent claims count fully, old ones fade out"""
+
+    def __init__(self, half_life=CLAIM_RATE_HALF_LIFE):
+        self.half_life = half_life
+        self.rate = 0.0
+        self.updated = time.monotonic()
+
+    def record(self, now=None):
+        """Count one claim"""
+        now = time.monotonic() if now is None else now
+        self.rate = self.per_second(now) + math.log(2) / self.half_life
+        self.updated = now
+
+    def per_second(self, now=None):
+        """Current claims per second"""
+        now = time.monotonic() if now is None else now
+        return self.rate * 0.5 ** ((now - self.updated) / self.half_life)
+
+# ███████████████████████████████████████████████████████████████
+# █ STANDBY INSTANCES                                           █
+# █ A pooled browser, hidden until claimed                      █
+# ███████████████████████████████████████████████████████████████
+
+class StandbyInstance(FleetInstance):
+    """A pre-started browser waiting in the pool"""
+
+    def __init__(self, slot, user_data_dir, proxy_port, profile, log_dir=None):
+        super().__init__(slot, user_data_dir, proxy_port, profile, log_dir=log_dir)
+        self.name = f"standby-{slot}"
+        self.connection = None
+        self.claim = None          # the pending claim being served while the window is shown
+        self.show_deadline = None
+        self.retire_deadline = None
+
+    def env(self, base_env, ready_port, stats_interval_ms=0):
+        """Fleet environment plus the standby flag (no stats stream)"""
+        env = super().env(base_env, ready_port, stats_interval_ms)
+        env[STANDBY_ENV] = "1"
+        return env
+
+    def close_connection(self):
+        """Drop the control connection (a hidden standby quits when it closes)"""
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except OSError:
+                pass
+            self.connection = None
+
+# ███████████████████████████████████████████████████████████████
+# █ STANDBY POOL                                                █
+# █ Spawning, sizing, claims and shutdown                       █
+# ███████████████████████████████████████████████████████████████
+
+class StandbyPool:
+    """Keeps hidden browsers ready and hands them out on claim"""
+
+    def __init__(self, cmd, cwd, pool_dir, base_env=None, proxy_base_port=9000, profile="balanced",
+                 min_size=MIN_STANDBY, max_size=MAX_STANDBY, memory_reserve_mb=MEMORY_RESERVE_MB,
+                 log_dir=None):
+        self.cmd = cmd
+        self.cwd = cwd
+        self.pool_dir = Path(pool_dir)
+        self.state_path = self.pool_dir / DAEMON_STATE_NAME
+        self.base_env = base_env or os.environ.copy()
+        self.proxy_base_port = proxy_base_port
+        self.profile = profile
+        self.min_size = min_size
+        self.max_size = max(min_size, max_size)
+        self.memory_reserve_mb = memory_reserve_mb
+        self.log_dir = log_dir
+        self.token = secrets.token_hex(16)
+        self.stopping = False
+
+        self.standbys = []   # starting, ready or being shown
+        self.claimed = []    # handed out; tracked only to free their slot
+        self.retiring = []   # asked to exit after the pool shrank
+        self.pending = []    # [client socket, received at, deadline] waiting for a standby
+
+        self.claims = ClaimRate()
+        self.claim_count = 0
+        self.rss_mb = DEFAULT_STANDBY_RSS_MB
+        self.refill_s = DEFAULT_REFILL_SECONDS
+        self.over_since = None
+        self.spawn_after = 0.0
+        self.backoff = BACKOFF_INITIAL
+
+        # Standbys report ready here and keep the connection for the show command
+        self.server = _listen()
+        self.port = self.server.getsockname()[1]
+
+        # Clients send claim and status commands here
+        self.control = _listen()
+        self.control_port = self.control.getsockname()[1]
+
+        self._connections = {}  # socket -> [buffer, StandbyInstance, None (unauthenticated) or "client"]
+
+    def run(self):
+        """Serve claims until interrupted, then stop every standby"""
+        previous = {}
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            previous[sig] = signal.signal(sig, self._request_stop)
+
+        try:
+            self._write_state()
+            print(f"{Colors.GREEN}[+]{Colors.END} Standby pool daemon listening on 127.0.0.1:{self.control_port} "
+                  f"(pool {self.min_size}-{self.max_size}, state {self.state_path})")
+            next_sample = next_stats = time.monotonic()
+            while not self.stopping:
+                busy = self.pending or any(s.claim for s in self.standbys)
+                self._poll_sockets(0.05 if busy else 0.5)
+                now = time.monotonic()
+                self._reap(now)
+                self._serve_claims(now)
+                self._resize(now)
+                if now >= next_sample:
+                    next_sample = now + SAMPLE_INTERVAL
+                    self._sample()
+                if now >= next_stats:
+                    next_stats = now + STATS_INTERVAL
+                    self.print_stats()
+        finally:
+            self.shutdown()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+        return 0
+
+    def target_size(self, now=None):
+        """Standbys to keep: enough for the claims expected during one refill, within memory"""
+        now = time.monotonic() if now is None else now
+        expected = self.claims.per_second(now) * self.refill_s
+        target = max(self.min_size, math.ceil(expected) + (1 if expected > 0 else 0), len(self.pending))
+        target = min(target, self.max_size)
+
+        headroom = self._memory_headroom_mb()
+        if headroom is not None:
+            live = len([s for s in self.standbys if s.claim is None])
+            target = min(target, live + math.floor(headroom / self.rss_mb))
+        return max(target, 0)
+
+    def stats(self):
+        """Pool state for status requests and the stats line"""
+        now = time.monotonic()
+        idle = [s for s in self.standbys if s.claim is None]
+        headroom = self._memory_headroom_mb()
+        return {
+            "ready": len([s for s in idle if s.ready_at is not None]),
+            "warming": len([s for s in idle if s.ready_at is None]),
+            "claimed": len(self.claimed),
+            "pending": len(self.pending),
+            "target": self.target_size(now),
+            "claims": self.claim_count,
+            "claims_per_minute": round(self.claims.per_second(now) * 60, 2),
+            "refill_s": round(self.refill_s, 1),
+            "standby_rss_mb": round(self.rss_mb),
+            "memory_headroom_mb": None if headroom is None else round(headroom),
+        }
+
+    def print_stats(self):
+        """Print one line of pool state"""
+        stats = self.stats()
+        line = (f"{Colors.BLUE}[POOL]{Colors.END} {stats['ready']} ready, {stats['warming']} warming, "
+                f"{stats['claimed']} claimed | target {stats['target']} "
+                f"({stats['claims_per_minute']} claims/min, refill {stats['refill_s']}s, "
+                f"~{stats['standby_rss_mb']} MB each)")
+        if stats["memory_headroom_mb"] is not None:
+            line += f" | headroom {_format_bytes(stats['memory_headroom_mb'] * MB)}"
+        print(line)
+
+    def shutdown(self, timeout=SHUTDOWN_TIMEOUT):
+        """Stop every standby; claimed browsers are left running"""
+        for client, _, _ in self.pending:
+            self._reply(client, {"ok": False, "error": "daemon stopping"})
+        self.pending = []
+
+        stopping = [s for s in self.standbys + self.retiring if s.running]
+        if stopping:
+            print(f"{Colors.BLUE}[INFO]{Colors.END} Stopping {len(stopping)} standby browser(s)...")
+        for standby in stopping:
+            if standby.claim is not None:
+                self._reply(standby.claim[0], {"ok": False, "error": "daemon stopping"})
+            standby.close_connection()
+            standby.terminate()
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and any(s.running for s in stopping):
+            time.sleep(0.1)
+        for standby in stopping:
+            if standby.running:
+                print(f"{Colors.YELLOW}[WARN]{Colors.END} Standby {standby.index} did not exit, killing it")
+                standby.kill()
+
+        for sock in list(self._connections):
+            sock.close()
+        self._connections.clear()
+        self.server.close()
+        self.control.close()
+        try:
+            self.state_path.unlink()
+        except OSError:
+            pass
+
+    def _write_state(self):
+        """Advertise the control port and token to clients (owner-only file)"""
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
+        temp = self.state_path.with_suffix(".tmp")
+        fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"pid": os.getpid(), "port": self.control_port, "token": self.token}, f)
+        os.replace(temp, self.state_path)
+
+    def _spawn(self, now):
+        """Start one standby in the lowest free slot"""
+        used = {s.index for s in self.standbys + self.claimed + self.retiring}
+        slot = next(i for i in range(len(used) + 1) if i not in used)
+        standby = StandbyInstance(slot, self.pool_dir / f"standby-{slot}", self.proxy_base_port + slot,
+                                  self.profile, log_dir=self.log_dir)
+        try:
+            standby.start(self.cmd, self.cwd, standby.env(self.base_env, self.port))
+        except OSError as e:
+            print(f"{Colors.RED}[ERROR]{Colors.END} Standby {slot} failed to start: {str(e)}")
+            self._back_off(now)
+            return
+        self.standbys.append(standby)
+        print(f"{Colors.GREEN}[+]{Colors.END} Standby {slot} starting (PID {standby.process.pid}, "
+              f"proxy port {standby.proxy_port})")
+
+    def _retire(self, standby, now):
+        """Ask a surplus standby to exit"""
+        self.standbys.remove(standby)
+        standby.close_connection()
+        standby.terminate()
+        standby.retire_deadline = now + SHUTDOWN_TIMEOUT
+        self.retiring.append(standby)
+        print(f"{Colors.BLUE}[INFO]{Colors.END} Retiring standby {standby.index} (pool over target)")
+
+    def _back_off(self, now):
+        """Delay the next spawn after a failed one, doubling the delay each time"""
+        self.spawn_after = now + self.backoff
+        print(f"{Colors.YELLOW}[WARN]{Colors.END} Next standby in {self.backoff:.0f}s")
+        self.backoff = min(self.backoff * 2, BACKOFF_MAX)
+
+    def _reap(self, now):
+        """Drop exited processes, requeue interrupted claims and expire waiting ones"""
+        for standby in list(self.standbys):
+            if standby.claim is not None and standby.running and now > standby.show_deadline:
+                print(f"{Colors.YELLOW}[WARN]{Colors.END} Standby {standby.index} did not show its window, killing it")
+                standby.kill()
+            if standby.running:
+                continue
+            self.standbys.remove(standby)
+            standby.close_connection()
+            if standby.claim is not None:
+                # The client is still waiting: give it the next standby instead
+                self.pending.insert(0, standby.claim)
+                standby.claim = None
+            code = standby.process.returncode
+            if standby.ready_at is None:
+                print(f"{Colors.YELLOW}[WARN]{Colors.END} Standby {standby.index} exited with code {code} before ready")
+                self._back_off(now)
+            else:
+                print(f"{Colors.YELLOW}[WARN]{Colors.END} Standby {standby.index} exited with code {code}")
+
+        self.claimed = [s for s in self.claimed if s.running]
+
+        for standby in list(self.retiring):
+            if standby.running and now > standby.retire_deadline:
+                standby.kill()
+            elif not standby.running:
+                self.retiring.remove(standby)
+
+        for claim in list(self.pending):
+            if now > claim[2]:
+                self.pending.remove(claim)
+                self._reply(claim[0], {"ok": False, "error": "no standby became ready in time"})
+
+    def _serve_claims(self, now):
+        """Show the longest-warmed standby to each waiting client"""
+        while self.pending:
+            ready = [s for s in self.standbys
+                     if s.ready_at is not None and s.claim is None and s.connection is not None]
+            if not ready:
+                return
+            claim = self.pending.pop(0)
+            if claim[0] not in self._connections:
+                continue  # the client gave up
+            standby = min(ready, key=lambda s: s.ready_at)
+            standby.claim = claim
+            standby.show_deadline = now + SHOW_TIMEOUT
+            try:
+                standby.connection.sendall(b'{"command":"show"}\n')
+            except OSError:
+                # Caught as an exit (or show timeout) by the next reap, which requeues the claim
+                standby.kill()
+
+    def _resize(self, now):
+        """Start a standby below target; retire one when over target for long enough"""
+        target = self.target_size(now)
+        idle = [s for s in self.standbys if s.claim is None]
+
+        if len(idle) < target:
+            self.over_since = None
+            warming = [s for s in idle if s.ready_at is None]
+            if len(warming) < MAX_WARMING and now >= self.spawn_after:
+                self._spawn(now)
+        elif len(idle) > target and not self.retiring:
+            headroom = self._memory_headroom_mb()
+            pressure = headroom is not None and headroom < 0
+            if self.over_since is None:
+                self.over_since = now
+            if pressure or now - self.over_since >= SHRINK_DELAY:
+                # Newest first: a warming standby is the cheapest to give up
+                victim = max(idle, key=lambda s: (s.ready_at is None, s.started_at))
+                self._retire(victim, now)
+                self.over_since = now
+        else:
+            self.over_since = None
+
+    def _sample(self):
+        """Refresh the per-standby RSS estimate from the ready standbys"""
+        for standby in self.standbys:
+            if standby.ready_at is None or standby.claim is not None:
+                continue
+            _, rss = standby.sample()
+            if rss:
+                self.rss_mb += ESTIMATE_WEIGHT * (rss / MB - self.rss_mb)
+
+    def _memory_headroom_mb(self):
+        """Available memory above the reserve (None without psutil)"""
+        if psutil is None:
+            return None
+        return psutil.virtual_memory().available / MB - self.memory_reserve_mb
+
+    def _poll_sockets(self, timeout):
+        """Accept standby and client connections and read their JSON lines"""
+        readable, _, _ = select.select([self.server, self.control] + list(self._connections), [], [], timeout)
+        for sock in readable:
+            if sock is self.server or sock is self.control:
+                try:
+                    conn, _ = sock.accept()
+                    conn.setblocking(False)
+                    self._connections[conn] = [b"", None if sock is self.server else "client"]
+                except OSError:
+                    pass
+                continue
+
+            if sock not in self._connections:
+                continue
+            try:
+                data = sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError:
+                data = b""
+            if not data:
+                self._drop(sock)
+                continue
+
+            state = self._connections[sock]
+            state[0] += data
+            while b"\n" in state[0]:
+                line, state[0] = state[0].split(b"\n", 1)
+                if not self._handle_message(sock, state, line):
+                    self._drop(sock)
+                    break
+
+    def _drop(self, sock):
+        """Close a connection and forget it"""
+        state = self._connections.pop(sock, None)
+        if state is not None and isinstance(state[1], StandbyInstance) and state[1].connection is sock:
+            state[1].connection = None
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+    def _handle_message(self, sock, state, line):
+        """Handle one JSON line from a standby or a client; False drops the connection"""
+        try:
+            message = json.loads(line.decode("utf-8"))
+        except ValueError:
+            return False
+
+        if state[1] == "client":
+            return self._handle_client(sock, message)
+
+        if state[1] is None:
+            # The first message must be a ready message with a standby token
+            standby = next((s for s in self.standbys if s.token == message.get("token")), None)
+            if standby is None or message.get("event") != "ready":
+                return False
+            state[1] = standby
+            standby.connection = sock
+            standby.ready_at = time.monotonic()
+            ready_s = standby.ready_at - standby.started_at
+            self.refill_s += ESTIMATE_WEIGHT * (ready_s - self.refill_s)
+            self.backoff = BACKOFF_INITIAL
+            print(f"{Colors.GREEN}[+]{Colors.END} Standby {standby.index} ready in {ready_s * 1000:.0f} ms")
+            return True
+
+        standby = state[1]
+        if message.get("event") == "shown" and standby.claim is not None:
+            client, received, _ = standby.claim
+            claim_ms = (time.monotonic() - received) * 1000
+            self._reply(client, {"ok": True, "pid": standby.process.pid, "slot": standby.index,
+                                 "proxy_port": standby.proxy_port, "claim_ms": round(claim_ms, 1),
+                                 "show_ms": message.get("showMs")})
+            print(f"{Colors.GREEN}[+]{Colors.END} Standby {standby.index} claimed in {claim_ms:.1f} ms")
+            self.standbys.remove(standby)
+            standby.claim = None
+            self.claimed.append(standby)
+            # Once shown the browser no longer needs the daemon
+            standby.connection = None
+            return False
+        return True
+
+    def _handle_client(self, sock, message):
+        """Answer a status request or queue a claim"""
+        if message.get("token") != self.token:
+            return False
+
+        command = message.get("command")
+        if command == "status":
+            self._reply(sock, {"ok": True, **self.stats()})
+            return True
+        if command == "claim":
+            now = time.monotonic()
+            self.claims.record(now)
+            self.claim_count += 1
+            wait = float(message.get("wait", DEFAULT_CLAIM_WAIT))
+            self.pending.append([sock, now, now + wait])
+            self._serve_claims(now)
+            return True
+        self._reply(sock, {"ok": False, "error": f"unknown command: {command}"})
+        return True
+
+    def _reply(self, sock, message):
+        """Send one JSON line to a client and close its connection"""
+        try:
+            sock.setblocking(True)
+            sock.settimeout(1.0)
+            sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        except OSError:
+            pass
+        self._drop(sock)
+
+    def _request_stop(self, signum, frame):
+        """Signal handler: leave the serving loop"""
+        self.stopping = True
+
+def _listen():
+    """Non-blocking loopback listener on an ephemeral port"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(64)
+    server.setblocking(False)
+    return server
+
+# ███████████████████████████████████████████████████████████████
+# █ CLIENT                                                      █
+# █ Claim a standby or query the pool from another process      █
+# ███████████████████████████████████████████████████████████████
+
+def request(command, state_path=None, timeout=5.0, **fields):
+    """Send one command to the running daemon; None if no daemon answers"""
+    try:
+        state = json.loads(Path(state_path or default_state_path()).read_text())
+        with socket.create_connection(("127.0.0.1", state["port"]), timeout=1.0) as sock:
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps({"token": state["token"], "command": command, **fields}).encode("utf-8") + b"\n")
+            buffer = b""
+            while b"\n" not in buffer:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    return None
+                buffer += chunk
+        return json.loads(buffer.split(b"\n", 1)[0].decode("utf-8"))
+    except (OSError, ValueError, KeyError):
+        return None
+
+def claim_standby(state_path=None, wait=DEFAULT_CLAIM_WAIT):
+    """Show a standby browser; the reply has ok, pid and claim_ms (None if no daemon answers)"""
+    return request("claim", state_path, timeout=wait + SHOW_TIMEOUT + 1.0, wait=wait)
+
+def main(argv=None):
+    """Claim a standby or show the pool state"""
+    parser = argparse.ArgumentParser(description="Internet Server standby pool client")
+    parser.add_argument("command", choices=["claim", "status"])
+    parser.add_argument("--state", help=f"Daemon state file (default ${DAEMON_STATE_ENV} or .daemon/{DAEMON_STATE_NAME})")
+    parser.add_argument("--wait", type=float, default=DEFAULT_CLAIM_WAIT,
+                        help="Seconds a claim may wait for a standby to become ready")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == "claim":
+        reply = claim_standby(args.state, wait=args.wait)
+    else:
+        reply = request("status", args.state)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if reply is None:
+        print(f"{Colors.RED}[ERROR]{Colors.END} No standby pool daemon is running")
+        return 1
+    if not reply.get("ok"):
+        print(f"{Colors.RED}[ERROR]{Colors.END} {reply.get('error')}")
+        return 1
+    if args.command == "claim":
+        print(f"{Colors.GREEN}[+]{Colors.END} Browser shown (PID {reply['pid']}) in {elapsed_ms:.1f} ms")
+    else:
+        reply.pop("ok")
+        print(json.dumps(reply, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
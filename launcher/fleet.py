@@ -0,0 +1,425 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Multi-instance fleet supervisor for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Starts N browsers with separate user-data dirs, proxy ports and profiles
+[+] Spreads instances across CPU cores with affinity (Linux)
+[+] Restarts crashed instances with exponential backoff
+[+] Clean shutdown of every instance's process group
+[+] Aggregate throughput and resource stats
+[+] Per-instance rotated logs and crash reports (launcher.logpipe)
+"""
+
+import json
+import os
+import platform
+import secrets
+import select
+import signal
+import socket
+import subprocess
+import time
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from launcher.cgroups import CGROUP_ENV
+from launcher.console import Colors
+from launcher.logpipe import logged_command
+from launcher.readiness import READY_PORT_ENV, READY_TOKEN_ENV
+
+IS_WINDOWS = platform.system() == "Windows"
+
+# Environment variables read by main.js, the LimiterManager and NetworkThrottler
+USER_DATA_ENV = "INTERNET_SERVER_USER_DATA"
+PROXY_PORT_ENV = "INTERNET_SERVER_PROXY_PORT"
+PROFILE_ENV = "INTERNET_SERVER_LIMITER_PROFILE"
+INSTANCE_ENV = "INTERNET_SERVER_INSTANCE"
+STATS_INTERVAL_ENV = "INTERNET_SERVER_STATS_INTERVAL"
+PROXY_CACHE_DIR_ENV = "INTERNET_SERVER_PROXY_CACHE_DIR"
+PROXY_CACHE_MB_ENV = "INTERNET_SERVER_PROXY_CACHE_MB"
+
+# Restart backoff (seconds); reset once an instance stays up long enough
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 60.0
+STABLE_UPTIME = 60.0
+
+# How long instances get to exit after SIGTERM before SIGKILL
+SHUTDOWN_TIMEOUT = 10.0
+
+# How long killed processes get to leave their cgroup before it is removed
+REAP_TIMEOUT = 5.0
+
+# ███████████████████████████████████████████████████████████████
+# █ CPU PLACEMENT                                               █
+# █ Partition the cores the launcher may use across instances   █
+# ███████████████████████████████████████████████████████████████
+
+def available_cpus():
+    """CPUs this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def cpu_sets(count, cpus=None):
+    """Split CPUs into one contiguous set per instance (shared round-robin if fewer CPUs)"""
+    cpus = cpus or available_cpus()
+    if count >= len(cpus):
+        return [{cpus[i % len(cpus)]} for i in range(count)]
+    per_instance = len(cpus) // count
+    return [set(cpus[i * per_instance:(i + 1) * per_instance]) for i in range(count)]
+
+# ███████████████████████████████████████████████████████████████
+# █ INSTANCES                                                   █
+# █ One supervised browser and its restart state                █
+# ███████████████████████████████████████████████████████████████
+
+class FleetInstance:
+    """A supervised browser instance"""
+
+    def __init__(self, index, user_data_dir, proxy_port, profile, cpus=None, cgroup=None, log_dir=None):
+        self.index = index
+        self.user_data_dir = Path(user_data_dir)
+        self.proxy_port = proxy_port
+        self.profile = profile
+        self.cpus = cpus
+        self.cgroup = cgroup
+        self.log_dir = log_dir
+        self.name = f"instance-{index}"
+        self.token = secrets.token_hex(16)
+
+        self.process = None
+        self.started_at = None
+        self.ready_at = None
+        self.restarts = 0
+        self.backoff = BACKOFF_INITIAL
+        self.restart_at = None
+        self.network = None
+        self.reported_profile = None
+        self._procs = {}  # pid -> psutil.Process, kept for cpu_percent deltas
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def env(self, base_env, ready_port, stats_interval_ms):
+        """Environment for this instance"""
+        env = dict(base_env)
+        env[USER_DATA_ENV] = str(self.user_data_dir)
+        env[PROXY_PORT_ENV] = str(self.proxy_port)
+        env[PROFILE_ENV] = self.profile
+        env[INSTANCE_ENV] = str(self.index)
+        env[READY_PORT_ENV] = str(ready_port)
+        env[READY_TOKEN_ENV] = self.token
+        env[STATS_INTERVAL_ENV] = str(stats_interval_ms)
+        if self.cgroup is not None:
+            env[CGROUP_ENV] = str(self.cgroup.path)
+        return env
+
+    def start(self, cmd, cwd, env):
+        """Spawn the instance in its own process group"""
+        self.user_data_dir.mkdir(parents=True, exist_ok=True)
+        if self.log_dir is not None:
+            # Output goes to instance-N.log (and a crash report) through the log relay
+            cmd = logged_command(cmd, self.name, self.log_dir, echo_prefix=self.name)
+        if IS_WINDOWS:
+            self.process = subprocess.Popen(cmd, cwd=cwd, env=env,
+                                            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+        else:
+            cpus, cgroup = self.cpus, self.cgroup
+
+            def enter_session():
+                os.setsid()
+                if cpus and hasattr(os, "sched_setaffinity"):
+                    os.sched_setaffinity(0, cpus)
+                if cgroup is not None:
+                    cgroup.attach()
+
+            self.process = subprocess.Popen(cmd, cwd=cwd, env=env, preexec_fn=enter_session)
+        self.started_at = time.monotonic()
+        self.ready_at = None
+        self.restart_at = None
+        self.network = None
+        self.reported_profile = None
+        self._procs = {}
+
+    def terminate(self):
+        """Ask the instance's whole process group to exit"""
+        self._signal_group(signal.CTRL_BREAK_EVENT if IS_WINDOWS else signal.SIGTERM)
+
+    def kill(self):
+        """Kill the instance's whole process group"""
+        if IS_WINDOWS:
+            if self.running:
+                self.process.kill()
+        else:
+            self._signal_group(signal.SIGKILL)
+
+    def reap(self, timeout):
+        """Wait for the instance's main process to exit and collect its status"""
+        if self.process is None:
+            return
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def _signal_group(self, sig):
+        """Send a signal to the process group os.setsid created"""
+        if not self.running:
+            return
+        try:
+            if IS_WINDOWS:
+                self.process.send_signal(sig)
+            else:
+                os.killpg(self.process.pid, sig)
+        except OSError:
+            pass
+
+    def sample(self):
+        """CPU % (of the machine) and RSS for the instance's process tree"""
+        if psutil is None or not self.running:
+            return 0.0, 0
+        try:
+            root = psutil.Process(self.process.pid)
+            current = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return 0.0, 0
+
+        cpu, rss = 0.0, 0
+        alive = {}
+        for proc in current:
+            proc = self._procs.get(proc.pid, proc)
+            try:
+                cpu += proc.cpu_percent(None)
+                rss += proc.memory_info().rss
+                alive[proc.pid] = proc
+            except psutil.Error:
+                continue
+        self._procs = alive
+        return cpu / (psutil.cpu_count() or 1), rss
+
+# ███████████████████████████████████████████████████████████████
+# █ FLEET SUPERVISOR                                            █
+# █ Spawning, restarts, stats and shutdown                      █
+# ███████████████████████████████████████████████████████████████
+
+class Fleet:
+    """Supervises a set of browser instances"""
+
+    def __init__(self, cmd, cwd, instances, base_env=None, stats_interval=10.0):
+        self.cmd = cmd
+        self.cwd = cwd
+        self.instances = instances
+        self.base_env = base_env or os.environ.copy()
+        self.stats_interval = stats_interval
+        self.stopping = False
+
+        # Instances report ready and stream stats back over this socket
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(64)
+        self.server.setblocking(False)
+        self.port = self.server.getsockname()[1]
+        self._connections = {}  # socket -> [buffer, instance or None]
+
+    def start_all(self):
+        """Start every instance"""
+        for instance in self.instances:
+            self._start(instance)
+
+    def run(self):
+        """Supervise until interrupted, then shut every instance down"""
+        previous = {}
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            previous[sig] = signal.signal(sig, self._request_stop)
+
+        try:
+            self.start_all()
+            next_stats = time.monotonic() + self.stats_interval
+            while not self.stopping:
+                self._poll_sockets(0.5)
+                self._supervise()
+                if time.monotonic() >= next_stats:
+                    next_stats = time.monotonic() + self.stats_interval
+                    self.print_stats()
+        finally:
+            self.shutdown()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+        return 0
+
+    def shutdown(self, timeout=SHUTDOWN_TIMEOUT):
+        """Terminate every instance's process group, escalating to SIGKILL"""
+        running = [i for i in self.instances if i.running]
+        if running:
+            print(f"{Colors.BLUE}[INFO]{Colors.END} Stopping {len(running)} instance(s)...")
+        for instance in running:
+            instance.terminate()
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and any(i.running for i in running):
+            time.sleep(0.1)
+
+        for instance in running:
+            if instance.running:
+                print(f"{Colors.YELLOW}[WARN]{Colors.END} Instance {instance.index} did not exit, killing it")
+                instance.kill()
+            instance.reap(REAP_TIMEOUT)
+
+        # Every instance has a cgroup, including crashed ones waiting for a restart
+        for instance in self.instances:
+            if instance.cgroup is not None and not instance.cgroup.remove(REAP_TIMEOUT):
+                print(f"{Colors.YELLOW}[WARN]{Colors.END} Could not remove {instance.cgroup.path}: processes are still in it")
+
+        for sock in list(self._connections):
+            sock.close()
+        self._connections.clear()
+        self.server.close()
+
+    def print_stats(self):
+        """Print aggregate throughput and resource stats for the fleet"""
+        running = [i for i in self.instances if i.running]
+        ready = [i for i in running if i.ready_at is not None]
+        restarts = sum(i.restarts for i in self.instances)
+
+        cpu = rss = 0
+        down = up = total_down = total_up = 0
+        for instance in running:
+            instance_cpu, instance_rss = instance.sample()
+            cpu += instance_cpu
+            rss += instance_rss
+            if instance.network:
+                down += instance.network.get("bytesDownloadedPerSecond", 0)
+                up += instance.network.get("bytesUploadedPerSecond", 0)
+                total_down += instance.network.get("totalBytesDownloaded", 0)
+                total_up += instance.network.get("totalBytesUploaded", 0)
+
+        line = (f"{Colors.BLUE}[STATS]{Colors.END} {len(running)}/{len(self.instances)} running, "
+                f"{len(ready)} ready, {restarts} restart(s) | "
+                f"down {_format_bytes(down)}/s up {_format_bytes(up)}/s "
+                f"(total {_format_bytes(total_down)} / {_format_bytes(total_up)})")
+        if psutil is not None:
+            line += f" | CPU {cpu:.1f}% RSS {_format_bytes(rss)}"
+        print(line)
+
+    def _start(self, instance):
+        """Start (or restart) one instance"""
+        env = instance.env(self.base_env, self.port, int(self.stats_interval * 1000))
+        try:
+            instance.start(self.cmd, self.cwd, env)
+        except OSError as e:
+            print(f"{Colors.RED}[ERROR]{Colors.END} Instance {instance.index} failed to start: {str(e)}")
+            self._schedule_restart(instance)
+            return
+        cpus = f", CPUs {','.join(str(c) for c in sorted(instance.cpus))}" if instance.cpus else ""
+        print(f"{Colors.GREEN}[+]{Colors.END} Instance {instance.index} started (PID {instance.process.pid}, "
+              f"profile {instance.profile}, proxy port {instance.proxy_port}{cpus})")
+
+    def _supervise(self):
+        """Notice crashed instances and restart them when their backoff expires"""
+        now = time.monotonic()
+        for instance in self.instances:
+            if instance.running:
+                continue
+
+            if instance.restart_at is None:
+                uptime = now - instance.started_at
+                print(f"{Colors.YELLOW}[WARN]{Colors.END} Instance {instance.index} exited with code "
+                      f"{instance.process.returncode} after {uptime:.1f}s")
+                if uptime >= STABLE_UPTIME:
+                    instance.backoff = BACKOFF_INITIAL
+                self._schedule_restart(instance)
+            elif now >= instance.restart_at:
+                instance.restarts += 1
+                self._start(instance)
+
+    def _schedule_restart(self, instance):
+        """Restart after the current backoff, doubling it for next time"""
+        instance.restart_at = time.monotonic() + instance.backoff
+        print(f"{Colors.BLUE}[INFO]{Colors.END} Restarting instance {instance.index} in {instance.backoff:.0f}s")
+        instance.backoff = min(instance.backoff * 2, BACKOFF_MAX)
+
+    def _poll_sockets(self, timeout):
+        """Accept instance connections and read their ready and stats lines"""
+        readable, _, _ = select.select([self.server] + list(self._connections), [], [], timeout)
+        for sock in readable:
+            if sock is self.server:
+                try:
+                    conn, _ = self.server.accept()
+                    conn.setblocking(False)
+                    self._connections[conn] = [b"", None]
+                except OSError:
+                    pass
+                continue
+
+            try:
+                data = sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError:
+                data = b""
+            if not data:
+                sock.close()
+                del self._connections[sock]
+                continue
+
+            state = self._connections[sock]
+            state[0] += data
+            while b"\n" in state[0]:
+                line, state[0] = state[0].split(b"\n", 1)
+                if not self._handle_message(sock, state, line):
+                    sock.close()
+                    del self._connections[sock]
+                    break
+
+    def _handle_message(self, sock, state, line):
+        """Handle one JSON line from an instance; False drops the connection"""
+        try:
+            message = json.loads(line.decode("utf-8"))
+        except ValueError:
+            return False
+
+        if state[1] is None:
+            # The first message must be a ready message with an instance token
+            instance = next((i for i in self.instances if i.token == message.get("token")), None)
+            if instance is None or message.get("event") != "ready":
+                return False
+            state[1] = instance
+            instance.ready_at = time.monotonic()
+            ready_s = instance.ready_at - instance.started_at
+            print(f"{Colors.GREEN}[+]{Colors.END} Instance {instance.index} ready in {ready_s * 1000:.0f} ms")
+            return True
+
+        if message.get("event") == "stats":
+            instance = state[1]
+            instance.network = message.get("network")
+            self._check_profile(instance, message.get("profile"))
+        return True
+
+    def _check_profile(self, instance, profile):
+        """Warn when an instance reports a limiter profile other than the one it was given"""
+        if profile is None or profile == instance.reported_profile:
+            return
+        instance.reported_profile = profile
+        if profile != instance.profile:
+            print(f"{Colors.YELLOW}[WARN]{Colors.END} Instance {instance.index} reports limiter profile "
+                  f"{profile}, expected {instance.profile}")
+
+    def _request_stop(self, signum, frame):
+        """Signal handler: leave the supervision loop"""
+        self.stopping = True
+
+def _format_bytes(value):
+    """Human readable byte count"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
@@ -0,0 +1,375 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Child-process log pipeline for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Streams stdout and stderr of every child line by line as it is written
+[+] Structured JSON-lines logs with per-line timestamps and source tags
+[+] Size-rotated log files, so long sessions and big installs stay bounded
+[+] Ring buffer of recent lines dumped to a crash report on failure
+[+] Relay mode wraps the browser, so its log outlives the launcher
+
+Usage:
+    python -m launcher.logpipe run --name NAME [--dir DIR] [--echo-prefix TAG] -- CMD [ARGS...]
+    python -m launcher.logpipe grep PATTERN [--dir DIR] [--name NAME] [--source SOURCE] [--since SECONDS]
+
+Log record (one JSON object per line):
+    {"t": epoch, "src": "npm install", "stream": "stderr", "pid": 1234, "line": "..."}
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from launcher.console import Colors
+
+IS_WINDOWS = platform.system() == "Windows"
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_LOG_DIR = BASE_DIR / "logs" / "processes"
+
+# Rotation: NAME.log grows to LOG_MAX_BYTES, then shifts to NAME.log.1 ... .LOG_BACKUPS
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 4
+
+# Recent lines kept in memory for crash reports and command results
+RING_LINES = 500
+
+# Longer lines are split, so one runaway line cannot grow the reader
+MAX_LINE_BYTES = 16 * 1024
+
+# Crash reports kept per log directory (oldest removed first)
+MAX_CRASH_REPORTS = 20
+
+# ███████████████████████████████████████████████████████████████
+# █ ROTATING LOG                                                █
+# █ Append-only JSON lines, rotated by size                     █
+# ███████████████████████████████████████████████████████████████
+
+class RotatingLog:
+    """JSON-lines file rotated to NAME.log.1 ... NAME.log.N once it is full"""
+
+    def __init__(self, path, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+
+    def write(self, record):
+        """Append one record (thread safe)"""
+        data = (json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                return
+            if self._size and self._size + len(data) > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backups, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index - 1}" if index > 1 else self.path.name)
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{index}"))
+        self._file = open(self.path, "ab")
+        self._size = 0
+
+def log_files(path):
+    """A log and its rotated backups, oldest first"""
+    path = Path(path)
+    backups = sorted(path.parent.glob(f"{path.name}.*"),
+                     key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else -1, reverse=True)
+    return [p for p in backups if p.suffix[1:].isdigit()] + ([path] if path.exists() else [])
+
+# ███████████████████████████████████████████████████████████████
+# █ PIPELINE                                                    █
+# █ One reader thread per stream, one shared log and ring       █
+# ███████████████████████████████████████████████████████████████
+
+class LogPipeline:
+    """Pumps child output into a rotating log, a ring buffer and the terminal"""
+
+    def __init__(self, name, log_dir=DEFAULT_LOG_DIR, echo=True, echo_prefix=None, ring_lines=RING_LINES):
+        self.name = name
+        self.log_dir = Path(log_dir)
+        self.log = RotatingLog(self.log_dir / f"{name}.log")
+        self.echo = echo
+        self.echo_prefix = echo_prefix
+        self.ring = deque(maxlen=ring_lines)
+        self._threads = []
+        self._echo_lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self.log.path
+
+    def attach(self, stream, source, stream_name, pid=None, echo_prefix=None):
+        """Start pumping a binary pipe until EOF"""
+        thread = threading.Thread(target=self._pump,
+                                  args=(stream, source, stream_name, pid, echo_prefix or self.echo_prefix),
+                                  name=f"logpipe-{source}-{stream_name}", daemon=True)
+        thread.start()
+        self._threads = [t for t in self._threads if t.is_alive()] + [thread]
+        return thread
+
+    def note(self, source, line, pid=None):
+        """Record an event of the launcher itself (not echoed)"""
+        self._record(source, "launcher", pid, line)
+
+    def join(self, timeout=None):
+        """Wait for every attached stream to reach EOF"""
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = [t for t in self._threads if t.is_alive()]
+
+    def tail(self, source=None, stream_name=None, pid=None):
+        """Recent records, optionally for one source, stream or process"""
+        return [r for r in list(self.ring)
+                if (source is None or r["src"] == source) and (stream_name is None or r["stream"] == stream_name)
+                and (pid is None or r["pid"] == pid)]
+
+    def crash_report(self, source, cmd, returncode, pid=None):
+        """Write the source's recent lines and exit status next to the log and return its path"""
+        now = time.time()
+        report = {
+            "name": self.name,
+            "source": source,
+            "cmd": cmd,
+            "pid": pid,
+            "returncode": returncode,
+            "signal": _signal_name(-returncode) if returncode is not None and returncode < 0 else None,
+            "time": now,
+            "log": str(self.path),
+            "tail": self.tail(source),
+        }
+        path = self.log_dir / f"{self.name}-crash-{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{os.getpid()}.json"
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        reports = sorted(self.log_dir.glob(f"{self.name}-crash-*.json"), key=lambda p: p.stat().st_mtime)
+        for old in reports[:-MAX_CRASH_REPORTS]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def close(self):
+        self.join(timeout=1.0)
+        self.log.close()
+
+    def _pump(self, stream, source, stream_name, pid, echo_prefix):
+        try:
+            for raw in iter(lambda: stream.readline(MAX_LINE_BYTES), b""):
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                self._record(source, stream_name, pid, line)
+                if self.echo:
+                    self._echo(stream_name, line, echo_prefix)
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+
+    def _record(self, source, stream_name, pid, line):
+        record = {"t": round(time.time(), 3), "src": source, "stream": stream_name, "pid": pid, "line": line}
+        self.ring.append(record)
+        self.log.write(record)
+
+    def _echo(self, stream_name, line, echo_prefix):
+        out = sys.stderr if stream_name == "stderr" else sys.stdout
+        text = f"{Colors.BLUE}[{echo_prefix}]{Colors.END} {line}" if echo_prefix else line
+        with self._echo_lock:
+            try:
+                out.write(text + "\n")
+                out.flush()
+            except (OSError, ValueError):
+                # Terminal went away; the log keeps going
+                self.echo = False
+
+def _signal_name(signum):
+    try:
+        return signal.Signals(signum).name
+    except ValueError:
+        return str(signum)
+
+def command_source(cmd):
+    """Source tag for a command: program name and first argument ("npm install")"""
+    words = [str(c) for c in cmd] if isinstance(cmd, list) else cmd.split()
+    return " ".join([Path(words[0]).name, *words[1:2]])
+
+def run_logged(cmd, pipeline, source=None, **popen_kwargs):
+    """Run a command to completion, streaming its output through `pipeline`
+
+    Returns (returncode, stdout tail, stderr tail); the tails come from the
+    ring buffer, so memory stays bounded however much the command prints.
+    """
+    source = source or command_source(cmd)
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **popen_kwargs)
+    pipeline.note(source, f"started: {cmd if isinstance(cmd, str) else ' '.join(map(str, cmd))}", process.pid)
+    readers = [
+        pipeline.attach(process.stdout, source, "stdout", process.pid, echo_prefix=source),
+        pipeline.attach(process.stderr, source, "stderr", process.pid, echo_prefix=source),
+    ]
+    returncode = process.wait()
+    # Only this command's readers: other commands may share the pipeline
+    for reader in readers:
+        reader.join()
+    pipeline.note(source, f"exited with code {returncode}", process.pid)
+
+    def text(stream_name):
+        return "\n".join(r["line"] for r in pipeline.tail(source, stream_name, process.pid))
+
+    return returncode, text("stdout"), text("stderr")
+
+# ███████████████████████████████████████████████████████████████
+# █ RELAY                                                       █
+# █ Wraps a long-lived child (the browser) in its own process   █
+# ███████████████████████████████████████████████████████████████
+
+def logged_command(cmd, name, log_dir=DEFAULT_LOG_DIR, python=None, echo_prefix=None):
+    """Command line that runs `cmd` under the relay, logging to log_dir/name.log"""
+    wrapper = [python or sys.executable, "-m", "launcher.logpipe", "run", "--name", name, "--dir", str(log_dir)]
+    if echo_prefix:
+        wrapper += ["--echo-prefix", echo_prefix]
+    return wrapper + ["--", *[str(c) for c in cmd]]
+
+def relay(cmd, name, log_dir=DEFAULT_LOG_DIR, echo_prefix=None):
+    """Run `cmd`, log its output, write a crash report on failure, return its exit code
+
+    Exits caused by a SIGTERM or SIGHUP sent to the relay are requested stops
+    and get no crash report.
+    """
+    pipeline = LogPipeline(name, log_dir, echo_prefix=echo_prefix)
+    source = command_source(cmd)
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as e:
+        pipeline.note(source, f"failed to start: {e}")
+        pipeline.close()
+        print(f"{Colors.RED}[ERROR]{Colors.END} Could not start {cmd[0]}: {str(e)}", file=sys.stderr)
+        return 127
+
+    # Ctrl+C reaches the child through the terminal; a SIGTERM aimed at the
+    # relay alone is passed on so the child still shuts down cleanly
+    stop = {"signal": None, "forwarded": False}
+
+    def forward(signum, frame):
+        stop["signal"] = signum
+        if process.poll() is None:
+            process.send_signal(signum)
+            stop["forwarded"] = True
+
+    if not IS_WINDOWS:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for signum in (signal.SIGTERM, signal.SIGHUP):
+            signal.signal(signum, forward)
+
+    pipeline.note(source, f"started: {' '.join(cmd)}", process.pid)
+    pipeline.attach(process.stdout, source, "stdout", process.pid)
+    pipeline.attach(process.stderr, source, "stderr", process.pid)
+    returncode = process.wait()
+    # Grandchildren may hold the pipes open briefly after the child exits
+    pipeline.join(timeout=5.0)
+    pipeline.note(source, f"exited with code {returncode}", process.pid)
+
+    # A stop the relay was asked for is not a crash, even if the child died of
+    # the signal (a process-group SIGTERM reaches both at once)
+    if stop["forwarded"] or (stop["signal"] is not None and -returncode in (signal.SIGTERM, stop["signal"])):
+        pipeline.note(source, f"stopped by {_signal_name(stop['signal'])}", process.pid)
+    elif returncode != 0:
+        report = pipeline.crash_report(source, cmd, returncode, process.pid)
+        print(f"{Colors.RED}[ERROR]{Colors.END} {name} exited with code {returncode}, crash report: {report}",
+              file=sys.stderr)
+    pipeline.close()
+    return returncode
+
+# ███████████████████████████████████████████████████████████████
+# █ SEARCH                                                      █
+# █ Grep an instance's history across rotated files             █
+# ███████████████████████████████████████████████████████████████
+
+def grep(log_dir, pattern, name=None, source=None, since=None):
+    """Yield matching records, oldest first"""
+    regex = re.compile(pattern)
+    cutoff = time.time() - since if since else None
+    logs = [Path(log_dir) / f"{name}.log"] if name else sorted(Path(log_dir).glob("*.log"))
+    for log in logs:
+        for path in log_files(log):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for raw in f:
+                    try:
+                        record = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if cutoff and record.get("t", 0) < cutoff:
+                        continue
+                    if source and source not in (record.get("src"), record.get("stream")):
+                        continue
+                    if regex.search(record.get("line", "")):
+                        yield log.stem, record
+
+# ███████████████████████████████████████████████████████████████
+# █ COMMAND LINE                                                █
+# ███████████████████████████████████████████████████████████████
+
+def main(argv=None):
+    """Relay a command or search logs"""
+    parser = argparse.ArgumentParser(description="Internet Server child-process log pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run a command and log its output")
+    run_parser.add_argument("--name", required=True)
+    run_parser.add_argument("--dir", default=str(DEFAULT_LOG_DIR))
+    run_parser.add_argument("--echo-prefix")
+    run_parser.add_argument("cmd", nargs=argparse.REMAINDER)
+
+    grep_parser = commands.add_parser("grep", help="Search logs (rotated files included)")
+    grep_parser.add_argument("pattern")
+    grep_parser.add_argument("--dir", default=str(DEFAULT_LOG_DIR))
+    grep_parser.add_argument("--name")
+    grep_parser.add_argument("--source", help="Source tag or stream (stdout, stderr, launcher)")
+    grep_parser.add_argument("--since", type=float, help="Only the last SECONDS")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        cmd = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        if not cmd:
+            parser.error("run needs a command after --")
+        returncode = relay(cmd, args.name, args.dir, args.echo_prefix)
+        if returncode < 0 and not IS_WINDOWS:
+            # Die of the same signal, so supervisors see what the child saw
+            try:
+                signal.signal(-returncode, signal.SIG_DFL)
+            except (OSError, ValueError):
+                pass  # SIGKILL and SIGSTOP cannot be handled anyway
+            os.kill(os.getpid(), -returncode)
+        return returncode
+
+    matches = 0
+    for name, record in grep(args.dir, args.pattern, args.name, args.source, args.since):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.get("t", 0)))
+        print(f"{name} {stamp} [{record.get('src')}/{record.get('stream')}] {record.get('line')}")
+        matches += 1
+    return 0 if matches else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Launch manifest for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Persists a fingerprint of every preflight check input
+[+] Lets warm launches skip checks whose inputs did not change
+[+] Content hashes for small files, stat fingerprints for binaries
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from launcher.plugin_index import PLUGIN_INDEX_NAME, plugins_fingerprint
+from launcher.runtime_config import RUNTIME_SETTINGS_NAME
+
+# ███████████████████████████████████████████████████████████████
+# █ MANIFEST INPUTS                                             █
+# █ Files whose contents decide whether a check must re-run     █
+# ███████████████████████████████████████████████████████████████
+
+MANIFEST_NAME = ".launch-manifest.json"
+MANIFEST_VERSION = 1
+
+# Inputs of the Node.js dependency check
+NODE_INPUTS = [
+    "package.json",
+    "package-lock.json",
+]
+
+# npm writes this hidden lockfile after every successful install, so its
+# stat changes whenever node_modules is rebuilt or removed
+NODE_MODULES_MARKER = Path("node_modules") / ".package-lock.json"
+
+# Inputs of the resource limiter component check
+LIMITER_INPUTS = [
+    "src/limiters/limiter-manager.js",
+    "src/limiters/cpu-limiter.js",
+    "src/limiters/memory-limiter.js",
+    "src/limiters/network-throttler.js",
+    "src/ui/components/limiter-settings-panel.js",
+]
+
+# Plugin manifests, indexed by launcher/plugin_index.py
+PLUGINS_DIR = Path("src") / "plugins"
+
+# ███████████████████████████████████████████████████████████████
+# █ FINGERPRINT HELPERS                                         █
+# █ Cheap, deterministic digests of files and directories       █
+# ███████████████████████████████████████████████████████████████
+
+def hash_files(base_dir, relative_paths):
+    """Return a sha256 digest over the names and contents of the given files"""
+    digest = hashlib.sha256()
+    for relative_path in relative_paths:
+        digest.update(str(relative_path).encode("utf-8"))
+        digest.update(b"\0")
+        try:
+            with open(Path(base_dir) / relative_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 16), b""):
+                    digest.update(block)
+        except OSError:
+            digest.update(b"<missing>")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def stat_fingerprint(path):
+    """Return a fingerprint of a file's resolved path, size and mtime"""
+    try:
+        resolved = Path(path).resolve()
+        st = resolved.stat()
+        return f"{resolved}:{st.st_size}:{st.st_mtime_ns}"
+    except OSError:
+        return "<missing>"
+
+def launch_fingerprints(base_dir, venv_python=None):
+    """Compute the current fingerprint of every cached preflight check"""
+    base_dir = Path(base_dir)
+    fingerprints = {
+        "node": "|".join([
+            hash_files(base_dir, NODE_INPUTS),
+            stat_fingerprint(base_dir / NODE_MODULES_MARKER),
+            "present" if (base_dir / "node_modules").is_dir() else "absent",
+        ]),
+        "ollama": hash_files(base_dir, [RUNTIME_SETTINGS_NAME, "package.json"]),
+        "limiters": hash_files(base_dir, LIMITER_INPUTS),
+        "plugins": plugins_fingerprint(base_dir / PLUGINS_DIR, base_dir / PLUGIN_INDEX_NAME),
+    }
+    if venv_python is not None:
+        # The interpreter binary can be large, so only its stat is hashed
+        venv_cfg = Path(venv_python).parent.parent / "pyvenv.cfg"
+        fingerprints["venv"] = stat_fingerprint(venv_python) + "|" + hash_files(venv_cfg.parent, [venv_cfg.name])
+    return fingerprints
+
+# ███████████████████████████████████████████████████████████████
+# █ LAUNCH MANIFEST                                             █
+# █ Persistent record of the last successful check inputs       █
+# ███████████████████████████████████████████████████████████████
+
+class LaunchManifest:
+    """Persistent record of the fingerprints each preflight check last passed with"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.checks = {}
+        self._load()
+
+    def _load(self):
+        """Read the manifest from disk, ignoring missing or stale formats"""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.checks = data.get("checks", {})
+        except (OSError, ValueError):
+            self.checks = {}
+
+    def is_fresh(self, name, fingerprint):
+        """Check whether a check last passed with exactly this fingerprint"""
+        entry = self.checks.get(name)
+        return bool(entry and entry.get("ok") and entry.get("fingerprint") == fingerprint)
+
+    def stale_checks(self, fingerprints):
+        """Return the names of the checks that have to run again"""
+        return {name for name, fingerprint in fingerprints.items() if not self.is_fresh(name, fingerprint)}
+
+    def record(self, name, fingerprint, ok):
+        """Remember the outcome of a check for the given fingerprint"""
+        self.checks[name] = {
+            "fingerprint": fingerprint,
+            "ok": bool(ok),
+            "checked_at": time.time(),
+        }
+
+    def clear(self):
+        """Forget every recorded check so the next launch runs them all"""
+        self.checks = {}
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def save(self):
+        """Write the manifest atomically next to its final location"""
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"version": MANIFEST_VERSION, "checks": self.checks}, f, indent=2)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
@@ -0,0 +1,451 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Ollama gateway sidecar for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] One pooled keep-alive HTTP session to the local Ollama server
+[+] Streams generated tokens to the browser as they arrive
+[+] Identical in-flight prompts share a single upstream generation
+[+] LRU + TTL response cache keyed on model, pre-prompt style and prompt
+[+] Cache hit/miss, coalescing and latency counters on request
+
+Usage: python -m launcher.ollama_gateway [--settings PATH] [--token TOKEN]
+
+Protocol: the client (main process) connects and sends one line
+{"hello": <electron main pid>, "token": "..."}; every later line is a request:
+{"id": n, "op": "generate", "prompt": "...", "model": "...", "style": "...", "cache": true}
+{"id": n, "op": "stats"}
+Generation replies with {"id": n, "token": "..."} lines followed by
+{"id": n, "done": true, "text": "...", "cached": bool, "shared": bool, "ms": total}
+or {"id": n, "error": "..."}; stats replies with {"id": n, "stats": {...}}.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import select
+import signal
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+from launcher.sidecars import listen_loopback, announce_listening, announce_unavailable
+from launcher.runtime_config import RuntimeSettings, RUNTIME_SETTINGS_NAME, RUNTIME_SETTINGS_ENV, OLLAMA_DEFAULTS
+
+# Environment variables read by the main process
+OLLAMA_PORT_ENV = "INTERNET_SERVER_OLLAMA_PORT"
+OLLAMA_TOKEN_ENV = "INTERNET_SERVER_OLLAMA_TOKEN"
+
+# Pre-prompts selected by the "style" setting; unknown styles send none
+STYLE_PROMPTS = {
+    "default": "",
+    "concise": "Answer as briefly as possible.",
+    "detailed": "Answer thoroughly, explaining your reasoning step by step.",
+    "technical": "Answer precisely for a technical audience, with code where it helps.",
+}
+
+# Upstream connection pool (generations beyond this wait for a connection)
+POOL_SIZE = 4
+CONNECT_TIMEOUT_S = 5
+READ_TIMEOUT_S = 300
+
+# Response cache bounds
+CACHE_ENTRIES = 256
+CACHE_TTL_S = 600
+
+# Latency samples kept for the percentiles in the stats reply
+LATENCY_SAMPLES = 256
+
+# Exit once no client has been connected for this many seconds
+IDLE_EXIT_S = 120
+
+class GatewayError(Exception):
+    """Upstream failure reported to every subscriber of a generation"""
+
+# ███████████████████████████████████████████████████████████████
+# █ RESPONSE CACHE                                              █
+# ███████████████████████████████████████████████████████████████
+
+class ResponseCache:
+    """Least-recently-used completions that also expire after a TTL"""
+
+    def __init__(self, max_entries=CACHE_ENTRIES, ttl=CACHE_TTL_S):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (stored at, text)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Cached text, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, text):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+def cache_key(model, style, prompt):
+    """Stable key for a (model, style, prompt) triple"""
+    digest = hashlib.sha256()
+    for part in (model, style, prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+# ███████████████████████████████████████████████████████████████
+# █ IN-FLIGHT GENERATIONS                                       █
+# █ One upstream stream, any number of subscribers              █
+# ███████████████████████████████████████████████████████████████
+
+class Flight:
+    """Tokens of one upstream generation, replayable by late subscribers"""
+
+    def __init__(self, key):
+        self.key = key
+        self.tokens = []
+        self.done = False
+        self.error = None
+        self._cond = threading.Condition()
+
+    def push(self, token):
+        with self._cond:
+            self.tokens.append(token)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.done = True
+            self.error = error
+            self._cond.notify_all()
+
+    def follow(self):
+        """Yield every token from the start, blocking until the flight ends"""
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self.tokens) and not self.done:
+                    self._cond.wait()
+                pending = self.tokens[index:]
+                index = len(self.tokens)
+                finished = self.done
+            for token in pending:
+                yield token
+            if finished and index >= len(self.tokens):
+                if self.error is not None:
+                    raise GatewayError(self.error)
+                return
+
+# ███████████████████████████████████████████████████████████████
+# █ GATEWAY                                                     █
+# ███████████████████████████████████████████████████████████████
+
+class OllamaGateway:
+    """Cache, coalescing and the pooled upstream session"""
+
+    def __init__(self, settings_path, cache=None):
+        self.settings = RuntimeSettings(settings_path)
+        self.cache = cache or ResponseCache()
+        self.counters = {
+            "requests": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "coalesced": 0,
+            "upstream_requests": 0,
+            "upstream_errors": 0,
+        }
+        self.first_token_ms = deque(maxlen=LATENCY_SAMPLES)
+        self.total_ms = deque(maxlen=LATENCY_SAMPLES)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._session = None
+        self._base_url = None
+        self._settings_mtime = None
+        self._ollama = dict(OLLAMA_DEFAULTS)
+
+    def ollama_settings(self):
+        """The Ollama section of the runtime settings, re-read when the file changes"""
+        try:
+            mtime = os.stat(self.settings.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._settings_mtime:
+            # Store the settings before the mtime, or a concurrent request
+            # could see the new mtime with the old settings
+            self._ollama = {**OLLAMA_DEFAULTS, **self.settings.read().get("ollama", {})}
+            self._settings_mtime = mtime
+        return self._ollama
+
+    def session(self):
+        """Keep-alive session for the configured server, rebuilt if the address changes"""
+        ollama = self.ollama_settings()
+        base_url = f"http://{ollama['ip']}:{ollama['port']}"
+        with self._lock:
+            if self._session is None or base_url != self._base_url:
+                if self._session is not None:
+                    self._session.close()
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, pool_block=True, max_retries=0)
+                session.mount("http://", adapter)
+                self._session = session
+                self._base_url = base_url
+            return self._session, self._base_url
+
+    def generate(self, request, emit):
+        """Serve one generate request; emit(message) sends a line to the client"""
+        started = time.perf_counter()
+        ollama = self.ollama_settings()
+        prompt = str(request.get("prompt", ""))
+        model = str(request.get("model") or ollama["model"])
+        style = str(request.get("style") or ollama["style"])
+        use_cache = request.get("cache", True)
+        key = cache_key(model, style, prompt)
+
+        with self._lock:
+            self.counters["requests"] += 1
+
+        text = self.cache.get(key) if use_cache else None
+        if text is not None:
+            with self._lock:
+                self.counters["cache_hits"] += 1
+            emit({"token": text})
+            emit({"done": True, "text": text, "cached": True, "shared": False, "ms": _elapsed_ms(started)})
+            return
+
+        with self._lock:
+            self.counters["cache_misses"] += 1
+            flight = self._flights.get(key)
+            shared = flight is not None
+            if shared:
+                self.counters["coalesced"] += 1
+            else:
+                flight = self._flights[key] = Flight(key)
+
+        if not shared:
+            threading.Thread(target=self._fetch, args=(flight, model, style, prompt), daemon=True).start()
+
+        parts = []
+        try:
+            for token in flight.follow():
+                parts.append(token)
+                emit({"token": token})
+        except GatewayError as e:
+            emit({"error": str(e)})
+            return
+        emit({"done": True, "text": "".join(parts), "cached": False, "shared": shared, "ms": _elapsed_ms(started)})
+
+    def stats(self):
+        """Counters, cache size and latency percentiles"""
+        with self._lock:
+            counters = dict(self.counters)
+            first_token = sorted(self.first_token_ms)
+            total = sorted(self.total_ms)
+            in_flight = len(self._flights)
+        lookups = counters["cache_hits"] + counters["cache_misses"]
+        return {
+            **counters,
+            "hit_ratio": round(counters["cache_hits"] / lookups, 3) if lookups else None,
+            "cache_entries": len(self.cache),
+            "in_flight": in_flight,
+            "first_token_ms": _percentiles(first_token),
+            "total_ms": _percentiles(total),
+            "upstream": self._base_url,
+        }
+
+    def _fetch(self, flight, model, style, prompt):
+        """Run one upstream generation, feeding the flight as tokens arrive"""
+        started = time.perf_counter()
+        first_token_ms = None
+        # Anything that ends the stream early leaves this set
+        error = "Ollama generation was interrupted"
+        payload = {"model": model, "prompt": prompt, "stream": True}
+        system = STYLE_PROMPTS.get(style, "")
+        if system:
+            payload["system"] = system
+
+        with self._lock:
+            self.counters["upstream_requests"] += 1
+        try:
+            session, base_url = self.session()
+            with session.post(f"{base_url}/api/generate", json=payload, stream=True,
+                              timeout=(CONNECT_TIMEOUT_S, READ_TIMEOUT_S)) as response:
+                if response.status_code != 200:
+                    raise GatewayError(f"Ollama returned HTTP {response.status_code}: {response.text[:200]}")
+                # Read to the end of the body (past "done") so the connection goes back to the pool
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if not isinstance(chunk, dict):
+                        raise GatewayError(f"Unexpected Ollama response: {line[:200]!r}")
+                    if chunk.get("error"):
+                        raise GatewayError(chunk["error"])
+                    token = chunk.get("response")
+                    if token:
+                        if first_token_ms is None:
+                            first_token_ms = _elapsed_ms(started)
+                        flight.push(str(token))
+            error = None
+        except GatewayError as e:
+            error = str(e)
+        except (requests.RequestException, ValueError) as e:
+            error = f"Ollama request failed: {e}"
+        except Exception as e:
+            error = f"Ollama gateway error: {e}"
+        finally:
+            # Followers block until the flight finishes, so it always does
+            try:
+                with self._lock:
+                    self._flights.pop(flight.key, None)
+                    if error is None:
+                        self.total_ms.append(_elapsed_ms(started))
+                        if first_token_ms is not None:
+                            self.first_token_ms.append(first_token_ms)
+                    else:
+                        self.counters["upstream_errors"] += 1
+                # Cache before finishing so a request arriving now hits it
+                if error is None:
+                    self.cache.put(flight.key, "".join(flight.tokens))
+            finally:
+                flight.finish(error)
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
+
+def _percentiles(values):
+    """p50/p90/p99 of an already sorted list"""
+    if not values:
+        return None
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {"n": len(values), "p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99)}
+
+# ███████████████████████████████████████████████████████████████
+# █ CLIENT CONNECTIONS                                          █
+# █ One thread per connection, one per generate request         █
+# ███████████████████████████████████████████████████████████████
+
+class GatewayClient:
+    """A connected main process; replies are serialised by a send lock"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.sock.setblocking(True)
+        self.open = True
+        self._send_lock = threading.Lock()
+
+    def send(self, message):
+        line = (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._send_lock:
+            if not self.open:
+                return
+            try:
+                self.sock.sendall(line)
+            except OSError:
+                self.open = False
+
+    def close(self):
+        self.open = False
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+def handle_client(client, gateway, token, active):
+    """Read the hello, then dispatch request lines until the client leaves"""
+    reader = client.sock.makefile("rb")
+    try:
+        try:
+            hello = json.loads(reader.readline().decode("utf-8"))
+            if token and hello.get("token") != token:
+                return
+        except (ValueError, AttributeError, OSError):
+            return
+
+        for line in reader:
+            try:
+                request = json.loads(line.decode("utf-8"))
+                request_id = request["id"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            emit = lambda message, request_id=request_id: client.send({"id": request_id, **message})
+            if request.get("op") == "stats":
+                emit({"stats": gateway.stats()})
+            elif request.get("op") == "generate":
+                threading.Thread(target=gateway.generate, args=(request, emit), daemon=True).start()
+            else:
+                emit({"error": f"Unknown op: {request.get('op')}"})
+    except OSError:
+        pass
+    finally:
+        reader.close()
+        client.close()
+        active.discard(client)
+
+# ███████████████████████████████████████████████████████████████
+# █ MAIN LOOP                                                   █
+# ███████████████████████████████████████████████████████████████
+
+def serve(settings_path, token):
+    """Run the gateway until no client has been connected for IDLE_EXIT_S"""
+    server = listen_loopback()
+    announce_listening(server.getsockname()[1])
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    gateway = OllamaGateway(settings_path)
+    active = set()
+    idle_since = time.monotonic()
+    while True:
+        readable, _, _ = select.select([server], [], [], 1.0)
+        if readable:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                conn = None
+            if conn is not None:
+                client = GatewayClient(conn)
+                active.add(client)
+                threading.Thread(target=handle_client, args=(client, gateway, token, active), daemon=True).start()
+
+        now = time.monotonic()
+        if active:
+            idle_since = now
+        elif now - idle_since > IDLE_EXIT_S:
+            return 0
+
+def main():
+    """Entry point for the Ollama gateway sidecar"""
+    default_settings = os.environ.get(RUNTIME_SETTINGS_ENV) or RUNTIME_SETTINGS_NAME
+    parser = argparse.ArgumentParser(description="Internet Server Ollama gateway")
+    parser.add_argument("--settings", default=default_settings, help="Runtime settings file with the Ollama section")
+    parser.add_argument("--token", default=os.environ.get(OLLAMA_TOKEN_ENV, ""), help="Shared secret clients must present")
+    args = parser.parse_args()
+
+    if requests is None:
+        announce_unavailable("requests is not installed")
+        return 1
+    return serve(args.settings, args.token)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Plugin index builder for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Scans src/plugins once, in preflight, instead of on every browser start
+[+] Validates manifests (required fields, files, permissions, activation events)
+[+] Reuses entries whose manifest size and mtime did not change
+[+] The PluginLoader reads the single index file and activates plugins lazily
+
+Usage: python -m launcher.plugin_index [--plugins-dir DIR] [--output FILE]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+# File name (next to main.js) and the variable the PluginLoader reads to override it
+PLUGIN_INDEX_NAME = ".plugin-index.json"
+PLUGIN_INDEX_ENV = "INTERNET_SERVER_PLUGIN_INDEX"
+PLUGIN_INDEX_VERSION = 1
+
+# Manifest rules (kept in step with src/plugins/plugin-loader.js)
+REQUIRED_FIELDS = ("id", "name", "version")
+FILE_FIELDS = ("main", "settings", "sidebar", "toolbar")
+KNOWN_PERMISSIONS = {"messaging", "storage", "tabs", "network"}
+ACTIVATION_EVENTS = {"onStartup", "onToolbar", "onSidebar", "onSettings"}
+PLUGIN_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+class ManifestError(Exception):
+    """A plugin manifest that cannot be indexed"""
+
+# ███████████████████████████████████████████████████████████████
+# █ MANIFEST VALIDATION                                         █
+# █ One manifest in, one index entry (or ManifestError) out     █
+# ███████████████████████████████████████████████████████████████
+
+def default_activation_events(manifest):
+    """Plugins with UI wait for it to be used; others start with the browser"""
+    events = [f"on{field.capitalize()}" for field in ("toolbar", "sidebar", "settings") if manifest.get(field)]
+    return events or ["onStartup"]
+
+def validate_manifest(plugin_dir, manifest):
+    """Check a parsed manifest and return the fields the loader needs"""
+    if not isinstance(manifest, dict):
+        raise ManifestError("manifest is not a JSON object")
+
+    for field in REQUIRED_FIELDS:
+        if not isinstance(manifest.get(field), str) or not manifest[field]:
+            raise ManifestError(f"missing required field '{field}'")
+    if not PLUGIN_ID_PATTERN.match(manifest["id"]):
+        raise ManifestError(f"invalid plugin id '{manifest['id']}'")
+
+    files = {}
+    for field in FILE_FIELDS:
+        name = manifest.get(field)
+        if not name:
+            files[field] = None
+            continue
+        target = (plugin_dir / name).resolve()
+        if plugin_dir.resolve() not in target.parents:
+            raise ManifestError(f"'{field}' points outside the plugin directory")
+        if not target.is_file():
+            raise ManifestError(f"'{field}' file not found: {name}")
+        files[field] = name
+
+    permissions = manifest.get("permissions", [])
+    if not isinstance(permissions, list):
+        raise ManifestError("'permissions' must be a list")
+    unknown = [p for p in permissions if p not in KNOWN_PERMISSIONS]
+    if unknown:
+        raise ManifestError(f"unknown permission(s): {', '.join(map(str, unknown))}")
+
+    events = manifest.get("activationEvents") or default_activation_events(manifest)
+    if not isinstance(events, list):
+        raise ManifestError("'activationEvents' must be a list")
+    for event in events:
+        if event not in ACTIVATION_EVENTS and not (isinstance(event, str) and event.startswith("onEvent:")):
+            raise ManifestError(f"unknown activation event '{event}'")
+
+    return {
+        "id": manifest["id"],
+        "name": manifest["name"],
+        "version": manifest["version"],
+        "description": manifest.get("description", ""),
+        "author": manifest.get("author", "Unknown"),
+        "permissions": permissions,
+        **files,
+        "activationEvents": events,
+    }
+
+# ███████████████████████████████████████████████████████████████
+# █ INDEX BUILDING                                              █
+# █ Incremental: unchanged manifests are not re-read            █
+# ███████████████████████████████████████████████████████████████
+
+def load_index(index_path):
+    """Read an existing index, or None if missing or from another version"""
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+        return index if index.get("version") == PLUGIN_INDEX_VERSION else None
+    except (OSError, ValueError):
+        return None
+
+def index_entry(plugin_dir, previous=None):
+    """Index entry for one plugin directory (reusing `previous` if unchanged)"""
+    manifest_path = plugin_dir / "manifest.json"
+    st = manifest_path.stat()
+    if (previous and previous.get("manifestMtimeNs") == str(st.st_mtime_ns)
+            and previous.get("manifestSize") == st.st_size):
+        # Referenced files may still have been removed
+        for field in FILE_FIELDS:
+            if previous.get(field) and not (plugin_dir / previous[field]).is_file():
+                break
+        else:
+            return previous
+
+    data = manifest_path.read_bytes()
+    try:
+        manifest = json.loads(data.decode("utf-8"))
+    except ValueError as e:
+        raise ManifestError(f"invalid JSON: {e}")
+
+    entry = validate_manifest(plugin_dir, manifest)
+    entry.update({
+        "directory": plugin_dir.name,
+        "manifestSha256": hashlib.sha256(data).hexdigest(),
+        "manifestMtimeNs": str(st.st_mtime_ns),
+        "manifestSize": st.st_size,
+    })
+    return entry
+
+def build_plugin_index(plugins_dir, index_path):
+    """Scan `plugins_dir`, write the index atomically and return it"""
+    plugins_dir = Path(plugins_dir)
+    index_path = Path(index_path)
+    previous = load_index(index_path) or {}
+    if previous.get("pluginsDir") != str(plugins_dir.resolve()):
+        previous = {}
+    reusable = {entry["directory"]: entry for entry in previous.get("plugins", [])}
+
+    plugins, errors, seen = [], [], {}
+    for child in sorted(plugins_dir.iterdir()) if plugins_dir.is_dir() else []:
+        if not child.is_dir() or not (child / "manifest.json").is_file():
+            continue
+        try:
+            entry = index_entry(child, reusable.get(child.name))
+        except (OSError, ManifestError) as e:
+            errors.append({"directory": child.name, "error": str(e)})
+            continue
+        if entry["id"] in seen:
+            errors.append({"directory": child.name, "error": f"duplicate plugin id '{entry['id']}' (also in {seen[entry['id']]})"})
+            continue
+        seen[entry["id"]] = child.name
+        plugins.append(entry)
+
+    # The loader trusts the index while the directory mtime is unchanged
+    # (adding or removing a plugin directory changes it)
+    index = {
+        "version": PLUGIN_INDEX_VERSION,
+        "pluginsDir": str(plugins_dir.resolve()),
+        "directoryMtimeNs": str(plugins_dir.stat().st_mtime_ns) if plugins_dir.is_dir() else None,
+        "builtAt": time.time(),
+        "plugins": plugins,
+        "errors": errors,
+    }
+
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, index_path)
+    return index
+
+def plugins_fingerprint(plugins_dir, index_path):
+    """Stat fingerprint of every manifest and of the index (launch manifest input)"""
+    plugins_dir = Path(plugins_dir)
+    digest = hashlib.sha256()
+    for path in [plugins_dir, Path(index_path)]:
+        try:
+            st = path.stat()
+            digest.update(f"{path.name}:{st.st_size}:{st.st_mtime_ns}\0".encode("utf-8"))
+        except OSError:
+            digest.update(f"{path.name}:<missing>\0".encode("utf-8"))
+    if plugins_dir.is_dir():
+        for child in sorted(plugins_dir.iterdir()):
+            manifest_path = child / "manifest.json"
+            try:
+                st = manifest_path.stat()
+            except OSError:
+                continue
+            digest.update(f"{child.name}:{st.st_size}:{st.st_mtime_ns}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+# ███████████████████████████████████████████████████████████████
+# █ COMMAND LINE                                                █
+# ███████████████████████████████████████████████████████████████
+
+def main(argv=None):
+    """Build the index and print what was indexed or rejected"""
+    base_dir = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description="Build the Internet Server plugin index")
+    parser.add_argument("--plugins-dir", default=str(base_dir / "src" / "plugins"))
+    parser.add_argument("--output", default=os.environ.get(PLUGIN_INDEX_ENV, str(base_dir / PLUGIN_INDEX_NAME)))
+    args = parser.parse_args(argv)
+
+    index = build_plugin_index(args.plugins_dir, args.output)
+    for entry in index["plugins"]:
+        print(f"[+] {entry['id']} v{entry['version']} ({', '.join(entry['activationEvents'])})")
+    for error in index["errors"]:
+        print(f"[WARN] {error['directory']}: {error['error']}")
+    return 0 if not index["errors"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Parallel preflight engine for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Runs launcher checks as a dependency graph on a thread pool
+[+] Independent checks (venv, npm, file checks) overlap
+[+] Per-check wall time reporting
+[+] Clean abort on the first fatal failure
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from launcher.console import Colors
+
+# ███████████████████████████████████████████████████████████████
+# █ CHECK DEFINITIONS                                           █
+# █ A check is a callable returning True on success             █
+# ███████████████████████████████████████████████████████████████
+
+class PreflightCheck:
+    """A single launcher check and its position in the dependency graph"""
+
+    def __init__(self, name, func, depends_on=(), fatal=False, when=None, label=None):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.fatal = fatal
+        self.when = when
+        self.label = label or name
+
+class PreflightResult:
+    """Outcome and timing of a single check"""
+
+    def __init__(self, name, ok, elapsed_ms=0.0, skipped=False, error=None):
+        self.name = name
+        self.ok = ok
+        self.elapsed_ms = elapsed_ms
+        self.skipped = skipped
+        self.error = error
+
+# ███████████████████████████████████████████████████████████████
+# █ PREFLIGHT SCHEDULER                                         █
+# █ Starts every check as soon as its dependencies finished     █
+# ███████████████████████████████████████████████████████████████
+
+class Preflight:
+    """Dependency-aware scheduler that runs independent checks concurrently"""
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.checks = {}
+        self.results = {}
+        self.aborted_by = None
+        self.elapsed_ms = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, name, func, depends_on=(), fatal=False, when=None, label=None):
+        """Register a check; `when` receives the results so far and may skip it"""
+        self.checks[name] = PreflightCheck(name, func, depends_on, fatal, when, label)
+        return self
+
+    def run(self):
+        """Run all checks and return True unless a fatal check failed"""
+        start = time.perf_counter()
+        pending = dict(self.checks)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="preflight") as pool:
+            while pending or running:
+                # Schedule every check whose dependencies are satisfied
+                if self.aborted_by is None:
+                    for name in list(pending):
+                        check = pending[name]
+                        if not self._dependencies_done(check):
+                            continue
+                        del pending[name]
+                        if check.when is not None and not check.when(self.results):
+                            self.results[name] = PreflightResult(name, True, skipped=True)
+                            continue
+                        running[pool.submit(self._run_check, check)] = check
+                else:
+                    # Abort: never start anything new, let in-flight checks finish
+                    for name in pending:
+                        self.results[name] = PreflightResult(name, False, skipped=True, error="aborted")
+                    pending.clear()
+
+                if not running:
+                    if pending and not any(self._dependencies_done(c) for c in pending.values()):
+                        # Unsatisfiable graph (cycle or missing result), fail loudly
+                        for name in pending:
+                            self.results[name] = PreflightResult(name, False, skipped=True, error="unresolved dependencies")
+                        pending.clear()
+                        self.aborted_by = self.aborted_by or "dependency cycle"
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    check = running.pop(future)
+                    result = future.result()
+                    self.results[check.name] = result
+                    if check.fatal and not result.ok and self.aborted_by is None:
+                        self.aborted_by = check.name
+
+        self.elapsed_ms = (time.perf_counter() - start) * 1000
+        return self.aborted_by is None
+
+    def report(self):
+        """Print the wall time of every check and of the whole preflight"""
+        for name in self.checks:
+            result = self.results.get(name)
+            if result is None:
+                continue
+            label = self.checks[name].label
+            if result.skipped:
+                status = f"{Colors.BLUE}skipped{Colors.END}"
+            elif result.ok:
+                status = f"{Colors.GREEN}ok{Colors.END}"
+            else:
+                status = f"{Colors.RED}failed{Colors.END}"
+            print(f"{Colors.BLUE}[TIME]{Colors.END} {label:<28} {result.elapsed_ms:8.1f} ms  {status}")
+
+        serial_ms = sum(r.elapsed_ms for r in self.results.values())
+        print(f"{Colors.BLUE}[TIME]{Colors.END} {'preflight (wall)':<28} {self.elapsed_ms:8.1f} ms  "
+              f"(serial sum {serial_ms:.1f} ms)")
+
+    def _dependencies_done(self, check):
+        """A dependency is done once it has a result or was never registered"""
+        return all(dep in self.results or dep not in self.checks for dep in check.depends_on)
+
+    def _run_check(self, check):
+        """Run one check on a worker thread, converting exceptions to failures"""
+        start = time.perf_counter()
+        try:
+            ok = bool(check.func())
+            error = None
+        except Exception as e:
+            ok = False
+            error = str(e)
+            print(f"{Colors.RED}[ERROR]{Colors.END} Preflight check '{check.label}' raised: {error}")
+        return PreflightResult(check.name, ok, (time.perf_counter() - start) * 1000, error=error)
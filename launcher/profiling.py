@@ -0,0 +1,419 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Profiling sessions for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] One directory per profiled run, shared by every process
+[+] cProfile of the launcher and sidecars by thread CPU time, every thread
+    (one shared profiler timed by process CPU time on Python 3.12+)
+[+] Summariser ranking hot functions and allocation sites across processes
+[+] Reads V8 .cpuprofile/.heapprofile, Chrome traces and pstats dumps
+
+Usage:
+    python run_browser.py --profile
+    python -m launcher.profiling summarize logs/profiles/<run> [--top 25]
+    python -m launcher.profiling run MODULE [ARGS...]    (used for sidecars)
+
+Run directory layout:
+    main-<pid>-<n>.cpuprofile                     Electron main process, one per flush
+    renderer-<pid>-<type>-<id>-<n>.cpuprofile     windows and webview tabs
+    <process>.heapprofile                         sampled live allocations
+    trace-<pid>.json                              GPU and utility process task slices
+    python-<name>-<pid>.pstats                    launcher and sidecars
+    summary.json                                  written by the summariser
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import re
+import runpy
+import signal
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from launcher.console import Colors
+
+# Environment variable read by main.js and the sidecar runner
+PROFILE_DIR_ENV = "INTERNET_SERVER_PROFILE_DIR"
+
+SUMMARY_NAME = "summary.json"
+
+# Rows printed per section, and kept in summary.json
+DEFAULT_TOP = 25
+SUMMARY_ROWS = 200
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# V8 pseudo-frames that are not work done by the program
+IDLE_FRAMES = {"(root)", "(idle)"}
+
+# main-123-0.cpuprofile -> main-123 ; renderer-45-webview-7-2.cpuprofile -> renderer-45-webview-7
+CHUNK_SUFFIX = re.compile(r"-\d+$")
+
+# Python 3.12+ profiles through sys.monitoring: one cProfile sees every thread,
+# and enabling a second one raises ValueError
+SHARED_PROFILER = sys.version_info >= (3, 12)
+
+# ███████████████████████████████████████████████████████████████
+# █ PYTHON PROFILING                                            █
+# █ cProfile for every thread of the current process            █
+# ███████████████████████████████████████████████████████████████
+
+class PythonProfiler:
+    """cProfile of every thread, timed by per-thread CPU time so blocked threads cost nothing"""
+
+    def __init__(self):
+        # A shared profiler gets events from every thread, so per-thread clocks would mix
+        self.main = cProfile.Profile(time.process_time if SHARED_PROFILER else time.thread_time)
+        self.threads = []
+
+    def start(self):
+        """Profile this thread and every thread started from now on"""
+        if SHARED_PROFILER:
+            print(f"{Colors.YELLOW}[WARN]{Colors.END} Python {sys.version_info.major}.{sys.version_info.minor} "
+                  "profiles every thread with one cProfile; times of concurrent threads are approximate")
+        else:
+            threading.setprofile(self._profile_thread)
+        self.main.enable()
+
+    def dump(self, path):
+        """Merge every thread's profile into one pstats file"""
+        self.main.disable()
+        threading.setprofile(None)
+        stats = None
+        for profiler in [self.main] + list(self.threads):
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profiler)
+                else:
+                    stats.add(profiler)
+            except TypeError:
+                continue  # nothing was recorded on that thread
+        if stats is None:
+            return False
+        stats.dump_stats(str(path))
+        return True
+
+    def _profile_thread(self, frame, event, arg):
+        """First profile event of a new thread: swap in a cProfile for it"""
+        sys.setprofile(None)
+        profiler = cProfile.Profile(time.thread_time)
+        self.threads.append(profiler)
+        profiler.enable()
+
+class ProfileSession:
+    """A profiled launcher run and the directory every process writes to"""
+
+    def __init__(self, root, name="launcher"):
+        self.name = name
+        self.dir = Path(root) / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.python = PythonProfiler()
+        self.started = None
+
+    def env(self):
+        """Environment that turns profiling on in the browser and sidecars"""
+        return {PROFILE_DIR_ENV: str(self.dir)}
+
+    def start(self):
+        """Create the run directory and start profiling this process"""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.started = time.time()
+        self.python.start()
+        print(f"{Colors.BLUE}[INFO]{Colors.END} Profiling this run into {self.dir}")
+
+    def finish(self, top=DEFAULT_TOP):
+        """Write this process's profile, then summarise everything in the run directory"""
+        self.python.dump(self.dir / f"python-{self.name}-{os.getpid()}.pstats")
+        summary = summarize(self.dir)
+        summary["duration_s"] = round(time.time() - self.started, 1)
+        write_summary(self.dir, summary)
+        print_summary(summary, top)
+        return summary
+
+def run_module(module, args):
+    """Run `python -m module args` under the profiler, dumping on exit or SIGTERM"""
+    out_dir = Path(os.environ[PROFILE_DIR_ENV])
+    out_dir.mkdir(parents=True, exist_ok=True)
+    name = module[len("launcher."):] if module.startswith("launcher.") else module
+
+    # Sidecars are stopped with SIGTERM; exit normally so the profile is written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    profiler = PythonProfiler()
+    sys.argv = [module, *args]
+    profiler.start()
+    try:
+        runpy.run_module(module, run_name="__main__", alter_sys=True)
+        return 0
+    except SystemExit as e:
+        return e.code
+    finally:
+        profiler.dump(out_dir / f"python-{name}-{os.getpid()}.pstats")
+
+# ███████████████████████████████████████████████████████████████
+# █ PROFILE READERS                                             █
+# █ Per-function times and bytes from each file format          █
+# ███████████████████████████████████████████████████████████████
+
+def _short_path(path):
+    """Path relative to the repository, or its last two parts"""
+    path = str(path)
+    if path.startswith("file://"):
+        path = path[len("file://"):]
+    try:
+        return str(Path(path).resolve().relative_to(BASE_DIR))
+    except (ValueError, OSError):
+        return "/".join(Path(path).parts[-2:]) or path
+
+def _js_key(frame):
+    """Function name and location of a V8 call frame"""
+    name = frame.get("functionName") or "(anonymous)"
+    url = frame.get("url")
+    if not url:
+        return name
+    return f"{name} {_short_path(url)}:{frame.get('lineNumber', 0) + 1}"
+
+def read_cpu_profile(path):
+    """Self and total milliseconds per function of a .cpuprofile"""
+    with open(path) as f:
+        profile = json.load(f)
+    nodes = {node["id"]: node for node in profile.get("nodes", [])}
+    parents = {}
+    for node in nodes.values():
+        for child in node.get("children", []):
+            parents[child] = node["id"]
+
+    # Each sample owns the time until the next one
+    self_us = defaultdict(float)
+    samples = profile.get("samples") or []
+    deltas = profile.get("timeDeltas") or []
+    if samples and len(deltas) == len(samples):
+        timestamp = profile.get("startTime", 0)
+        for i, node_id in enumerate(samples):
+            timestamp += deltas[i]
+            if i + 1 < len(samples):
+                self_us[node_id] += max(deltas[i + 1], 0)
+            else:
+                self_us[node_id] += max(profile.get("endTime", timestamp) - timestamp, 0)
+    else:
+        hits = sum(node.get("hitCount", 0) for node in nodes.values()) or 1
+        interval = (profile.get("endTime", 0) - profile.get("startTime", 0)) / hits
+        for node_id, node in nodes.items():
+            self_us[node_id] += node.get("hitCount", 0) * interval
+
+    times = defaultdict(lambda: [0.0, 0.0])
+    for node_id, us in self_us.items():
+        if us <= 0 or node_id not in nodes:
+            continue
+        key = _js_key(nodes[node_id]["callFrame"])
+        if key in IDLE_FRAMES:
+            continue
+        times[key][0] += us / 1000
+
+        # Recursion counts once towards a function's total
+        seen = set()
+        current = node_id
+        while current is not None:
+            ancestor = _js_key(nodes[current]["callFrame"])
+            if ancestor not in seen and ancestor not in IDLE_FRAMES:
+                seen.add(ancestor)
+                times[ancestor][1] += us / 1000
+            current = parents.get(current)
+    return times
+
+def read_heap_profile(path):
+    """Sampled live bytes per allocating function of a .heapprofile"""
+    with open(path) as f:
+        profile = json.load(f)
+    sizes = defaultdict(int)
+    stack = [profile.get("head", {})]
+    while stack:
+        node = stack.pop()
+        if node.get("selfSize"):
+            sizes[_js_key(node.get("callFrame", {}))] += node["selfSize"]
+        stack.extend(node.get("children", []))
+    return sizes
+
+def read_pstats(path):
+    """Self and total milliseconds (thread CPU time) per function of a pstats dump"""
+    times = {}
+    for (filename, line, name), (_, _, self_s, total_s, _) in pstats.Stats(str(path)).stats.items():
+        key = name if filename == "~" else f"{name} {_short_path(filename)}:{line}"
+        times[key] = [self_s * 1000, total_s * 1000]
+    return times
+
+def read_trace(path):
+    """Self milliseconds per (process, task) of a Chrome trace's complete events"""
+    with open(path) as f:
+        trace = json.load(f)
+    events = trace.get("traceEvents", trace) if isinstance(trace, dict) else trace
+
+    names = {}
+    threads = defaultdict(list)
+    for event in events:
+        if event.get("ph") == "M" and event.get("name") == "process_name":
+            names[event.get("pid")] = event.get("args", {}).get("name", "")
+        elif event.get("ph") == "X" and "dur" in event:
+            threads[(event.get("pid"), event.get("tid"))].append(event)
+
+    times = defaultdict(float)
+    for (pid, _), slices in threads.items():
+        process = f"{names.get(pid) or 'process'}-{pid}"
+        slices.sort(key=lambda e: (e["ts"], -e["dur"]))
+        stack = []  # [end, key, self_us]
+        for event in slices:
+            while stack and stack[-1][0] <= event["ts"]:
+                end, key, self_us = stack.pop()
+                times[(process, key)] += self_us / 1000
+            if stack:
+                stack[-1][2] -= event["dur"]
+            stack.append([event["ts"] + event["dur"], _task_key(event), event["dur"]])
+        for _, key, self_us in stack:
+            times[(process, key)] += self_us / 1000
+    return times
+
+def _task_key(event):
+    """Trace slice name plus the source location that posted the task, if recorded"""
+    args = event.get("args") or {}
+    source = args.get("src_func") or ((args.get("task") or {}).get("posted_from") or {}).get("function_name")
+    return f"{event.get('name')} ({source})" if source else event.get("name", "?")
+
+# ███████████████████████████████████████████████████████████████
+# █ SUMMARY                                                     █
+# █ Rankings across every process of a run                      █
+# ███████████████████████████████████████████████████████████████
+
+def _process_label(path):
+    """Process a profile file belongs to (CPU chunks of one process share a label)"""
+    stem = Path(path).stem
+    return CHUNK_SUFFIX.sub("", stem) if Path(path).suffix == ".cpuprofile" else stem
+
+def _ranked(table, value, rows=SUMMARY_ROWS):
+    """Rows of {key: ...} sorted by one field, with the top processes for each"""
+    ordered = sorted(table.items(), key=lambda item: item[1][value], reverse=True)[:rows]
+    result = []
+    for key, entry in ordered:
+        processes = sorted(entry["processes"].items(), key=lambda item: item[1], reverse=True)
+        row = {"function": key, **{k: round(v, 1) for k, v in entry.items() if k != "processes"}}
+        row["processes"] = [label for label, _ in processes]
+        result.append(row)
+    return result
+
+def summarize(run_dir):
+    """Rank hot functions, allocation sites and native tasks across a run directory"""
+    run_dir = Path(run_dir)
+    processes = defaultdict(lambda: {"cpu_ms": 0.0, "files": 0})
+    functions = defaultdict(lambda: {"self_ms": 0.0, "total_ms": 0.0, "processes": defaultdict(float)})
+    allocations = defaultdict(lambda: {"bytes": 0, "processes": defaultdict(float)})
+    tasks = defaultdict(lambda: {"self_ms": 0.0, "processes": defaultdict(float)})
+    errors = []
+
+    for path in sorted(run_dir.iterdir()):
+        label = _process_label(path)
+        try:
+            if path.suffix in (".cpuprofile", ".pstats"):
+                times = read_cpu_profile(path) if path.suffix == ".cpuprofile" else read_pstats(path)
+                for key, (self_ms, total_ms) in times.items():
+                    functions[key]["self_ms"] += self_ms
+                    functions[key]["total_ms"] += total_ms
+                    functions[key]["processes"][label] += self_ms
+                    processes[label]["cpu_ms"] += self_ms
+            elif path.suffix == ".heapprofile":
+                for key, size in read_heap_profile(path).items():
+                    allocations[key]["bytes"] += size
+                    allocations[key]["processes"][label] += size
+            elif path.suffix == ".json" and path.name.startswith("trace-"):
+                # One trace covers many processes, listed under their own names
+                for (process, key), ms in read_trace(path).items():
+                    tasks[key]["self_ms"] += ms
+                    tasks[key]["processes"][process] += ms
+                    processes[process]["cpu_ms"] += ms
+                continue
+            else:
+                continue
+        except (OSError, ValueError, TypeError, KeyError, EOFError) as e:
+            errors.append(f"{path.name}: {str(e)}")
+            continue
+        processes[label]["files"] += 1
+
+    total_ms = sum(entry["self_ms"] for entry in functions.values()) or 1.0
+    ranked = _ranked(functions, "self_ms")
+    for row in ranked:
+        row["share"] = round(100 * row["self_ms"] / total_ms, 1)
+
+    return {
+        "run_dir": str(run_dir),
+        "processes": {label: {"cpu_ms": round(p["cpu_ms"], 1), "files": p["files"]}
+                      for label, p in sorted(processes.items())},
+        "functions": ranked,
+        "allocations": _ranked(allocations, "bytes"),
+        "tasks": _ranked(tasks, "self_ms"),
+        "errors": errors,
+    }
+
+def write_summary(run_dir, summary):
+    """Store the summary next to the profiles"""
+    with open(Path(run_dir) / SUMMARY_NAME, "w") as f:
+        json.dump(summary, f, indent=2)
+
+def print_summary(summary, top=DEFAULT_TOP):
+    """Print the rankings"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}Profile summary{Colors.END} {summary['run_dir']}")
+    for label, process in summary["processes"].items():
+        source = f"{process['files']} file(s)" if process["files"] else "trace"
+        print(f"  {process['cpu_ms']:10.1f} ms  {label} ({source})")
+
+    print(f"\n{Colors.BOLD}Hot functions (self CPU time, all processes){Colors.END}")
+    for row in summary["functions"][:top]:
+        print(f"  {row['self_ms']:10.1f} ms {row['share']:5.1f}%  total {row['total_ms']:10.1f} ms  "
+              f"{row['function']}  [{', '.join(row['processes'][:3])}]")
+
+    if summary["allocations"]:
+        print(f"\n{Colors.BOLD}Allocation sites (sampled live bytes){Colors.END}")
+        for row in summary["allocations"][:top]:
+            print(f"  {row['bytes'] / 1024:10.1f} KB  {row['function']}  [{', '.join(row['processes'][:3])}]")
+
+    if summary["tasks"]:
+        print(f"\n{Colors.BOLD}Native tasks (GPU, utility and browser processes){Colors.END}")
+        for row in summary["tasks"][:top]:
+            print(f"  {row['self_ms']:10.1f} ms  {row['function']}  [{', '.join(row['processes'][:3])}]")
+
+    for error in summary.get("errors", []):
+        print(f"{Colors.YELLOW}[WARN]{Colors.END} Unreadable profile {error}")
+    print(f"\n{Colors.BLUE}[INFO]{Colors.END} Full rankings in {Path(summary['run_dir']) / SUMMARY_NAME}")
+
+def main(argv=None):
+    """Summarise a run directory, or run a module under the profiler"""
+    parser = argparse.ArgumentParser(description="Internet Server profiling tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    summarize_cmd = sub.add_parser("summarize", help="Rank hot functions and allocation sites of a run")
+    summarize_cmd.add_argument("run_dir")
+    summarize_cmd.add_argument("--top", type=int, default=DEFAULT_TOP)
+
+    run_cmd = sub.add_parser("run", help=f"Run `python -m MODULE` profiled into ${PROFILE_DIR_ENV}")
+    run_cmd.add_argument("module")
+    run_cmd.add_argument("args", nargs=argparse.REMAINDER)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return run_module(args.module, args.args)
+
+    if not Path(args.run_dir).is_dir():
+        print(f"{Colors.RED}[ERROR]{Colors.END} No such run directory: {args.run_dir}")
+        return 1
+    summary = summarize(args.run_dir)
+    write_summary(args.run_dir, summary)
+    print_summary(summary, args.top)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
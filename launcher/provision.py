@@ -0,0 +1,336 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Offline dependency provisioning for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Builds a local store once: wheels, an npm tarball cache and installed trees
+[+] Fills new venvs and node_modules from the store without the network
+[+] Reflinks (copy-on-write) where the filesystem supports them, else hardlinks
+[+] Trees are keyed by lockfile, interpreter and platform, so they never mix
+
+Usage:
+    python -m launcher.provision build [--store DIR] [--skip-python] [--skip-node]
+    python -m launcher.provision status [--store DIR]
+
+Store layout:
+    wheels/                       pip wheel output (offline pip fallback)
+    npm-cache/                    npm tarball cache (offline `npm ci` fallback)
+    python/<key>/site-packages/   requirements installed with pip --target
+    node/<key>/node_modules/      `npm ci` result for one package-lock.json
+
+Linked files share storage with the store. pip and npm replace files
+rather than rewriting them, which breaks a hardlink safely; editing a
+linked file in place would change the store copy too.
+"""
+
+import argparse
+import hashlib
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import venv
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from launcher.console import Colors
+from launcher.logpipe import LogPipeline, run_logged
+
+IS_WINDOWS = platform.system() == "Windows"
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Store location override (a directory shared or synced between hosts)
+PROVISION_STORE_ENV = "INTERNET_SERVER_PROVISION_STORE"
+DEFAULT_STORE = BASE_DIR / ".provision-store"
+
+# Packages the launcher's venv needs (the sampler uses psutil)
+PYTHON_REQUIREMENTS = ["requests", "psutil"]
+
+# Files whose contents decide which node_modules tree fits
+NODE_INPUTS = ["package.json", "package-lock.json"]
+
+# Written last into a finished tree; trees without it are ignored
+COMPLETE_MARKER = ".provision-complete"
+
+# Linux FICLONE ioctl (btrfs, XFS, bcachefs copy-on-write clone)
+FICLONE = 0x40049409
+
+NPM_CMD = "npm.cmd" if IS_WINDOWS else "npm"
+
+# ███████████████████████████████████████████████████████████████
+# █ LINKING                                                     █
+# █ Reflink, then hardlink, then copy, per filesystem           █
+# ███████████████████████████████████████████████████████████████
+
+class Linker:
+    """Materialises store files, degrading from reflink to hardlink to copy"""
+
+    MODES = ("auto", "reflink", "hardlink", "copy")
+
+    def __init__(self, mode="auto"):
+        if mode not in self.MODES:
+            raise ValueError(f"unknown link mode '{mode}'")
+        self.mode = mode
+        # 'auto' settles on the first method that works for this pair of filesystems
+        self._method = "reflink" if mode == "auto" else mode
+        self.counts = {"reflink": 0, "hardlink": 0, "copy": 0, "symlink": 0}
+
+    def link_file(self, src, dst):
+        if self._method == "reflink":
+            try:
+                self._reflink(src, dst)
+                self.counts["reflink"] += 1
+                return
+            except OSError:
+                if self.mode == "reflink":
+                    raise
+                self._method = "hardlink"
+
+        if self._method == "hardlink":
+            try:
+                os.link(src, dst)
+                self.counts["hardlink"] += 1
+                return
+            except OSError:
+                if self.mode == "hardlink":
+                    raise
+                self._method = "copy"
+
+        shutil.copy2(src, dst)
+        self.counts["copy"] += 1
+
+    def link_tree(self, src_dir, dst_dir, skip=()):
+        """Recreate src_dir at dst_dir; symlinks are kept as symlinks, never followed"""
+        os.makedirs(dst_dir, exist_ok=True)
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                if entry.name in skip:
+                    continue
+                dst = os.path.join(dst_dir, entry.name)
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), dst, target_is_directory=entry.is_dir())
+                    self.counts["symlink"] += 1
+                elif entry.is_dir():
+                    self.link_tree(entry.path, dst)
+                else:
+                    self.link_file(entry.path, dst)
+
+    def summary(self):
+        return ", ".join(f"{count} {name}" for name, count in self.counts.items() if count) or "nothing"
+
+    def _reflink(self, src, dst):
+        if fcntl is None or not hasattr(fcntl, "ioctl") or platform.system() != "Linux":
+            raise OSError("reflinks are not supported here")
+        with open(src, "rb") as source, open(dst, "wb") as target:
+            try:
+                fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+            except OSError:
+                target.close()
+                os.unlink(dst)
+                raise
+        shutil.copystat(src, dst)
+
+# ███████████████████████████████████████████████████████████████
+# █ STORE                                                       █
+# █ Keyed trees plus the caches needed to rebuild them offline  █
+# ███████████████████████████████████████████████████████████████
+
+class ProvisionStore:
+    """Local dependency store shared by every checkout on a host"""
+
+    def __init__(self, root=None):
+        self.root = Path(root or os.environ.get(PROVISION_STORE_ENV) or DEFAULT_STORE)
+        self.wheels_dir = self.root / "wheels"
+        self.npm_cache = self.root / "npm-cache"
+
+    def python_key(self, requirements=PYTHON_REQUIREMENTS):
+        """Interpreter, platform and requirements the tree was built for"""
+        digest = hashlib.sha256("\0".join(sorted(requirements)).encode("utf-8")).hexdigest()[:12]
+        return (f"{sys.implementation.name}{sys.version_info.major}{sys.version_info.minor}-"
+                f"{sys.platform}-{platform.machine().lower()}-{digest}")
+
+    def node_key(self, base_dir):
+        """Lockfile, platform and Node.js version the tree was built for"""
+        digest = hashlib.sha256()
+        for name in NODE_INPUTS:
+            try:
+                digest.update((Path(base_dir) / name).read_bytes())
+            except OSError:
+                digest.update(b"<missing>")
+            digest.update(b"\0")
+        return f"{sys.platform}-{platform.machine().lower()}-node{_node_major()}-{digest.hexdigest()[:16]}"
+
+    def python_tree(self, requirements=PYTHON_REQUIREMENTS):
+        return self.root / "python" / self.python_key(requirements) / "site-packages"
+
+    def node_tree(self, base_dir):
+        return self.root / "node" / self.node_key(base_dir) / "node_modules"
+
+    def has_python(self, requirements=PYTHON_REQUIREMENTS):
+        return (self.python_tree(requirements).parent / COMPLETE_MARKER).exists()
+
+    def has_node(self, base_dir):
+        return (self.node_tree(base_dir).parent / COMPLETE_MARKER).exists()
+
+    def has_wheels(self):
+        return self.wheels_dir.is_dir() and any(self.wheels_dir.glob("*.whl"))
+
+    def has_npm_cache(self):
+        return self.npm_cache.is_dir() and any(self.npm_cache.iterdir())
+
+    def pip_offline_args(self):
+        """pip arguments that install from the wheel store only"""
+        return ["--no-index", "--find-links", str(self.wheels_dir)]
+
+    def npm_offline_args(self):
+        """npm arguments that install from the tarball cache only"""
+        return ["--offline", "--cache", str(self.npm_cache)]
+
+    def build_python(self, run, python=None, requirements=PYTHON_REQUIREMENTS):
+        """Download or build wheels, then install them into a keyed tree"""
+        python = python or sys.executable
+        self.wheels_dir.mkdir(parents=True, exist_ok=True)
+        if not run([python, "-m", "pip", "wheel", "--wheel-dir", str(self.wheels_dir), *requirements]):
+            return False
+
+        tree = self.python_tree(requirements)
+        staging = tree.parent.with_name(f"{tree.parent.name}.staging-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        target = staging / "site-packages"
+        if not run([python, "-m", "pip", "install", "--no-compile", *self.pip_offline_args(),
+                    "--target", str(target), *requirements]):
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        return self._publish(staging, tree.parent)
+
+    def build_node(self, run, base_dir, npm_cmd=NPM_CMD):
+        """`npm ci` into a keyed tree, filling the tarball cache on the way"""
+        tree = self.node_tree(base_dir)
+        staging = tree.parent.with_name(f"{tree.parent.name}.staging-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        for name in NODE_INPUTS:
+            shutil.copy2(Path(base_dir) / name, staging / name)
+
+        self.npm_cache.mkdir(parents=True, exist_ok=True)
+        if not run([npm_cmd, "ci", "--cache", str(self.npm_cache)], cwd=staging):
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        return self._publish(staging, tree.parent)
+
+    def _publish(self, staging, final):
+        """Mark a staged tree complete and move it into place atomically"""
+        (staging / COMPLETE_MARKER).write_text(f"{time.time()}\n")
+        if final.exists():
+            shutil.rmtree(final)
+        os.replace(staging, final)
+        return True
+
+    def provision_venv(self, venv_dir, requirements=PYTHON_REQUIREMENTS, linker=None):
+        """Create a venv (without pip) and link the requirement tree into it"""
+        linker = linker or Linker()
+        venv.create(venv_dir, with_pip=False)
+        linker.link_tree(self.python_tree(requirements), venv_site_packages(venv_dir), skip={"bin"})
+        return linker
+
+    def provision_node_modules(self, base_dir, linker=None):
+        """Link the tree for this lockfile into base_dir/node_modules"""
+        linker = linker or Linker()
+        final = Path(base_dir) / "node_modules"
+        staging = final.with_name(f"node_modules.provision-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        linker.link_tree(self.node_tree(base_dir), staging)
+        if final.exists():
+            shutil.rmtree(final)
+        os.replace(staging, final)
+        return linker
+
+    def status(self, base_dir):
+        """What the store holds for this checkout"""
+        return {
+            "store": str(self.root),
+            "python": {"key": self.python_key(), "ready": self.has_python(), "wheels": self.has_wheels()},
+            "node": {"key": self.node_key(base_dir), "ready": self.has_node(base_dir),
+                     "npm_cache": self.has_npm_cache()},
+            "size_mb": round(_tree_bytes(self.root) / (1024 * 1024), 1),
+        }
+
+def venv_site_packages(venv_dir):
+    """site-packages of a venv created by this interpreter"""
+    if IS_WINDOWS:
+        return Path(venv_dir) / "Lib" / "site-packages"
+    return Path(venv_dir) / "lib" / f"python{sys.version_info.major}.{sys.version_info.minor}" / "site-packages"
+
+@lru_cache(maxsize=1)
+def _node_major():
+    """Major version of the Node.js on PATH (native modules are built for it)"""
+    try:
+        out = subprocess.run(["node", "--version"], capture_output=True, text=True, timeout=10).stdout
+        return out.strip().lstrip("v").split(".")[0] or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+def _tree_bytes(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+# ███████████████████████████████████████████████████████████████
+# █ COMMAND LINE                                                █
+# ███████████████████████████████████████████████████████████████
+
+def main(argv=None):
+    """Build the store or show what it holds"""
+    parser = argparse.ArgumentParser(description="Internet Server offline dependency store")
+    parser.add_argument("command", choices=["build", "status"])
+    parser.add_argument("--store", help=f"Store directory (default ${PROVISION_STORE_ENV} or {DEFAULT_STORE})")
+    parser.add_argument("--skip-python", action="store_true")
+    parser.add_argument("--skip-node", action="store_true")
+    args = parser.parse_args(argv)
+
+    store = ProvisionStore(args.store)
+    if args.command == "status":
+        status = store.status(BASE_DIR)
+        print(f"{Colors.BLUE}[INFO]{Colors.END} Store {status['store']} ({status['size_mb']} MB)")
+        for kind in ("python", "node"):
+            state = "ready" if status[kind]["ready"] else "missing"
+            print(f"{Colors.BLUE}[INFO]{Colors.END} {kind}: {status[kind]['key']} ({state})")
+        return 0
+
+    pipeline = LogPipeline("provision", BASE_DIR / "logs" / "processes")
+
+    def run(cmd, cwd=None):
+        print(f"{Colors.CYAN}[EXEC]{Colors.END} {' '.join(map(str, cmd))}")
+        returncode, _, _ = run_logged(cmd, pipeline, cwd=cwd or BASE_DIR)
+        return returncode == 0
+
+    ok = True
+    started = time.perf_counter()
+    if not args.skip_python:
+        ok = store.build_python(run) and ok
+    if not args.skip_node:
+        ok = store.build_node(run, BASE_DIR) and ok
+    pipeline.close()
+
+    if ok:
+        print(f"{Colors.GREEN}[+]{Colors.END} Store built in {time.perf_counter() - started:.1f}s at {store.root}")
+    else:
+        print(f"{Colors.RED}[ERROR]{Colors.END} Store build failed, see {pipeline.path}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
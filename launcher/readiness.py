@@ -0,0 +1,147 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Readiness handshake for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Loopback listener the Electron main process reports to
+[+] Token-authenticated JSON "ready" message
+[+] Early exit detection and configurable timeout
+[+] Time-to-ready log for tracking startup regressions
+"""
+
+import json
+import os
+import secrets
+import select
+import socket
+import time
+from pathlib import Path
+
+# Environment variables read by main.js
+READY_PORT_ENV = "INTERNET_SERVER_READY_PORT"
+READY_TOKEN_ENV = "INTERNET_SERVER_READY_TOKEN"
+
+# Default time to wait for the browser to report readiness (seconds)
+DEFAULT_READY_TIMEOUT = 30.0
+
+# ███████████████████████████████████████████████████████████████
+# █ READINESS SIGNAL                                            █
+# █ What the browser reported once it finished starting         █
+# ███████████████████████████████████████████████████████████████
+
+class ReadySignal:
+    """Ready message received from the browser and the connection it came on"""
+
+    def __init__(self, message, connection, elapsed_ms):
+        self.message = message
+        self.connection = connection
+        self.elapsed_ms = elapsed_ms
+
+    def close(self):
+        """Close the control connection to the browser"""
+        try:
+            self.connection.close()
+        except OSError:
+            pass
+
+# ███████████████████████████████████████████████████████████████
+# █ READINESS LISTENER                                          █
+# █ Loopback socket the browser connects back to                █
+# ███████████████████████████████████████████████████████████████
+
+class ReadinessListener:
+    """Loopback listener that waits for the browser's ready message"""
+
+    def __init__(self, host="127.0.0.1"):
+        self.token = secrets.token_hex(16)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind((host, 0))
+        self.sock.listen(4)
+        self.sock.setblocking(False)
+        self.port = self.sock.getsockname()[1]
+        self.started = time.perf_counter()
+
+    def env(self):
+        """Environment variables that tell the browser where to report"""
+        return {
+            READY_PORT_ENV: str(self.port),
+            READY_TOKEN_ENV: self.token,
+        }
+
+    def wait(self, process, timeout=DEFAULT_READY_TIMEOUT):
+        """Block until the browser reports ready, exits, or the timeout passes"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            if process is not None and process.poll() is not None:
+                return None
+
+            # Short slices so an early exit is noticed promptly
+            readable, _, _ = select.select([self.sock], [], [], min(0.1, remaining))
+            if not readable:
+                continue
+
+            try:
+                connection, _ = self.sock.accept()
+            except (BlockingIOError, OSError):
+                continue
+
+            message = self._read_message(connection, deadline)
+            if message is not None:
+                elapsed_ms = (time.perf_counter() - self.started) * 1000
+                return ReadySignal(message, connection, elapsed_ms)
+            connection.close()
+
+    def close(self):
+        """Stop listening"""
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def _read_message(self, connection, deadline):
+        """Read one JSON line and validate its token"""
+        connection.setblocking(True)
+        buffer = b""
+        while b"\n" not in buffer:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            connection.settimeout(remaining)
+            try:
+                chunk = connection.recv(4096)
+            except OSError:
+                return None
+            if not chunk:
+                return None
+            buffer += chunk
+
+        try:
+            message = json.loads(buffer.split(b"\n", 1)[0].decode("utf-8"))
+        except ValueError:
+            return None
+        if message.get("event") != "ready" or message.get("token") != self.token:
+            return None
+        connection.settimeout(None)
+        return message
+
+# ███████████████████████████████████████████████████████████████
+# █ STARTUP LOG                                                 █
+# █ One JSON line per launch for regression tracking            █
+# ███████████████████████████████████████████████████████████████
+
+def log_startup_time(log_path, record):
+    """Append a startup timing record to the JSON lines log"""
+    try:
+        log_path = Path(log_path)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        record = {"timestamp": time.time(), "pid": os.getpid(), **record}
+        with open(log_path, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,581 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Telemetry recorder sidecar for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Ingests the LimiterManager status stream over loopback
+[+] Appends to fixed-width columnar chunk files (one series per instance)
+[+] Memory-mapped reads with binary-searched range queries
+[+] Minute rollups maintained at ingest for long ranges
+[+] Bounded memory and retention-based pruning
+
+Usage:
+    python -m launcher.recorder serve [--dir DIR] [--retention-days N]
+    python -m launcher.recorder instances [--dir DIR]
+    python -m launcher.recorder query --instance ID [--since S] [--window S] [--columns a,b]
+
+Chunk file layout (native-endian float64):
+    header  "ISTS" | version u16 | columns u16 | capacity u32 | rows u32
+    data    column 0 [capacity], column 1 [capacity], ...
+Chunks are preallocated, so a column is one contiguous slice of the file
+and appending a batch is one write per column.
+"""
+
+import argparse
+import bisect
+import json
+import math
+import mmap
+import os
+import select
+import signal
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from launcher.sidecars import listen_loopback, announce_listening
+
+# Environment variables read by the LimiterManager
+RECORDER_PORT_ENV = "INTERNET_SERVER_RECORDER_PORT"
+RECORDER_TOKEN_ENV = "INTERNET_SERVER_RECORDER_TOKEN"
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / "logs" / "telemetry"
+
+# Flattened status record fields (see src/limiters/telemetry-exporter.js)
+COLUMNS = (
+    "t",
+    "cpu", "cpu_system", "cpu_limit", "cpu_throttling",
+    "mem_total", "mem_main", "mem_renderer", "mem_limit", "mem_limiting",
+    "net_down", "net_up", "net_connections",
+    "psi_cpu", "psi_memory", "psi_io",
+)
+METRICS = COLUMNS[1:]
+
+# Rollup series: window start, then mean and max of every metric
+ROLLUP_SECONDS = 60
+ROLLUP_COLUMNS = ("t",) + tuple(f"{m}_{agg}" for m in METRICS for agg in ("mean", "max"))
+
+MAGIC = b"ISTS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+CHUNK_SUFFIX = ".chunk"
+
+# Rows per chunk: one hour of 1 Hz raw data, ten days of minute rollups
+RAW_CHUNK_ROWS = 3600
+ROLLUP_CHUNK_ROWS = 14400
+
+# Rows buffered in memory per series before they are written out
+FLUSH_ROWS = 30
+FLUSH_INTERVAL_S = 10.0
+
+# Exit once no client has been connected for this long
+IDLE_EXIT_S = 120
+
+# ███████████████████████████████████████████████████████████████
+# █ CHUNK FILES                                                 █
+# █ Fixed-capacity column blocks, appended in batches           █
+# ███████████████████████████████████████████████████████████████
+
+class ChunkWriter:
+    """Appends rows to one preallocated chunk file"""
+
+    def __init__(self, path, columns, capacity=None):
+        self.path = Path(path)
+        self.columns = columns
+        if self.path.exists():
+            self.file = open(self.path, "r+b")
+            magic, _, ncols, self.capacity, self.rows = HEADER.unpack(self.file.read(HEADER.size))
+            if magic != MAGIC or ncols != len(columns):
+                self.file.close()
+                raise ValueError(f"{self.path} is not a compatible chunk")
+        else:
+            self.capacity = capacity
+            self.rows = 0
+            self.file = open(self.path, "w+b")
+            self.file.write(HEADER.pack(MAGIC, VERSION, len(columns), capacity, 0))
+            self.file.truncate(HEADER.size + len(columns) * capacity * 8)
+        self.pending = [array("d") for _ in columns]
+        self.last_t = self._last_t()
+
+    @property
+    def full(self):
+        return self.rows + len(self.pending[0]) >= self.capacity
+
+    def append(self, values):
+        """Buffer one row (a sequence in column order)"""
+        for column, value in zip(self.pending, values):
+            column.append(value)
+        self.last_t = values[0]
+
+    def flush(self):
+        """Write buffered rows, one write per column, then publish the row count"""
+        count = len(self.pending[0])
+        if not count:
+            return
+        for index, column in enumerate(self.pending):
+            self.file.seek(HEADER.size + (index * self.capacity + self.rows) * 8)
+            self.file.write(column.tobytes())
+        self.rows += count
+        # Readers trust the header, so it is only updated after the data
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(self.columns), self.capacity, self.rows))
+        self.file.flush()
+        self.pending = [array("d") for _ in self.columns]
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def _last_t(self):
+        """Timestamp of the last stored row, so restarts stay monotonic"""
+        if not self.rows:
+            return -math.inf
+        self.file.seek(HEADER.size + (self.rows - 1) * 8)
+        return struct.unpack("d", self.file.read(8))[0]
+
+class ChunkReader:
+    """Memory-mapped read access to one chunk file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = open(self.path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, self.ncols, self.capacity, self.rows = HEADER.unpack(self.map[:HEADER.size])
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a chunk file")
+
+    def column(self, index, start=0, stop=None):
+        """Rows [start, stop) of a column: a NumPy array if available, else a memoryview"""
+        stop = self.rows if stop is None else min(stop, self.rows)
+        offset = HEADER.size + (index * self.capacity + start) * 8
+        if numpy is not None:
+            return numpy.frombuffer(self.map, dtype=numpy.float64, count=max(0, stop - start), offset=offset)
+        return memoryview(self.map)[offset:offset + max(0, stop - start) * 8].cast("d")
+
+    def span(self, start_t, end_t):
+        """Row range whose timestamps fall in [start_t, end_t)"""
+        times = self.column(0)
+        if numpy is not None:
+            lo, hi = (int(i) for i in numpy.searchsorted(times, [start_t, end_t]))
+        else:
+            lo = bisect.bisect_left(times, start_t)
+            hi = bisect.bisect_left(times, end_t, lo)
+        _release(times)
+        return lo, hi
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+def _release(view):
+    """Release a memoryview so its mmap can be closed"""
+    if isinstance(view, memoryview):
+        view.release()
+
+# ███████████████████████████████████████████████████████████████
+# █ SERIES                                                      █
+# █ A directory of chunks named by their first timestamp        █
+# ███████████████████████████████████████████████████████████████
+
+def _chunk_name(t):
+    return f"{int(t * 1000):016d}{CHUNK_SUFFIX}"
+
+def _chunk_start(path):
+    return int(path.stem) / 1000.0
+
+def list_chunks(directory):
+    """Chunk files of a series, oldest first"""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted(p for p in directory.iterdir() if p.suffix == CHUNK_SUFFIX)
+
+class SeriesWriter:
+    """Appends rows to a series, rotating to a new chunk when one fills"""
+
+    def __init__(self, directory, columns, chunk_rows):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.chunk = None
+        chunks = list_chunks(self.directory)
+        if chunks:
+            try:
+                self.chunk = ChunkWriter(chunks[-1], columns)
+            except (OSError, ValueError, struct.error):
+                self.chunk = None
+
+    @property
+    def last_t(self):
+        return self.chunk.last_t if self.chunk else -math.inf
+
+    def append(self, values):
+        """Append a row; out-of-order timestamps are dropped"""
+        if values[0] <= self.last_t:
+            return False
+        if self.chunk is None or self.chunk.full:
+            if self.chunk is not None:
+                self.chunk.close()
+            self.chunk = ChunkWriter(self.directory / _chunk_name(values[0]), self.columns, self.chunk_rows)
+        self.chunk.append(values)
+        if len(self.chunk.pending[0]) >= FLUSH_ROWS:
+            self.chunk.flush()
+        return True
+
+    def flush(self):
+        if self.chunk is not None:
+            self.chunk.flush()
+
+    def prune(self, cutoff):
+        """Delete chunks whose rows are all older than cutoff"""
+        chunks = list_chunks(self.directory)
+        for current, following in zip(chunks, chunks[1:]):
+            if _chunk_start(following) <= cutoff:
+                current.unlink()
+
+    def close(self):
+        if self.chunk is not None:
+            self.chunk.close()
+            self.chunk = None
+
+class SeriesReader:
+    """Range queries over a series"""
+
+    def __init__(self, directory, columns):
+        self.directory = Path(directory)
+        self.columns = columns
+
+    def query(self, start_t, end_t, columns=None):
+        """Rows with start_t <= t < end_t as {column: array('d')}"""
+        columns = columns or self.columns
+        indexes = [self.columns.index(c) for c in columns]
+        result = {c: array("d") for c in columns}
+
+        chunks = list_chunks(self.directory)
+        starts = [_chunk_start(p) for p in chunks]
+        # The chunk containing start_t is the last one starting at or before it
+        first = max(0, bisect.bisect_right(starts, start_t) - 1)
+        for path, chunk_start in zip(chunks[first:], starts[first:]):
+            if chunk_start >= end_t:
+                break
+            try:
+                reader = ChunkReader(path)
+            except (OSError, ValueError, struct.error):
+                continue
+            try:
+                lo, hi = reader.span(start_t, end_t)
+                for name, index in zip(columns, indexes):
+                    values = reader.column(index, lo, hi)
+                    result[name].frombytes(values.tobytes())
+                    # The mmap cannot close while a view into it is alive
+                    _release(values)
+                    del values
+            finally:
+                reader.close()
+        return result
+
+# ███████████████████████████████████████████████████████████████
+# █ ROLLUPS                                                     █
+# █ Per-window mean and max, built at ingest and at query time  █
+# ███████████████████████████████████████████████████████████████
+
+class RollupAccumulator:
+    """Folds raw rows into fixed windows of mean and max per metric"""
+
+    def __init__(self, window=ROLLUP_SECONDS):
+        self.window = window
+        self.window_start = None
+        self._reset()
+
+    def add(self, values):
+        """Add a raw row; returns a finished rollup row when a window closes"""
+        window_start = values[0] - values[0] % self.window
+        finished = None
+        if self.window_start is not None and window_start != self.window_start:
+            finished = self.finish()
+        self.window_start = window_start
+        for index, value in enumerate(values[1:]):
+            if value == value:  # skip NaN
+                self.sums[index] += value
+                self.counts[index] += 1
+                self.maxima[index] = max(self.maxima[index], value)
+        return finished
+
+    def finish(self):
+        """The rollup row for the current window"""
+        if self.window_start is None:
+            return None
+        row = [self.window_start]
+        for total, count, maximum in zip(self.sums, self.counts, self.maxima):
+            row.append(total / count if count else math.nan)
+            row.append(maximum if count else math.nan)
+        self._reset()
+        return row
+
+    def _reset(self):
+        self.sums = [0.0] * len(METRICS)
+        self.counts = [0] * len(METRICS)
+        self.maxima = [-math.inf] * len(METRICS)
+
+def rollup(times, values, window):
+    """Group (t, value) pairs into windows: [(window start, mean, min, max, count)]"""
+    if numpy is not None and len(times):
+        t = numpy.frombuffer(times, dtype=numpy.float64)
+        v = numpy.frombuffer(values, dtype=numpy.float64)
+        keep = ~numpy.isnan(v)
+        t, v = t[keep], v[keep]
+        if not len(t):
+            return []
+        buckets = t - t % window
+        edges = numpy.flatnonzero(numpy.diff(buckets)) + 1
+        starts = numpy.concatenate(([0], edges))
+        counts = numpy.diff(numpy.concatenate((starts, [len(v)])))
+        means = numpy.add.reduceat(v, starts) / counts
+        mins = numpy.minimum.reduceat(v, starts)
+        maxs = numpy.maximum.reduceat(v, starts)
+        return list(zip(buckets[starts].tolist(), means.tolist(), mins.tolist(), maxs.tolist(), counts.tolist()))
+
+    result = []
+    for t, v in zip(times, values):
+        if v != v:
+            continue
+        bucket = t - t % window
+        if result and result[-1][0] == bucket:
+            start, total, low, high, count = result[-1]
+            result[-1] = [start, total + v, min(low, v), max(high, v), count + 1]
+        else:
+            result.append([bucket, v, v, v, 1])
+    return [(start, total / count, low, high, count) for start, total, low, high, count in result]
+
+# ███████████████████████████████████████████████████████████████
+# █ TELEMETRY STORE                                             █
+# █ Raw and minute series for every instance                    █
+# ███████████████████████████████████████████████████████████████
+
+class InstanceRecorder:
+    """Raw and rollup writers for one browser instance"""
+
+    def __init__(self, directory):
+        self.raw = SeriesWriter(Path(directory) / "raw", COLUMNS, RAW_CHUNK_ROWS)
+        self.minutes = SeriesWriter(Path(directory) / "1m", ROLLUP_COLUMNS, ROLLUP_CHUNK_ROWS)
+        self.accumulator = RollupAccumulator()
+
+    def record(self, sample):
+        """Append one status record"""
+        values = []
+        for column in COLUMNS:
+            value = sample.get(column)
+            values.append(float(value) if isinstance(value, (int, float)) else math.nan)
+        if values[0] != values[0] or not self.raw.append(values):
+            return False
+        finished = self.accumulator.add(values)
+        if finished is not None:
+            self.minutes.append(finished)
+        return True
+
+    def flush(self):
+        self.raw.flush()
+        self.minutes.flush()
+
+    def prune(self, cutoff):
+        self.raw.prune(cutoff)
+        self.minutes.prune(cutoff)
+
+    def close(self):
+        # Keep the partial minute too; a restart within it cannot add it again
+        finished = self.accumulator.finish()
+        if finished is not None:
+            self.minutes.append(finished)
+        self.raw.close()
+        self.minutes.close()
+
+class TelemetryStore:
+    """Query interface over the recorder directory"""
+
+    def __init__(self, directory=DEFAULT_DIR):
+        self.directory = Path(directory)
+
+    def instances(self):
+        """Recorded instance ids"""
+        if not self.directory.is_dir():
+            return []
+        return sorted(p.name for p in self.directory.iterdir() if (p / "raw").is_dir())
+
+    def query(self, instance, start_t, end_t, columns=None):
+        """Raw rows in [start_t, end_t)"""
+        return SeriesReader(self.directory / instance / "raw", COLUMNS).query(start_t, end_t, columns)
+
+    def rollup(self, instance, column, start_t, end_t, window):
+        """Windowed mean/min/max of a metric; uses the minute series for windows of whole minutes"""
+        if window >= ROLLUP_SECONDS and window % ROLLUP_SECONDS == 0:
+            reader = SeriesReader(self.directory / instance / "1m", ROLLUP_COLUMNS)
+            rows = reader.query(start_t, end_t, ["t", f"{column}_mean", f"{column}_max"])
+            if len(rows["t"]):
+                means = rollup(rows["t"], rows[f"{column}_mean"], window)
+                maxima = rollup(rows["t"], rows[f"{column}_max"], window)
+                # Minimum is not kept in the minute series; report the minimum minute mean
+                return [(start, mean, low, high, count)
+                        for (start, mean, low, _, count), (_, _, _, high, _) in zip(means, maxima)]
+        rows = self.query(instance, start_t, end_t, ["t", column])
+        return rollup(rows["t"], rows[column], window)
+
+# ███████████████████████████████████████████████████████████████
+# █ SIDECAR SERVER                                              █
+# █ One connection per Electron instance                        █
+# ███████████████████████████████████████████████████████████████
+
+class RecorderClient:
+    """A connected LimiterManager and the instance it records for"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.buffer = b""
+        self.instance = None
+
+def serve(directory, token, retention_days):
+    """Run the recorder until no client has been connected for IDLE_EXIT_S"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    server = listen_loopback()
+    announce_listening(server.getsockname()[1])
+
+    # Flush and close cleanly when the launcher stops us
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    recorders = {}
+    clients = []
+    idle_since = time.monotonic()
+    next_flush = time.monotonic() + FLUSH_INTERVAL_S
+    try:
+        while True:
+            readable, _, _ = select.select([server] + [c.sock for c in clients], [], [], 1.0)
+            for sock in readable:
+                if sock is server:
+                    try:
+                        conn, _ = server.accept()
+                        clients.append(RecorderClient(conn))
+                    except OSError:
+                        pass
+                    continue
+                client = next(c for c in clients if c.sock is sock)
+                if not _read_records(client, token, directory, recorders):
+                    sock.close()
+                    clients.remove(client)
+
+            now = time.monotonic()
+            if now >= next_flush:
+                next_flush = now + FLUSH_INTERVAL_S
+                cutoff = time.time() - retention_days * 86400 if retention_days else None
+                for recorder in recorders.values():
+                    recorder.flush()
+                    if cutoff is not None:
+                        recorder.prune(cutoff)
+
+            if clients:
+                idle_since = now
+            elif now - idle_since > IDLE_EXIT_S:
+                return 0
+    finally:
+        for recorder in recorders.values():
+            recorder.close()
+
+def _read_records(client, token, directory, recorders):
+    """Consume client input; the first line names the instance"""
+    try:
+        data = client.sock.recv(65536)
+    except (BlockingIOError, InterruptedError):
+        return True
+    except OSError:
+        return False
+    if not data:
+        return False
+
+    client.buffer += data
+    while b"\n" in client.buffer:
+        line, client.buffer = client.buffer.split(b"\n", 1)
+        try:
+            message = json.loads(line.decode("utf-8"))
+        except ValueError:
+            continue
+        if client.instance is None:
+            if token and message.get("token") != token:
+                return False
+            # Instance ids become directory names
+            instance = "".join(ch for ch in str(message.get("hello", "default")) if ch.isalnum() or ch in "-_")
+            client.instance = instance or "default"
+            if client.instance not in recorders:
+                recorders[client.instance] = InstanceRecorder(directory / client.instance)
+            continue
+        recorders[client.instance].record(message)
+    return len(client.buffer) < 1024 * 1024
+
+# ███████████████████████████████████████████████████████████████
+# █ COMMAND LINE                                                █
+# ███████████████████████████████████████████████████████████████
+
+def _print_query(store, args):
+    """Print raw rows or rollups as JSON lines"""
+    end_t = args.until or time.time()
+    start_t = end_t - args.since
+    columns = [c for c in args.columns.split(",") if c] if args.columns else list(METRICS)
+    unknown = [c for c in columns if c not in METRICS]
+    if unknown:
+        print(f"Unknown column(s): {', '.join(unknown)}", file=sys.stderr)
+        return 1
+
+    if args.window:
+        for column in columns:
+            for start, mean, low, high, count in store.rollup(args.instance, column, start_t, end_t, args.window):
+                print(json.dumps({"column": column, "t": start, "mean": round(mean, 3),
+                                  "min": round(low, 3), "max": round(high, 3), "n": count}))
+        return 0
+
+    rows = store.query(args.instance, start_t, end_t, ["t"] + columns)
+    for index in range(len(rows["t"])):
+        print(json.dumps({c: rows[c][index] for c in rows}))
+    return 0
+
+def main():
+    """Entry point for the recorder sidecar and its query commands"""
+    parser = argparse.ArgumentParser(description="Internet Server telemetry recorder")
+    parser.add_argument("--dir", default=str(DEFAULT_DIR), help="Telemetry directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the recorder sidecar")
+    serve_parser.add_argument("--token", default=os.environ.get(RECORDER_TOKEN_ENV, ""), help="Shared secret clients must present")
+    serve_parser.add_argument("--retention-days", type=float, default=14, help="Delete data older than this (0 keeps everything)")
+
+    commands.add_parser("instances", help="List recorded instances")
+
+    query_parser = commands.add_parser("query", help="Print recorded telemetry as JSON lines")
+    query_parser.add_argument("--instance", default="default", help="Instance id")
+    query_parser.add_argument("--since", type=float, default=3600, help="Seconds before --until")
+    query_parser.add_argument("--until", type=float, default=None, help="End of the range (epoch seconds, default now)")
+    query_parser.add_argument("--window", type=float, default=0, help="Roll up into windows of this many seconds")
+    query_parser.add_argument("--columns", default="", help="Comma separated metrics (default all)")
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        return serve(args.dir, args.token, args.retention_days)
+
+    store = TelemetryStore(args.dir)
+    if args.command == "instances":
+        for instance in store.instances():
+            print(instance)
+        return 0
+    return _print_query(store, args)
+
+if __name__ == "__main__":
+    sys.exit(main())
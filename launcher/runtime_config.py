@@ -0,0 +1,141 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Runtime settings file for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Ollama and limiter settings live in runtime-settings.json, not package.json
+[+] Writes only when the desired settings differ from the file
+[+] Atomic writes (temp file + rename) under an exclusive lock
+[+] The Electron main process watches the file and reloads live
+"""
+
+import copy
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# File name (next to main.js) and the variable main.js reads to override it
+RUNTIME_SETTINGS_NAME = "runtime-settings.json"
+RUNTIME_SETTINGS_ENV = "INTERNET_SERVER_RUNTIME_SETTINGS"
+
+# Defaults filled in when a key is missing
+OLLAMA_DEFAULTS = {
+    "model": "llama3.2",
+    "ip": "127.0.0.1",
+    "port": "11434",
+    "style": "default",
+}
+
+# Values the launcher enforces whatever the file says
+OLLAMA_REQUIRED = {
+    "model": "llama3.2",
+}
+
+# ███████████████████████████████████████████████████████████████
+# █ FILE HELPERS                                                █
+# ███████████████████████████████████████████████████████████████
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on `path` (a sidecar .lock file) for the block"""
+    lock_path = Path(f"{path}.lock")
+    with open(lock_path, "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def atomic_write_json(path, data):
+    """Write JSON to a temp file in the same directory, fsync it, then rename over path"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+# ███████████████████████████████████████████████████████████████
+# █ RUNTIME SETTINGS                                            █
+# ███████████████████████████████████████████████████████████████
+
+class RuntimeSettings:
+    """The runtime settings file shared by the launcher and the browser"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def read(self):
+        """Current settings, or an empty dict if the file is missing or invalid"""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def apply(self, changes=None, defaults=None):
+        """Merge defaults (missing keys only) and changes (overrides) per section
+
+        Returns (settings, written); the file is untouched when nothing differs.
+        """
+        with file_lock(self.path):
+            # Re-read under the lock so a concurrent launcher's write is kept
+            current = self.read()
+            desired = copy.deepcopy(current)
+            for section, values in (defaults or {}).items():
+                target = desired.setdefault(section, {})
+                for key, value in values.items():
+                    target.setdefault(key, value)
+            for section, values in (changes or {}).items():
+                desired.setdefault(section, {}).update(values)
+
+            if desired == current:
+                return desired, False
+            atomic_write_json(self.path, desired)
+            return desired, True
+
+def legacy_ollama_config(package_json):
+    """Ollama settings left in package.json by older launchers (read only)"""
+    try:
+        with open(package_json, "r") as f:
+            return json.load(f).get("config", {}).get("ollama", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def ensure_ollama_settings(settings_path, package_json=None):
+    """Make sure the Ollama section is complete; returns (ollama settings, written)"""
+    runtime = RuntimeSettings(settings_path)
+    defaults = dict(OLLAMA_DEFAULTS)
+    if package_json is not None:
+        # Carry customisations over from package.json the first time
+        defaults.update({k: v for k, v in legacy_ollama_config(package_json).items() if k in OLLAMA_DEFAULTS})
+    settings, written = runtime.apply(changes={"ollama": OLLAMA_REQUIRED}, defaults={"ollama": defaults})
+    return settings["ollama"], written
@@ -0,0 +1,366 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Resource sampler sidecar for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] One psutil pass per interval over the whole Electron process tree
+[+] CPU, RSS, IO and thread counts per process and per tree
+[+] Streams compact JSON line records to the limiters over loopback
+[+] Or fixed binary records through a /dev/shm ring (Linux), socket as doorbell
+[+] Replaces per-tick execSync('top') / PowerShell in the limiters
+
+Usage: python -m launcher.sampler [--interval MS] [--token TOKEN]
+
+Protocol: the client (LimiterManager) connects and sends one line
+{"hello": <electron main pid>, "token": "...", "shm": true|false}; it then
+receives one record per interval:
+{"t": epoch, "pid": root, "cpu": tree %, "sys": system %, "rss": bytes,
+ "ior": bytes, "iow": bytes, "thr": threads, "n": processes,
+ "procs": [[pid, type, cpu %, rss], ...]}
+CPU percentages are of total machine capacity (all cores = 100).
+Later lines from the client are commands: {"interval": ms}.
+
+With "shm": true on a host that has /dev/shm, the first line back is
+{"shm": path} instead. Records then go through that channel (see
+launcher/shm_ring.py) as one TREE record followed by n PROC records, and
+the socket only carries doorbell bytes, both ways; the client sends
+commands as COMMAND records. A client that cannot open the channel sends
+{"shm": false} and gets JSON lines again.
+"""
+
+import argparse
+import json
+import os
+import select
+import sys
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from launcher import shm_ring
+from launcher.sidecars import listen_loopback, announce_listening, announce_unavailable
+
+# Environment variables read by the LimiterManager
+SAMPLER_PORT_ENV = "INTERNET_SERVER_SAMPLER_PORT"
+SAMPLER_TOKEN_ENV = "INTERNET_SERVER_SAMPLER_TOKEN"
+
+DEFAULT_INTERVAL_MS = 1000
+MIN_INTERVAL_MS = 50
+
+# Per-client outbound buffer cap; records are dropped, never split, past it
+MAX_PENDING_BYTES = 256 * 1024
+
+# Exit if no client ever connects within this many seconds
+CONNECT_GRACE_S = 120
+
+# ███████████████████████████████████████████████████████████████
+# █ PROCESS TREE SAMPLING                                       █
+# █ Keeps psutil.Process objects alive to get CPU time deltas   █
+# ███████████████████████████████████████████████████████████████
+
+class TreeSampler:
+    """Samples a process and all of its descendants in one pass"""
+
+    def __init__(self, root_pid):
+        self.root_pid = root_pid
+        self.root = psutil.Process(root_pid)
+        self.cpu_count = psutil.cpu_count() or 1
+        self._last = {}   # pid -> (wall, cpu seconds)
+        self._types = {}  # pid -> electron process type
+
+    def alive(self):
+        """Whether the root process is still running"""
+        return self.root.is_running()
+
+    def sample(self, system_cpu):
+        """Collect one record for the whole tree"""
+        now = time.monotonic()
+        try:
+            procs = [self.root] + self.root.children(recursive=True)
+        except psutil.Error:
+            procs = [self.root]
+
+        totals = {"cpu": 0.0, "rss": 0, "ior": 0, "iow": 0, "thr": 0}
+        rows = []
+        seen = set()
+        for proc in procs:
+            try:
+                with proc.oneshot():
+                    cpu_times = proc.cpu_times()
+                    rss = proc.memory_info().rss
+                    threads = proc.num_threads()
+                    try:
+                        io = proc.io_counters()
+                        io_read, io_write = io.read_bytes, io.write_bytes
+                    except (psutil.AccessDenied, AttributeError):
+                        io_read = io_write = 0
+            except psutil.Error:
+                continue
+
+            pid = proc.pid
+            seen.add(pid)
+            cpu_seconds = cpu_times.user + cpu_times.system
+            last = self._last.get(pid)
+            self._last[pid] = (now, cpu_seconds)
+            cpu = 0.0
+            if last is not None and now > last[0]:
+                cpu = (cpu_seconds - last[1]) / (now - last[0]) * 100 / self.cpu_count
+
+            totals["cpu"] += cpu
+            totals["rss"] += rss
+            totals["ior"] += io_read
+            totals["iow"] += io_write
+            totals["thr"] += threads
+            rows.append([pid, self._process_type(proc), round(cpu, 1), rss])
+
+        # Forget processes that exited
+        for pid in list(self._last):
+            if pid not in seen:
+                del self._last[pid]
+                self._types.pop(pid, None)
+
+        return {
+            "t": round(time.time(), 3),
+            "pid": self.root_pid,
+            "cpu": round(totals["cpu"], 1),
+            "sys": system_cpu,
+            "rss": totals["rss"],
+            "ior": totals["ior"],
+            "iow": totals["iow"],
+            "thr": totals["thr"],
+            "n": len(rows),
+            "procs": rows,
+        }
+
+    def _process_type(self, proc):
+        """Electron process type from --type=..., cached per pid"""
+        ptype = self._types.get(proc.pid)
+        if ptype is None:
+            ptype = "main" if proc.pid == self.root_pid else "other"
+            try:
+                for arg in proc.cmdline():
+                    if arg.startswith("--type="):
+                        ptype = arg[len("--type="):]
+                        break
+            except psutil.Error:
+                pass
+            self._types[proc.pid] = ptype
+        return ptype
+
+# ███████████████████████████████████████████████████████████████
+# █ CLIENT CONNECTIONS                                          █
+# █ One connection per Electron instance                        █
+# ███████████████████████████████████████████████████████████████
+
+class SamplerClient:
+    """A connected limiter and the tree it asked to be sampled"""
+
+    def __init__(self, sock, interval):
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.inbound = b""
+        self.pending = b""
+        self.tree = None
+        self.channel = None
+        self.interval = interval
+        self.next_tick = 0.0
+        self.dropped = 0
+
+    def queue(self, record):
+        """Queue a record, dropping it if the client is not keeping up"""
+        if self.channel is not None:
+            self._queue_binary(record)
+            return
+        self._queue_line(record)
+
+    def _queue_line(self, message):
+        line = (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+        if len(self.pending) + len(line) > MAX_PENDING_BYTES:
+            self.dropped += 1
+            return
+        self.pending += line
+
+    def _queue_binary(self, record):
+        """One TREE record and its PROC records, then a doorbell"""
+        if not self.channel.outbound.write_sample(record):
+            self.dropped += 1
+            return
+        # Anything still queued wakes the client just as well
+        if not self.pending:
+            self.pending = shm_ring.DOORBELL
+
+    def open_channel(self):
+        """Switch this client to a shared memory channel; False keeps JSON lines"""
+        try:
+            channel = shm_ring.ShmChannel.create("sampler")
+        except OSError:
+            return False
+        self._queue_line({"shm": channel.path})
+        self.channel = channel
+        return True
+
+    def close_channel(self):
+        if self.channel is not None:
+            self.channel.close()
+            self.channel = None
+
+    def commands(self):
+        """Commands the client wrote to its channel since the last doorbell"""
+        if self.channel is None:
+            return []
+        return [{"interval": values[0]} for kind, code, _, _, values in self.channel.inbound.read()
+                if kind == shm_ring.KIND_COMMAND and code == shm_ring.COMMAND_SET_INTERVAL]
+
+    def flush(self):
+        """Write as much pending data as the socket accepts"""
+        if not self.pending:
+            return True
+        try:
+            sent = self.sock.send(self.pending)
+            self.pending = self.pending[sent:]
+            return True
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            return False
+
+# ███████████████████████████████████████████████████████████████
+# █ MAIN LOOP                                                   █
+# █ Single thread: accept, read hellos, sample, write           █
+# ███████████████████████████████████████████████████████████████
+
+def serve(interval_ms, token):
+    """Run the sampler until every client has gone away"""
+    server = listen_loopback()
+    announce_listening(server.getsockname()[1])
+
+    clients = []
+    started = time.monotonic()
+    ever_connected = False
+    interval = interval_ms / 1000.0
+    psutil.cpu_percent(None)
+
+    try:
+        while True:
+            # Each client is sampled at its own interval
+            now = time.monotonic()
+            ticks = [c.next_tick for c in clients if c.tree is not None]
+            timeout = max(0.0, min(ticks, default=now + interval) - now)
+            watch = [server] + [c.sock for c in clients]
+            writers = [c.sock for c in clients if c.pending]
+            readable, writable, _ = select.select(watch, writers, [], timeout)
+
+            for sock in readable:
+                if sock is server:
+                    try:
+                        conn, _ = server.accept()
+                        clients.append(SamplerClient(conn, interval))
+                        ever_connected = True
+                    except OSError:
+                        pass
+                    continue
+                client = next(c for c in clients if c.sock is sock)
+                if not _read_client(client, token):
+                    _drop(clients, client)
+
+            for sock in writable:
+                client = next((c for c in clients if c.sock is sock), None)
+                if client and not client.flush():
+                    _drop(clients, client)
+
+            now = time.monotonic()
+            due = [c for c in clients if c.tree is not None and now >= c.next_tick]
+            if due:
+                system_cpu = psutil.cpu_percent(None)
+            for client in due:
+                client.next_tick += client.interval
+                if client.next_tick < now:
+                    client.next_tick = now + client.interval
+                if not client.tree.alive():
+                    _drop(clients, client)
+                    continue
+                client.queue(client.tree.sample(system_cpu))
+                if not client.flush():
+                    _drop(clients, client)
+
+            if ever_connected and not clients:
+                return 0
+            if not ever_connected and time.monotonic() - started > CONNECT_GRACE_S:
+                return 0
+    finally:
+        # Channel files live in /dev/shm until removed
+        for client in list(clients):
+            _drop(clients, client)
+
+def _read_client(client, token):
+    """Consume client input: the hello line, then commands and doorbells"""
+    try:
+        data = client.sock.recv(4096)
+    except (BlockingIOError, InterruptedError):
+        return True
+    except OSError:
+        return False
+    if not data:
+        return False
+
+    if shm_ring.DOORBELL in data:
+        data = data.replace(shm_ring.DOORBELL, b"")
+        for command in client.commands():
+            _apply_command(client, command)
+
+    client.inbound += data
+    while b"\n" in client.inbound:
+        line, client.inbound = client.inbound.split(b"\n", 1)
+        try:
+            message = json.loads(line.decode("utf-8"))
+            if client.tree is None:
+                if token and message.get("token") != token:
+                    return False
+                client.tree = TreeSampler(int(message["hello"]))
+                client.next_tick = time.monotonic()
+                if message.get("shm") and shm_ring.available():
+                    client.open_channel()
+            else:
+                _apply_command(client, message)
+        except (ValueError, KeyError, TypeError, AttributeError, psutil.Error):
+            return False
+    return len(client.inbound) < 4096
+
+def _apply_command(client, command):
+    """Apply one client command; unknown keys are ignored"""
+    if "interval" in command:
+        interval = max(MIN_INTERVAL_MS, int(command["interval"])) / 1000.0
+        client.next_tick += interval - client.interval
+        client.interval = interval
+    if command.get("shm") is False:
+        client.close_channel()
+
+def _drop(clients, client):
+    """Close and forget a client"""
+    try:
+        client.sock.close()
+    except OSError:
+        pass
+    client.close_channel()
+    if client in clients:
+        clients.remove(client)
+
+def main():
+    """Entry point for the sampler sidecar"""
+    parser = argparse.ArgumentParser(description="Internet Server resource sampler")
+    parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL_MS, help="Sampling interval in ms")
+    parser.add_argument("--token", default=os.environ.get(SAMPLER_TOKEN_ENV, ""), help="Shared secret clients must present")
+    args = parser.parse_args()
+
+    if psutil is None:
+        announce_unavailable("psutil is not installed")
+        return 1
+    return serve(max(MIN_INTERVAL_MS, args.interval), args.token)
+
+if __name__ == "__main__":
+    sys.exit(main())
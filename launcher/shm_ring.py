@@ -0,0 +1,253 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Shared memory record rings for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] One /dev/shm file per connection, mapped by the launcher side
+[+] Two single-writer rings: launcher -> Electron and Electron -> launcher
+[+] Fixed-size binary records packed in place, nothing serialised
+[+] One doorbell byte per published batch; bytes queued on the socket coalesce
+
+Read from Node.js by src/limiters/shm-ring.js; keep the two in step.
+
+File layout (little-endian):
+    0     header  "ISRB" | version u16 | record size u16 | capacity u32
+    64    ring 0  (launcher writes, Electron reads)
+    192   ring 1  (Electron writes, launcher reads)
+    320   ring 0 slots, then ring 1 slots: capacity records each
+Ring header, 128 bytes; writer and reader fields sit on separate cache lines:
+    +0    write seq u64 | dropped u32
+    +64   read seq u64
+Record, 96 bytes:
+    seq u64 | kind u16 | code u16 | pid u32 | t f64 | 9 x f64 values
+A record's seq is its position plus one. Writers fill the record with
+seq 0 and set seq afterwards; readers check seq before the rest. So a
+reader can tell a slot it may not use yet, and can scan ahead without
+the ring's write seq.
+
+Doorbells: a writer sends one byte over the connection's socket after
+each publish, and a reader drains the ring whenever bytes arrive, so no
+wake-up can be lost. The read seq only bounds the writer; a reader may
+advance it lazily (every quarter ring) to save writes.
+"""
+
+import mmap
+import os
+import secrets
+import struct
+import sys
+
+SHM_DIR = "/dev/shm"
+
+MAGIC = b"ISRB"
+VERSION = 1
+RECORD_SIZE = 96
+VALUES = 9
+DEFAULT_CAPACITY = 1024
+
+HEADER = struct.Struct("<4sHHI")
+HEADER_SIZE = 64
+RING_HEADER_SIZE = 128
+SLOTS_OFFSET = HEADER_SIZE + 2 * RING_HEADER_SIZE
+
+# Field offsets within a ring header
+WRITE_SEQ = 0
+DROPPED = 8
+READ_SEQ = 64
+
+SEQ = struct.Struct("<Q")
+WORD = struct.Struct("<I")
+RECORD = struct.Struct(f"<QHHId{VALUES}d")
+ZEROS = (0.0,) * VALUES
+
+# Sample records with only the values their kind uses; the rest pack as zeros
+TREE_FIELDS = "QHHId7d16x"
+PROC_FIELDS = "QHHI3d56x"
+
+DOORBELL = b"\x01"
+
+# ███████████████████████████████████████████████████████████████
+# █ RECORD KINDS                                                █
+# █ Shared with src/limiters/shm-ring.js                        █
+# ███████████████████████████████████████████████████████████████
+
+# A tree sample: values are cpu, sys, rss, ior, iow, thr, n; it is
+# followed by n PROC records (code = PROCESS_TYPES index, values cpu, rss)
+KIND_TREE = 1
+KIND_PROC = 2
+
+# Electron -> launcher; code selects the command
+KIND_COMMAND = 3
+COMMAND_SET_INTERVAL = 1  # values[0] = sampling interval in ms
+
+PROCESS_TYPES = ("main", "renderer", "gpu-process", "utility", "zygote",
+                 "crashpad-handler", "broker", "ppapi", "other")
+_TYPE_CODES = {name: code for code, name in enumerate(PROCESS_TYPES)}
+_OTHER = _TYPE_CODES["other"]
+
+_sample_structs = {}
+
+def _sample_struct(procs):
+    """One struct for a TREE record and `procs` PROC records, cached per size"""
+    packer = _sample_structs.get(procs)
+    if packer is None:
+        packer = _sample_structs[procs] = struct.Struct("<" + TREE_FIELDS + PROC_FIELDS * procs)
+    return packer
+
+def available():
+    """Whether shared memory channels can be created on this host"""
+    return (sys.platform.startswith("linux") and sys.byteorder == "little"
+            and os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK))
+
+# ███████████████████████████████████████████████████████████████
+# █ RING                                                        █
+# █ One direction of a channel: one writer, one reader          █
+# ███████████████████████████████████████████████████████████████
+
+class Ring:
+    """Fixed records in a mapped file, addressed by sequence number"""
+
+    def __init__(self, mm, header, slots, capacity):
+        self.mm = mm
+        self.header = header
+        self.slots = slots
+        self.capacity = capacity
+        self.write_seq = SEQ.unpack_from(mm, header + WRITE_SEQ)[0]
+        self.read_seq = SEQ.unpack_from(mm, header + READ_SEQ)[0]
+
+    def free(self):
+        """Slots the writer may fill before the reader catches up"""
+        return self.capacity - (self.write_seq - SEQ.unpack_from(self.mm, self.header + READ_SEQ)[0])
+
+    def write(self, kind, code=0, pid=0, t=0.0, values=()):
+        """Append one record and publish it; False (and counted) if the ring is full"""
+        if self.free() < 1:
+            self.count_dropped()
+            return False
+        self.put(kind, code, pid, t, values)
+        self.publish()
+        return True
+
+    def write_sample(self, record):
+        """A TreeSampler record as one TREE and n PROC records, published together"""
+        procs = record["procs"]
+        count = 1 + len(procs)
+        if self.free() < count:
+            self.count_dropped()
+            return False
+
+        seq, t = self.write_seq, record["t"]
+        index = seq % self.capacity
+        if index + count <= self.capacity:
+            # Contiguous slots: one pack for the whole sample
+            args = [0, KIND_TREE, 0, record["pid"], t, record["cpu"], record["sys"], record["rss"],
+                    record["ior"], record["iow"], record["thr"], record["n"]]
+            for pid, ptype, cpu, rss in procs:
+                args += (0, KIND_PROC, _TYPE_CODES.get(ptype, _OTHER), pid, t, cpu, rss)
+            offset = self.slots + index * RECORD_SIZE
+            _sample_struct(len(procs)).pack_into(self.mm, offset, *args)
+            for number in range(seq + 1, seq + count + 1):
+                SEQ.pack_into(self.mm, offset, number)
+                offset += RECORD_SIZE
+            self.write_seq += count
+        else:
+            self.put(KIND_TREE, 0, record["pid"], t, (record["cpu"], record["sys"], record["rss"],
+                                                      record["ior"], record["iow"], record["thr"], record["n"]))
+            for pid, ptype, cpu, rss in procs:
+                self.put(KIND_PROC, _TYPE_CODES.get(ptype, _OTHER), pid, t, (cpu, rss))
+        self.publish()
+        return True
+
+    def put(self, kind, code=0, pid=0, t=0.0, values=()):
+        """Append one record without publishing it; check free() first"""
+        offset = self.slots + (self.write_seq % self.capacity) * RECORD_SIZE
+        RECORD.pack_into(self.mm, offset, 0, kind, code, pid, t, *values, *ZEROS[len(values):])
+        self.write_seq += 1
+        SEQ.pack_into(self.mm, offset, self.write_seq)
+
+    def publish(self):
+        """Make every put() record visible to the reader"""
+        SEQ.pack_into(self.mm, self.header + WRITE_SEQ, self.write_seq)
+
+    def count_dropped(self):
+        WORD.pack_into(self.mm, self.header + DROPPED, WORD.unpack_from(self.mm, self.header + DROPPED)[0] + 1)
+
+    def dropped(self):
+        """Records the writer could not fit"""
+        return WORD.unpack_from(self.mm, self.header + DROPPED)[0]
+
+    def read(self):
+        """Yield (kind, code, pid, t, values) for every record published since the last read"""
+        written = SEQ.unpack_from(self.mm, self.header + WRITE_SEQ)[0]
+        try:
+            while self.read_seq < written:
+                offset = self.slots + (self.read_seq % self.capacity) * RECORD_SIZE
+                if SEQ.unpack_from(self.mm, offset)[0] != self.read_seq + 1:
+                    break
+                _, kind, code, pid, t, *values = RECORD.unpack_from(self.mm, offset)
+                self.read_seq += 1
+                yield kind, code, pid, t, values
+        finally:
+            SEQ.pack_into(self.mm, self.header + READ_SEQ, self.read_seq)
+
+# ███████████████████████████████████████████████████████████████
+# █ CHANNEL                                                     █
+# █ The mapped file and its two rings                           █
+# ███████████████████████████████████████████████████████████████
+
+class ShmChannel:
+    """Both rings of one connection; the creator writes ring 0 and owns the file"""
+
+    def __init__(self, path, mm, owner):
+        self.path = path
+        self.mm = mm
+        self.owner = owner
+        _, _, _, self.capacity = HEADER.unpack_from(mm, 0)
+        rings = [Ring(mm, HEADER_SIZE + i * RING_HEADER_SIZE,
+                      SLOTS_OFFSET + i * self.capacity * RECORD_SIZE, self.capacity) for i in range(2)]
+        self.outbound, self.inbound = rings if owner else rings[::-1]
+
+    @classmethod
+    def create(cls, tag, capacity=DEFAULT_CAPACITY):
+        """A new zeroed channel file in /dev/shm, readable by this user only"""
+        path = os.path.join(SHM_DIR, f"internet-server-{tag}-{os.getpid()}-{secrets.token_hex(4)}")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            os.ftruncate(fd, SLOTS_OFFSET + 2 * capacity * RECORD_SIZE)
+            mm = mmap.mmap(fd, 0)
+        except OSError:
+            os.unlink(path)
+            raise
+        finally:
+            os.close(fd)
+        HEADER.pack_into(mm, 0, MAGIC, VERSION, RECORD_SIZE, capacity)
+        return cls(path, mm, owner=True)
+
+    @classmethod
+    def attach(cls, path):
+        """Map a channel another process created, as its peer"""
+        fd = os.open(path, os.O_RDWR)
+        try:
+            mm = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+        magic, version, record_size, capacity = HEADER.unpack_from(mm, 0)
+        if (magic, version, record_size) != (MAGIC, VERSION, RECORD_SIZE) or \
+                len(mm) < SLOTS_OFFSET + 2 * capacity * RECORD_SIZE:
+            mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} record ring")
+        return cls(path, mm, owner=False)
+
+    def close(self):
+        """Unmap; the creator also removes the file"""
+        try:
+            self.mm.close()
+        except BufferError:
+            pass
+        if self.owner:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
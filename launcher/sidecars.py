@@ -0,0 +1,148 @@
+"""
+█▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+█▄▄ █▄█ █▄▀ ██▄ █░█
+
+Sidecar process helpers for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Starts long-lived Python helpers next to the browser
+[+] Loopback port handshake over the helper's stdout
+[+] Helpers outlive the launcher in their own session
+[+] Run under the profiler when the launcher profiles the session
+"""
+
+import os
+import platform
+import select
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from launcher.console import Colors
+from launcher.profiling import PROFILE_DIR_ENV
+
+IS_WINDOWS = platform.system() == "Windows"
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# First stdout line a sidecar prints once it is listening
+LISTENING_PREFIX = "LISTENING "
+UNAVAILABLE_PREFIX = "UNAVAILABLE "
+
+# ███████████████████████████████████████████████████████████████
+# █ LAUNCHER SIDE                                               █
+# █ Spawning a sidecar and waiting for its port                 █
+# ███████████████████████████████████████████████████████████████
+
+class Sidecar:
+    """A running helper process and the loopback port it listens on"""
+
+    def __init__(self, name, process, port):
+        self.name = name
+        self.process = process
+        self.port = port
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def stop(self, timeout=2.0):
+        """Terminate the helper, escalating to kill after the timeout"""
+        if self.process.poll() is not None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+def spawn_sidecar(name, module, args=(), python=None, env=None, timeout=10.0):
+    """Start `python -m module` and wait for its LISTENING handshake line"""
+    env = env or os.environ.copy()
+    cmd = [python or sys.executable, "-m", module, *[str(a) for a in args]]
+    if env.get(PROFILE_DIR_ENV):
+        # Same process, with cProfile around it and a profile dump on exit
+        cmd[2:3] = ["launcher.profiling", "run", module]
+    popen_kwargs = {}
+    if IS_WINDOWS:
+        popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        # Own session so the helper survives the launcher exiting
+        popen_kwargs["start_new_session"] = True
+
+    try:
+        process = subprocess.Popen(
+            cmd,
+            cwd=BASE_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+            **popen_kwargs
+        )
+    except OSError as e:
+        print(f"{Colors.YELLOW}[WARN]{Colors.END} Could not start {name}: {str(e)}")
+        return None
+
+    line = _read_handshake(process, timeout)
+    if line is not None and line.startswith(LISTENING_PREFIX):
+        try:
+            port = int(line[len(LISTENING_PREFIX):].strip())
+        except ValueError:
+            port = None
+        if port:
+            process.stdout.close()
+            print(f"{Colors.GREEN}[+]{Colors.END} {name} started (PID {process.pid}, port {port})")
+            return Sidecar(name, process, port)
+
+    reason = line[len(UNAVAILABLE_PREFIX):].strip() if line and line.startswith(UNAVAILABLE_PREFIX) else "no handshake"
+    print(f"{Colors.YELLOW}[WARN]{Colors.END} {name} unavailable: {reason}")
+    if process.poll() is None:
+        process.kill()
+    return None
+
+def _read_handshake(process, timeout):
+    """Read the first stdout line of a sidecar without blocking forever"""
+    if IS_WINDOWS:
+        # select() does not work on pipes on Windows; the helper prints its
+        # handshake before doing anything slow, so a blocking read is fine
+        return process.stdout.readline()
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        readable, _, _ = select.select([process.stdout], [], [], 0.1)
+        if readable:
+            return process.stdout.readline()
+        if process.poll() is not None:
+            return process.stdout.readline()
+    return None
+
+# ███████████████████████████████████████████████████████████████
+# █ SIDECAR SIDE                                                █
+# █ Helpers used inside the sidecar process itself              █
+# ███████████████████████████████████████████████████████████████
+
+def listen_loopback(backlog=16):
+    """Bind a non-blocking listening socket on an ephemeral loopback port"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(backlog)
+    sock.setblocking(False)
+    return sock
+
+def announce_listening(port):
+    """Print the handshake line and detach stdout from the launcher pipe"""
+    sys.stdout.write(f"{LISTENING_PREFIX}{port}\n")
+    sys.stdout.flush()
+    _detach_stdout()
+
+def announce_unavailable(reason):
+    """Tell the launcher this sidecar cannot run here"""
+    sys.stdout.write(f"{UNAVAILABLE_PREFIX}{reason}\n")
+    sys.stdout.flush()
+
+def _detach_stdout():
+    """Point stdout at the null device so a departed launcher cannot EPIPE us"""
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
@@ -17,15 +17,32 @@ const os = require('os');
 const { autoUpdater } = require('electron-updater');
 const pidusage = require('pidusage');
 const http = require('http');
+const net = require('net');
 const httpProxy = require('http-proxy');
 
 // ==== SYSTEM CONSTANTS ====
 const IS_DEV = process.argv.includes('--debug');
 const IS_WINDOWS = process.platform === 'win32';
 const IS_LINUX = process.platform === 'linux';
+
+// Standby pool browsers start hidden and wait for the launcher daemon's show command
+let isStandby = process.env.INTERNET_SERVER_STANDBY === '1';
+
+// Fleet instances each get their own profile directory from the launcher
+if (process.env.INTERNET_SERVER_USER_DATA) {
+  app.setPath('userData', process.env.INTERNET_SERVER_USER_DATA);
+}
 const APP_DATA_PATH = app.getPath('userData');
 const CONFIG_PATH = path.join(APP_DATA_PATH, 'config.json');
 
+// Launcher-managed settings (Ollama, limiter profile), watched for live reloads
+const RUNTIME_SETTINGS_PATH = process.env.INTERNET_SERVER_RUNTIME_SETTINGS ||
+  path.join(__dirname, 'runtime-settings.json');
+
+// Limiter profile pinned by the launcher (fleet instance or --cgroup); it wins
+// over the config defaults and the runtime settings shared by every instance
+const LAUNCHER_PROFILE = process.env.INTERNET_SERVER_LIMITER_PROFILE || null;
+
 // ==== DEFAULT CONFIGURATION ====
 let config = {
   theme: 'xp_classic',
@@ -49,9 +66,27 @@ let mainWindow = null;
 // Resource manager
 let limiterManager = null;
 
+// Control connection to the Python launcher (if launched through it)
+let launcherSocket = null;
+
+// Runtime settings watcher and the last contents applied
+let runtimeSettingsWatcher = null;
+let runtimeSettingsText = null;
+
+// Connection to the launcher's Ollama gateway (if launched through it)
+let ollamaGateway = null;
+
 // Import our limiter modules
-const { LimiterManager } = require('./src/limiters/limiter-manager');
-const { PluginSystem } = require('./src/plugins/plugin-loader');
+const LimiterManager = require('./src/limiters/limiter-manager');
+const PluginLoader = require('./src/plugins/plugin-loader');
+const OllamaGatewayClient = require('./src/ollama/gateway-client');
+const ProcessProfiler = require('./src/profiling/process-profiler');
+
+// Sampling CPU and heap profiles of every process (launcher --profile mode)
+const profiler = ProcessProfiler.fromEnvironment();
+if (profiler) {
+  profiler.start();
+}
 let networkThrottle = null;
 
 /**
@@ -87,6 +122,69 @@ function saveConfiguration() {
   }
 }
 
+/**
+ * Applies the launcher's runtime settings file (Ollama and limiter profile)
+ * Called at startup and whenever the file changes on disk
+ */
+function loadRuntimeSettings() {
+  let text;
+  try {
+    text = fs.readFileSync(RUNTIME_SETTINGS_PATH, 'utf8');
+  } catch (error) {
+    return; // No launcher-managed settings
+  }
+  
+  // fs.watch fires several times per write; only act on real changes
+  if (text === runtimeSettingsText) {
+    return;
+  }
+  
+  let settings;
+  try {
+    settings = JSON.parse(text);
+  } catch (error) {
+    console.error('❌ Invalid runtime settings:', error.message);
+    return;
+  }
+  runtimeSettingsText = text;
+  
+  if (settings.ollama) {
+    config.ollama = { ...config.ollama, ...settings.ollama };
+  }
+  
+  const profile = settings.limiter && settings.limiter.profile;
+  if (profile && !LAUNCHER_PROFILE && limiterManager && limiterManager.settings.profiles.current !== profile) {
+    limiterManager.settings.enabled = true;
+    limiterManager.setProfile(profile);
+  }
+  
+  if (mainWindow && !mainWindow.isDestroyed()) {
+    mainWindow.webContents.send('config-updated', config);
+  }
+  console.log('✅ Runtime settings applied');
+}
+
+/**
+ * Reloads the runtime settings when the launcher rewrites them
+ * The directory is watched because atomic renames replace the file
+ */
+function watchRuntimeSettings() {
+  const fileName = path.basename(RUNTIME_SETTINGS_PATH);
+  let reloadTimer = null;
+  
+  try {
+    runtimeSettingsWatcher = fs.watch(path.dirname(RUNTIME_SETTINGS_PATH), (eventType, changed) => {
+      if (changed && changed !== fileName) {
+        return;
+      }
+      clearTimeout(reloadTimer);
+      reloadTimer = setTimeout(loadRuntimeSettings, 100);
+    });
+  } catch (error) {
+    console.error('❌ Could not watch runtime settings:', error.message);
+  }
+}
+
 /**
  * Creates the main browser window with Windows XP styling
  * Sets up frameless window with custom frame rendering
@@ -114,13 +212,10 @@ function createMainWindow() {
   // Load the index.html of the app
   mainWindow.loadFile(path.join(__dirname, 'src', 'ui', 'index.html'));
 
-  // Show window when ready to avoid flashing
+  // Show window when ready to avoid flashing (standbys wait to be claimed)
   mainWindow.once('ready-to-show', () => {
-    mainWindow.show();
-    
-    // Check for updates (except in dev mode)
-    if (!IS_DEV) {
-      autoUpdater.checkForUpdatesAndNotify();
+    if (!isStandby) {
+      revealMainWindow();
     }
   });
 
@@ -176,6 +271,20 @@ function createMainWindow() {
   initPluginSystem();
 }
 
+/**
+ * Shows and focuses the main window, then checks for updates
+ * Called once the window has rendered, or when a standby is claimed
+ */
+function revealMainWindow() {
+  mainWindow.show();
+  mainWindow.focus();
+  
+  // Check for updates (except in dev mode)
+  if (!IS_DEV) {
+    autoUpdater.checkForUpdatesAndNotify();
+  }
+}
+
 /**
  * ███████████████████████████████████████████████████████████████
  * █ Initialize Resource Limiter Manager                        █
@@ -187,9 +296,11 @@ function initLimiterManager() {
   
   // Create the limiter manager instance
   limiterManager = new LimiterManager(mainWindow);
+  limiterManager.init();
   
-  // Initialize with settings from config (if available)
-  if (config.limiter) {
+  // Initialize with settings from config (if available), unless
+  // init() already applied a profile pinned by the launcher
+  if (config.limiter && !LAUNCHER_PROFILE) {
     // Convert legacy config format to new format if needed
     const limiterSettings = {
       enabled: true,
@@ -237,6 +348,123 @@ function initLimiterManager() {
   return limiterManager;
 }
 
+/**
+ * Reports readiness to the Python launcher over its loopback handshake socket
+ * Only active when the launcher passed INTERNET_SERVER_READY_PORT
+ */
+function notifyLauncherReady(timings) {
+  const port = parseInt(process.env.INTERNET_SERVER_READY_PORT, 10);
+  if (!port) {
+    return;
+  }
+  
+  launcherSocket = net.connect({ host: '127.0.0.1', port }, () => {
+    launcherSocket.write(JSON.stringify({
+      event: 'ready',
+      token: process.env.INTERNET_SERVER_READY_TOKEN,
+      pid: process.pid,
+      timings
+    }) + '\n');
+    startLauncherStats();
+  });
+  
+  // The launcher may send commands back as JSON lines on the same socket
+  let buffer = '';
+  launcherSocket.setEncoding('utf8');
+  launcherSocket.on('data', (chunk) => {
+    buffer += chunk;
+    let newline;
+    while ((newline = buffer.indexOf('\n')) !== -1) {
+      const line = buffer.slice(0, newline);
+      buffer = buffer.slice(newline + 1);
+      try {
+        handleLauncherCommand(JSON.parse(line));
+      } catch (err) {
+        console.error('❌ Invalid launcher command:', err.message);
+      }
+    }
+  });
+  
+  // A standby nobody can claim any more only holds memory
+  launcherSocket.on('close', () => {
+    if (isStandby) {
+      console.log('Standby pool daemon went away, quitting');
+      app.quit();
+    }
+  });
+  
+  launcherSocket.on('error', (err) => {
+    console.error('❌ Launcher readiness handshake failed:', err.message);
+  });
+}
+
+/**
+ * Handles a command from the launcher's control connection
+ * 'show' hands a hidden standby browser to the user
+ */
+function handleLauncherCommand(message) {
+  if (message.command === 'show' && mainWindow) {
+    const start = process.hrtime.bigint();
+    isStandby = false;
+    revealMainWindow();
+    launcherSocket.write(JSON.stringify({
+      event: 'shown',
+      pid: process.pid,
+      showMs: Number(process.hrtime.bigint() - start) / 1e6
+    }) + '\n');
+  }
+}
+
+/**
+ * Streams periodic throughput stats to a supervising launcher (fleet mode)
+ * Only active when the launcher passed INTERNET_SERVER_STATS_INTERVAL
+ */
+function startLauncherStats() {
+  const interval = parseInt(process.env.INTERNET_SERVER_STATS_INTERVAL, 10);
+  if (!interval) {
+    return;
+  }
+  
+  const timer = setInterval(() => {
+    if (!launcherSocket || launcherSocket.destroyed) {
+      clearInterval(timer);
+      return;
+    }
+    const stats = limiterManager ? limiterManager.getStats() : null;
+    launcherSocket.write(JSON.stringify({
+      event: 'stats',
+      pid: process.pid,
+      profile: stats ? stats.profile : null,
+      network: stats ? stats.network : null
+    }) + '\n');
+  }, interval);
+}
+
+/**
+ * Connects to the launcher's Ollama gateway and exposes it over IPC
+ * Tokens stream to the requesting renderer as 'ollama-token' events
+ */
+function initOllamaGateway() {
+  ollamaGateway = new OllamaGatewayClient();
+  ollamaGateway.connect();
+  
+  ipcMain.handle('ollama-generate', async (event, prompt, options = {}) => {
+    const requestId = options.requestId;
+    const result = await ollamaGateway.generate(prompt, {
+      model: options.model || config.ollama.model,
+      style: options.style || config.ollama.style,
+      cache: options.cache
+    }, (token) => {
+      if (!event.sender.isDestroyed()) {
+        event.sender.send('ollama-token', { requestId, token });
+      }
+    });
+    return { requestId, ...result };
+  });
+  
+  ipcMain.handle('ollama-stats', () => ollamaGateway.getStats());
+}
+
 /**
  * Initializes the plugin system
  * Loads plugin modules from the plugins directory
@@ -287,12 +515,28 @@ app.whenReady().then(() => {
   createMainWindow();
   
   // Initialize plugin system
-  const pluginSystem = new PluginSystem(mainWindow);
+  const pluginSystem = new PluginLoader(mainWindow);
   pluginSystem.loadPlugins();
   
   // Initialize the resource limiter manager
   initLimiterManager();
   
+  // Launcher-managed settings override the saved ones, and reload live
+  loadRuntimeSettings();
+  watchRuntimeSettings();
+  
+  // Local model access through the launcher's gateway
+  initOllamaGateway();
+  const limitersReadyMs = Math.round(process.uptime() * 1000);
+  
+  // Report readiness to the launcher once the window has rendered
+  mainWindow.once('ready-to-show', () => {
+    notifyLauncherReady({
+      limitersReadyMs,
+      windowReadyMs: Math.round(process.uptime() * 1000)
+    });
+  });
+  
   // Log startup details
   console.log(`
     █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
@@ -336,6 +580,18 @@ app.on('window-all-closed', () => {
 
 // Save configuration when app is about to quit
 app.on('before-quit', () => {
+  // Stop watching the runtime settings
+  if (runtimeSettingsWatcher) {
+    runtimeSettingsWatcher.close();
+    runtimeSettingsWatcher = null;
+  }
+  
+  // Close the Ollama gateway connection
+  if (ollamaGateway) {
+    ollamaGateway.dispose();
+    ollamaGateway = null;
+  }
+  
   // Save user configuration
   saveConfiguration();
   
@@ -13,6 +13,13 @@
 
 const { contextBridge, ipcRenderer } = require('electron');
 const os = require('os');
+const TelemetryClient = require('./src/ui/telemetry-client');
+
+// Delta updates from the main process telemetry bus
+const telemetry = new TelemetryClient(ipcRenderer);
+
+// Plugin IDs and message types; keeps plugin pages off other IPC channels
+const PLUGIN_CHANNEL_PART = /^[A-Za-z0-9._-]+$/;
 
 // Expose protected methods that allow the renderer process to use
 // the ipcRenderer without exposing the entire object
@@ -29,6 +36,9 @@ contextBridge.exposeInMainWorld('electronAPI', {
   // Configuration management
   getConfig: () => ipcRenderer.invoke('get-config'),
   updateConfig: (config) => ipcRenderer.send('update-config', config),
+  onConfigUpdated: (callback) => {
+    ipcRenderer.on('config-updated', (event, config) => callback(config));
+  },
   
   // System information
   getSystemInfo: () => {
@@ -42,16 +52,16 @@ contextBridge.exposeInMainWorld('electronAPI', {
     };
   },
   
-  // Resource usage listeners
-  onCpuUsageUpdate: (callback) => {
-    ipcRenderer.on('update-cpu-usage', (event, usage) => callback(usage));
-  },
-  onRamUsageUpdate: (callback) => {
-    ipcRenderer.on('update-ram-usage', (event, usage) => callback(usage));
-  },
-  onNetworkUsageUpdate: (callback) => {
-    ipcRenderer.on('update-network-usage', (event, usage) => callback(usage));
+  // Local model (Ollama) generation, streamed token by token
+  ollamaGenerate: (prompt, options) => ipcRenderer.invoke('ollama-generate', prompt, options),
+  onOllamaToken: (callback) => {
+    ipcRenderer.on('ollama-token', (event, data) => callback(data));
   },
+  getOllamaStats: () => ipcRenderer.invoke('ollama-stats'),
+  
+  // Resource usage: subscribe to fields ('cpu.current', 'network'); the callback
+  // gets the stats object and the changed paths, the promise an unsubscribe function
+  subscribeTelemetry: (fields, options, callback) => telemetry.subscribe(fields, options, callback),
   
   // Resource Limiter Settings Panel IPC channels
   // Get current limiter settings
@@ -63,9 +73,9 @@ contextBridge.exposeInMainWorld('electronAPI', {
   // Get real-time resource stats
   getResourceStats: () => ipcRenderer.invoke('get-resource-stats'),
   
-  // Subscribe to resource stats updates
+  // Subscribe to resource stats updates (sent only when something changed)
   onResourceStatsUpdate: (callback) => {
-    ipcRenderer.on('resource-stats-update', (event, stats) => callback(stats));
+    telemetry.subscribe(['limiter', 'cpu', 'memory', 'network', 'cgroup'], { intervalMs: 2000 }, (stats) => callback(stats));
   },
   
   // Profile management
@@ -88,10 +98,42 @@ contextBridge.exposeInMainWorld('electronAPI', {
     ipcRenderer.on('suspend-inactive-tabs', () => callback());
   },
   
+  // Tab hibernation: the main process destroys cold tabs and restores them on activation
+  registerTab: (tabId, webContentsId) => ipcRenderer.send('register-tab', { tabId, webContentsId }),
+  tabActivated: (tabId) => ipcRenderer.send('tab-activated', tabId),
+  tabClosed: (tabId) => ipcRenderer.send('tab-closed', tabId),
+  onHibernateTab: (callback) => {
+    ipcRenderer.on('hibernate-tab', (event, data) => callback(data));
+  },
+  tabHibernated: (tabId, hibernated) => ipcRenderer.send('tab-hibernated', { tabId, hibernated }),
+  restoreTab: (tabId) => ipcRenderer.invoke('restore-tab', tabId),
+  tabRestored: (tabId, webContentsId) => ipcRenderer.send('tab-restored', { tabId, webContentsId }),
+  
   // Plugin system
   registerPluginUI: (pluginId, uiElement) => {
     ipcRenderer.send('register-plugin-ui', { pluginId, uiElement });
   },
+  onRegisterPluginUI: (callback) => {
+    ipcRenderer.on('register-plugin-ui', (event, plugin) => callback(plugin));
+  },
+  onUnregisterPluginUI: (callback) => {
+    ipcRenderer.on('unregister-plugin-ui', (event, plugin) => callback(plugin));
+  },
+  getPlugins: () => ipcRenderer.invoke('get-plugins'),
+  enablePlugin: (pluginId) => ipcRenderer.invoke('enable-plugin', pluginId),
+  disablePlugin: (pluginId) => ipcRenderer.invoke('disable-plugin', pluginId),
+  // Plugins load on first use: call before talking to a plugin's main module
+  activatePlugin: (pluginId, event) => ipcRenderer.invoke('activate-plugin', { pluginId, event }),
+  triggerPluginEvent: (eventName) => ipcRenderer.invoke('plugin-event', eventName),
+  // Messages between plugin pages and their main module ({ plugin, type, data })
+  sendPluginMessage: (pluginId, type, data) => {
+    if (PLUGIN_CHANNEL_PART.test(pluginId) && PLUGIN_CHANNEL_PART.test(type)) {
+      ipcRenderer.send(`plugin:${pluginId}:${type}`, data);
+    }
+  },
+  onPluginMessage: (callback) => {
+    ipcRenderer.on('plugin-message', (event, message) => callback(message));
+  },
   
   // Auto-updater
   onUpdateAvailable: (callback) => {
@@ -17,6 +17,13 @@ Copyright (c) 2025 ZARI CORP - All Rights Reserved
 [+] Virtual environment setup and dependency management
 [+] Electron application wrapper
 [+] Development environment configuration
+[+] Optional cgroup v2 enforcement of limiter profiles (Linux)
+[+] Multi-instance fleet supervision for load testing
+[+] Pooled, caching Ollama gateway for the browser
+[+] Streamed, rotated and searchable logs of every child process
+[+] Offline provisioning of the venv and node_modules from a linked store
+[+] Standby pool daemon of pre-started hidden browsers, claimed instantly
+[+] Profiling mode: CPU and heap profiles of every process, ranked per run
 """
 
 import os
@@ -29,6 +36,27 @@ import shutil
 from pathlib import Path
 import venv
 import time
+import secrets
+import signal
+import threading
+import atexit
+
+from launcher.console import Colors
+from launcher.manifest import LaunchManifest, MANIFEST_NAME, launch_fingerprints
+from launcher.preflight import Preflight
+from launcher.readiness import ReadinessListener, DEFAULT_READY_TIMEOUT, log_startup_time
+from launcher.sidecars import spawn_sidecar
+from launcher.sampler import SAMPLER_PORT_ENV, SAMPLER_TOKEN_ENV
+from launcher.recorder import RECORDER_PORT_ENV, RECORDER_TOKEN_ENV
+from launcher.ollama_gateway import OLLAMA_PORT_ENV, OLLAMA_TOKEN_ENV
+from launcher.cgroups import CgroupController, CGROUP_ENV, LIMITER_PROFILES, own_cgroup
+from launcher.fleet import Fleet, FleetInstance, cpu_sets, PROFILE_ENV, PROXY_CACHE_DIR_ENV, PROXY_CACHE_MB_ENV
+from launcher.plugin_index import build_plugin_index, PLUGIN_INDEX_NAME
+from launcher.runtime_config import RuntimeSettings, RUNTIME_SETTINGS_NAME, ensure_ollama_settings
+from launcher.logpipe import LogPipeline, run_logged, logged_command, command_source
+from launcher.provision import ProvisionStore, PYTHON_REQUIREMENTS
+from launcher.profiling import ProfileSession
+from launcher.daemon import StandbyPool, claim_standby, DAEMON_STATE_NAME, MIN_STANDBY, MAX_STANDBY, MEMORY_RESERVE_MB
 
 # ███████████████████████████████████████████████████████████████
 # █ CONFIGURATION VARIABLES                                     █
@@ -40,6 +68,21 @@ BASE_DIR = Path(__file__).resolve().parent
 VENV_DIR = BASE_DIR / ".venv"
 NODE_MODULES = BASE_DIR / "node_modules"
 PACKAGE_JSON = BASE_DIR / "package.json"
+MANIFEST_PATH = BASE_DIR / MANIFEST_NAME
+RUNTIME_SETTINGS = BASE_DIR / RUNTIME_SETTINGS_NAME
+LOGS_DIR = BASE_DIR / "logs"
+STARTUP_LOG = LOGS_DIR / "startup-times.jsonl"
+TELEMETRY_DIR = LOGS_DIR / "telemetry"
+PROCESS_LOG_DIR = LOGS_DIR / "processes"
+PROFILE_DIR = LOGS_DIR / "profiles"
+FLEET_DIR = BASE_DIR / ".fleet"
+DAEMON_DIR = BASE_DIR / ".daemon"
+PROXY_CACHE_DIR = BASE_DIR / ".proxy-cache"
+
+# Per-host throttling rules file, read (and reloaded on change) by the proxy
+DOMAIN_RULES_ENV = "INTERNET_SERVER_DOMAIN_RULES"
+PLUGINS_DIR = BASE_DIR / "src" / "plugins"
+PLUGIN_INDEX = BASE_DIR / PLUGIN_INDEX_NAME
 
 # OS detection
 IS_WINDOWS = platform.system() == "Windows"
@@ -50,22 +93,6 @@ VENV_PYTHON = str(VENV_DIR / ("Scripts" if IS_WINDOWS else "bin") / "python")
 VENV_PIP = str(VENV_DIR / ("Scripts" if IS_WINDOWS else "bin") / "pip")
 NPM_CMD = "npm.cmd" if IS_WINDOWS else "npm"
 
-# ███████████████████████████████████████████████████████████████
-# █ CONSOLE COLORS                                              █
-# █ ANSI color codes for terminal output styling                █
-# ███████████████████████████████████████████████████████████████
-class Colors:
-    HEADER = '\033[95m'    # Purple
-    BLUE = '\033[94m'      # Blue
-    CYAN = '\033[96m'      # Cyan
-    GREEN = '\033[92m'     # Green
-    YELLOW = '\033[93m'    # Yellow
-    WARNING = '\033[93m'   # Yellow (same as YELLOW, for backwards compatibility)
-    RED = '\033[91m'       # Red
-    END = '\033[0m'        # Reset all formatting
-    BOLD = '\033[1m'       # Bold text
-    UNDERLINE = '\033[4m'  # Underlined text
-
 # ███████████████████████████████████████████████████████████████
 # █ HELPER FUNCTIONS                                            █
 # █ Utility functions for setup and configuration               █
@@ -82,8 +109,19 @@ def print_banner():
 """
     print(banner)
 
+_command_log = None
+_command_log_lock = threading.Lock()
+
+def command_log():
+    """Log pipeline shared by every command the launcher runs (preflight runs them in parallel)"""
+    global _command_log
+    with _command_log_lock:
+        if _command_log is None:
+            _command_log = LogPipeline("run_browser", PROCESS_LOG_DIR)
+        return _command_log
+
 def run_command(cmd, cwd=None, shell=False, env=None):
-    """Execute a command and return the result"""
+    """Execute a command, streaming its output, and return the result"""
     print(f"{Colors.CYAN}[EXEC]{Colors.END} {' '.join(cmd) if isinstance(cmd, list) else cmd}")
     try:
         if isinstance(cmd, str) and not shell:
@@ -92,39 +130,48 @@ def run_command(cmd, cwd=None, shell=False, env=None):
         if env is None:
             env = os.environ.copy()
 
-        process = subprocess.run(
-            cmd, 
-            cwd=cwd or BASE_DIR,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            shell=shell,
-            env=env
-        )
+        # Output is shown as it arrives and logged; only the tail is kept in memory
+        pipeline = command_log()
+        returncode, out, err = run_logged(cmd, pipeline, cwd=cwd or BASE_DIR, shell=shell, env=env)
         
-        if process.returncode != 0:
-            print(f"{Colors.RED}[ERROR] Command failed with code {process.returncode}{Colors.END}")
-            print(f"{Colors.RED}[STDERR] {process.stderr}{Colors.END}")
-            return False, process.stdout, process.stderr
+        if returncode != 0:
+            report = pipeline.crash_report(command_source(cmd), cmd, returncode)
+            print(f"{Colors.RED}[ERROR] Command failed with code {returncode}{Colors.END}")
+            print(f"{Colors.RED}[LOG]{Colors.END} Full output in {pipeline.path}, last lines in {report}")
+            return False, out, err
         
-        return True, process.stdout, process.stderr
+        return True, out, err
     except Exception as e:
         print(f"{Colors.RED}[EXCEPTION] {str(e)}{Colors.END}")
         return False, "", str(e)
 
-def setup_virtual_environment():
+def setup_virtual_environment(store=None, offline=False):
     """Create and configure the Python virtual environment"""
     if VENV_DIR.exists():
         print(f"{Colors.BLUE}[INFO]{Colors.END} Virtual environment already exists at {VENV_DIR}")
         return True
     
-    print(f"{Colors.GREEN}[+]{Colors.END} Creating Python virtual environment...")
+    store = store or ProvisionStore()
     try:
+        # Linked from the provisioning store: no pip, no network
+        if store.has_python():
+            started = time.perf_counter()
+            linker = store.provision_venv(VENV_DIR)
+            print(f"{Colors.GREEN}[+]{Colors.END} Virtual environment provisioned from {store.root} "
+                  f"in {time.perf_counter() - started:.1f}s ({linker.summary()})")
+            return True
+        
+        if offline and not store.has_wheels():
+            print(f"{Colors.RED}[ERROR]{Colors.END} Offline: no Python packages in {store.root} (run with --build-store first)")
+            return False
+        
+        print(f"{Colors.GREEN}[+]{Colors.END} Creating Python virtual environment...")
         venv.create(VENV_DIR, with_pip=True)
         print(f"{Colors.GREEN}[+]{Colors.END} Virtual environment created successfully")
         
         # Install Python dependencies - only essential packages
-        success, out, err = run_command([VENV_PIP, "install", "requests", "psutil"])
+        pip_args = store.pip_offline_args() if offline else []
+        success, out, err = run_command([VENV_PIP, "install", *pip_args, *PYTHON_REQUIREMENTS])
         if not success:
             return False
             
@@ -134,11 +181,22 @@ def setup_virtual_environment():
         print(f"{Colors.RED}[ERROR]{Colors.END} Failed to create virtual environment: {str(e)}")
         return False
 
-def check_node_dependencies():
+def check_node_dependencies(store=None, offline=False):
     """Check if Node.js dependencies are installed"""
     if not NODE_MODULES.exists():
+        store = store or ProvisionStore()
+        
+        # Linked from the provisioning store when it has this lockfile's tree
+        if store.has_node(BASE_DIR):
+            started = time.perf_counter()
+            linker = store.provision_node_modules(BASE_DIR)
+            print(f"{Colors.GREEN}[+]{Colors.END} Node.js dependencies provisioned from {store.root} "
+                  f"in {time.perf_counter() - started:.1f}s ({linker.summary()})")
+            return True
+        
         print(f"{Colors.YELLOW}[WARN]{Colors.END} Node modules not found, installing dependencies...")
-        success, out, err = run_command([NPM_CMD, "install"])
+        cmd = [NPM_CMD, "ci", *store.npm_offline_args()] if offline else [NPM_CMD, "install"]
+        success, out, err = run_command(cmd)
         if not success:
             print(f"{Colors.RED}[ERROR]{Colors.END} Failed to install Node.js dependencies")
             return False
@@ -149,40 +207,11 @@ def check_node_dependencies():
     return True
 
 def check_ollama_configuration():
-    """Check and update Ollama configuration"""
+    """Check the Ollama settings in the runtime settings file"""
     try:
-        if not PACKAGE_JSON.exists():
-            print(f"{Colors.RED}[ERROR]{Colors.END} package.json not found!")
-            return False
-            
-        with open(PACKAGE_JSON, 'r') as f:
-            package_data = json.load(f)
-            
-        # Ensure Ollama settings exist and are correct
-        if 'config' not in package_data:
-            package_data['config'] = {}
-            
-        if 'ollama' not in package_data['config']:
-            package_data['config']['ollama'] = {}
-            
-        # Set defaults according to user rules
-        ollama_config = package_data['config']['ollama']
-        if 'model' not in ollama_config or ollama_config['model'] != 'llama3.2':
-            ollama_config['model'] = 'llama3.2'
-            
-        if 'ip' not in ollama_config:
-            ollama_config['ip'] = '127.0.0.1'
-            
-        if 'port' not in ollama_config:
-            ollama_config['port'] = '11434'
-            
-        if 'style' not in ollama_config:
-            ollama_config['style'] = 'default'
-            
-        # Write back any changes
-        with open(PACKAGE_JSON, 'w') as f:
-            json.dump(package_data, f, indent=2)
-            
+        ollama_config, written = ensure_ollama_settings(RUNTIME_SETTINGS, PACKAGE_JSON)
+        if written:
+            print(f"{Colors.GREEN}[+]{Colors.END} Updated {RUNTIME_SETTINGS.name}")
         print(f"{Colors.GREEN}[+]{Colors.END} Ollama configuration verified: using {ollama_config['model']} model")
         return True
     except Exception as e:
@@ -218,13 +247,113 @@ def check_limiter_components():
         print(f"{Colors.RED}[ERROR]{Colors.END} Failed to check resource limiter components: {str(e)}")
         return False
 
+def check_plugin_index():
+    """Validate plugin manifests and rebuild the index the browser starts from"""
+    try:
+        index = build_plugin_index(PLUGINS_DIR, PLUGIN_INDEX)
+        for error in index["errors"]:
+            print(f"{Colors.YELLOW}[WARN]{Colors.END} Plugin {error['directory']} skipped: {error['error']}")
+        print(f"{Colors.GREEN}[+]{Colors.END} Plugin index built: {len(index['plugins'])} plugin(s)")
+        return True
+    except Exception as e:
+        print(f"{Colors.RED}[ERROR]{Colors.END} Failed to build plugin index: {str(e)}")
+        return False
+
+def install_limiter_dependencies(store=None, offline=False):
+    """Install the npm packages required by the resource limiters"""
+    print(f"{Colors.YELLOW}[WARN]{Colors.END} Some resource limiter components may be missing")
+    print(f"{Colors.YELLOW}[ACTION]{Colors.END} Installing missing resource limiter dependencies...")
+    npm_args = (store or ProvisionStore()).npm_offline_args() if offline else []
+    success, out, err = run_command([NPM_CMD, "install", *npm_args, "pidusage", "throttle", "http-proxy"])
+    if not success:
+        print(f"{Colors.RED}[ERROR]{Colors.END} Failed to install resource limiter dependencies")
+    return success
+
+def sidecar_python():
+    """Interpreter for sidecars: the venv (which has psutil) if it exists"""
+    return VENV_PYTHON if Path(VENV_PYTHON).exists() else sys.executable
+
+def start_sampler(env):
+    """Start the psutil sampler sidecar and export its port to the browser env"""
+    token = secrets.token_hex(16)
+    sampler_env = os.environ.copy()
+    sampler_env[SAMPLER_TOKEN_ENV] = token
+    sampler = spawn_sidecar("Resource sampler", "launcher.sampler", python=sidecar_python(), env=sampler_env)
+    if sampler is not None:
+        env[SAMPLER_PORT_ENV] = str(sampler.port)
+        env[SAMPLER_TOKEN_ENV] = token
+    return sampler
+
+def start_recorder(env):
+    """Start the telemetry recorder sidecar and export its port to the browser env"""
+    token = secrets.token_hex(16)
+    recorder_env = os.environ.copy()
+    recorder_env[RECORDER_TOKEN_ENV] = token
+    recorder = spawn_sidecar("Telemetry recorder", "launcher.recorder",
+                             args=["--dir", TELEMETRY_DIR, "serve"], python=sidecar_python(), env=recorder_env)
+    if recorder is not None:
+        env[RECORDER_PORT_ENV] = str(recorder.port)
+        env[RECORDER_TOKEN_ENV] = token
+    return recorder
+
+def start_ollama_gateway(env):
+    """Start the Ollama gateway sidecar and export its port to the browser env"""
+    token = secrets.token_hex(16)
+    gateway_env = os.environ.copy()
+    gateway_env[OLLAMA_TOKEN_ENV] = token
+    gateway = spawn_sidecar("Ollama gateway", "launcher.ollama_gateway",
+                            args=["--settings", RUNTIME_SETTINGS], python=sidecar_python(), env=gateway_env)
+    if gateway is not None:
+        env[OLLAMA_PORT_ENV] = str(gateway.port)
+        env[OLLAMA_TOKEN_ENV] = token
+    return gateway
+
+def setup_cgroup(profile_name, name="internet-server", parent=None):
+    """Create the browser cgroup and apply a limiter profile's CPU and memory limits"""
+    if not IS_LINUX:
+        print(f"{Colors.YELLOW}[WARN]{Colors.END} cgroup enforcement is only available on Linux")
+        return None
+    
+    cgroup = CgroupController(name=name, parent=parent)
+    if not cgroup.available() or not cgroup.setup() or not cgroup.apply_profile(LIMITER_PROFILES[profile_name]):
+        print(f"{Colors.YELLOW}[WARN]{Colors.END} cgroup enforcement unavailable: {cgroup.error}")
+        return None
+    
+    print(f"{Colors.GREEN}[+]{Colors.END} cgroup enforcement enabled ({profile_name}): {cgroup.path}")
+    return cgroup
+
+def enable_proxy_cache(env, directory, size_mb):
+    """Point the throttling proxy at a shared on-disk HTTP cache"""
+    directory.mkdir(parents=True, exist_ok=True)
+    env[PROXY_CACHE_DIR_ENV] = str(directory)
+    env[PROXY_CACHE_MB_ENV] = str(size_mb)
+    print(f"{Colors.BLUE}[INFO]{Colors.END} Proxy cache: {directory} ({size_mb} MB)")
+
 # ███████████████████████████████████████████████████████████████
 # █ MAIN EXECUTION FUNCTIONS                                    █
 # █ Core functionality for launching the application            █
 # ███████████████████████████████████████████████████████████████
 
-def start_browser(dev_mode=False):
+def wait_for_browser(process, timeout=30.0):
+    """Stay attached until the browser exits; Ctrl+C asks it to quit (so profiles get written)"""
+    try:
+        return process.wait()
+    except KeyboardInterrupt:
+        print(f"{Colors.BLUE}[INFO]{Colors.END} Stopping the browser...")
+    try:
+        if IS_WINDOWS:
+            process.terminate()
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+        return process.wait(timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired):
+        process.kill()
+        return process.wait()
+
+def start_browser(dev_mode=False, ready_timeout=DEFAULT_READY_TIMEOUT, cgroup=None, telemetry=True, ollama=True,
+                  proxy_cache_mb=0, attach=False, limiter_profile=None):
     """Start the Electron browser application"""
+    listener = None
     try:
         # Command to run the browser
         cmd = [NPM_CMD, "run", "dev" if dev_mode else "start"]
@@ -236,41 +365,213 @@ def start_browser(dev_mode=False):
         print(f"{Colors.GREEN}[+]{Colors.END} Starting Internet Server Browser - Alpha Version")
         print(f"{Colors.BLUE}[INFO]{Colors.END} Mode: {'Development' if dev_mode else 'Normal'}")
         print(f"{Colors.BLUE}[INFO]{Colors.END} Platform: {platform.system()} {platform.release()}")
-        print(f"{Colors.BLUE}[INFO]{Colors.END} Resource limiters: Enabled")
+        print(f"{Colors.BLUE}[INFO]{Colors.END} Resource limiters: Enabled{' (cgroup v2)' if cgroup else ''}")
         print(f"{Colors.CYAN}[RUN]{Colors.END} {' '.join(cmd)}")
         
         # Notify user about alpha version
         print(f"{Colors.YELLOW}\n[ALPHA TEST VERSION]{Colors.END} Please report any issues or feedback")
         print(f"{Colors.YELLOW}[INFO]{Colors.END} Use the limiter settings panel to manage system resources\n")
-        time.sleep(1)  # Short pause for user to read the message
         
         # Execute in a subprocess so that it doesn't block Python
         env = os.environ.copy()
         if dev_mode:
             env["DEBUG"] = "1"
+        
+        # Pin the limiters to the profile the cgroup enforces, so their
+        # cgroup mirror writes the same limits instead of the config defaults
+        if limiter_profile:
+            env[PROFILE_ENV] = limiter_profile
+        
+        # Limiters read tree-wide samples from this sidecar instead of forking
+        sampler = start_sampler(env)
+        
+        # Limiter status history is kept on disk for after-the-fact analysis
+        recorder = start_recorder(env) if telemetry else None
+        
+        # One pooled, caching connection to Ollama for every tab
+        gateway = start_ollama_gateway(env) if ollama else None
+        
+        # Plain HTTP responses through the throttling proxy are cached on disk
+        if proxy_cache_mb:
+            enable_proxy_cache(env, PROXY_CACHE_DIR, proxy_cache_mb)
+        
+        # The main process reports back on this socket once it is ready
+        listener = ReadinessListener()
+        env.update(listener.env())
+        
+        # The LimiterManager reads pressure and rewrites limits through this path
+        if cgroup is not None:
+            env[CGROUP_ENV] = str(cgroup.path)
+        
+        # The browser runs under the log relay, which outlives this launcher
+        cmd = logged_command(cmd, "browser", PROCESS_LOG_DIR)
+        
+        spawn_start = time.perf_counter()
             
         if IS_WINDOWS:
             # Use subprocess.Popen for Windows
             process = subprocess.Popen(cmd, cwd=BASE_DIR, env=env)
         else:
-            # For Linux, start in a separate process group
-            process = subprocess.Popen(cmd, cwd=BASE_DIR, env=env, preexec_fn=os.setsid)
+            # For Linux, start in a separate process group, joining the
+            # cgroup before exec so every renderer and GPU child is born in it
+            def enter_session():
+                os.setsid()
+                if cgroup is not None:
+                    cgroup.attach()
             
+            process = subprocess.Popen(cmd, cwd=BASE_DIR, env=env, preexec_fn=enter_session)
+            
+        spawn_ms = (time.perf_counter() - spawn_start) * 1000
         print(f"{Colors.GREEN}[+]{Colors.END} Browser started with PID: {process.pid}")
         
-        # Wait a moment to ensure the process starts
-        time.sleep(2)
+        # Wait for the window and the limiter manager to report ready
+        ready = listener.wait(process, timeout=ready_timeout)
         
-        # Check if the process is still running
-        if process.poll() is None:
-            print(f"{Colors.GREEN}[+]{Colors.END} Internet Server Browser is running")
+        if ready is not None:
+            ready_ms = (time.perf_counter() - spawn_start) * 1000
+            ready.close()
+            print(f"{Colors.GREEN}[+]{Colors.END} Internet Server Browser is ready")
+            print(f"{Colors.BLUE}[TIME]{Colors.END} Time-to-spawn {spawn_ms:.1f} ms, time-to-ready {ready_ms:.1f} ms")
+            log_startup_time(STARTUP_LOG, {
+                "launcher": "run_browser",
+                "mode": "dev" if dev_mode else "normal",
+                "spawn_ms": round(spawn_ms, 1),
+                "ready_ms": round(ready_ms, 1),
+                "browser_pid": process.pid,
+                "browser": ready.message.get("timings", {}),
+                "cgroup": str(cgroup.path) if cgroup else None,
+            })
+            
+            # A profiled session ends when the browser exits, and the sidecars with it
+            if attach:
+                print(f"{Colors.BLUE}[INFO]{Colors.END} Profiling until the browser exits (Ctrl+C to stop it)")
+                wait_for_browser(process)
+                for sidecar in (sampler, recorder, gateway):
+                    if sidecar is not None:
+                        sidecar.stop()
             return True
-        else:
+        
+        if process.poll() is not None:
             print(f"{Colors.RED}[ERROR]{Colors.END} Browser process terminated unexpectedly with code: {process.returncode}")
+            for sidecar in (sampler, recorder, gateway):
+                if sidecar is not None:
+                    sidecar.stop()
             return False
+        
+        print(f"{Colors.YELLOW}[WARN]{Colors.END} Browser did not report ready within {ready_timeout:.0f}s, leaving it running")
+        log_startup_time(STARTUP_LOG, {
+            "launcher": "run_browser",
+            "mode": "dev" if dev_mode else "normal",
+            "spawn_ms": round(spawn_ms, 1),
+            "ready_ms": None,
+            "browser_pid": process.pid,
+            "timeout_s": ready_timeout,
+        })
+        return True
     except Exception as e:
         print(f"{Colors.RED}[ERROR]{Colors.END} Failed to start browser: {str(e)}")
         return False
+    finally:
+        if listener is not None:
+            listener.close()
+
+def start_fleet(count, profiles, proxy_base_port, stats_interval, use_cgroups=False, dev_mode=False, telemetry=True,
+                ollama=True, proxy_cache_mb=0):
+    """Start and supervise several browser instances until interrupted"""
+    cmd = [NPM_CMD, "run", "dev" if dev_mode else "start"]
+    env = os.environ.copy()
+    env['BROWSER_DEV_MODE'] = '1' if dev_mode else '0'
+    
+    print(f"{Colors.GREEN}[+]{Colors.END} Starting a fleet of {count} browser instances")
+    print(f"{Colors.CYAN}[RUN]{Colors.END} {' '.join(cmd)} x {count}")
+    
+    # One sampler serves every instance (it accepts one client per browser)
+    sampler = start_sampler(env)
+    recorder = start_recorder(env) if telemetry else None
+    gateway = start_ollama_gateway(env) if ollama else None
+    
+    # Every instance's proxy shares one cache, so a page fetched once serves all
+    if proxy_cache_mb:
+        enable_proxy_cache(env, FLEET_DIR / "proxy-cache", proxy_cache_mb)
+    
+    placement = cpu_sets(count) if IS_LINUX else [None] * count
+    
+    # The first setup() moves the launcher into a "launcher" leaf, so the
+    # parent is resolved once and every instance's cgroup is a sibling
+    cgroup_parent = (own_cgroup() or "") if use_cgroups and IS_LINUX else None
+    
+    instances = []
+    for index in range(count):
+        profile = profiles[index % len(profiles)]
+        cgroup = setup_cgroup(profile, name=f"internet-server-{index}", parent=cgroup_parent) if use_cgroups else None
+        instances.append(FleetInstance(
+            index,
+            FLEET_DIR / f"instance-{index}",
+            proxy_base_port + index,
+            profile,
+            cpus=placement[index],
+            cgroup=cgroup,
+            log_dir=PROCESS_LOG_DIR
+        ))
+    
+    fleet = Fleet(cmd, BASE_DIR, instances, base_env=env, stats_interval=stats_interval)
+    try:
+        return fleet.run()
+    finally:
+        for sidecar in (sampler, recorder, gateway):
+            if sidecar is not None:
+                sidecar.stop()
+        print(f"{Colors.GREEN}[+]{Colors.END} Fleet stopped")
+
+def start_daemon(min_size, max_size, memory_reserve_mb, proxy_base_port, profile, dev_mode=False, telemetry=True,
+                 ollama=True, proxy_cache_mb=0):
+    """Keep a pool of hidden, ready browsers and hand them out on claim until interrupted"""
+    cmd = [NPM_CMD, "run", "dev" if dev_mode else "start"]
+    env = os.environ.copy()
+    env['BROWSER_DEV_MODE'] = '1' if dev_mode else '0'
+    
+    print(f"{Colors.GREEN}[+]{Colors.END} Starting the standby pool daemon ({min_size}-{max_size} browsers, profile {profile})")
+    print(f"{Colors.CYAN}[RUN]{Colors.END} {' '.join(cmd)} (hidden, per standby)")
+    
+    # Sidecars are shared by every standby and outlive the claims
+    sampler = start_sampler(env)
+    recorder = start_recorder(env) if telemetry else None
+    gateway = start_ollama_gateway(env) if ollama else None
+    if proxy_cache_mb:
+        enable_proxy_cache(env, DAEMON_DIR / "proxy-cache", proxy_cache_mb)
+    
+    pool = StandbyPool(cmd, BASE_DIR, DAEMON_DIR, base_env=env, proxy_base_port=proxy_base_port, profile=profile,
+                       min_size=min_size, max_size=max_size, memory_reserve_mb=memory_reserve_mb,
+                       log_dir=PROCESS_LOG_DIR)
+    try:
+        return pool.run()
+    finally:
+        for sidecar in (sampler, recorder, gateway):
+            if sidecar is not None:
+                sidecar.stop()
+        print(f"{Colors.GREEN}[+]{Colors.END} Standby pool daemon stopped")
+
+def claim_browser(wait):
+    """Show a standby browser from the running daemon; False if none could be claimed"""
+    start = time.perf_counter()
+    reply = claim_standby(DAEMON_DIR / DAEMON_STATE_NAME, wait=wait)
+    claim_ms = (time.perf_counter() - start) * 1000
+    if reply is None:
+        print(f"{Colors.BLUE}[INFO]{Colors.END} No standby pool daemon running, starting a browser")
+        return False
+    if not reply.get("ok"):
+        print(f"{Colors.YELLOW}[WARN]{Colors.END} Standby claim failed ({reply.get('error')}), starting a browser")
+        return False
+    print(f"{Colors.GREEN}[+]{Colors.END} Claimed standby browser (PID {reply['pid']}) in {claim_ms:.1f} ms")
+    log_startup_time(STARTUP_LOG, {
+        "launcher": "run_browser",
+        "mode": "claim",
+        "ready_ms": round(claim_ms, 1),
+        "browser_pid": reply["pid"],
+        "daemon_claim_ms": reply.get("claim_ms"),
+        "show_ms": reply.get("show_ms"),
+    })
+    return True
 
 def main():
     """Main entry point for the launcher"""
@@ -279,10 +580,77 @@ def main():
     parser.add_argument("--dev", action="store_true", help="Start in development mode with DevTools")
     parser.add_argument("--reset", action="store_true", help="Reset virtual environment and reinstall dependencies")
     parser.add_argument("--build", choices=['win', 'linux'], help="Build packages for specified platform")
+    parser.add_argument("--full-check", action="store_true", help="Ignore the launch manifest and run every dependency check")
+    parser.add_argument("--build-store", action="store_true",
+                        help="Build the offline dependency store (wheels, npm cache, linkable trees) and exit")
+    parser.add_argument("--store", help="Dependency store directory (default .provision-store)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Install dependencies from the dependency store only, never from the network")
+    parser.add_argument("--ready-timeout", type=float, default=DEFAULT_READY_TIMEOUT,
+                        help="Seconds to wait for the browser to report ready")
+    parser.add_argument("--cgroup", action="store_true",
+                        help="Enforce CPU and memory limits on the whole browser tree with cgroup v2 (Linux)")
+    parser.add_argument("--cgroup-profile", choices=sorted(LIMITER_PROFILES),
+                        help="Limiter profile to enforce with --cgroup (default: --limiter-profile, else balanced)")
+    parser.add_argument("--limiter-profile", choices=sorted(LIMITER_PROFILES),
+                        help="Limiter profile to apply (written to runtime-settings.json, applied live)")
+    parser.add_argument("--no-telemetry", action="store_true",
+                        help="Do not record limiter telemetry to logs/telemetry")
+    parser.add_argument("--no-ollama-gateway", action="store_true",
+                        help="Do not start the Ollama gateway sidecar")
+    parser.add_argument("--proxy-cache", action="store_true",
+                        help="Cache plain HTTP responses in the throttling proxy (shared by fleet instances)")
+    parser.add_argument("--proxy-cache-mb", type=int, default=256,
+                        help="Disk budget of the proxy cache in MB")
+    parser.add_argument("--domain-rules", metavar="FILE",
+                        help="JSON per-host proxy rules (exclude, kbps, priority, latency); edits apply live")
+    parser.add_argument("--instances", type=int, default=1,
+                        help="Supervise this many browser instances (fleet mode)")
+    parser.add_argument("--instance-profiles", default="balanced",
+                        help="Comma separated limiter profiles assigned round-robin to fleet instances")
+    parser.add_argument("--proxy-base-port", type=int, default=9000,
+                        help="Throttling proxy port of the first fleet instance")
+    parser.add_argument("--stats-interval", type=float, default=10.0,
+                        help="Seconds between fleet stats reports")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep a pool of pre-started hidden browsers for --claim (uses --proxy-base-port)")
+    parser.add_argument("--pool-min", type=int, default=MIN_STANDBY,
+                        help="Standby browsers the daemon always keeps ready")
+    parser.add_argument("--pool-max", type=int, default=MAX_STANDBY,
+                        help="Most standby browsers the daemon keeps when claims are frequent")
+    parser.add_argument("--pool-memory-reserve-mb", type=int, default=MEMORY_RESERVE_MB,
+                        help="Memory the daemon leaves free; standbys are only added above it")
+    parser.add_argument("--claim", action="store_true",
+                        help="Show a browser from the standby pool daemon, starting one normally if none is available")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the launcher, sidecars and every browser process until the browser exits, "
+                             "then rank hot functions (logs/profiles/<run>/)")
     args = parser.parse_args()
     
+    # --cgroup pins the browser to one profile, so the two flags must agree
+    if args.cgroup_profile and args.limiter_profile and args.cgroup_profile != args.limiter_profile:
+        print(f"{Colors.RED}[ERROR]{Colors.END} --cgroup-profile {args.cgroup_profile} conflicts with "
+              f"--limiter-profile {args.limiter_profile}; pass one of them")
+        return 1
+    cgroup_profile = args.cgroup_profile or args.limiter_profile or "balanced"
+    
+    # A claim skips the banner and preflight: the daemon already did both
+    if args.claim and claim_browser(args.ready_timeout):
+        return 0
+    
     print_banner()
     
+    # Profile everything from here on: this process, its sidecars and the browser,
+    # and summarise the run directory however the launcher exits
+    if args.profile:
+        session = ProfileSession(PROFILE_DIR, "run_browser")
+        session.start()
+        os.environ.update(session.env())
+        atexit.register(session.finish)
+    
+    # Load the launch manifest recording the inputs of the last passing checks
+    manifest = LaunchManifest(MANIFEST_PATH)
+    
     # Reset if requested
     if args.reset:
         print(f"{Colors.YELLOW}[WARN]{Colors.END} Resetting environment as requested...")
@@ -291,28 +659,87 @@ def main():
         if NODE_MODULES.exists():
             shutil.rmtree(NODE_MODULES)
     
-    # Check and setup virtual environment
-    if not setup_virtual_environment():
-        print(f"{Colors.RED}[FATAL]{Colors.END} Failed to setup Python virtual environment")
-        return 1
+    if args.reset or args.full_check:
+        manifest.clear()
+    
+    # New venvs and node_modules trees are linked from this store when it has them
+    store = ProvisionStore(args.store)
+    if args.build_store:
+        print(f"{Colors.GREEN}[+]{Colors.END} Building dependency store at {store.root}...")
+        def run(cmd, cwd=None):
+            return run_command(cmd, cwd=cwd)[0]
+        if not (store.build_python(run) and store.build_node(run, BASE_DIR)):
+            print(f"{Colors.RED}[ERROR]{Colors.END} Dependency store build failed")
+            return 1
+        print(f"{Colors.GREEN}[+]{Colors.END} Dependency store ready ({store.status(BASE_DIR)['size_mb']} MB)")
+        return 0
+    
+    # Only checks whose inputs changed since the last launch have to run
+    current = launch_fingerprints(BASE_DIR, VENV_PYTHON)
+    stale = manifest.stale_checks(current)
+    
+    if not stale:
+        print(f"{Colors.GREEN}[+]{Colors.END} Warm launch: launch manifest unchanged, skipping dependency checks")
     
-    # Check Node.js dependencies
-    if not check_node_dependencies():
-        print(f"{Colors.RED}[FATAL]{Colors.END} Failed to install Node.js dependencies")
+    # Build the preflight graph: venv, npm, the limiter file check and the
+    # Ollama settings are independent; the limiter package install waits
+    # for npm so they never race on node_modules or package.json
+    preflight = Preflight()
+    if "venv" in stale:
+        preflight.add("venv", lambda: setup_virtual_environment(store, args.offline), fatal=True,
+                      label="Python virtual environment")
+    if "node" in stale:
+        preflight.add("node", lambda: check_node_dependencies(store, args.offline), fatal=True,
+                      label="Node.js dependencies")
+    if "limiters" in stale:
+        preflight.add("limiters", check_limiter_components, label="Limiter components")
+        preflight.add("limiter-deps", lambda: install_limiter_dependencies(store, args.offline),
+                      depends_on=["node", "limiters"],
+                      when=lambda results: not results["limiters"].ok, label="Limiter dependencies")
+    if "ollama" in stale:
+        preflight.add("ollama", check_ollama_configuration, label="Ollama configuration")
+    if "plugins" in stale:
+        preflight.add("plugins", check_plugin_index, label="Plugin index")
+    
+    preflight_ok = preflight.run()
+    preflight.report()
+    results = {name: preflight.results[name].ok for name in current if name in preflight.results}
+    
+    # Record the inputs the checks ran against (after any side effects),
+    # even on abort so finished checks are not repeated next time
+    if results:
+        fingerprints = launch_fingerprints(BASE_DIR, VENV_PYTHON)
+        for name, ok in results.items():
+            manifest.record(name, fingerprints[name], ok)
+        manifest.save()
+    
+    if not preflight_ok:
+        if preflight.aborted_by == "venv":
+            print(f"{Colors.RED}[FATAL]{Colors.END} Failed to setup Python virtual environment")
+        elif preflight.aborted_by == "node":
+            print(f"{Colors.RED}[FATAL]{Colors.END} Failed to install Node.js dependencies")
+        else:
+            print(f"{Colors.RED}[FATAL]{Colors.END} Preflight aborted by {preflight.aborted_by}")
         return 1
     
-    # Check Ollama configuration
-    if not check_ollama_configuration():
+    if not results.get("ollama", True):
         print(f"{Colors.YELLOW}[WARN]{Colors.END} Ollama configuration issues detected")
     
-    # Verify resource limiter components
-    if not check_limiter_components():
-        print(f"{Colors.YELLOW}[WARN]{Colors.END} Some resource limiter components may be missing")
-        print(f"{Colors.YELLOW}[ACTION]{Colors.END} Installing missing resource limiter dependencies...")
-        # Install necessary packages for resource limiters
-        success, out, err = run_command([NPM_CMD, "install", "pidusage", "throttle", "http-proxy"])
-        if not success:
-            print(f"{Colors.RED}[ERROR]{Colors.END} Failed to install resource limiter dependencies")
+    print(f"{Colors.BLUE}[INFO]{Colors.END} Preflight completed in {preflight.elapsed_ms:.1f} ms ({len(results)} of {len(current)} checks run)")
+    
+    # A running browser picks this up live through its settings watcher
+    if args.limiter_profile:
+        _, written = RuntimeSettings(RUNTIME_SETTINGS).apply(changes={"limiter": {"profile": args.limiter_profile}})
+        state = "applied" if written else "unchanged"
+        print(f"{Colors.BLUE}[INFO]{Colors.END} Limiter profile {args.limiter_profile} ({state})")
+    
+    # Every browser started below inherits the rules file
+    if args.domain_rules:
+        rules_path = Path(args.domain_rules).resolve()
+        if not rules_path.is_file():
+            print(f"{Colors.RED}[ERROR]{Colors.END} Domain rules file not found: {rules_path}")
+            return 1
+        os.environ[DOMAIN_RULES_ENV] = str(rules_path)
     
     # Build packages if requested
     if args.build:
@@ -324,8 +751,33 @@ def main():
         print(f"{Colors.GREEN}[+]{Colors.END} Build completed successfully")
         return 0
     
+    # Fleet mode: supervise several instances until interrupted
+    if args.instances > 1:
+        profiles = [p.strip() for p in args.instance_profiles.split(",") if p.strip()]
+        unknown = [p for p in profiles if p not in LIMITER_PROFILES]
+        if unknown or not profiles:
+            print(f"{Colors.RED}[ERROR]{Colors.END} Unknown limiter profile(s): {', '.join(unknown) or '(none)'}")
+            return 1
+        return start_fleet(args.instances, profiles, args.proxy_base_port, args.stats_interval,
+                           use_cgroups=args.cgroup, dev_mode=args.dev, telemetry=not args.no_telemetry,
+                           ollama=not args.no_ollama_gateway,
+                           proxy_cache_mb=args.proxy_cache_mb if args.proxy_cache else 0)
+    
+    # Daemon mode: keep standbys ready until interrupted
+    if args.daemon:
+        return start_daemon(args.pool_min, args.pool_max, args.pool_memory_reserve_mb, args.proxy_base_port,
+                            args.limiter_profile or "balanced", dev_mode=args.dev,
+                            telemetry=not args.no_telemetry, ollama=not args.no_ollama_gateway,
+                            proxy_cache_mb=args.proxy_cache_mb if args.proxy_cache else 0)
+    
+    # Kernel-enforced limits for the whole browser tree, if requested
+    cgroup = setup_cgroup(cgroup_profile) if args.cgroup else None
+    
     # Start the browser
-    start_browser(dev_mode=args.dev)
+    start_browser(dev_mode=args.dev, ready_timeout=args.ready_timeout, cgroup=cgroup,
+                  telemetry=not args.no_telemetry, ollama=not args.no_ollama_gateway,
+                  proxy_cache_mb=args.proxy_cache_mb if args.proxy_cache else 0, attach=args.profile,
+                  limiter_profile=cgroup_profile if cgroup else None)
     
     return 0
 
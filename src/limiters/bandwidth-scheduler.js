@@ -0,0 +1,429 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Bandwidth Scheduler
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Hierarchical token buckets shared by every proxied socket    ║
+ * ║ One global budget per direction, optional tab/domain buckets ║
+ * ║ Deficit round robin across active streams, scaled by weight  ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Throughput stays at the configured rate however many sockets are open
+ * - [+] Per-tab and per-domain sub-budgets under the global one
+ * - [+] Byte-granular weighted fair sharing (a chunk may be split)
+ * - [+] Per-bucket queue depth and wait time counters
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const { Transform } = require('stream');
+
+// Bytes a stream may send per round, multiplied by its weight
+const QUANTUM_BYTES = 4096;
+
+// Bucket depth: this much of a second's budget may be sent at once
+const BURST_MS = 50;
+const MIN_BURST_BYTES = 4096;
+
+// Smallest send worth waking up for when a bucket is nearly empty
+const MIN_SEND_BYTES = 1024;
+
+// Lowest weight (background priority): a quarter quantum per round
+const MIN_WEIGHT = MIN_SEND_BYTES / QUANTUM_BYTES;
+
+class TokenBucket {
+    constructor(name, bytesPerSecond = 0) {
+        this.name = name;
+        this.tokens = 0;
+        this.lastRefill = Date.now();
+        this.setRate(bytesPerSecond);
+
+        // Counters reported through getStats()
+        this.queueDepth = 0;
+        this.maxQueueDepth = 0;
+        this.sentBytes = 0;
+        this.waits = 0;
+        this.totalWaitMs = 0;
+        this.maxWaitMs = 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Changes the rate (0 = unlimited), keeping earned tokens     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    setRate(bytesPerSecond) {
+        this.refill(Date.now());
+        this.rate = Math.max(0, bytesPerSecond || 0);
+        this.burst = Math.max(MIN_BURST_BYTES, this.rate * BURST_MS / 1000);
+        this.tokens = Math.min(this.tokens, this.burst);
+    }
+
+    refill(now) {
+        if (this.rate > 0 && now > this.lastRefill) {
+            this.tokens = Math.min(this.burst, this.tokens + (now - this.lastRefill) * this.rate / 1000);
+        }
+        this.lastRefill = now;
+    }
+
+    available() {
+        return this.rate > 0 ? Math.floor(this.tokens) : Infinity;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Milliseconds until a worthwhile send is possible            █
+     * ███████████████████████████████████████████████████████████████
+     */
+    msUntil(bytes) {
+        const need = Math.min(bytes, this.burst) - this.tokens;
+        return need > 0 ? Math.ceil(need * 1000 / this.rate) : 0;
+    }
+
+    getStats() {
+        return {
+            name: this.name,
+            rateBytesPerSecond: this.rate,
+            queueDepth: this.queueDepth,
+            maxQueueDepth: this.maxQueueDepth,
+            sentBytes: this.sentBytes,
+            waits: this.waits,
+            avgWaitMs: this.waits ? Math.round(this.totalWaitMs / this.waits) : 0,
+            maxWaitMs: this.maxWaitMs
+        };
+    }
+}
+
+class BandwidthScheduler {
+    constructor(name) {
+        this.name = name;
+        this.global = new TokenBucket(`${name}:global`);
+        this.tabs = new Map();     // tab id -> TokenBucket
+        this.domains = new Map();  // domain pattern -> TokenBucket
+
+        // Streams with a chunk waiting (or just sent), served round robin
+        this.active = [];
+        this.cursor = 0;
+        this.timer = null;
+        this.scheduled = false;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Sets the global rate and the tab/domain sub-budgets         █
+     * █ Rates are bytes per second; 0 or missing = unlimited        █
+     * ███████████████████████████████████████████████████████████████
+     */
+    configure({ rate = 0, tabRates = {}, domainRates = {} } = {}) {
+        this.global.setRate(rate);
+        this._syncBuckets(this.tabs, tabRates, 'tab');
+        this._syncBuckets(this.domains, domainRates, 'domain');
+        this._schedule();
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Creates a pass-through stream metered by this scheduler     █
+     * █ tab/domain select sub-buckets; weight scales the share      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    createStream({ tab = null, domain = null, weight = 1 } = {}) {
+        const scheduler = this;
+        const flow = {
+            tab,
+            domain,
+            weight: Math.max(MIN_WEIGHT, weight),
+            deficit: 0,
+            chunk: null,
+            offset: 0,
+            callback: null,
+            queuedAt: 0,
+            path: null,
+            stream: null
+        };
+
+        flow.stream = new Transform({
+            transform(chunk, encoding, callback) {
+                scheduler._enqueue(flow, chunk, callback);
+            },
+            destroy(err, callback) {
+                scheduler._remove(flow);
+                callback(err);
+            }
+        });
+
+        return flow.stream;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Gets per-bucket queue depth, wait time and byte counters    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getStats() {
+        return {
+            activeStreams: this.active.length,
+            global: this.global.getStats(),
+            tabs: Array.from(this.tabs.values()).map(bucket => bucket.getStats()),
+            domains: Array.from(this.domains.values()).map(bucket => bucket.getStats())
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Stops the timer and releases every waiting stream           █
+     * ███████████████████████████████████████████████████████████████
+     */
+    dispose() {
+        clearTimeout(this.timer);
+        this.timer = null;
+        for (const flow of this.active.slice()) {
+            if (flow.chunk) {
+                flow.stream.destroy();
+            }
+        }
+        this.active = [];
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Creates, updates and drops sub-buckets             █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _syncBuckets(buckets, rates, kind) {
+        for (const [key, rate] of Object.entries(rates)) {
+            if (!buckets.has(key)) {
+                buckets.set(key, new TokenBucket(`${this.name}:${kind}:${key}`, rate));
+            } else {
+                buckets.get(key).setRate(rate);
+            }
+        }
+        // Buckets still on an active path are kept (as unlimited) until it drains
+        for (const [key, bucket] of buckets) {
+            if (!(key in rates)) {
+                bucket.setRate(0);
+                if (!this.active.some(flow => flow.path.includes(bucket))) {
+                    buckets.delete(key);
+                }
+            }
+        }
+    }
+
+    _path(tab, domain) {
+        const path = [this.global];
+        if (tab !== null && this.tabs.has(String(tab))) {
+            path.push(this.tabs.get(String(tab)));
+        }
+        if (domain !== null && this.domains.has(domain)) {
+            path.push(this.domains.get(domain));
+        }
+        return path;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Queues a chunk; its callback releases the next one █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _enqueue(flow, chunk, callback) {
+        flow.path = this._path(flow.tab, flow.domain);
+
+        // Nothing limits this stream right now: pass straight through
+        if (!flow.path.some(bucket => bucket.rate > 0)) {
+            for (const bucket of flow.path) {
+                bucket.sentBytes += chunk.length;
+            }
+            callback(null, chunk);
+            return;
+        }
+
+        flow.chunk = chunk;
+        flow.offset = 0;
+        flow.callback = callback;
+        flow.queuedAt = Date.now();
+        for (const bucket of flow.path) {
+            bucket.queueDepth++;
+            bucket.maxQueueDepth = Math.max(bucket.maxQueueDepth, bucket.queueDepth);
+        }
+        // A stream between chunks is still in the rotation, in its old place
+        if (!this.active.includes(flow)) {
+            this.active.push(flow);
+        }
+        this._schedule();
+    }
+
+    _remove(flow) {
+        const index = this.active.indexOf(flow);
+        if (index === -1) {
+            return;
+        }
+        this.active.splice(index, 1);
+        if (this.cursor > index) {
+            this.cursor--;
+        }
+        this._release(flow);
+    }
+
+    _release(flow) {
+        if (flow.chunk) {
+            for (const bucket of flow.path) {
+                bucket.queueDepth--;
+            }
+        }
+        flow.chunk = null;
+        flow.callback = null;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Drops streams that wrote nothing since their last  █
+     * █ chunk went out; a busy stream's next one is already queued  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _dropIdle() {
+        for (const flow of this.active.filter(flow => !flow.chunk)) {
+            this._remove(flow);
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Runs the scheduler on the next tick (coalesced)    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _schedule() {
+        if (this.scheduled) {
+            return;
+        }
+        this.scheduled = true;
+        clearTimeout(this.timer);
+        this.timer = null;
+        setImmediate(() => {
+            this.scheduled = false;
+            this._run();
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Deficit round robin over the waiting streams       █
+     * █ Each turn earns weight x quantum bytes, sent as the tokens  █
+     * █ in every bucket on the stream's path allow; the turn only   █
+     * █ passes on once they are spent or its own bucket runs dry    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _run() {
+        const now = Date.now();
+        for (const bucket of [this.global, ...this.tabs.values(), ...this.domains.values()]) {
+            bucket.refill(now);
+        }
+        this._dropIdle();
+
+        let progressed = true;
+        let pending = false;
+        while (this.active.length && progressed && !pending) {
+            progressed = false;
+            const round = this.active.length;
+            for (let turn = 0; turn < round && this.active.length; turn++) {
+                // Every path starts at the global bucket: when it is empty the
+                // current stream keeps its turn until the next refill
+                if (this.global.available() <= 0) {
+                    break;
+                }
+                if (this.cursor >= this.active.length) {
+                    this.cursor = 0;
+                }
+                const flow = this.active[this.cursor];
+
+                // It sent a whole chunk this run; the next one is written on the
+                // next tick, and the others must not take its turn meanwhile
+                if (!flow.chunk) {
+                    pending = true;
+                    break;
+                }
+                if (flow.deficit <= 0) {
+                    flow.deficit += flow.weight * QUANTUM_BYTES;
+                }
+                const remaining = flow.chunk.length - flow.offset;
+                const allowance = Math.min(
+                    remaining,
+                    Math.floor(flow.deficit),
+                    ...flow.path.map(bucket => bucket.available())
+                );
+
+                if (allowance <= 0) {
+                    this.cursor++;
+                    continue;
+                }
+
+                for (const bucket of flow.path) {
+                    if (bucket.rate > 0) {
+                        bucket.tokens -= allowance;
+                    }
+                    bucket.sentBytes += allowance;
+                }
+                flow.stream.push(flow.chunk.subarray(flow.offset, flow.offset + allowance));
+                flow.offset += allowance;
+                flow.deficit -= allowance;
+                progressed = true;
+
+                const spent = flow.deficit <= 0;
+                if (flow.offset >= flow.chunk.length) {
+                    this._complete(flow, now);
+                }
+                if (spent) {
+                    this.cursor++;
+                }
+            }
+        }
+
+        if (pending) {
+            this._schedule();
+        } else if (this.active.length) {
+            this.timer = setTimeout(() => {
+                this.timer = null;
+                this._run();
+            }, this._nextWakeMs());
+        }
+    }
+
+    _complete(flow, now) {
+        const waitMs = now - flow.queuedAt;
+        for (const bucket of flow.path) {
+            bucket.waits++;
+            bucket.totalWaitMs += waitMs;
+            bucket.maxWaitMs = Math.max(bucket.maxWaitMs, waitMs);
+        }
+        const callback = flow.callback;
+        this._release(flow);
+        callback();
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Earliest time some waiting stream can send again   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _nextWakeMs() {
+        let wake = Infinity;
+        for (const flow of this.active) {
+            if (!flow.chunk) {
+                continue;
+            }
+            const remaining = flow.chunk.length - flow.offset;
+            let flowWake = 0;
+            for (const bucket of flow.path) {
+                if (bucket.rate > 0) {
+                    flowWake = Math.max(flowWake, bucket.msUntil(Math.min(remaining, MIN_SEND_BYTES)));
+                }
+            }
+            wake = Math.min(wake, flowWake);
+        }
+        return Math.max(1, wake === Infinity ? 1 : wake);
+    }
+}
+
+module.exports = BandwidthScheduler;
@@ -0,0 +1,170 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - cgroup v2 Monitor
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Talks to the cgroup the launcher started the browser in      ║
+ * ║ Kernel-enforced CPU and memory limits for the whole tree     ║
+ * ║ Reports pressure stall information (PSI) to the limiters     ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] cpu.max, memory.high and memory.max from limiter settings
+ * - [+] cpu, memory and io pressure (avg10 / avg60 / avg300)
+ * - [+] Renderer and GPU processes included, no polling to enforce
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+// cpu.max period in microseconds (matches launcher/cgroups.py)
+const CPU_PERIOD_US = 100000;
+
+// memory.high sits this far below memory.max so reclaim starts first
+const MEMORY_HIGH_RATIO = 0.9;
+
+class CgroupMonitor {
+    constructor() {
+        // cgroup directory (from the launcher environment)
+        this.path = process.env.INTERNET_SERVER_CGROUP || '';
+
+        // State
+        this.pressure = null;
+        this.limits = null;
+        this.lastError = null;
+        this.refreshing = false;
+        this.cpuCount = os.cpus().length || 1;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Whether the launcher started us inside a cgroup             █
+     * ███████████████████████████████████████████████████████████████
+     */
+    isAvailable() {
+        return this.path !== '';
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Writes CPU and memory limits to the cgroup                  █
+     * █ null (or a disabled limiter) removes the limit              █
+     * ███████████████████████████████████████████████████████████████
+     */
+    applyLimits(maxCpuPercent, maxMemoryMB) {
+        if (!this.isAvailable()) {
+            return false;
+        }
+
+        const cpuMax = this._cpuMaxValue(maxCpuPercent);
+        let memoryHigh = 'max';
+        let memoryMax = 'max';
+        if (maxMemoryMB) {
+            const limit = Math.floor(maxMemoryMB) * 1024 * 1024;
+            memoryHigh = String(Math.floor(limit * MEMORY_HIGH_RATIO));
+            memoryMax = String(limit);
+        }
+
+        try {
+            fs.writeFileSync(path.join(this.path, 'cpu.max'), cpuMax);
+            fs.writeFileSync(path.join(this.path, 'memory.high'), memoryHigh);
+            fs.writeFileSync(path.join(this.path, 'memory.max'), memoryMax);
+            this.limits = { cpuMax, memoryHigh, memoryMax };
+            this.lastError = null;
+            return true;
+        } catch (err) {
+            this.lastError = err.message;
+            console.error('Failed to write cgroup limits:', err.message);
+            return false;
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Re-reads cpu, memory and io pressure in the background      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    refresh() {
+        if (!this.isAvailable() || this.refreshing) {
+            return;
+        }
+
+        this.refreshing = true;
+        const resources = ['cpu', 'memory', 'io'];
+        Promise.all(resources.map((resource) =>
+            fs.promises.readFile(path.join(this.path, `${resource}.pressure`), 'utf8')
+                .then((text) => this._parsePressure(text))
+                .catch(() => null)
+        )).then((results) => {
+            const pressure = {};
+            resources.forEach((resource, i) => {
+                if (results[i]) {
+                    pressure[resource] = results[i];
+                }
+            });
+            this.pressure = pressure;
+        }).finally(() => {
+            this.refreshing = false;
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Gets cgroup statistics                                      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getStats() {
+        return {
+            available: this.isAvailable(),
+            path: this.path || null,
+            limits: this.limits,
+            pressure: this.pressure,
+            lastError: this.lastError
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: cpu.max line for a share of the whole machine      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _cpuMaxValue(maxCpuPercent) {
+        if (!maxCpuPercent || maxCpuPercent >= 100) {
+            return `max ${CPU_PERIOD_US}`;
+        }
+        const quota = Math.max(1000, Math.floor(CPU_PERIOD_US * this.cpuCount * maxCpuPercent / 100));
+        return `${quota} ${CPU_PERIOD_US}`;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Parses a PSI file into { some: {...}, full: {...} } █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _parsePressure(text) {
+        const pressure = {};
+        for (const line of text.split('\n')) {
+            const parts = line.trim().split(/\s+/);
+            if (!parts[0]) {
+                continue;
+            }
+            const values = {};
+            for (const field of parts.slice(1)) {
+                const [key, value] = field.split('=');
+                const number = Number(value);
+                if (key && !Number.isNaN(number)) {
+                    values[key] = number;
+                }
+            }
+            pressure[parts[0]] = values;
+        }
+        return pressure;
+    }
+}
+
+module.exports = CgroupMonitor;
@@ -16,6 +16,7 @@
  * - [+] Configurable CPU percentage cap
  * - [+] Gradual throttling mechanism
  * - [+] Cross-platform implementation
+ * - [+] Duty-cycle mode: caps renderer/GPU processes, not just priority
  * 
  * Copyright (c) 2025 ZARI CORP
  */
@@ -24,6 +25,7 @@ const os = require('os');
 const { ipcMain } = require('electron');
 const osUtils = require('os-utils');
 const { execSync } = require('child_process');
+const DutyCycleController = require('./duty-cycle-controller');
 
 class CpuLimiter {
     constructor() {
@@ -33,7 +35,8 @@ class CpuLimiter {
             maxCpuPercent: 70, // Default max CPU usage (70%)
             throttleCheckInterval: 1000, // Check interval in ms
             monitorInterval: 2000, // Monitor interval in ms
-            processPriority: 'normal' // Process priority (high, normal, low)
+            processPriority: 'normal', // Process priority (high, normal, low)
+            enforcementMode: 'priority' // 'priority' or 'duty-cycle' (SIGSTOP/SIGCONT, not Windows)
         };
         
         // State
@@ -52,6 +55,15 @@ class CpuLimiter {
         
         // Event callback for renderer
         this.onCpuUpdate = null;
+        
+        // Optional psutil sampler sidecar (see sampler-client.js)
+        this.sampler = null;
+        
+        // Telemetry bus fed once per monitor tick (see telemetry-bus.js)
+        this.telemetryBus = null;
+        
+        // Renderer/GPU duty cycling (enforcementMode 'duty-cycle')
+        this.dutyCycle = null;
     }
     
     /**
@@ -88,6 +100,7 @@ class CpuLimiter {
             this._stopThrottling();
             this._setPriority('normal');
         }
+        this._syncDutyCycle();
         
         console.log(`CPU limiter ${enabled ? 'enabled' : 'disabled'}`);
         return this.settings.enabled;
@@ -126,10 +139,32 @@ class CpuLimiter {
             this._setPriority(this.settings.processPriority);
         }
         
+        // Start, stop or retarget duty cycling
+        this._syncDutyCycle();
+        
         console.log('CPU limiter settings updated:', this.settings);
         return this.settings;
     }
     
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Attaches the launcher's resource sampler                    █
+     * █ Tree-wide samples replace per-tick top/PowerShell forks     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    setSampler(sampler) {
+        this.sampler = sampler;
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Attaches the telemetry bus each monitor tick publishes to   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    setTelemetryBus(bus) {
+        this.telemetryBus = bus;
+    }
+    
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Gets current CPU statistics                                 █
@@ -143,6 +178,8 @@ class CpuLimiter {
             limit: this.settings.maxCpuPercent,
             isThrottling: this.isThrottling,
             enabled: this.settings.enabled,
+            enforcementMode: this.settings.enforcementMode,
+            dutyCycle: this.dutyCycle ? this.dutyCycle.getStats() : null,
             cpuCores: this.numCpuCores,
             history: this.cpuHistory
         };
@@ -158,6 +195,12 @@ class CpuLimiter {
         this._stopMonitoring();
         this._stopThrottling();
         
+        // Continue any renderer stopped mid-cycle
+        if (this.dutyCycle) {
+            this.dutyCycle.stop();
+            this.dutyCycle = null;
+        }
+        
         // Reset process priority
         this._setPriority('normal');
     }
@@ -252,34 +295,48 @@ class CpuLimiter {
      * ███████████████████████████████████████████████████████████████
      */
     _updateCpuUsage() {
+        // Prefer the sampler sidecar: one tree-wide reading, no forks
+        const sample = this.sampler ? this.sampler.getLatest(this.settings.monitorInterval * 3) : null;
+        if (sample) {
+            this.systemCpuPercent = Math.round(sample.sys);
+            this._recordCpuUsage(Math.round(sample.cpu));
+            return;
+        }
+        
         // Get system CPU usage
         osUtils.cpuUsage((systemUsage) => {
             this.systemCpuPercent = Math.round(systemUsage * 100);
             
             // Get own process CPU usage (implementation varies by platform)
             this._getProcessCpuUsage().then(processUsage => {
-                this.currentCpuPercent = processUsage;
-                
-                // Update history (keep last 10 entries)
-                this.cpuHistory.push(processUsage);
-                if (this.cpuHistory.length > 10) {
-                    this.cpuHistory.shift();
-                }
-                
-                // Send update to renderer if window exists
-                if (this.mainWindow && !this.mainWindow.isDestroyed()) {
-                    this.mainWindow.webContents.send('cpu-usage-update', {
-                        process: processUsage,
-                        system: this.systemCpuPercent,
-                        isThrottling: this.isThrottling
-                    });
-                }
+                this._recordCpuUsage(processUsage);
             }).catch(err => {
                 console.error('Error getting process CPU usage:', err);
             });
         });
     }
     
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Records a CPU reading                              █
+     * █ Updates history and publishes the tick's sample             █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _recordCpuUsage(processUsage) {
+        this.currentCpuPercent = processUsage;
+        
+        // Update history (keep last 10 entries)
+        this.cpuHistory.push(processUsage);
+        if (this.cpuHistory.length > 10) {
+            this.cpuHistory.shift();
+        }
+        
+        // One sample per tick; subscribers get the fields that changed
+        if (this.telemetryBus) {
+            this.telemetryBus.publish('cpu', this.getStats());
+        }
+    }
+    
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Private: Gets process CPU usage                             █
@@ -391,6 +448,12 @@ class CpuLimiter {
             return;
         }
         
+        // The duty-cycle controller enforces the limit on its own timers
+        if (this.dutyCycle) {
+            this.isThrottling = this.dutyCycle.duty < 1;
+            return;
+        }
+        
         // Check if current usage exceeds limit
         if (this.currentCpuPercent > this.settings.maxCpuPercent) {
             // Calculate how much we're over the limit
@@ -429,6 +492,40 @@ class CpuLimiter {
         }
     }
     
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Starts, stops or retargets duty cycling            █
+     * █ Falls back to priority throttling where signals are missing █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _syncDutyCycle() {
+        const wanted = this.settings.enabled && this.settings.enforcementMode === 'duty-cycle';
+        
+        if (wanted && !DutyCycleController.isSupported()) {
+            console.error('Duty-cycle CPU limiting is not supported on this platform, using priority only');
+            this.settings.enforcementMode = 'priority';
+            return;
+        }
+        
+        if (!wanted) {
+            if (this.dutyCycle) {
+                this.dutyCycle.stop();
+                this.dutyCycle = null;
+                console.log('CPU duty cycling stopped');
+            }
+            return;
+        }
+        
+        if (!this.dutyCycle) {
+            const { app } = require('electron');
+            this.dutyCycle = new DutyCycleController(() => app.getAppMetrics(), this.settings.maxCpuPercent);
+            this.dutyCycle.start();
+            console.log(`CPU duty cycling renderers at ${this.settings.maxCpuPercent}%`);
+        } else {
+            this.dutyCycle.setTarget(this.settings.maxCpuPercent);
+        }
+    }
+    
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Private: Sets process priority                              █
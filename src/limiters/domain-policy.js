@@ -0,0 +1,435 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Domain Policy
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Per-host rules for the throttling proxy                      ║
+ * ║ Compiled into a reversed-label suffix trie, one step a label ║
+ * ║ however many rules there are; hot hosts skip even that       ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Exclude, per-domain kbps, priority class and latency profile per rule
+ * - [+] Exact ('example.com') and subdomain ('*.example.com') patterns
+ * - [+] Most specific rule wins: exact, then the longest wildcard
+ * - [+] Small LRU of recently seen hosts in front of the trie
+ * - [+] Rules file reloaded on change, without restarting the proxy
+ * - [+] Per-rule hit counters (kept across reloads)
+ *
+ * A rule:
+ *   { "pattern": "*.steamcontent.com", "exclude": false,
+ *     "downloadKbps": 20000, "uploadKbps": 0, "priority": "low",
+ *     "latencyProfile": "3g" }
+ * latencyProfile names a network profile, or is an object
+ * { latencyMs, jitterMs, packetLossRate }. A rules file holds an array
+ * of rules, or { "rules": [...] }.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const fs = require('fs');
+const path = require('path');
+
+// Recently looked-up hosts kept in front of the trie
+const HOT_HOSTS = 512;
+
+// Scheduler share per priority class (the default weight is 1)
+const PRIORITY_WEIGHTS = {
+    realtime: 8,
+    high: 4,
+    normal: 1,
+    low: 0.5,
+    background: 0.25
+};
+
+// Editors save in bursts (truncate, write, rename); reload once it settles
+const RELOAD_DEBOUNCE_MS = 200;
+
+// getStats() lists this many of the most-hit rules
+const REPORTED_RULES = 50;
+
+class DomainPolicy {
+    constructor(latencyProfiles = {}) {
+        // Named conditions a rule's latencyProfile may refer to
+        this.latencyProfiles = latencyProfiles;
+
+        // Compiled index, swapped whole on every change
+        this.root = newNode();
+        this.rules = [];
+        this.hot = new Map(); // hostname -> rule or null, oldest first
+
+        // Sources: inline rules plus an optional rules file
+        this.inlineRules = [];
+        this.file = null;
+        this.fileRules = [];
+        this.watcher = null;
+        this.reloadTimer = null;
+
+        // Called after the rules file changed and was recompiled
+        this.onReload = null;
+
+        this.stats = {
+            lookups: 0,
+            hotHits: 0,
+            matched: 0,
+            reloads: 0,
+            lastReloadAt: null,
+            lastError: null
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Sets the inline rules and the rules file, and recompiles    █
+     * █ A rule that does not compile keeps the previous rule set    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    configure({ rules = [], file = null } = {}) {
+        this.inlineRules = rules;
+        this.stats.lastError = null;
+
+        if (file !== this.file) {
+            this._unwatch();
+            this.file = file;
+            this.fileRules = (file && this._readFile(file)) || [];
+            if (file) {
+                this._watch(file);
+            }
+        }
+
+        this._compile();
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Most specific rule for a hostname, or null                  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    lookup(hostname) {
+        if (!hostname || this.rules.length === 0) {
+            return null;
+        }
+        this.stats.lookups++;
+
+        let rule;
+        if (this.hot.has(hostname)) {
+            // Re-inserting keeps the map in least recently used order
+            rule = this.hot.get(hostname);
+            this.hot.delete(hostname);
+            this.stats.hotHits++;
+        } else {
+            rule = this._walk(normalize(hostname));
+            if (this.hot.size >= HOT_HOSTS) {
+                this.hot.delete(this.hot.keys().next().value);
+            }
+        }
+        this.hot.set(hostname, rule);
+
+        if (rule) {
+            rule.hits++;
+            this.stats.matched++;
+        }
+        return rule;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Per-rule byte rates for a scheduler direction               █
+     * █ Keyed by pattern, the flow's domain bucket                  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    domainRates(direction) {
+        const key = direction === 'download' ? 'downloadKbps' : 'uploadKbps';
+        const rates = {};
+        for (const rule of this.rules) {
+            if (rule[key] > 0) {
+                rates[rule.pattern] = rule[key] * 1024 / 8;
+            }
+        }
+        return rates;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Hit counters of every rule, by pattern                      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getRuleHits() {
+        return Object.fromEntries(this.rules.map(rule => [rule.pattern, rule.hits]));
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Lookup counters and the most-hit rules                      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getStats() {
+        const hit = this.rules.filter(rule => rule.hits > 0);
+        hit.sort((a, b) => b.hits - a.hits);
+
+        return {
+            ...this.stats,
+            rules: this.rules.length,
+            rulesHit: hit.length,
+            hotHosts: this.hot.size,
+            file: this.file,
+            topRules: hit.slice(0, REPORTED_RULES).map(rule => ({
+                pattern: rule.pattern,
+                hits: rule.hits,
+                exclude: rule.exclude,
+                downloadKbps: rule.downloadKbps,
+                uploadKbps: rule.uploadKbps,
+                priority: rule.priority
+            }))
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Stops watching the rules file                               █
+     * ███████████████████████████████████████████████████████████████
+     */
+    dispose() {
+        this._unwatch();
+        this.onReload = null;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Builds a new trie from every source and swaps it   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _compile() {
+        let rules;
+        try {
+            rules = this._merge(this.inlineRules.concat(this.fileRules));
+        } catch (err) {
+            this.stats.lastError = err.message;
+            console.error('❌ Domain rules not applied:', err.message);
+            return false;
+        }
+
+        const root = newNode();
+        for (const rule of rules) {
+            const wildcard = rule.pattern.startsWith('*.');
+            const labels = (wildcard ? rule.pattern.slice(2) : rule.pattern).split('.').reverse();
+
+            let node = root;
+            for (const label of labels) {
+                if (!node.children.has(label)) {
+                    node.children.set(label, newNode());
+                }
+                node = node.children.get(label);
+            }
+            if (wildcard) {
+                node.wildcard = rule;
+            } else {
+                node.exact = rule;
+            }
+        }
+
+        // Counters survive a reload for rules that are still there
+        const previous = new Map(this.rules.map(rule => [rule.pattern, rule.hits]));
+        for (const rule of rules) {
+            rule.hits = previous.get(rule.pattern) || 0;
+        }
+
+        this.root = root;
+        this.rules = rules;
+        this.hot = new Map();
+        return true;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Validates rules; later ones add to earlier fields  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _merge(sources) {
+        const byPattern = new Map();
+
+        sources.forEach((source, index) => {
+            if (!source || typeof source.pattern !== 'string' || !source.pattern.trim()) {
+                throw new Error(`rule ${index} has no pattern`);
+            }
+            const pattern = normalize(source.pattern);
+            if (pattern.slice(pattern.startsWith('*.') ? 2 : 0).includes('*')) {
+                throw new Error(`rule ${index}: only a leading "*." wildcard is supported (${source.pattern})`);
+            }
+            if (source.priority !== undefined && !(source.priority in PRIORITY_WEIGHTS)) {
+                throw new Error(`rule ${index}: unknown priority "${source.priority}"`);
+            }
+
+            const rule = byPattern.get(pattern) || {
+                pattern,
+                exclude: false,
+                downloadKbps: 0,
+                uploadKbps: 0,
+                priority: 'normal',
+                weight: 1,
+                conditions: null,
+                hits: 0
+            };
+
+            if (source.exclude !== undefined) rule.exclude = Boolean(source.exclude);
+            if (source.kbps !== undefined) rule.downloadKbps = rule.uploadKbps = Number(source.kbps) || 0;
+            if (source.downloadKbps !== undefined) rule.downloadKbps = Number(source.downloadKbps) || 0;
+            if (source.uploadKbps !== undefined) rule.uploadKbps = Number(source.uploadKbps) || 0;
+            if (source.priority !== undefined) {
+                rule.priority = source.priority;
+                rule.weight = PRIORITY_WEIGHTS[source.priority];
+            }
+            if (source.weight !== undefined) rule.weight = Number(source.weight) || 1;
+            if (source.latencyProfile !== undefined) {
+                rule.conditions = this._conditions(source.latencyProfile, index);
+            }
+
+            byPattern.set(pattern, rule);
+        });
+
+        return Array.from(byPattern.values());
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Emulator conditions for a rule's latency profile   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _conditions(profile, index) {
+        if (profile === null) {
+            return null;
+        }
+
+        const settings = typeof profile === 'string' ? this.latencyProfiles[profile] : profile;
+        if (!settings || typeof settings !== 'object') {
+            throw new Error(`rule ${index}: unknown latency profile "${profile}"`);
+        }
+
+        const latencyMs = Number(settings.latencyMs) || 0;
+        const jitterMs = Number(settings.jitterMs) || 0;
+        const lossRate = Number(settings.packetLossRate !== undefined ? settings.packetLossRate : settings.lossRate) || 0;
+        return { latencyMs, jitterMs, lossRate };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Walks the trie from the top-level label down       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _walk(hostname) {
+        const labels = hostname.split('.');
+        let node = this.root;
+        let best = null;
+
+        for (let i = labels.length - 1; i >= 0; i--) {
+            node = node.children.get(labels[i]);
+            if (!node) {
+                return best;
+            }
+            if (i === 0) {
+                return node.exact || best;
+            }
+            // *.example.com matches hosts with at least one more label
+            if (node.wildcard) {
+                best = node.wildcard;
+            }
+        }
+        return best;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Reads a rules file (an array or { rules: [...] })  █
+     * █ null if it cannot be read or parsed                         █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _readFile(file) {
+        try {
+            const data = JSON.parse(fs.readFileSync(file, 'utf8'));
+            const rules = Array.isArray(data) ? data : data.rules;
+            if (!Array.isArray(rules)) {
+                throw new Error('expected an array of rules or { "rules": [...] }');
+            }
+            return rules;
+        } catch (err) {
+            this.stats.lastError = `${file}: ${err.message}`;
+            console.error(`❌ Failed to read domain rules from ${file}:`, err.message);
+            return null;
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Recompiles when the rules file changes             █
+     * █ The directory is watched, so atomic renames are seen too    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _watch(file) {
+        const name = path.basename(file);
+        try {
+            this.watcher = fs.watch(path.dirname(file), (eventType, changed) => {
+                if (changed && changed.toString() !== name) {
+                    return;
+                }
+                clearTimeout(this.reloadTimer);
+                this.reloadTimer = setTimeout(() => this._reload(), RELOAD_DEBOUNCE_MS);
+            });
+            this.watcher.on('error', (err) => {
+                console.error('❌ Domain rules watcher failed:', err.message);
+                this._unwatch();
+            });
+        } catch (err) {
+            console.error(`❌ Cannot watch ${file}; rules load once:`, err.message);
+        }
+    }
+
+    _unwatch() {
+        clearTimeout(this.reloadTimer);
+        this.reloadTimer = null;
+        if (this.watcher) {
+            this.watcher.close();
+            this.watcher = null;
+        }
+    }
+
+    _reload() {
+        this.reloadTimer = null;
+        if (!fs.existsSync(this.file)) {
+            // Mid-rename; the new file triggers another event
+            return;
+        }
+
+        this.stats.lastError = null;
+        const rules = this._readFile(this.file);
+        if (rules === null) {
+            // A half-written or broken file: keep serving the last good rules
+            return;
+        }
+
+        this.fileRules = rules;
+        if (this._compile()) {
+            this.stats.reloads++;
+            this.stats.lastReloadAt = Date.now();
+            console.log(`Domain rules reloaded: ${this.rules.length} rule(s)`);
+            if (this.onReload) {
+                this.onReload();
+            }
+        }
+    }
+}
+
+function newNode() {
+    return { children: new Map(), exact: null, wildcard: null };
+}
+
+// Hostnames compare case-insensitively, without a trailing root dot
+function normalize(hostname) {
+    const host = hostname.trim().toLowerCase();
+    return host.endsWith('.') ? host.slice(0, -1) : host;
+}
+
+DomainPolicy.PRIORITY_WEIGHTS = PRIORITY_WEIGHTS;
+
+module.exports = DomainPolicy;
@@ -0,0 +1,410 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Duty Cycle Controller
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Caps renderer and GPU CPU use without cgroups or privileges  ║
+ * ║ Runs each process for part of every period (SIGSTOP/SIGCONT) ║
+ * ║ EWMA demand forecast + PI control holds the tree at target   ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Works on an idle machine, where renicing changes nothing
+ * - [+] Feed-forward from forecast demand, PI trim with anti-windup
+ * - [+] Overshoot, settling time and oscillation metrics
+ * - [+] Every stopped process is continued on stop, dispose and exit
+ *
+ * Usage is measured as a percentage of the whole machine (all cores),
+ * like the sampler and the cgroup cpu.max limit. The main process is
+ * never stopped: it runs this controller's timers.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const os = require('os');
+
+// One run/stop cycle; short enough that pages stay responsive
+const PERIOD_MS = 100;
+
+// How often usage is measured and the duty cycle recomputed
+const CONTROL_INTERVAL_MS = 500;
+
+// Never stop processes for more than this share of a period
+const MIN_DUTY = 0.05;
+
+// Demand forecast smoothing and PI gains (duty units per unit error)
+const EWMA_ALPHA = 0.3;
+const KP = 0.1;
+const KI = 0.25; // per second
+
+// Within this many percentage points (or 10% of target) counts as on target
+const MIN_BAND_PERCENT = 2;
+const BAND_FRACTION = 0.1;
+
+// Consecutive on-target samples before the tree counts as settled
+const SETTLE_SAMPLES = 3;
+
+// Error samples kept for the oscillation metric
+const ERROR_WINDOW = 20;
+
+// Electron process types that are duty cycled
+const TARGET_TYPES = ['Tab', 'GPU'];
+
+class DutyCycleController {
+    constructor(getMetrics, target = 70) {
+        // Returns app.getAppMetrics()-shaped entries
+        this.getMetrics = getMetrics;
+        this.target = target;
+        this.numCpuCores = os.cpus().length;
+
+        // Control state
+        this.duty = 1;
+        this.demand = null;   // Forecast of unthrottled target usage
+        this.integral = 0;
+        this.pids = new Set();
+        this.stopped = false;
+        this.running = false;
+
+        // Timers
+        this.cycleTimer = null;
+        this.controlTimer = null;
+
+        // Time actually spent running during the current control interval
+        this.phaseStart = 0;
+        this.runMs = 0;
+        this.intervalStart = 0;
+
+        // Metrics
+        this.lastUsage = 0;
+        this.settled = true;
+        this.inBandCount = SETTLE_SAMPLES;
+        this.episode = null; // { start, peak, firstInBand }
+        this.errors = [];
+        this.metrics = {
+            episodes: 0,
+            lastOvershootPercent: 0,
+            maxOvershootPercent: 0,
+            lastSettlingMs: 0,
+            maxSettlingMs: 0,
+            signalErrors: 0
+        };
+
+        this._continueOnExit = () => this._signalAll('SIGCONT');
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Whether the platform can stop and continue processes        █
+     * ███████████████████████████████████████████████████████████████
+     */
+    static isSupported() {
+        return os.platform() !== 'win32';
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Starts measuring and duty cycling                           █
+     * ███████████████████████████████████████████████████████████████
+     */
+    start() {
+        if (this.running) {
+            return;
+        }
+        this.running = true;
+
+        // Stopped renderers would outlive a crashed main process
+        process.on('exit', this._continueOnExit);
+
+        this.intervalStart = Date.now();
+        this.runMs = 0;
+        this._measure(); // Primes the per-process CPU counters
+        this.controlTimer = setInterval(() => this._control(), CONTROL_INTERVAL_MS);
+        this._cycle();
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Stops cycling and continues every stopped process           █
+     * ███████████████████████████████████████████████████████████████
+     */
+    stop() {
+        if (!this.running) {
+            return;
+        }
+        this.running = false;
+
+        clearTimeout(this.cycleTimer);
+        clearInterval(this.controlTimer);
+        this.cycleTimer = null;
+        this.controlTimer = null;
+
+        this._signalAll('SIGCONT');
+        this.stopped = false;
+        this.duty = 1;
+        this.integral = 0;
+        process.removeListener('exit', this._continueOnExit);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Changes the target (percent of all cores)                   █
+     * █ Starts a new settling episode                               █
+     * ███████████████████████████████████████████████████████████████
+     */
+    setTarget(target) {
+        if (target === this.target) {
+            return;
+        }
+        this.target = target;
+        if (this.running) {
+            this._startEpisode(Date.now());
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Gets duty, forecast and control quality metrics             █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getStats() {
+        const mean = this.errors.length
+            ? this.errors.reduce((sum, e) => sum + e, 0) / this.errors.length
+            : 0;
+        const variance = this.errors.length
+            ? this.errors.reduce((sum, e) => sum + (e - mean) * (e - mean), 0) / this.errors.length
+            : 0;
+
+        return {
+            running: this.running,
+            target: this.target,
+            usage: Math.round(this.lastUsage * 10) / 10,
+            duty: Math.round(this.duty * 1000) / 1000,
+            forecastDemand: this.demand === null ? null : Math.round(this.demand * 10) / 10,
+            processes: this.pids.size,
+            settled: this.settled,
+            oscillation: Math.round(Math.sqrt(variance) * 10) / 10,
+            ...this.metrics
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: One period: run for duty x period, then stop       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _cycle() {
+        if (!this.running) {
+            return;
+        }
+
+        this._setStopped(false);
+        const runFor = Math.round(PERIOD_MS * this.duty);
+        if (runFor >= PERIOD_MS) {
+            this.cycleTimer = setTimeout(() => this._cycle(), PERIOD_MS);
+            return;
+        }
+
+        this.cycleTimer = setTimeout(() => {
+            this._setStopped(true);
+            this.cycleTimer = setTimeout(() => this._cycle(), PERIOD_MS - runFor);
+        }, runFor);
+    }
+
+    _setStopped(stopped) {
+        const now = Date.now();
+        if (!this.stopped) {
+            this.runMs += now - Math.max(this.phaseStart, this.intervalStart);
+        }
+        this.phaseStart = now;
+
+        if (stopped !== this.stopped) {
+            this.stopped = stopped;
+            this._signalAll(stopped ? 'SIGSTOP' : 'SIGCONT');
+        }
+    }
+
+    _signalAll(signal) {
+        for (const pid of this.pids) {
+            try {
+                process.kill(pid, signal);
+            } catch (err) {
+                // Exited (ESRCH) or not ours: stop tracking it
+                if (err.code !== 'ESRCH') {
+                    this.metrics.signalErrors++;
+                }
+                this.pids.delete(pid);
+            }
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Reads per-process usage and refreshes the targets  █
+     * █ Returns { controlled, fixed } in percent of all cores       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _measure() {
+        let metrics;
+        try {
+            metrics = this.getMetrics();
+        } catch (err) {
+            console.error('Duty cycle: failed to read process metrics:', err.message);
+            return null;
+        }
+
+        const usage = { controlled: 0, fixed: 0 };
+        const current = new Set();
+        for (const entry of metrics) {
+            const percent = (entry.cpu && entry.cpu.percentUsage) || 0;
+            if (TARGET_TYPES.includes(entry.type) && entry.pid !== process.pid) {
+                current.add(entry.pid);
+                usage.controlled += percent;
+            } else {
+                usage.fixed += percent;
+            }
+        }
+
+        // New processes join the current phase; departed ones are continued
+        for (const pid of this.pids) {
+            if (!current.has(pid) && this.stopped) {
+                try {
+                    process.kill(pid, 'SIGCONT');
+                } catch (err) {
+                    // Already gone
+                }
+            }
+        }
+        for (const pid of current) {
+            if (!this.pids.has(pid) && this.stopped) {
+                try {
+                    process.kill(pid, 'SIGSTOP');
+                } catch (err) {
+                    current.delete(pid);
+                }
+            }
+        }
+        this.pids = current;
+
+        // percentUsage is per core
+        usage.controlled /= this.numCpuCores;
+        usage.fixed /= this.numCpuCores;
+        return usage;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Control step                                       █
+     * █ duty = (target - fixed) / forecast demand  (feed-forward)   █
+     * █      + Kp x error + Ki x integral of error  (PI trim)       █
+     * █ Errors are normalized by the target                         █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _control() {
+        const now = Date.now();
+        if (!this.stopped) {
+            this.runMs += now - Math.max(this.phaseStart, this.intervalStart);
+            this.phaseStart = now;
+        }
+        const elapsed = Math.max(1, now - this.intervalStart);
+        const appliedDuty = Math.min(1, Math.max(MIN_DUTY, this.runMs / elapsed));
+        this.intervalStart = now;
+        this.runMs = 0;
+
+        const usage = this._measure();
+        if (!usage) {
+            return;
+        }
+        const total = usage.controlled + usage.fixed;
+        this.lastUsage = total;
+
+        // What the targets would use if never stopped
+        const demandSample = usage.controlled / appliedDuty;
+        this.demand = this.demand === null
+            ? demandSample
+            : EWMA_ALPHA * demandSample + (1 - EWMA_ALPHA) * this.demand;
+
+        const budget = Math.max(0, this.target - usage.fixed);
+        const feedForward = this.demand > 0 ? budget / this.demand : 1;
+        const error = (this.target - total) / Math.max(1, this.target);
+
+        let duty = feedForward + KP * error + this.integral;
+        const saturated = duty >= 1 || duty <= MIN_DUTY;
+
+        // Anti-windup: integrate only while the output can still move
+        if (!saturated || (duty >= 1 && error < 0) || (duty <= MIN_DUTY && error > 0)) {
+            this.integral += KI * error * (elapsed / 1000);
+        } else if (duty >= 1) {
+            // Demand below target: forget old corrections
+            this.integral *= 0.5;
+        }
+        this.integral = Math.max(-1, Math.min(1, this.integral));
+
+        duty = feedForward + KP * error + this.integral;
+        this.duty = Math.max(MIN_DUTY, Math.min(1, duty));
+
+        this._recordQuality(total, now);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Overshoot and settling time per disturbance        █
+     * █ An episode starts when usage leaves the band (or the        █
+     * █ target changes) and ends after SETTLE_SAMPLES in band       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _recordQuality(total, now) {
+        const band = Math.max(MIN_BAND_PERCENT, this.target * BAND_FRACTION);
+        const over = total - this.target;
+
+        // Running below target at full duty is not a control error
+        const inBand = over <= band && (over >= -band || this.duty >= 1);
+
+        if (this.duty < 1 || over > 0) {
+            this.errors.push(over);
+            if (this.errors.length > ERROR_WINDOW) {
+                this.errors.shift();
+            }
+        }
+
+        if (!inBand && this.settled) {
+            this._startEpisode(now);
+        }
+
+        if (!this.episode) {
+            return;
+        }
+
+        this.episode.peak = Math.max(this.episode.peak, over);
+        if (!inBand) {
+            this.inBandCount = 0;
+            this.episode.firstInBand = null;
+            return;
+        }
+
+        this.inBandCount++;
+        if (this.episode.firstInBand === null) {
+            this.episode.firstInBand = now;
+        }
+        if (this.inBandCount >= SETTLE_SAMPLES) {
+            const settlingMs = this.episode.firstInBand - this.episode.start;
+            const overshoot = Math.max(0, this.episode.peak) / Math.max(1, this.target) * 100;
+            this.metrics.episodes++;
+            this.metrics.lastSettlingMs = settlingMs;
+            this.metrics.maxSettlingMs = Math.max(this.metrics.maxSettlingMs, settlingMs);
+            this.metrics.lastOvershootPercent = Math.round(overshoot * 10) / 10;
+            this.metrics.maxOvershootPercent = Math.max(this.metrics.maxOvershootPercent, this.metrics.lastOvershootPercent);
+            this.episode = null;
+            this.settled = true;
+        }
+    }
+
+    _startEpisode(now) {
+        this.episode = { start: now, peak: 0, firstInBand: null };
+        this.settled = false;
+        this.inBandCount = 0;
+    }
+}
+
+module.exports = DutyCycleController;
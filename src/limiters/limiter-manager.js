@@ -16,11 +16,14 @@
  * - [+] IPC-based UI integration
  * - [+] Configuration persistence
  * - [+] Cross-platform implementation
+ * - [+] Optional cgroup v2 enforcement with pressure stall info
+ * - [+] Status history streamed to the launcher's telemetry recorder
+ * - [+] Telemetry bus: renderers subscribe to the fields they show
  * 
  * Copyright (c) 2025 ZARI CORP
  */
 
-const { ipcMain } = require('electron');
+const { ipcMain, session } = require('electron');
 const path = require('path');
 const fs = require('fs');
 
@@ -28,6 +31,10 @@ const fs = require('fs');
 const CpuLimiter = require('./cpu-limiter');
 const MemoryLimiter = require('./memory-limiter');
 const NetworkThrottler = require('./network-throttler');
+const SamplerClient = require('./sampler-client');
+const CgroupMonitor = require('./cgroup-monitor');
+const TelemetryExporter = require('./telemetry-exporter');
+const TelemetryBus = require('./telemetry-bus');
 
 class LimiterManager {
     constructor(mainWindow) {
@@ -38,6 +45,18 @@ class LimiterManager {
         this.memoryLimiter = new MemoryLimiter();
         this.networkThrottler = new NetworkThrottler();
         
+        // Launcher-provided psutil sampler (replaces per-tick forks)
+        this.sampler = new SamplerClient();
+        
+        // Launcher-created cgroup v2 (kernel-enforced limits for the tree)
+        this.cgroup = new CgroupMonitor();
+        
+        // Launcher-provided telemetry recorder (persists status history)
+        this.telemetry = new TelemetryExporter();
+        
+        // Limiters publish their samples here; windows subscribe to fields
+        this.bus = new TelemetryBus();
+        
         // Configuration path
         this.configPath = path.join(
             require('electron').app.getPath('userData'),
@@ -66,13 +85,15 @@ class LimiterManager {
             cpu: {
                 enabled: false,
                 maxCpuPercent: 70,
-                priority: 'normal'
+                priority: 'normal',
+                enforcement: 'priority' // 'priority' or 'duty-cycle' (renderer SIGSTOP/SIGCONT)
             },
             memory: {
                 enabled: false,
                 maxMemoryMB: 1024,
                 perTabLimitMB: 200,
-                aggressiveGC: false
+                aggressiveGC: false,
+                hibernateTabs: true // Destroy cold tabs to stay under maxMemoryMB
             },
             network: {
                 enabled: false,
@@ -143,6 +164,29 @@ class LimiterManager {
         // Load saved configuration
         this._loadConfiguration();
         
+        // A fleet launcher can pin this instance to a profile
+        this._applyLauncherProfile();
+        
+        // Connect to the resource sampler if the launcher started one
+        if (this.sampler.isAvailable()) {
+            this.sampler.connect();
+            this.cpuLimiter.setSampler(this.sampler);
+            this.memoryLimiter.setSampler(this.sampler);
+        }
+        
+        this.telemetry.connect();
+        
+        if (this.cgroup.isAvailable()) {
+            console.log(`cgroup v2 enforcement active: ${this.cgroup.path}`);
+            this.cgroup.refresh();
+        }
+        
+        // Every limiter publishes one sample per tick to the bus
+        this.bus.init();
+        this.cpuLimiter.setTelemetryBus(this.bus);
+        this.memoryLimiter.setTelemetryBus(this.bus);
+        this.networkThrottler.setTelemetryBus(this.bus);
+        
         // Initialize individual limiters
         this.cpuLimiter.init(this.mainWindow);
         this.memoryLimiter.init(this.mainWindow);
@@ -154,7 +198,7 @@ class LimiterManager {
         // Apply settings
         this.applySettings();
         
-        // Start status updates to renderer
+        // Start status history for the recorder and cgroup
         this._startStatusUpdates();
         
         console.log('Resource limiter manager initialized successfully');
@@ -175,7 +219,8 @@ class LimiterManager {
         this.cpuLimiter.setEnabled(isEnabled && this.settings.cpu.enabled);
         this.cpuLimiter.updateSettings({
             maxCpuPercent: this.settings.cpu.maxCpuPercent,
-            processPriority: this.settings.cpu.priority
+            processPriority: this.settings.cpu.priority,
+            enforcementMode: this.settings.cpu.enforcement || 'priority'
         });
         
         // Apply memory settings
@@ -183,7 +228,8 @@ class LimiterManager {
         this.memoryLimiter.updateSettings({
             maxMemoryMB: this.settings.memory.maxMemoryMB,
             perTabLimitMB: this.settings.memory.perTabLimitMB,
-            aggressiveGC: this.settings.memory.aggressiveGC
+            aggressiveGC: this.settings.memory.aggressiveGC,
+            hibernateTabs: this.settings.memory.hibernateTabs !== false
         });
         
         // Apply network settings
@@ -202,6 +248,17 @@ class LimiterManager {
             });
         }
         
+        // The sampler only needs to run as often as the CPU limiter reads it
+        this.sampler.setSamplingInterval(this.cpuLimiter.settings.monitorInterval);
+        
+        // Mirror CPU and memory limits into the cgroup so they bind renderers too
+        if (this.cgroup.isAvailable()) {
+            this.cgroup.applyLimits(
+                isEnabled && this.settings.cpu.enabled ? this.settings.cpu.maxCpuPercent : null,
+                isEnabled && this.settings.memory.enabled ? this.settings.memory.maxMemoryMB : null
+            );
+        }
+        
         // Apply browser proxy settings if network throttling is enabled
         if (isEnabled && this.settings.network.enabled) {
             const proxyConfig = this.networkThrottler.getProxyConfig();
@@ -211,6 +268,12 @@ class LimiterManager {
             session.defaultSession.setProxy({ mode: 'direct' });
         }
         
+        // Tag plain HTTP requests with their tab so per-tab budgets apply
+        this._tagTabRequests(isEnabled && this.settings.network.enabled);
+        
+        // New limits reach subscribers now, not on the next tick
+        this._publishStats();
+        
         console.log('Applied resource limiter settings');
         
         // Save configuration
@@ -323,7 +386,10 @@ class LimiterManager {
             profile: this.settings.profiles.current,
             cpu: this.cpuLimiter.getStats(),
             memory: this.memoryLimiter.getStats(),
-            network: this.networkThrottler.getStats()
+            network: this.networkThrottler.getStats(),
+            samplerConnected: this.sampler.connected,
+            cgroup: this.cgroup.getStats(),
+            telemetryBus: this.bus.getStats()
         };
     }
     
@@ -364,6 +430,9 @@ class LimiterManager {
         this.cpuLimiter.dispose();
         this.memoryLimiter.dispose();
         this.networkThrottler.dispose();
+        this.sampler.dispose();
+        this.telemetry.dispose();
+        this.bus.dispose();
     }
     
     /**
@@ -801,27 +870,98 @@ class LimiterManager {
         });
     }
     
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Adds the tab header the network throttler reads    █
+     * █ HTTPS goes through CONNECT tunnels, which carry no headers, █
+     * █ so only plain HTTP is tagged (and the proxy strips it)      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _tagTabRequests(enabled) {
+        if (!enabled) {
+            session.defaultSession.webRequest.onBeforeSendHeaders(null);
+            return;
+        }
+        
+        session.defaultSession.webRequest.onBeforeSendHeaders({ urls: ['http://*/*'] }, (details, callback) => {
+            if (details.webContentsId !== undefined) {
+                details.requestHeaders['X-Internet-Server-Tab'] = String(details.webContentsId);
+            }
+            callback({ requestHeaders: details.requestHeaders });
+        });
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Applies the profile forced by the launcher         █
+     * █ Settings only; init() applies them once limiters are up     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _applyLauncherProfile() {
+        const profileName = process.env.INTERNET_SERVER_LIMITER_PROFILE;
+        if (!profileName) {
+            return;
+        }
+        
+        const profile = this.profiles[profileName];
+        if (!profile) {
+            console.error(`Launcher profile "${profileName}" not found`);
+            return;
+        }
+        
+        this.settings.enabled = true;
+        this.settings.profiles.current = profileName;
+        this.settings.cpu = { ...this.settings.cpu, ...profile.cpu };
+        this.settings.memory = { ...this.settings.memory, ...profile.memory };
+        this.settings.network = { ...this.settings.network, ...profile.network };
+        console.log(`Using launcher-selected "${profileName}" resource profile`);
+    }
+    
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Private: Starts regular status updates                      █
-     * █ Sends resource stats to renderer periodically               █
+     * █ Records history and cgroup pressure; windows use the bus    █
      * ███████████████████████████████████████████████████████████████
      */
     _startStatusUpdates() {
         // Clear existing interval if any
         if (this.statusInterval) {
             clearInterval(this.statusInterval);
+            this.statusInterval = null;
         }
         
-        // Send updates every 2 seconds
+        // Nobody to record for: no wakeups at all
+        if (!this.telemetry.isAvailable() && !this.cgroup.isAvailable()) {
+            return;
+        }
+        
+        // Record every 2 seconds
         this.statusInterval = setInterval(() => {
-            if (this.mainWindow && !this.mainWindow.isDestroyed()) {
-                const stats = this.getStats();
-                this.mainWindow.webContents.send('resource-stats-update', stats);
-            }
+            // Pressure is read asynchronously and reported on the next tick
+            this.cgroup.refresh();
+            this.bus.publish('cgroup', this.cgroup.getStats());
+            
+            this.telemetry.record(this.getStats());
         }, 2000);
     }
     
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Publishes every limiter's sample to the bus        █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _publishStats() {
+        this.bus.publish('cpu', this.cpuLimiter.getStats());
+        this.bus.publish('memory', this.memoryLimiter.getStats());
+        this.bus.publish('network', this.networkThrottler.getStats());
+        this.bus.publish('cgroup', this.cgroup.getStats());
+        this.bus.publish('limiter', {
+            enabled: this.settings.enabled,
+            profile: this.settings.profiles.current,
+            samplerConnected: this.sampler.connected
+        });
+    }
+    
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Private: Loads configuration from disk                      █
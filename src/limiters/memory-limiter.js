@@ -15,6 +15,7 @@
  * - [+] Automatic garbage collection
  * - [+] Tab-based memory limiting
  * - [+] Memory leak detection
+ * - [+] Cold tab hibernation under a hard RSS budget
  * - [+] Cross-platform implementation
  * 
  * Copyright (c) 2025 ZARI CORP
@@ -22,6 +23,7 @@
 
 const { ipcMain, app, webContents } = require('electron');
 const os = require('os');
+const TabHibernator = require('./tab-hibernator');
 
 class MemoryLimiter {
     constructor() {
@@ -34,7 +36,8 @@ class MemoryLimiter {
             aggressiveGC: false, // Aggressive garbage collection
             perTabLimitMB: 200, // Per-tab memory limit (200MB)
             leakDetectionEnabled: true, // Enable memory leak detection
-            leakThresholdPercent: 10 // 10% growth in 1 minute = potential leak
+            leakThresholdPercent: 10, // 10% growth in 1 minute = potential leak
+            hibernateTabs: true // Hibernate cold tabs to stay under maxMemoryMB
         };
         
         // State tracking
@@ -61,6 +64,15 @@ class MemoryLimiter {
         
         // Tab memory tracking
         this.tabMemory = new Map(); // webContentsId -> memory usage
+        
+        // Optional psutil sampler sidecar (see sampler-client.js)
+        this.sampler = null;
+        
+        // Telemetry bus fed once per check (see telemetry-bus.js)
+        this.telemetryBus = null;
+        
+        // Destroys cold tabs and restores them on activation
+        this.hibernator = new TabHibernator();
     }
     
     /**
@@ -81,6 +93,9 @@ class MemoryLimiter {
         // Setup event listeners for tabs
         this._setupTabListeners();
         
+        // Prepare the hibernated tab store
+        this.hibernator.init(mainWindow);
+        
         console.log('Memory limiter initialized');
         console.log(`System memory: ${Math.round(os.totalmem() / (1024 * 1024))} MB`);
     }
@@ -133,6 +148,25 @@ class MemoryLimiter {
         return this.settings;
     }
     
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Attaches the launcher's resource sampler                    █
+     * █ Uses real RSS of the whole process tree when available      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    setSampler(sampler) {
+        this.sampler = sampler;
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Attaches the telemetry bus each memory check publishes to   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    setTelemetryBus(bus) {
+        this.telemetryBus = bus;
+    }
+    
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Forces garbage collection                                   █
@@ -173,6 +207,7 @@ class MemoryLimiter {
             percentUsed: Math.round((this.currentMemoryUsage.total / this.settings.maxMemoryMB) * 100),
             tabCount: this.tabMemory.size,
             memoryLeakDetected: this._detectMemoryLeak(),
+            hibernation: this.hibernator.getStats(),
             tabMemory: Array.from(this.tabMemory.entries()).map(([id, mem]) => ({ 
                 id, 
                 memory: mem,
@@ -189,6 +224,7 @@ class MemoryLimiter {
      */
     dispose() {
         this._stopMonitoring();
+        this.hibernator.dispose();
         this.tabMemory.clear();
         this.memoryHistory = [];
     }
@@ -319,12 +355,26 @@ class MemoryLimiter {
         // Request memory usage from renderer processes
         this._getRendererMemoryUsage().then(rendererMemoryMB => {
             // Calculate total memory usage
-            const totalMemoryMB = mainProcessRssMB + rendererMemoryMB;
+            let totalMemoryMB = mainProcessRssMB + rendererMemoryMB;
+            let mainMemoryMB = mainProcessRssMB;
+            
+            // Prefer the sampler's resident set sizes over JS heap estimates
+            const sample = this.sampler ? this.sampler.getLatest(this.settings.checkIntervalMs * 2) : null;
+            if (sample) {
+                const toMB = (bytes) => Math.round(bytes / (1024 * 1024));
+                const byType = (type) => sample.procs
+                    .filter(([, procType]) => procType === type)
+                    .reduce((sum, [, , , rss]) => sum + rss, 0);
+                
+                totalMemoryMB = toMB(sample.rss);
+                mainMemoryMB = toMB(byType('main'));
+                rendererMemoryMB = toMB(byType('renderer'));
+            }
             
             // Update current memory usage
             this.currentMemoryUsage = {
                 total: totalMemoryMB,
-                main: mainProcessRssMB,
+                main: mainMemoryMB,
                 renderer: rendererMemoryMB,
                 system: systemMemory
             };
@@ -358,13 +408,9 @@ class MemoryLimiter {
                 }
             }
             
-            // Send memory update to renderer
-            if (this.mainWindow && !this.mainWindow.isDestroyed()) {
-                this.mainWindow.webContents.send('memory-usage-update', {
-                    ...this.currentMemoryUsage,
-                    percentUsed: Math.round((totalMemoryMB / this.settings.maxMemoryMB) * 100),
-                    isLimiting: this.isLimiting
-                });
+            // One sample per check; subscribers get the fields that changed
+            if (this.telemetryBus) {
+                this.telemetryBus.publish('memory', this.getStats());
             }
         }).catch(err => {
             console.error('Error getting memory usage:', err);
@@ -441,6 +487,12 @@ class MemoryLimiter {
             return;
         }
         
+        // Hard budget on the RSS of every browser process: garbage collection
+        // alone rarely gives memory back, destroying cold tabs does
+        if (this.settings.hibernateTabs) {
+            this.hibernator.enforceBudget(this.settings.maxMemoryMB);
+        }
+        
         const memoryPercent = (totalMemoryMB / this.settings.maxMemoryMB) * 100;
         
         // Check if we need to take action
@@ -498,9 +550,16 @@ class MemoryLimiter {
                     limit: this.settings.perTabLimitMB
                 });
                 
-                // Optionally reload the tab if it's using excessive memory
-                // (more than 2x the limit)
+                // Hibernate (background) or reload (foreground) a tab using
+                // excessive memory (more than 2x the limit)
                 if (memoryMB > this.settings.perTabLimitMB * 2) {
+                    const tabId = this.settings.hibernateTabs ? this.hibernator.findTab(id) : null;
+                    if (tabId && tabId !== this.hibernator.activeTabId) {
+                        console.warn(`Tab ${id} using excessive memory (${memoryMB}MB), hibernating`);
+                        this.hibernator.hibernate(tabId);
+                        continue;
+                    }
+                    
                     console.warn(`Tab ${id} using excessive memory (${memoryMB}MB), reloading`);
                     
                     try {
@@ -0,0 +1,418 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Network Emulator
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Replays bandwidth/latency/jitter/loss traces over time       ║
+ * ║ Delays chunks per direction without reordering or dropping   ║
+ * ║ Seeded randomness so runs are reproducible                   ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Built-in traces (variable 3G, congested Wi-Fi, LTE handover)
+ * - [+] JSON step traces and Mahimahi packet-delivery trace files
+ * - [+] Loss modelled as a retransmission delay, never as missing bytes
+ * - [+] Step changes drive the bandwidth scheduler's rates
+ *
+ * Trace JSON: { "name": "...", "loop": true, "steps": [ { "durationMs": 5000,
+ *   "downloadKbps": 1500, "uploadKbps": 750, "latencyMs": 150,
+ *   "jitterMs": 30, "lossRate": 0.01 }, ... ] }
+ * latencyMs is the round trip; each direction gets half of it.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { Transform } = require('stream');
+
+// Mahimahi traces: one line per 1500-byte delivery opportunity (ms timestamp)
+const MAHIMAHI_PACKET_BYTES = 1500;
+const MAHIMAHI_BIN_MS = 250;
+
+// Loss model: per-segment loss, recovered after a retransmission timeout
+const SEGMENT_BYTES = 1460;
+const MIN_RTO_MS = 200;
+
+// Bytes a delay stream holds before it stops accepting more (backpressure)
+const MAX_IN_FLIGHT_BYTES = 256 * 1024;
+
+const STEP_DEFAULTS = {
+    downloadKbps: 0,
+    uploadKbps: 0,
+    latencyMs: 0,
+    jitterMs: 0,
+    lossRate: 0
+};
+
+const BUILTIN_TRACES = {
+    '3g-variable': {
+        loop: true,
+        steps: [
+            { durationMs: 5000, downloadKbps: 1600, uploadKbps: 768, latencyMs: 150, jitterMs: 20, lossRate: 0.005 },
+            { durationMs: 5000, downloadKbps: 900, uploadKbps: 400, latencyMs: 250, jitterMs: 60, lossRate: 0.01 },
+            { durationMs: 3000, downloadKbps: 300, uploadKbps: 150, latencyMs: 400, jitterMs: 120, lossRate: 0.03 },
+            { durationMs: 5000, downloadKbps: 1200, uploadKbps: 600, latencyMs: 200, jitterMs: 40, lossRate: 0.01 }
+        ]
+    },
+    'congested-wifi': {
+        loop: true,
+        steps: [
+            { durationMs: 4000, downloadKbps: 20000, uploadKbps: 8000, latencyMs: 20, jitterMs: 10, lossRate: 0.001 },
+            { durationMs: 2000, downloadKbps: 4000, uploadKbps: 1000, latencyMs: 120, jitterMs: 80, lossRate: 0.02 },
+            { durationMs: 1000, downloadKbps: 500, uploadKbps: 200, latencyMs: 300, jitterMs: 150, lossRate: 0.05 },
+            { durationMs: 3000, downloadKbps: 8000, uploadKbps: 3000, latencyMs: 60, jitterMs: 40, lossRate: 0.01 }
+        ]
+    },
+    'lte-handover': {
+        loop: true,
+        steps: [
+            { durationMs: 8000, downloadKbps: 30000, uploadKbps: 10000, latencyMs: 50, jitterMs: 10, lossRate: 0 },
+            { durationMs: 600, downloadKbps: 64, uploadKbps: 64, latencyMs: 600, jitterMs: 100, lossRate: 0.1 },
+            { durationMs: 6000, downloadKbps: 12000, uploadKbps: 5000, latencyMs: 70, jitterMs: 20, lossRate: 0.002 }
+        ]
+    }
+};
+
+/**
+ * Small seeded PRNG (mulberry32); returns floats in [0, 1)
+ */
+function seededRandom(seed) {
+    let state = seed >>> 0;
+    return () => {
+        state = (state + 0x6D2B79F5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+class NetworkEmulator {
+    constructor() {
+        // Conditions used when no trace is playing
+        this.staticConditions = { latencyMs: 0, jitterMs: 0, lossRate: 0 };
+
+        // Trace playback
+        this.trace = null;
+        this.stepIndex = 0;
+        this.nextStepAt = 0;
+        this.timer = null;
+        this.seed = 1;
+        this.random = { download: seededRandom(1), upload: seededRandom(2) };
+
+        // Called with the new step whenever the trace advances
+        this.onStepChange = null;
+
+        this.stats = {
+            delayedChunks: 0,
+            retransmissions: 0,
+            totalDelayMs: 0,
+            maxDelayMs: 0,
+            stepChanges: 0
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Loads a built-in trace by name, or a trace file by path     █
+     * █ .json files hold steps; anything else is read as Mahimahi   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    static loadTrace(source) {
+        if (BUILTIN_TRACES[source]) {
+            return NetworkEmulator.normalizeTrace({ name: source, ...BUILTIN_TRACES[source] });
+        }
+
+        const text = fs.readFileSync(source, 'utf8');
+        const name = path.basename(source);
+        if (source.endsWith('.json')) {
+            return NetworkEmulator.normalizeTrace({ name, ...JSON.parse(text) });
+        }
+        return NetworkEmulator.parseMahimahi(text, name);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Validates a step trace and fills in missing fields          █
+     * ███████████████████████████████████████████████████████████████
+     */
+    static normalizeTrace(trace) {
+        if (!Array.isArray(trace.steps) || !trace.steps.length) {
+            throw new Error(`Network trace ${trace.name} has no steps`);
+        }
+
+        const steps = trace.steps.map((step, index) => {
+            if (!(step.durationMs > 0)) {
+                throw new Error(`Network trace ${trace.name}: step ${index} needs a positive durationMs`);
+            }
+            return { ...STEP_DEFAULTS, ...step };
+        });
+
+        return { name: trace.name || 'trace', loop: trace.loop !== false, steps };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Converts a Mahimahi trace into fixed-length rate steps      █
+     * █ Each line is a ms timestamp allowing one 1500-byte packet   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    static parseMahimahi(text, name = 'mahimahi') {
+        const stamps = text.split(/\r?\n/)
+            .map(line => parseInt(line, 10))
+            .filter(stamp => Number.isFinite(stamp) && stamp >= 0);
+        if (!stamps.length) {
+            throw new Error(`Network trace ${name} has no delivery timestamps`);
+        }
+
+        const bins = new Array(Math.floor(stamps[stamps.length - 1] / MAHIMAHI_BIN_MS) + 1).fill(0);
+        for (const stamp of stamps) {
+            bins[Math.floor(stamp / MAHIMAHI_BIN_MS)]++;
+        }
+
+        // Kbps = packets x bytes x 8 bits / 1024 over the bin length
+        const toKbps = (packets) => packets * MAHIMAHI_PACKET_BYTES * 8 / 1024 / (MAHIMAHI_BIN_MS / 1000);
+        const steps = bins.map(packets => ({
+            ...STEP_DEFAULTS,
+            durationMs: MAHIMAHI_BIN_MS,
+            // A bin with no deliveries still stalls; 1 Kbps is as close as the scheduler gets
+            downloadKbps: Math.max(1, toKbps(packets)),
+            uploadKbps: Math.max(1, toKbps(packets))
+        }));
+
+        return { name, loop: true, steps };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Starts replaying a trace from its first step                █
+     * ███████████████████████████████████████████████████████████████
+     */
+    start(trace, { seed = 1 } = {}) {
+        this.stop();
+        this.trace = trace;
+        this._reseed(seed);
+        this.nextStepAt = Date.now();
+        this._enterStep(0);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Stops trace playback (static conditions apply again)        █
+     * ███████████████████████████████████████████████████████████████
+     */
+    stop() {
+        clearTimeout(this.timer);
+        this.timer = null;
+        this.trace = null;
+        this.stepIndex = 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Sets the conditions used when no trace is playing           █
+     * ███████████████████████████████████████████████████████████████
+     */
+    setStatic({ latencyMs = 0, jitterMs = 0, lossRate = 0 } = {}, seed = this.seed) {
+        this.staticConditions = { latencyMs, jitterMs, lossRate };
+        if (seed !== this.seed) {
+            this._reseed(seed);
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Current conditions: the trace step, or the static ones      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    conditions() {
+        if (this.trace) {
+            return this.trace.steps[this.stepIndex];
+        }
+        return { ...STEP_DEFAULTS, ...this.staticConditions, downloadKbps: null, uploadKbps: null };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Whether chunks need to go through a delay stream at all     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    isActive() {
+        const { latencyMs, jitterMs, lossRate } = this.staticConditions;
+        return this.trace !== null || latencyMs > 0 || jitterMs > 0 || lossRate > 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Creates an order-preserving delay stream for one direction  █
+     * █ Every byte arrives, in order, after the emulated delay      █
+     * █ conditions (a domain rule's) replace the current ones       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    createDelayStream(direction, conditions = null) {
+        const emulator = this;
+        const queue = [];  // { releaseAt, chunk } in arrival order
+        let timer = null;
+        let lastReleaseAt = 0;
+        let inFlightBytes = 0;
+        let held = null;
+        let flushCallback = null;
+
+        // One timer for the head of the queue: separate timers due in the
+        // same millisecond may fire in any order
+        const drain = () => {
+            timer = null;
+            const now = Date.now();
+            while (queue.length && queue[0].releaseAt <= now) {
+                const { chunk } = queue.shift();
+                inFlightBytes -= chunk.length;
+                stream.push(chunk);
+            }
+            if (held && inFlightBytes < MAX_IN_FLIGHT_BYTES) {
+                const next = held;
+                held = null;
+                next();
+            }
+            if (queue.length) {
+                timer = setTimeout(drain, queue[0].releaseAt - now);
+            } else if (flushCallback) {
+                flushCallback();
+            }
+        };
+
+        const stream = new Transform({
+            transform(chunk, encoding, callback) {
+                const now = Date.now();
+                // Never release before an earlier chunk: jitter delays, it does not reorder
+                const releaseAt = Math.max(now + emulator._chunkDelay(direction, chunk.length, conditions), lastReleaseAt);
+                lastReleaseAt = releaseAt;
+                inFlightBytes += chunk.length;
+                queue.push({ releaseAt, chunk });
+                if (!timer) {
+                    timer = setTimeout(drain, queue[0].releaseAt - now);
+                }
+
+                if (inFlightBytes < MAX_IN_FLIGHT_BYTES) {
+                    callback();
+                } else {
+                    held = callback;
+                }
+            },
+            flush(callback) {
+                if (!lastReleaseAt) {
+                    // An empty body still takes one trip to arrive
+                    timer = setTimeout(callback, emulator._chunkDelay(direction, 0, conditions));
+                } else if (!queue.length) {
+                    callback();
+                } else {
+                    flushCallback = callback;
+                }
+            },
+            destroy(err, callback) {
+                clearTimeout(timer);
+                timer = null;
+                queue.length = 0;
+                callback(err);
+            }
+        });
+
+        return stream;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Gets playback position and delay counters                   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getStats() {
+        return {
+            ...this.stats,
+            avgDelayMs: this.stats.delayedChunks ? Math.round(this.stats.totalDelayMs / this.stats.delayedChunks) : 0,
+            trace: this.trace ? this.trace.name : null,
+            step: this.trace ? this.stepIndex : null,
+            seed: this.seed,
+            conditions: this.conditions()
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Dispose of the emulator                                     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    dispose() {
+        this.stop();
+        this.onStepChange = null;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: One-way delay for a chunk, with jitter and loss    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _chunkDelay(direction, bytes, conditions = null) {
+        const { latencyMs, jitterMs, lossRate } = conditions || this.conditions();
+        const random = this.random[direction];
+
+        let delay = latencyMs / 2;
+        if (jitterMs > 0) {
+            delay += (random() * 2 - 1) * jitterMs / 2;
+        }
+
+        // A chunk spans several segments; any lost one costs a retransmission timeout
+        if (lossRate > 0) {
+            const segments = Math.max(1, Math.ceil(bytes / SEGMENT_BYTES));
+            if (random() < 1 - Math.pow(1 - lossRate, segments)) {
+                delay += Math.max(MIN_RTO_MS, latencyMs + 4 * jitterMs);
+                this.stats.retransmissions++;
+            }
+        }
+
+        delay = Math.max(0, Math.round(delay));
+        this.stats.delayedChunks++;
+        this.stats.totalDelayMs += delay;
+        this.stats.maxDelayMs = Math.max(this.stats.maxDelayMs, delay);
+        return delay;
+    }
+
+    _reseed(seed) {
+        this.seed = seed;
+        this.random = { download: seededRandom(seed), upload: seededRandom(seed + 1) };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Moves to a step and schedules the next one         █
+     * █ Boundaries are computed from the start, so timers never     █
+     * █ accumulate drift                                            █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _enterStep(index) {
+        this.stepIndex = index;
+        this.stats.stepChanges++;
+        if (this.onStepChange) {
+            this.onStepChange(this.trace.steps[index]);
+        }
+
+        let next = index + 1;
+        if (next >= this.trace.steps.length) {
+            if (!this.trace.loop) {
+                return; // Hold the last step
+            }
+            next = 0;
+        }
+
+        this.nextStepAt += this.trace.steps[index].durationMs;
+        this.timer = setTimeout(() => {
+            this.timer = null;
+            this._enterStep(next);
+        }, Math.max(0, this.nextStepAt - Date.now()));
+    }
+}
+
+NetworkEmulator.BUILTIN_TRACES = BUILTIN_TRACES;
+
+module.exports = NetworkEmulator;
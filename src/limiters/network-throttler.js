@@ -12,10 +12,14 @@
  * 
  * FEATURES:
  * - [+] Throttle download/upload independently
- * - [+] Per-tab bandwidth limits
+ * - [+] Per-tab bandwidth limits (plain HTTP; HTTPS tunnels carry no tab)
  * - [+] Simulate different network conditions
+ * - [+] Trace-driven emulation (rate, latency, jitter, loss over time)
  * - [+] Real-time bandwidth monitoring
  * - [+] Configurable throttling profiles
+ * - [+] One shared token-bucket budget per direction (not per socket)
+ * - [+] Optional shared on-disk HTTP cache (fleet instances share it)
+ * - [+] Per-host rules (exclude, kbps, priority, latency) from a compiled index
  * 
  * Copyright (c) 2025 ZARI CORP
  */
@@ -23,9 +27,62 @@
 const http = require('http');
 const https = require('https');
 const net = require('net');
+const path = require('path');
 const url = require('url');
-const { Throttle } = require('stream-throttle');
 const { ipcMain } = require('electron');
+const BandwidthScheduler = require('./bandwidth-scheduler');
+const NetworkEmulator = require('./network-emulator');
+const ProxyCache = require('./proxy-cache');
+const DomainPolicy = require('./domain-policy');
+
+// Request header carrying the tab (webContents id) of a plain HTTP request
+const TAB_HEADER = 'x-internet-server-tab';
+
+// Predefined network profiles (also usable as a domain rule's latencyProfile)
+const NETWORK_PROFILES = {
+    'unlimited': {
+        downloadKbps: 0,
+        uploadKbps: 0,
+        latencyMs: 0,
+        packetLossRate: 0
+    },
+    'fast-4g': {
+        downloadKbps: 20000, // 20 Mbps
+        uploadKbps: 10000,   // 10 Mbps
+        latencyMs: 50,
+        packetLossRate: 0.01
+    },
+    '3g': {
+        downloadKbps: 1500,  // 1.5 Mbps
+        uploadKbps: 750,     // 750 Kbps
+        latencyMs: 100,
+        packetLossRate: 0.03
+    },
+    '2g': {
+        downloadKbps: 250,   // 250 Kbps
+        uploadKbps: 100,     // 100 Kbps
+        latencyMs: 300,
+        packetLossRate: 0.05
+    },
+    'slow-2g': {
+        downloadKbps: 50,    // 50 Kbps
+        uploadKbps: 20,      // 20 Kbps
+        latencyMs: 500,
+        packetLossRate: 0.08
+    },
+    'dial-up': {
+        downloadKbps: 30,    // 30 Kbps
+        uploadKbps: 10,      // 10 Kbps
+        latencyMs: 200,
+        packetLossRate: 0.02
+    },
+    'satellite': {
+        downloadKbps: 2000,  // 2 Mbps
+        uploadKbps: 1000,    // 1 Mbps
+        latencyMs: 600,      // High latency
+        packetLossRate: 0.04
+    }
+};
 
 class NetworkThrottler {
     constructor() {
@@ -34,12 +91,42 @@ class NetworkThrottler {
             enabled: false,
             downloadKbps: 0, // 0 = unlimited
             uploadKbps: 0,   // 0 = unlimited
-            latencyMs: 0,    // Additional latency
-            packetLossRate: 0, // 0-1 (percentage as decimal)
-            proxyPort: 8888,  // Local proxy port
-            excludedDomains: [] // Domains to exclude from throttling
+            latencyMs: 0,    // Additional round-trip latency
+            jitterMs: 0,     // Latency variation (+/- half per direction)
+            packetLossRate: 0, // 0-1, emulated as retransmission delay
+            trace: null,     // Built-in trace name or trace file path
+            traceSeed: 1,    // Seed for jitter and loss (reproducible runs)
+            proxyPort: parseInt(process.env.INTERNET_SERVER_PROXY_PORT, 10) || 8888,  // Local proxy port (per fleet instance)
+            excludedDomains: [], // Domains to exclude from throttling
+            tabLimits: {},       // Tab (webContents id) -> Kbps sub-budget, plain HTTP only
+            domainLimits: {},    // Domain pattern -> Kbps sub-budget
+            domainWeights: {},   // Domain pattern -> share weight (default 1)
+            domainRules: [],     // Per-host rules, see domain-policy.js
+            domainRulesFile: process.env.INTERNET_SERVER_DOMAIN_RULES || null, // JSON rules, reloaded on change
+            cache: {             // Shared HTTP cache for plain HTTP responses
+                enabled: Boolean(process.env.INTERNET_SERVER_PROXY_CACHE_DIR),
+                maxMB: parseInt(process.env.INTERNET_SERVER_PROXY_CACHE_MB, 10) || 256,
+                directory: process.env.INTERNET_SERVER_PROXY_CACHE_DIR || null // null = userData/proxy-cache
+            }
         };
         
+        // Shared budgets: every proxied socket draws from these
+        this.downloadScheduler = new BandwidthScheduler('download');
+        this.uploadScheduler = new BandwidthScheduler('upload');
+        
+        // Latency, jitter and loss, static or replayed from a trace
+        this.emulator = new NetworkEmulator();
+        this.emulator.onStepChange = () => this._configureSchedulers();
+        
+        // Per-host rules; a changed rules file applies to new connections at once
+        this.policy = new DomainPolicy(NETWORK_PROFILES);
+        this.policy.onReload = () => this._configureSchedulers();
+        this._syncPolicy();
+        this._configureSchedulers();
+        
+        // Created on demand by _syncCache()
+        this.cache = null;
+        
         // Proxy server reference
         this.proxyServer = null;
         
@@ -55,8 +142,11 @@ class NetworkThrottler {
             activeConnections: 0
         };
         
-        // Stats interval
+        // Stats interval (runs while the proxy does)
         this.statsInterval = null;
+        
+        // Telemetry bus fed once per stats tick (see telemetry-bus.js)
+        this.telemetryBus = null;
     }
     
     /**
@@ -69,8 +159,11 @@ class NetworkThrottler {
         // Register IPC handlers
         this._registerIpcHandlers();
         
-        // Start stats collection
-        this._startStatsCollection();
+        // The cache may have been enabled by the launcher environment
+        this._syncCache();
+        
+        // Rates are measured while the proxy runs; until then they stay at zero
+        this._publishStats();
         
         console.log('Network throttler initialized');
     }
@@ -116,6 +209,8 @@ class NetworkThrottler {
         this.proxyServer.listen(this.settings.proxyPort, '127.0.0.1', () => {
             console.log(`Proxy server started on port ${this.settings.proxyPort}`);
         });
+        
+        this._startStatsCollection();
     }
     
     /**
@@ -135,6 +230,7 @@ class NetworkThrottler {
         }
         
         this.activeConnections.clear();
+        this._stopStatsCollection();
         
         // Close server
         this.proxyServer.close(() => {
@@ -175,11 +271,39 @@ class NetworkThrottler {
      * ███████████████████████████████████████████████████████████████
      */
     updateSettings(newSettings) {
+        const previousPort = this.settings.proxyPort;
+        
+        const previousTrace = this.settings.trace;
+        const previousSeed = this.settings.traceSeed;
+        
         // Update settings
         Object.assign(this.settings, newSettings);
         
-        // If proxy is running, restart it to apply new settings
-        if (this.settings.enabled && this.proxyServer) {
+        // Start, switch or stop trace playback
+        if (this.settings.trace !== previousTrace || (this.settings.trace && this.settings.traceSeed !== previousSeed)) {
+            if (this.settings.trace) {
+                this.emulator.start(NetworkEmulator.loadTrace(this.settings.trace), { seed: this.settings.traceSeed });
+            } else {
+                this.emulator.stop();
+            }
+        }
+        this.emulator.setStatic({
+            latencyMs: this.settings.latencyMs,
+            jitterMs: this.settings.jitterMs,
+            lossRate: this.settings.packetLossRate
+        }, this.settings.traceSeed);
+        
+        // Recompile the domain rules (legacy exclusions and limits included)
+        this._syncPolicy();
+        
+        // Rates apply live to open sockets through the shared schedulers
+        this._configureSchedulers();
+        
+        // Open, resize or drop the shared cache
+        this._syncCache();
+        
+        // Only a port change needs the proxy restarted
+        if (this.settings.enabled && this.proxyServer && this.settings.proxyPort !== previousPort) {
             this.stopProxy();
             this.startProxy();
         }
@@ -199,7 +323,14 @@ class NetworkThrottler {
             throttlingEnabled: this.settings.enabled,
             downloadLimit: this.settings.downloadKbps,
             uploadLimit: this.settings.uploadKbps,
-            latency: this.settings.latencyMs
+            latency: this.settings.latencyMs,
+            emulation: this.emulator.getStats(),
+            cache: this.cache ? this.cache.getStats() : null,
+            policy: this.policy.getStats(),
+            scheduler: {
+                download: this.downloadScheduler.getStats(),
+                upload: this.uploadScheduler.getStats()
+            }
         };
     }
     
@@ -210,60 +341,35 @@ class NetworkThrottler {
      * ███████████████████████████████████████████████████████████████
      */
     setNetworkProfile(profileName) {
-        // Predefined network profiles
-        const profiles = {
-            'unlimited': {
-                downloadKbps: 0,
-                uploadKbps: 0,
-                latencyMs: 0,
-                packetLossRate: 0
-            },
-            'fast-4g': {
-                downloadKbps: 20000, // 20 Mbps
-                uploadKbps: 10000,   // 10 Mbps
-                latencyMs: 50,
-                packetLossRate: 0.01
-            },
-            '3g': {
-                downloadKbps: 1500,  // 1.5 Mbps
-                uploadKbps: 750,     // 750 Kbps
-                latencyMs: 100,
-                packetLossRate: 0.03
-            },
-            '2g': {
-                downloadKbps: 250,   // 250 Kbps
-                uploadKbps: 100,     // 100 Kbps
-                latencyMs: 300,
-                packetLossRate: 0.05
-            },
-            'slow-2g': {
-                downloadKbps: 50,    // 50 Kbps
-                uploadKbps: 20,      // 20 Kbps
-                latencyMs: 500,
-                packetLossRate: 0.08
-            },
-            'dial-up': {
-                downloadKbps: 30,    // 30 Kbps
-                uploadKbps: 10,      // 10 Kbps
-                latencyMs: 200,
-                packetLossRate: 0.02
-            },
-            'satellite': {
-                downloadKbps: 2000,  // 2 Mbps
-                uploadKbps: 1000,    // 1 Mbps
-                latencyMs: 600,      // High latency
-                packetLossRate: 0.04
-            }
-        };
+        // Trace profiles vary rate, latency and loss over time
+        if (NetworkEmulator.BUILTIN_TRACES[profileName]) {
+            return this.setNetworkTrace(profileName);
+        }
         
         // Get profile settings
-        const profile = profiles[profileName];
+        const profile = NETWORK_PROFILES[profileName];
         if (!profile) {
             throw new Error(`Unknown network profile: ${profileName}`);
         }
         
         // Apply profile settings
-        return this.updateSettings(profile);
+        return this.updateSettings({ ...profile, trace: null });
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Replays a network trace (built-in name or file path)        █
+     * █ null stops playback; the same seed reproduces the same run  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    setNetworkTrace(trace, seed = this.settings.traceSeed) {
+        return this.updateSettings({
+            trace,
+            traceSeed: seed,
+            latencyMs: 0,
+            jitterMs: 0,
+            packetLossRate: 0
+        });
     }
     
     /**
@@ -298,6 +404,25 @@ class NetworkThrottler {
         
         // Stop proxy
         this.stopProxy();
+        
+        // Stop trace playback
+        this.emulator.dispose();
+        
+        // Stop watching the domain rules file
+        this.policy.dispose();
+        
+        // Release any streams still waiting for budget
+        this.downloadScheduler.dispose();
+        this.uploadScheduler.dispose();
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Attaches the telemetry bus each stats tick publishes to     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    setTelemetryBus(bus) {
+        this.telemetryBus = bus;
     }
     
     /**
@@ -326,6 +451,11 @@ class NetworkThrottler {
         ipcMain.handle('set-network-profile', (event, { profile }) => {
             return this.setNetworkProfile(profile);
         });
+        
+        // Replay a network trace (null stops it)
+        ipcMain.handle('set-network-trace', (event, { trace, seed }) => {
+            return this.setNetworkTrace(trace, seed);
+        });
     }
     
     /**
@@ -335,6 +465,10 @@ class NetworkThrottler {
      * ███████████████████████████████████████████████████████████████
      */
     _startStatsCollection() {
+        if (this.statsInterval) {
+            return;
+        }
+        
         // Reset counters
         let lastDownloadedBytes = this.stats.totalBytesDownloaded;
         let lastUploadedBytes = this.stats.totalBytesUploaded;
@@ -353,9 +487,40 @@ class NetworkThrottler {
             this.stats.bytesDownloadedPerSecond = downloadedBytesPerSecond;
             this.stats.bytesUploadedPerSecond = uploadedBytesPerSecond;
             this.stats.activeConnections = this.activeConnections.size;
+            
+            this._publishStats();
         }, 1000);
     }
     
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Stops statistics collection                        █
+     * █ No proxy, no traffic: rates drop to zero                    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _stopStatsCollection() {
+        if (this.statsInterval) {
+            clearInterval(this.statsInterval);
+            this.statsInterval = null;
+        }
+        
+        this.stats.bytesDownloadedPerSecond = 0;
+        this.stats.bytesUploadedPerSecond = 0;
+        this.stats.activeConnections = 0;
+        this._publishStats();
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Publishes one sample to the telemetry bus          █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _publishStats() {
+        if (this.telemetryBus) {
+            this.telemetryBus.publish('network', this.getStats());
+        }
+    }
+    
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Private: Handles HTTP requests                              █
@@ -366,8 +531,45 @@ class NetworkThrottler {
         // Parse the requested URL
         const parsedUrl = url.parse(clientReq.url);
         
-        // Check if domain is excluded from throttling
-        const isExcluded = this._isDomainExcluded(parsedUrl.hostname);
+        // The host's rule decides exclusion, domain bucket, share and latency
+        const rule = this.policy.lookup(parsedUrl.hostname);
+        const isExcluded = Boolean(rule && rule.exclude);
+        
+        // Scheduler buckets for this request (the tab header is ours, not the site's)
+        const flow = this._flow(clientReq.headers[TAB_HEADER] || null, rule);
+        delete clientReq.headers[TAB_HEADER];
+        
+        // Plain HTTP GETs may be answered from the shared cache
+        if (!this.cache || !this.cache.accepts(clientReq)) {
+            this._forwardHttpRequest(clientReq, clientRes, parsedUrl, isExcluded, flow, null);
+            return;
+        }
+        
+        const cache = this.cache;
+        cache.lookup(clientReq, clientReq.url)
+            .then(async (entry) => {
+                // Fresh hits never touch the network, so no throttling applies
+                if (entry && entry.fresh && await cache.serve(entry, clientReq, clientRes)) {
+                    return;
+                }
+                this._forwardHttpRequest(clientReq, clientRes, parsedUrl, isExcluded, flow, entry, cache);
+            })
+            .catch((err) => {
+                console.error('Proxy cache lookup failed:', err.message);
+                this._forwardHttpRequest(clientReq, clientRes, parsedUrl, isExcluded, flow, null);
+            });
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Sends an HTTP request on to the target server      █
+     * █ With a cache: revalidates stale entries, stores responses   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _forwardHttpRequest(clientReq, clientRes, parsedUrl, isExcluded, flow, entry, cache = null) {
+        // A stale entry is revalidated, unless the browser sent its own validators
+        const ownValidators = clientReq.headers['if-none-match'] || clientReq.headers['if-modified-since'];
+        const revalidating = Boolean(entry) && !ownValidators;
         
         // Options for the outgoing request
         const options = {
@@ -376,22 +578,42 @@ class NetworkThrottler {
             port: parsedUrl.port || (parsedUrl.protocol === 'https:' ? 443 : 80),
             path: parsedUrl.path,
             method: clientReq.method,
-            headers: clientReq.headers
+            headers: revalidating ? { ...clientReq.headers, ...cache.validators(entry) } : clientReq.headers
         };
         
         // Create request to the target server
         const proxyReq = http.request(options, (proxyRes) => {
-            // Set response headers
-            clientRes.writeHead(proxyRes.statusCode, proxyRes.headers);
+            // Not modified: serve the stored body, refreshed
+            if (revalidating && proxyRes.statusCode === 304) {
+                proxyRes.resume();
+                cache.refresh(entry, proxyRes)
+                    .then(refreshed => cache.serve(refreshed, clientReq, clientRes, true))
+                    .then((served) => {
+                        // Evicted meanwhile: fetch it again, unconditionally
+                        if (!served) {
+                            this._forwardHttpRequest(clientReq, clientRes, parsedUrl, isExcluded, flow, null, cache);
+                        }
+                    })
+                    .catch((err) => {
+                        console.error('Proxy cache refresh failed:', err.message);
+                        clientRes.destroy();
+                    });
+                return;
+            }
             
-            // Add artificial latency if configured
-            if (this.settings.latencyMs > 0 && !isExcluded) {
-                setTimeout(() => {
-                    this._pipeResponse(proxyRes, clientRes, isExcluded);
-                }, this.settings.latencyMs);
-            } else {
-                this._pipeResponse(proxyRes, clientRes, isExcluded);
+            // Stored alongside the client's copy; committed only if complete
+            const writer = cache ? cache.createWriter(clientReq, clientReq.url, proxyRes) : null;
+            if (writer) {
+                proxyRes.pipe(writer);
             }
+            
+            // Set response headers
+            clientRes.writeHead(proxyRes.statusCode, cache
+                ? { ...proxyRes.headers, [ProxyCache.STATUS_HEADER]: 'MISS' }
+                : proxyRes.headers);
+            
+            // Headers go out with the first (emulated, delayed) body chunk
+            this._pipeResponse(proxyRes, clientRes, isExcluded, flow);
         });
         
         // Handle request errors
@@ -401,8 +623,14 @@ class NetworkThrottler {
             clientRes.end(`Proxy error: ${err.message}`);
         });
         
+        // A retry after eviction has no body left to send
+        if (clientReq.readableEnded) {
+            proxyReq.end();
+            return;
+        }
+        
         // Pipe client request to proxy request with upload throttling
-        this._pipeRequest(clientReq, proxyReq, isExcluded);
+        this._pipeRequest(clientReq, proxyReq, isExcluded, flow);
     }
     
     /**
@@ -417,8 +645,13 @@ class NetworkThrottler {
         const hostname = parsedUrl.hostname;
         const port = parsedUrl.port || 443;
         
-        // Check if domain is excluded from throttling
-        const isExcluded = this._isDomainExcluded(hostname);
+        // The host's rule decides exclusion, domain bucket, share and latency
+        const rule = this.policy.lookup(hostname);
+        const isExcluded = Boolean(rule && rule.exclude);
+        
+        // Tunnels carry no tab header, and Chromium shares proxy credentials across
+        // the session, so a CONNECT cannot be tied to a tab: tab limits skip HTTPS
+        const flow = this._flow(null, rule);
         
         // Create connection to target server
         const serverSocket = net.connect(port, hostname, () => {
@@ -427,14 +660,8 @@ class NetworkThrottler {
                                 'Proxy-agent: Internet-Server-Proxy\r\n' +
                                 '\r\n');
             
-            // Add artificial latency if configured
-            if (this.settings.latencyMs > 0 && !isExcluded) {
-                setTimeout(() => {
-                    this._setupTunnel(clientSocket, serverSocket, isExcluded);
-                }, this.settings.latencyMs);
-            } else {
-                this._setupTunnel(clientSocket, serverSocket, isExcluded);
-            }
+            // Latency is applied per chunk, in each direction
+            this._setupTunnel(clientSocket, serverSocket, isExcluded, flow);
         });
         
         // Track active connection
@@ -483,60 +710,10 @@ class NetworkThrottler {
      * █ Applies throttling to both directions                       █
      * ███████████████████████████████████████████████████████████████
      */
-    _setupTunnel(clientSocket, serverSocket, isExcluded) {
-        // Apply download throttling (server -> client)
-        if (this.settings.downloadKbps > 0 && !isExcluded) {
-            const downloadThrottle = new Throttle({ rate: this.settings.downloadKbps * 1024 / 8 });
-            
-            // Track downloaded bytes
-            downloadThrottle.on('data', (chunk) => {
-                this.stats.totalBytesDownloaded += chunk.length;
-            });
-            
-            // Pipe through throttle
-            serverSocket.pipe(downloadThrottle).pipe(clientSocket);
-        } else {
-            // Direct pipe with byte counting
-            serverSocket.on('data', (chunk) => {
-                this.stats.totalBytesDownloaded += chunk.length;
-                
-                // Simulate packet loss
-                if (!isExcluded && this.settings.packetLossRate > 0 && 
-                    Math.random() < this.settings.packetLossRate) {
-                    // Drop packet
-                    return;
-                }
-                
-                clientSocket.write(chunk);
-            });
-        }
-        
-        // Apply upload throttling (client -> server)
-        if (this.settings.uploadKbps > 0 && !isExcluded) {
-            const uploadThrottle = new Throttle({ rate: this.settings.uploadKbps * 1024 / 8 });
-            
-            // Track uploaded bytes
-            uploadThrottle.on('data', (chunk) => {
-                this.stats.totalBytesUploaded += chunk.length;
-            });
-            
-            // Pipe through throttle
-            clientSocket.pipe(uploadThrottle).pipe(serverSocket);
-        } else {
-            // Direct pipe with byte counting
-            clientSocket.on('data', (chunk) => {
-                this.stats.totalBytesUploaded += chunk.length;
-                
-                // Simulate packet loss
-                if (!isExcluded && this.settings.packetLossRate > 0 && 
-                    Math.random() < this.settings.packetLossRate) {
-                    // Drop packet
-                    return;
-                }
-                
-                serverSocket.write(chunk);
-            });
-        }
+    _setupTunnel(clientSocket, serverSocket, isExcluded, flow) {
+        // Download (server -> client) and upload (client -> server)
+        this._pipeThrough(serverSocket, clientSocket, 'download', isExcluded, flow);
+        this._pipeThrough(clientSocket, serverSocket, 'upload', isExcluded, flow);
     }
     
     /**
@@ -545,37 +722,8 @@ class NetworkThrottler {
      * █ Used for HTTP request bodies (client -> server)             █
      * ███████████████████████████████████████████████████████████████
      */
-    _pipeRequest(clientReq, proxyReq, isExcluded) {
-        // Apply upload throttling
-        if (this.settings.uploadKbps > 0 && !isExcluded) {
-            const uploadThrottle = new Throttle({ rate: this.settings.uploadKbps * 1024 / 8 });
-            
-            // Track uploaded bytes
-            uploadThrottle.on('data', (chunk) => {
-                this.stats.totalBytesUploaded += chunk.length;
-            });
-            
-            // Pipe through throttle
-            clientReq.pipe(uploadThrottle).pipe(proxyReq);
-        } else {
-            // Direct pipe with byte counting
-            clientReq.on('data', (chunk) => {
-                this.stats.totalBytesUploaded += chunk.length;
-                
-                // Simulate packet loss
-                if (!isExcluded && this.settings.packetLossRate > 0 && 
-                    Math.random() < this.settings.packetLossRate) {
-                    // Drop packet
-                    return;
-                }
-                
-                proxyReq.write(chunk);
-            });
-            
-            clientReq.on('end', () => {
-                proxyReq.end();
-            });
-        }
+    _pipeRequest(clientReq, proxyReq, isExcluded, flow) {
+        this._pipeThrough(clientReq, proxyReq, 'upload', isExcluded, flow);
     }
     
     /**
@@ -584,63 +732,142 @@ class NetworkThrottler {
      * █ Used for HTTP response bodies (server -> client)            █
      * ███████████████████████████████████████████████████████████████
      */
-    _pipeResponse(proxyRes, clientRes, isExcluded) {
-        // Apply download throttling
-        if (this.settings.downloadKbps > 0 && !isExcluded) {
-            const downloadThrottle = new Throttle({ rate: this.settings.downloadKbps * 1024 / 8 });
-            
-            // Track downloaded bytes
-            downloadThrottle.on('data', (chunk) => {
-                this.stats.totalBytesDownloaded += chunk.length;
-            });
-            
-            // Pipe through throttle
-            proxyRes.pipe(downloadThrottle).pipe(clientRes);
-        } else {
-            // Direct pipe with byte counting
-            proxyRes.on('data', (chunk) => {
-                this.stats.totalBytesDownloaded += chunk.length;
-                
-                // Simulate packet loss
-                if (!isExcluded && this.settings.packetLossRate > 0 && 
-                    Math.random() < this.settings.packetLossRate) {
-                    // Drop packet
-                    return;
-                }
-                
-                clientRes.write(chunk);
-            });
+    _pipeResponse(proxyRes, clientRes, isExcluded, flow) {
+        this._pipeThrough(proxyRes, clientRes, 'download', isExcluded, flow);
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Pipes one direction through the shared scheduler   █
+     * █ Counts bytes; only excluded hosts bypass the scheduler      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _pipeThrough(source, destination, direction, isExcluded, flow) {
+        const scheduler = direction === 'download' ? this.downloadScheduler : this.uploadScheduler;
+        const counter = direction === 'download' ? 'totalBytesDownloaded' : 'totalBytesUploaded';
+        let stream = source;
+        
+        // Emulated latency, jitter and loss: every byte arrives, in order, later
+        if (!isExcluded && (flow.conditions || this.emulator.isActive())) {
+            const delayed = this.emulator.createDelayStream(direction, flow.conditions);
+            destination.on('close', () => delayed.destroy());
+            stream = stream.pipe(delayed);
+        }
+        
+        // Limits may be set while the connection is open (settings, a playing
+        // trace), so every flow is metered; unlimited chunks pass straight through
+        if (!isExcluded) {
+            const metered = scheduler.createStream(flow);
             
-            proxyRes.on('end', () => {
-                clientRes.end();
-            });
+            // Give the budget back if the receiving side goes away
+            destination.on('close', () => metered.destroy());
+            stream = stream.pipe(metered);
         }
+        
+        // Track bytes as they are released to the other side
+        stream.on('data', (chunk) => {
+            this.stats[counter] += chunk.length;
+        });
+        
+        stream.pipe(destination);
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Pushes the configured limits into the schedulers   █
+     * █ Kbps settings become bytes per second per bucket            █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _configureSchedulers() {
+        const toBytes = (kbps) => (kbps > 0 ? kbps * 1024 / 8 : 0);
+        const convert = (limits) => Object.fromEntries(
+            Object.entries(limits || {}).map(([key, kbps]) => [key, toBytes(kbps)])
+        );
+        
+        const tabRates = convert(this.settings.tabLimits);
+        
+        // A playing trace overrides the configured global rates
+        const rates = this.emulator.trace ? this.emulator.conditions() : this.settings;
+        
+        this.downloadScheduler.configure({
+            rate: toBytes(rates.downloadKbps),
+            tabRates,
+            domainRates: this.policy.domainRates('download')
+        });
+        this.uploadScheduler.configure({
+            rate: toBytes(rates.uploadKbps),
+            tabRates,
+            domainRates: this.policy.domainRates('upload')
+        });
     }
     
     /**
      * ███████████████████████████████████████████████████████████████
-     * █ Private: Checks if domain is excluded from throttling       █
-     * █ Allows certain domains to bypass throttling                 █
+     * █ Private: Opens, reopens or drops the shared HTTP cache      █
+     * █ Only a changed directory or budget replaces the instance    █
      * ███████████████████████████████████████████████████████████████
      */
-    _isDomainExcluded(hostname) {
-        if (!hostname || !this.settings.excludedDomains.length) {
-            return false;
+    _syncCache() {
+        const settings = this.settings.cache || {};
+        if (!settings.enabled) {
+            this.cache = null;
+            return;
         }
         
-        return this.settings.excludedDomains.some(domain => {
-            // Exact match
-            if (hostname === domain) {
-                return true;
+        let directory = settings.directory;
+        if (!directory) {
+            try {
+                directory = path.join(require('electron').app.getPath('userData'), 'proxy-cache');
+            } catch (err) {
+                console.error('Proxy cache has no directory:', err.message);
+                this.cache = null;
+                return;
             }
-            
-            // Wildcard match (*.example.com)
-            if (domain.startsWith('*.') && hostname.endsWith(domain.substring(1))) {
-                return true;
-            }
-            
-            return false;
-        });
+        }
+        
+        const maxBytes = (settings.maxMB || 256) * 1024 * 1024;
+        if (this.cache && this.cache.directory === directory && this.cache.maxBytes === maxBytes) {
+            return;
+        }
+        
+        try {
+            this.cache = new ProxyCache(directory, maxBytes);
+            console.log(`Proxy cache: ${directory} (${settings.maxMB || 256} MB)`);
+        } catch (err) {
+            console.error('Failed to open proxy cache:', err.message);
+            this.cache = null;
+        }
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Compiles the domain rules from every setting       █
+     * █ excludedDomains, domainLimits and domainWeights are rules   █
+     * █ too; domainRules and the rules file add to them             █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _syncPolicy() {
+        const rules = [
+            ...this.settings.excludedDomains.map(pattern => ({ pattern, exclude: true })),
+            ...Object.entries(this.settings.domainLimits).map(([pattern, kbps]) => ({ pattern, kbps })),
+            ...Object.entries(this.settings.domainWeights).map(([pattern, weight]) => ({ pattern, weight })),
+            ...(this.settings.domainRules || [])
+        ];
+        this.policy.configure({ rules, file: this.settings.domainRulesFile || null });
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Scheduler and emulator inputs for one connection   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _flow(tab, rule) {
+        return {
+            tab,
+            domain: rule ? rule.pattern : null,
+            weight: rule ? rule.weight : 1,
+            conditions: rule ? rule.conditions : null
+        };
     }
 }
 
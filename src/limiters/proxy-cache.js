@@ -0,0 +1,498 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Proxy Cache
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Shared HTTP cache for the throttling proxy (plain HTTP only) ║
+ * ║ Content-addressed bodies, one small index file per URL       ║
+ * ║ Safe to share between browser instances on one host          ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Cache-Control / Expires freshness, ETag and Last-Modified revalidation
+ * - [+] Identical bodies stored once (sha256 of the content)
+ * - [+] LRU eviction under a byte budget (index mtime = last use)
+ * - [+] Hit ratio and upstream bytes saved
+ *
+ * Layout: <dir>/objects/<2 hex>/<sha256>  bodies
+ *         <dir>/index/<sha256 of URL>.json  status, headers, freshness
+ *         <dir>/tmp/                        bodies being written
+ * Files are written to tmp/ and renamed into place, so concurrent
+ * instances never see partial bodies or index entries.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const { Writable } = require('stream');
+
+// Responses that may be cached without explicit freshness (RFC 9110 15.1)
+const CACHEABLE_STATUS = new Set([200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501]);
+
+// Headers that describe the connection, not the resource
+const HOP_BY_HOP_HEADERS = new Set([
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade', 'age'
+]);
+
+// Heuristic freshness: 10% of the time since Last-Modified, capped
+const HEURISTIC_FRACTION = 0.1;
+const MAX_HEURISTIC_MS = 24 * 60 * 60 * 1000;
+
+// Eviction trims to this fraction of the budget so it does not run per store
+const EVICT_TARGET = 0.9;
+
+// Response header telling the browser (and tests) how a request was served
+const CACHE_STATUS_HEADER = 'x-internet-server-cache';
+
+class ProxyCache {
+    constructor(directory, maxBytes = 256 * 1024 * 1024) {
+        this.directory = directory;
+        this.maxBytes = maxBytes;
+        // One object may use at most an eighth of the budget
+        this.maxObjectBytes = Math.floor(maxBytes / 8);
+
+        this.diskBytes = 0;
+        this.evicting = null;
+
+        this.stats = {
+            requests: 0,
+            hits: 0,
+            revalidated: 0,
+            misses: 0,
+            bypassed: 0,
+            stored: 0,
+            evicted: 0,
+            bytesServed: 0,
+            bytesSaved: 0
+        };
+
+        for (const sub of ['objects', 'index', 'tmp']) {
+            fs.mkdirSync(path.join(directory, sub), { recursive: true });
+        }
+
+        // Pick up what other instances (or earlier runs) stored
+        this._evict().catch(err => console.error('Proxy cache scan failed:', err.message));
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Whether a request may be answered from or stored in cache   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    accepts(req) {
+        this.stats.requests++;
+        const cacheControl = this._directives(req.headers['cache-control']);
+        const cacheable = req.method === 'GET' &&
+            !req.headers.authorization &&
+            !req.headers.range &&
+            !('no-store' in cacheControl);
+        if (!cacheable) {
+            this.stats.bypassed++;
+        }
+        return cacheable;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Finds the stored entry for a request                        █
+     * █ Resolves null, or { meta, fresh, indexPath, bodyPath }      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async lookup(req, requestUrl) {
+        const indexPath = this._indexPath(requestUrl);
+        let meta;
+        try {
+            meta = JSON.parse(await fs.promises.readFile(indexPath, 'utf8'));
+        } catch (err) {
+            return null;
+        }
+
+        // A different variant of the resource (Vary) counts as a miss
+        for (const [name, value] of Object.entries(meta.vary || {})) {
+            if ((req.headers[name] || '') !== value) {
+                return null;
+            }
+        }
+
+        const requestDirectives = this._directives(req.headers['cache-control']);
+        const forceRevalidate = 'no-cache' in requestDirectives || req.headers.pragma === 'no-cache';
+        return {
+            meta,
+            indexPath,
+            bodyPath: this._bodyPath(meta.bodyHash),
+            fresh: !forceRevalidate && Date.now() < meta.freshUntil
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Headers that turn a stale entry into a conditional request  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    validators(entry) {
+        const headers = {};
+        if (entry.meta.etag) {
+            headers['if-none-match'] = entry.meta.etag;
+        }
+        if (entry.meta.lastModified) {
+            headers['if-modified-since'] = entry.meta.lastModified;
+        }
+        return headers;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Answers a request from disk                                 █
+     * █ Resolves false if the body has been evicted meanwhile       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async serve(entry, req, res, revalidated = false) {
+        let handle;
+        try {
+            handle = await fs.promises.open(entry.bodyPath, 'r');
+        } catch (err) {
+            fs.promises.unlink(entry.indexPath).catch(() => {});
+            return false;
+        }
+
+        const { meta } = entry;
+        const age = Math.max(0, Math.round((Date.now() - meta.storedAt) / 1000) + (meta.initialAge || 0));
+        const status = revalidated ? 'REVALIDATED' : 'HIT';
+        this.stats[revalidated ? 'revalidated' : 'hits']++;
+        this._touch(entry.indexPath);
+
+        // The browser's own validator matches: no body needed
+        if (meta.etag && req.headers['if-none-match'] === meta.etag) {
+            await handle.close();
+            res.writeHead(304, { etag: meta.etag, age: String(age), [CACHE_STATUS_HEADER]: status });
+            res.end();
+            return true;
+        }
+
+        res.writeHead(meta.status, {
+            ...meta.headers,
+            'content-length': String(meta.size),
+            age: String(age),
+            [CACHE_STATUS_HEADER]: status
+        });
+
+        const body = handle.createReadStream();
+        // A revalidated body still saves its download: only headers crossed the wire
+        body.on('data', (chunk) => {
+            this.stats.bytesServed += chunk.length;
+            this.stats.bytesSaved += chunk.length;
+        });
+        body.on('error', () => res.destroy());
+        body.pipe(res);
+        return true;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Updates a stored entry after a 304 Not Modified             █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async refresh(entry, upstreamRes) {
+        const meta = {
+            ...entry.meta,
+            headers: { ...entry.meta.headers, ...this._storableHeaders(upstreamRes.headers) },
+            storedAt: Date.now(),
+            initialAge: parseInt(upstreamRes.headers.age, 10) || 0
+        };
+        meta.freshUntil = this._freshUntil(meta.status, meta.headers, meta.storedAt, meta.initialAge);
+        if (upstreamRes.headers.etag) {
+            meta.etag = upstreamRes.headers.etag;
+        }
+        await this._writeAtomic(entry.indexPath, JSON.stringify(meta));
+        entry.meta = meta;
+        return entry;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Returns a stream that stores the upstream body, or null     █
+     * █ Pipe the upstream response into it alongside the client     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    createWriter(req, requestUrl, upstreamRes) {
+        this.stats.misses++;
+        if (!this._storable(upstreamRes)) {
+            return null;
+        }
+
+        const tmpPath = path.join(this.directory, 'tmp', `${process.pid}-${crypto.randomBytes(8).toString('hex')}`);
+        const file = fs.createWriteStream(tmpPath);
+        const hash = crypto.createHash('sha256');
+        const cache = this;
+        let size = 0;
+        let failed = false;
+
+        const fail = () => {
+            if (!failed) {
+                failed = true;
+                file.destroy();
+                fs.promises.unlink(tmpPath).catch(() => {});
+            }
+        };
+
+        file.on('error', fail);
+        // Aborted upstream responses must never be stored
+        upstreamRes.on('aborted', fail);
+
+        const writer = new Writable({
+            write(chunk, encoding, callback) {
+                size += chunk.length;
+                if (failed || size > cache.maxObjectBytes) {
+                    fail();
+                    callback();
+                    return;
+                }
+                hash.update(chunk);
+                file.write(chunk, () => callback());
+            },
+            final(callback) {
+                if (failed || !upstreamRes.complete) {
+                    fail();
+                    callback();
+                    return;
+                }
+                file.end(() => {
+                    cache._commit(tmpPath, hash.digest('hex'), size, req, requestUrl, upstreamRes)
+                        .catch(err => {
+                            console.error('Proxy cache store failed:', err.message);
+                            fs.promises.unlink(tmpPath).catch(() => {});
+                        });
+                    callback();
+                });
+            }
+        });
+        writer.on('error', fail);
+        return writer;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Gets hit ratio, bytes saved and disk usage                  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getStats() {
+        const lookups = this.stats.hits + this.stats.revalidated + this.stats.misses;
+        return {
+            ...this.stats,
+            hitRatio: lookups ? Math.round((this.stats.hits + this.stats.revalidated) / lookups * 1000) / 1000 : 0,
+            diskBytes: this.diskBytes,
+            maxBytes: this.maxBytes,
+            directory: this.directory
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Moves a finished body and its index into place     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _commit(tmpPath, bodyHash, size, req, requestUrl, upstreamRes) {
+        const bodyPath = this._bodyPath(bodyHash);
+        await fs.promises.mkdir(path.dirname(bodyPath), { recursive: true });
+
+        // Same content already stored (by any instance): keep one copy
+        try {
+            await fs.promises.access(bodyPath);
+            await fs.promises.unlink(tmpPath);
+        } catch (err) {
+            await fs.promises.rename(tmpPath, bodyPath);
+            this.diskBytes += size;
+        }
+
+        const headers = this._storableHeaders(upstreamRes.headers);
+        const storedAt = Date.now();
+        const initialAge = parseInt(upstreamRes.headers.age, 10) || 0;
+        const vary = {};
+        for (const name of (upstreamRes.headers.vary || '').split(',').map(v => v.trim().toLowerCase()).filter(Boolean)) {
+            vary[name] = req.headers[name] || '';
+        }
+
+        const meta = {
+            url: requestUrl,
+            status: upstreamRes.statusCode,
+            headers,
+            vary,
+            bodyHash,
+            size,
+            storedAt,
+            initialAge,
+            freshUntil: this._freshUntil(upstreamRes.statusCode, headers, storedAt, initialAge),
+            etag: upstreamRes.headers.etag || null,
+            lastModified: upstreamRes.headers['last-modified'] || null
+        };
+        await this._writeAtomic(this._indexPath(requestUrl), JSON.stringify(meta));
+        this.stats.stored++;
+
+        if (this.diskBytes > this.maxBytes) {
+            await this._evict();
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Whether an upstream response may be stored         █
+     * █ Shared-cache rules: no private, no-store or cookies         █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _storable(upstreamRes) {
+        const headers = upstreamRes.headers;
+        const directives = this._directives(headers['cache-control']);
+        if (!CACHEABLE_STATUS.has(upstreamRes.statusCode) ||
+            'no-store' in directives || 'private' in directives ||
+            headers['set-cookie'] || (headers.vary || '').includes('*')) {
+            return false;
+        }
+
+        const length = parseInt(headers['content-length'], 10);
+        return !(length > this.maxObjectBytes);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Epoch ms until which a response is fresh           █
+     * █ s-maxage > max-age > Expires > Last-Modified heuristic      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _freshUntil(status, headers, storedAt, initialAge) {
+        const directives = this._directives(headers['cache-control']);
+        if ('no-cache' in directives) {
+            return 0; // Store, but revalidate every time
+        }
+
+        const ageMs = initialAge * 1000;
+        const maxAge = parseInt(directives['s-maxage'] !== undefined ? directives['s-maxage'] : directives['max-age'], 10);
+        if (Number.isFinite(maxAge)) {
+            return storedAt + maxAge * 1000 - ageMs;
+        }
+
+        const date = Date.parse(headers.date) || storedAt;
+        if (headers.expires) {
+            const expires = Date.parse(headers.expires);
+            return Number.isFinite(expires) ? storedAt + (expires - date) - ageMs : 0;
+        }
+
+        const lastModified = Date.parse(headers['last-modified']);
+        if (Number.isFinite(lastModified) && status === 200) {
+            return storedAt + Math.min(MAX_HEURISTIC_MS, (date - lastModified) * HEURISTIC_FRACTION) - ageMs;
+        }
+        return 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Deletes least recently used entries over budget    █
+     * █ Rescans the shared directory, so other instances' entries   █
+     * █ count too; bodies are deleted once nothing references them  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _evict() {
+        if (this.evicting) {
+            return this.evicting;
+        }
+
+        this.evicting = (async () => {
+            const indexDir = path.join(this.directory, 'index');
+            const entries = [];
+            const references = new Map(); // body hash -> index entries using it
+            for (const name of await fs.promises.readdir(indexDir)) {
+                const indexPath = path.join(indexDir, name);
+                try {
+                    const [text, stat] = await Promise.all([
+                        fs.promises.readFile(indexPath, 'utf8'),
+                        fs.promises.stat(indexPath)
+                    ]);
+                    const meta = JSON.parse(text);
+                    entries.push({ indexPath, bodyHash: meta.bodyHash, size: meta.size, lastUsed: stat.mtimeMs });
+                    references.set(meta.bodyHash, (references.get(meta.bodyHash) || 0) + 1);
+                } catch (err) {
+                    // Removed by another instance, or not ours
+                }
+            }
+
+            const bodySizes = new Map(entries.map(entry => [entry.bodyHash, entry.size]));
+            let total = Array.from(bodySizes.values()).reduce((sum, size) => sum + size, 0);
+
+            // Oldest use first
+            entries.sort((a, b) => a.lastUsed - b.lastUsed);
+            for (const entry of entries) {
+                if (total <= this.maxBytes * EVICT_TARGET) {
+                    break;
+                }
+                await fs.promises.unlink(entry.indexPath).catch(() => {});
+                this.stats.evicted++;
+                const remaining = references.get(entry.bodyHash) - 1;
+                references.set(entry.bodyHash, remaining);
+                if (remaining === 0) {
+                    await fs.promises.unlink(this._bodyPath(entry.bodyHash)).catch(() => {});
+                    total -= entry.size;
+                }
+            }
+            this.diskBytes = total;
+        })().finally(() => {
+            this.evicting = null;
+        });
+
+        return this.evicting;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Helpers                                            █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _indexPath(requestUrl) {
+        const key = crypto.createHash('sha256').update(requestUrl).digest('hex');
+        return path.join(this.directory, 'index', `${key}.json`);
+    }
+
+    _bodyPath(bodyHash) {
+        return path.join(this.directory, 'objects', bodyHash.slice(0, 2), bodyHash);
+    }
+
+    _directives(header) {
+        const directives = {};
+        for (const part of (header || '').split(',')) {
+            const [name, value] = part.split('=');
+            if (name.trim()) {
+                directives[name.trim().toLowerCase()] = value === undefined ? true : value.trim().replace(/^"|"$/g, '');
+            }
+        }
+        return directives;
+    }
+
+    _storableHeaders(headers) {
+        const stored = {};
+        for (const [name, value] of Object.entries(headers)) {
+            if (!HOP_BY_HOP_HEADERS.has(name) && !name.startsWith('proxy-') &&
+                name !== 'content-length' && name !== CACHE_STATUS_HEADER) {
+                stored[name] = value;
+            }
+        }
+        return stored;
+    }
+
+    _touch(indexPath) {
+        const now = new Date();
+        fs.promises.utimes(indexPath, now, now).catch(() => {});
+    }
+
+    async _writeAtomic(target, text) {
+        const tmpPath = path.join(this.directory, 'tmp', `${process.pid}-${crypto.randomBytes(8).toString('hex')}`);
+        await fs.promises.writeFile(tmpPath, text);
+        await fs.promises.rename(tmpPath, target);
+    }
+}
+
+ProxyCache.STATUS_HEADER = CACHE_STATUS_HEADER;
+
+module.exports = ProxyCache;
@@ -0,0 +1,281 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Resource Sampler Client
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Connects to the launcher's psutil sampler sidecar            ║
+ * ║ Receives one record per interval for the whole process tree  ║
+ * ║ Lets the limiters measure without forking top or PowerShell  ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Tree-wide CPU, RSS, IO and thread counts
+ * - [+] Per-process breakdown (main, renderer, gpu-process, ...)
+ * - [+] Staleness check so limiters can fall back cleanly
+ * - [+] Binary records through a /dev/shm ring on Linux, JSON lines elsewhere
+ * - [+] Sampling interval follows the limiters that read it
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const net = require('net');
+const { EventEmitter } = require('events');
+
+const ShmChannel = require('./shm-ring');
+
+const { KIND, COMMAND, PROCESS_TYPES, DOORBELL } = ShmChannel;
+
+class SamplerClient extends EventEmitter {
+    constructor() {
+        super();
+
+        // Connection settings (from the launcher environment)
+        this.port = parseInt(process.env.INTERNET_SERVER_SAMPLER_PORT, 10) || 0;
+        this.token = process.env.INTERNET_SERVER_SAMPLER_TOKEN || '';
+
+        // State
+        this.socket = null;
+        this.connected = false;
+        this.buffer = '';
+        this.latest = null;
+        this.latestReceivedAt = 0;
+
+        // Shared memory channel, once the sampler has offered one
+        this.channel = null;
+        this.assembling = null;
+        this.onRecord = (record) => this._onRecord(record);
+
+        // Requested sampling interval (0 = the sampler's default)
+        this.intervalMs = 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Whether a sampler sidecar was provided by the launcher      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    isAvailable() {
+        return this.port > 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Connects to the sampler and asks it to sample our tree      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    connect() {
+        if (!this.isAvailable() || this.socket) {
+            return;
+        }
+
+        this.socket = net.connect({ host: '127.0.0.1', port: this.port }, () => {
+            this.connected = true;
+            this.socket.write(JSON.stringify({
+                hello: process.pid,
+                token: this.token,
+                shm: ShmChannel.isSupported()
+            }) + '\n');
+            if (this.intervalMs) {
+                this._sendInterval();
+            }
+            console.log(`Resource sampler connected on port ${this.port}`);
+        });
+
+        this.socket.setEncoding('utf8');
+
+        this.socket.on('data', (chunk) => {
+            this._onData(chunk);
+        });
+
+        this.socket.on('error', (err) => {
+            console.error('Resource sampler connection error:', err.message);
+        });
+
+        this.socket.on('close', () => {
+            this.connected = false;
+            this.socket = null;
+            this._closeChannel();
+            this.emit('disconnected');
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Asks the sampler for one record every intervalMs            █
+     * ███████████████████████████████████████████████████████████████
+     */
+    setSamplingInterval(intervalMs) {
+        if (!intervalMs || intervalMs === this.intervalMs) {
+            return;
+        }
+        this.intervalMs = intervalMs;
+        if (this.connected) {
+            this._sendInterval();
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Returns the latest sample if it is recent enough            █
+     * █ maxAgeMs bounds how stale a reading may be                  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getLatest(maxAgeMs = 5000) {
+        if (!this.connected || !this.latest) {
+            return null;
+        }
+
+        if (Date.now() - this.latestReceivedAt > maxAgeMs) {
+            return null;
+        }
+
+        return this.latest;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Closes the connection to the sampler                        █
+     * ███████████████████████████████████████████████████████████████
+     */
+    dispose() {
+        if (this.socket) {
+            this.socket.destroy();
+            this.socket = null;
+        }
+        this._closeChannel();
+        this.connected = false;
+        this.removeAllListeners();
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Splits the stream into JSON line records           █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _onData(chunk) {
+        // On a shared memory channel the socket only carries doorbells
+        if (this.channel) {
+            this._drainChannel();
+            return;
+        }
+
+        this.buffer += chunk;
+
+        let newline;
+        while ((newline = this.buffer.indexOf('\n')) !== -1) {
+            const line = this.buffer.slice(0, newline);
+            this.buffer = this.buffer.slice(newline + 1);
+
+            if (!line) {
+                continue;
+            }
+
+            let message;
+            try {
+                message = JSON.parse(line);
+            } catch (err) {
+                console.error('Malformed resource sample:', err.message);
+                continue;
+            }
+
+            if (message.shm) {
+                this._openChannel(message.shm);
+                if (this.channel) {
+                    this.buffer = '';
+                    this._drainChannel();
+                    return;
+                }
+                continue;
+            }
+            this._setLatest(message);
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Opens the sampler's channel or falls back to JSON  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _openChannel(path) {
+        try {
+            this.channel = ShmChannel.attach(path);
+            console.log(`Resource sampler using shared memory channel ${path}`);
+        } catch (err) {
+            console.error('Resource sampler channel unavailable, using JSON lines:', err.message);
+            this.socket.write(JSON.stringify({ shm: false }) + '\n');
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Reads every record the sampler has published       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _drainChannel() {
+        this.channel.inbound.receive(this.onRecord);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Rebuilds a sample from its TREE and PROC records   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _onRecord(record) {
+        const values = record.values;
+        if (record.kind === KIND.TREE) {
+            this.assembling = {
+                t: record.t,
+                pid: record.pid,
+                cpu: values[0],
+                sys: values[1],
+                rss: values[2],
+                ior: values[3],
+                iow: values[4],
+                thr: values[5],
+                n: values[6],
+                procs: []
+            };
+        } else if (record.kind === KIND.PROC && this.assembling) {
+            this.assembling.procs.push([record.pid, PROCESS_TYPES[record.code] || 'other', values[0], values[1]]);
+        } else {
+            return;
+        }
+
+        if (this.assembling.procs.length === this.assembling.n) {
+            this._setLatest(this.assembling);
+            this.assembling = null;
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Sends the sampling interval on the current channel █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _sendInterval() {
+        if (this.channel) {
+            this.channel.outbound.write(KIND.COMMAND, COMMAND.SET_INTERVAL, process.pid, Date.now() / 1000, [this.intervalMs]);
+            this.socket.write(DOORBELL);
+        } else {
+            this.socket.write(JSON.stringify({ interval: this.intervalMs }) + '\n');
+        }
+    }
+
+    _setLatest(sample) {
+        this.latest = sample;
+        this.latestReceivedAt = Date.now();
+        this.emit('sample', this.latest);
+    }
+
+    _closeChannel() {
+        if (this.channel) {
+            this.channel.close();
+            this.channel = null;
+        }
+        this.assembling = null;
+    }
+}
+
+module.exports = SamplerClient;
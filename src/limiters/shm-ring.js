@@ -0,0 +1,256 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Shared Memory Record Rings
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Electron side of the launcher's /dev/shm record channel      ║
+ * ║ Fixed binary records in, commands out, no JSON either way    ║
+ * ║ Layout and doorbell rules: launcher/shm_ring.py              ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Reads ring 0 (launcher -> Electron) ahead in contiguous batches
+ * - [+] Writes commands to ring 1 (Electron -> launcher)
+ * - [+] Decodes records in place into one reused record object
+ * - [+] Woken by doorbell bytes on the sampler socket, idle otherwise
+ * - [+] One file read per wake-up, however many records arrived
+ *
+ * Node.js core cannot map a file, so the channel file is accessed with
+ * positioned reads and writes into buffers allocated once per ring. On
+ * tmpfs these hit the same pages the launcher has mapped.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const fs = require('fs');
+const os = require('os');
+
+const SHM_DIR = '/dev/shm';
+
+const MAGIC = 'ISRB';
+const VERSION = 1;
+const RECORD_SIZE = 96;
+const VALUES = 9;
+
+// Slots fetched per read while draining
+const READ_AHEAD = 16;
+
+const HEADER_SIZE = 64;
+const RING_HEADER_SIZE = 128;
+const SLOTS_OFFSET = HEADER_SIZE + 2 * RING_HEADER_SIZE;
+
+// Field offsets within a ring header
+const WRITE_SEQ = 0;
+const DROPPED = 8;
+const READ_SEQ = 64;
+
+const DOORBELL = '\x01';
+
+// Record kinds and commands (see launcher/shm_ring.py)
+const KIND = { TREE: 1, PROC: 2, COMMAND: 3 };
+const COMMAND = { SET_INTERVAL: 1 };
+const PROCESS_TYPES = ['main', 'renderer', 'gpu-process', 'utility', 'zygote',
+    'crashpad-handler', 'broker', 'ppapi', 'other'];
+
+class ShmRing {
+    constructor(fd, header, slots, capacity) {
+        this.fd = fd;
+        this.header = header;
+        this.slots = slots;
+        this.capacity = capacity;
+
+        // Allocated once: header words, a read-ahead batch, one outgoing record
+        this.word = Buffer.alloc(8);
+        this.records = Buffer.alloc(Math.min(READ_AHEAD, capacity) * RECORD_SIZE);
+        this.doubles = new Float64Array(this.records.buffer, this.records.byteOffset, this.records.length / 8);
+        this.words = new Uint32Array(this.records.buffer, this.records.byteOffset, this.records.length / 4);
+        this.halves = new Uint16Array(this.records.buffer, this.records.byteOffset, this.records.length / 2);
+        this.outgoing = Buffer.alloc(RECORD_SIZE);
+
+        // Reused for every decoded record
+        this.record = { kind: 0, code: 0, pid: 0, t: 0, values: new Float64Array(VALUES) };
+
+        this.readSeq = this._readSeq(header + READ_SEQ);
+        this.releasedSeq = this.readSeq;
+        this.writeSeq = this._readSeq(header + WRITE_SEQ);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Calls onRecord for every published record; run it whenever  █
+     * █ a doorbell arrives. The record object is reused: copy what  █
+     * █ must outlive the callback                                   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    receive(onRecord) {
+        const count = this._drain(onRecord);
+
+        // The writer only needs the read seq to find free slots
+        if (this.readSeq - this.releasedSeq >= this.capacity / 4) {
+            this._writeSeq(this.header + READ_SEQ, this.readSeq);
+            this.releasedSeq = this.readSeq;
+        }
+        return count;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Appends and publishes one record; false if the ring is full █
+     * ███████████████████████████████████████████████████████████████
+     */
+    write(kind, code = 0, pid = 0, t = 0, values = []) {
+        if (this.writeSeq - this._readSeq(this.header + READ_SEQ) >= this.capacity) {
+            this._writeWord(this.header + DROPPED, this._readWord(this.header + DROPPED) + 1);
+            return false;
+        }
+
+        const record = this.outgoing;
+        record.fill(0);
+        record.writeUInt16LE(kind, 8);
+        record.writeUInt16LE(code, 10);
+        record.writeUInt32LE(pid, 12);
+        record.writeDoubleLE(t, 16);
+        for (let v = 0; v < Math.min(values.length, VALUES); v++) {
+            record.writeDoubleLE(values[v], 24 + v * 8);
+        }
+
+        // The record with seq 0 first, then its seq: a reader never sees half of it
+        const position = this.slots + (this.writeSeq % this.capacity) * RECORD_SIZE;
+        fs.writeSync(this.fd, record, 0, RECORD_SIZE, position);
+        this.writeSeq++;
+        this._writeSeq(position, this.writeSeq);
+        this._writeSeq(this.header + WRITE_SEQ, this.writeSeq);
+        return true;
+    }
+
+    dropped() {
+        return this._readWord(this.header + DROPPED);
+    }
+
+    _drain(onRecord) {
+        const record = this.record;
+        let count = 0;
+
+        // Records carry their sequence number, so slots are read ahead of the write seq
+        for (;;) {
+            const index = this.readSeq % this.capacity;
+            const batch = Math.min(READ_AHEAD, this.capacity - index);
+            fs.readSync(this.fd, this.records, 0, batch * RECORD_SIZE, this.slots + index * RECORD_SIZE);
+
+            // Typed array views decode in place (little-endian hosts only)
+            for (let i = 0; i < batch; i++) {
+                const word = i * RECORD_SIZE / 4;
+                if (this.words[word] + this.words[word + 1] * 0x100000000 !== this.readSeq + 1) {
+                    return count;
+                }
+                record.kind = this.halves[word * 2 + 4];
+                record.code = this.halves[word * 2 + 5];
+                record.pid = this.words[word + 3];
+                const first = word / 2 + 2;
+                record.t = this.doubles[first];
+                for (let v = 0; v < VALUES; v++) {
+                    record.values[v] = this.doubles[first + 1 + v];
+                }
+                this.readSeq++;
+                count++;
+                onRecord(record);
+            }
+        }
+    }
+
+    _readSeq(position) {
+        fs.readSync(this.fd, this.word, 0, 8, position);
+        return readSeqAt(this.word, 0);
+    }
+
+    _writeSeq(position, seq) {
+        writeSeqAt(this.word, 0, seq);
+        fs.writeSync(this.fd, this.word, 0, 8, position);
+    }
+
+    _readWord(position) {
+        fs.readSync(this.fd, this.word, 0, 4, position);
+        return this.word.readUInt32LE(0);
+    }
+
+    _writeWord(position, value) {
+        this.word.writeUInt32LE(value, 0);
+        fs.writeSync(this.fd, this.word, 0, 4, position);
+    }
+}
+
+class ShmChannel {
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Whether this host can share a channel with the launcher     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    static isSupported() {
+        return process.platform === 'linux' && os.endianness() === 'LE' && fs.existsSync(SHM_DIR);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Opens a channel the launcher created; throws if it is not   █
+     * █ a ring file of this version                                 █
+     * ███████████████████████████████████████████████████████████████
+     */
+    static attach(path) {
+        const fd = fs.openSync(path, 'r+');
+        try {
+            const header = Buffer.alloc(12);
+            fs.readSync(fd, header, 0, header.length, 0);
+            const capacity = header.readUInt32LE(8);
+            const size = SLOTS_OFFSET + 2 * capacity * RECORD_SIZE;
+            if (header.toString('latin1', 0, 4) !== MAGIC ||
+                header.readUInt16LE(4) !== VERSION ||
+                header.readUInt16LE(6) !== RECORD_SIZE ||
+                fs.fstatSync(fd).size < size) {
+                throw new Error(`${path} is not a version ${VERSION} record ring`);
+            }
+            return new ShmChannel(fd, capacity);
+        } catch (err) {
+            fs.closeSync(fd);
+            throw err;
+        }
+    }
+
+    constructor(fd, capacity) {
+        this.fd = fd;
+        this.capacity = capacity;
+        this.inbound = new ShmRing(fd, HEADER_SIZE, SLOTS_OFFSET, capacity);
+        this.outbound = new ShmRing(fd, HEADER_SIZE + RING_HEADER_SIZE,
+            SLOTS_OFFSET + capacity * RECORD_SIZE, capacity);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Closes the file; the launcher removes it                    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    close() {
+        if (this.fd !== null) {
+            fs.closeSync(this.fd);
+            this.fd = null;
+        }
+    }
+}
+
+// Sequence numbers are u64 on disk; they stay far below 2^53
+function readSeqAt(buffer, offset) {
+    return buffer.readUInt32LE(offset) + buffer.readUInt32LE(offset + 4) * 0x100000000;
+}
+
+function writeSeqAt(buffer, offset, seq) {
+    buffer.writeUInt32LE(seq % 0x100000000, offset);
+    buffer.writeUInt32LE(Math.floor(seq / 0x100000000), offset + 4);
+}
+
+ShmChannel.KIND = KIND;
+ShmChannel.COMMAND = COMMAND;
+ShmChannel.PROCESS_TYPES = PROCESS_TYPES;
+ShmChannel.DOORBELL = DOORBELL;
+
+module.exports = ShmChannel;
@@ -0,0 +1,556 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Tab Hibernator
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Frees the memory of cold tabs by destroying their renderer   ║
+ * ║ Page state is kept in a small on-disk store meanwhile        ║
+ * ║ Tabs come back transparently when they are activated again   ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Hard RSS budget measured over every browser process
+ * - [+] Victims ranked by idle time times resident memory
+ * - [+] URL, history, scroll position and edited form fields kept
+ * - [+] Reports the memory each hibernation gave back
+ *
+ * The renderer owns the <webview> elements: the main process asks it
+ * to drop a tab ('hibernate-tab') and waits for the confirmation, so a
+ * tab the user has just switched to is never taken away.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const { ipcMain, app, webContents } = require('electron');
+const fs = require('fs');
+const path = require('path');
+
+// Start hibernating above this share of the budget, stop below the second
+const HIGH_WATER_FRACTION = 0.9;
+const LOW_WATER_FRACTION = 0.75;
+
+// Tabs used more recently than this are left alone
+const MIN_IDLE_MS = 60000;
+
+// Upper bound on tabs hibernated by a single enforcement pass
+const MAX_PER_PASS = 8;
+
+// How long page capture and the renderer's confirmation may take
+const CAPTURE_TIMEOUT_MS = 2000;
+const CONFIRM_TIMEOUT_MS = 3000;
+
+// Form values longer than this are not stored
+const MAX_FIELD_LENGTH = 8192;
+
+// Bumped when the on-disk state layout changes
+const STATE_VERSION = 1;
+
+// Runs inside the page: scroll offset and the form fields the user changed
+const CAPTURE_SCRIPT = `(function() {
+    const skip = ['password', 'hidden', 'file', 'submit', 'button', 'reset', 'image'];
+    const fields = [];
+    document.querySelectorAll('input, textarea, select').forEach((el, index) => {
+        const type = (el.type || '').toLowerCase();
+        const key = el.name || el.id || '';
+        if (skip.includes(type)) return;
+        if (type === 'checkbox' || type === 'radio') {
+            if (el.checked !== el.defaultChecked) fields.push([index, key, el.checked]);
+        } else if (el.tagName === 'SELECT') {
+            if (Array.from(el.options).some(o => o.selected !== o.defaultSelected)) fields.push([index, key, el.value]);
+        } else if (el.value !== el.defaultValue && el.value.length <= ${MAX_FIELD_LENGTH}) {
+            fields.push([index, key, el.value]);
+        }
+    });
+    return { scroll: [Math.round(window.scrollX), Math.round(window.scrollY)], fields };
+})()`;
+
+// Runs inside the restored page: puts the captured fields and scroll back
+const applyScript = (page) => `(function(page) {
+    const elements = document.querySelectorAll('input, textarea, select');
+    for (const [index, key, value] of page.fields) {
+        const el = elements[index];
+        if (!el || (el.name || el.id || '') !== key) continue;
+        if (typeof value === 'boolean') el.checked = value; else el.value = value;
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        el.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+    window.scrollTo(page.scroll[0], page.scroll[1]);
+    return true;
+})(${JSON.stringify(page)})`;
+
+class TabHibernator {
+    constructor() {
+        this.mainWindow = null;
+        this.directory = null;
+
+        // tabId -> { webContentsId, lastActive, memoryMB, hibernating, hibernated, savedMB }
+        this.tabs = new Map();
+        this.activeTabId = null;
+
+        // tabId -> resolve() of a hibernation waiting for the renderer
+        this.pending = new Map();
+        this.enforcing = false;
+
+        this.stats = {
+            hibernations: 0,
+            restores: 0,
+            failures: 0,
+            reclaimedMB: 0,
+            rssMB: 0,
+            lastPass: null
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Initializes the hibernator                                  █
+     * █ Prepares the state store and registers IPC handlers         █
+     * ███████████████████████████████████████████████████████████████
+     */
+    init(mainWindow, directory) {
+        this.mainWindow = mainWindow;
+        this.directory = directory || path.join(app.getPath('userData'), 'tab-hibernation');
+
+        try {
+            fs.mkdirSync(this.directory, { recursive: true });
+            // Tabs do not survive a restart, so neither does their state
+            this._clearStore();
+        } catch (err) {
+            console.error('Error preparing tab hibernation store:', err);
+        }
+
+        this._registerIpcHandlers();
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Keeps the browser under an RSS budget                       █
+     * █ Hibernates cold tabs once usage passes the high-water mark  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async enforceBudget(budgetMB) {
+        if (this.enforcing) {
+            return 0;
+        }
+
+        this.enforcing = true;
+        try {
+            const metrics = app.getAppMetrics();
+            const rssMB = Math.round(metrics.reduce((sum, m) => sum + m.memory.workingSetSize, 0) / 1024);
+            this.stats.rssMB = rssMB;
+
+            if (rssMB < budgetMB * HIGH_WATER_FRACTION) {
+                return 0;
+            }
+
+            const targetMB = budgetMB * LOW_WATER_FRACTION;
+            let reclaimedMB = 0;
+            let count = 0;
+
+            for (const { tabId } of this._rankCandidates(metrics)) {
+                if (rssMB - reclaimedMB <= targetMB || count >= MAX_PER_PASS) {
+                    break;
+                }
+
+                const savedMB = await this.hibernate(tabId);
+                if (savedMB !== null) {
+                    reclaimedMB += savedMB;
+                    count++;
+                }
+            }
+
+            this.stats.lastPass = { timestamp: Date.now(), rssMB, budgetMB, hibernated: count, reclaimedMB };
+            if (count > 0) {
+                console.log(`Hibernated ${count} tab(s), reclaimed ~${reclaimedMB}MB (RSS ${rssMB}MB, budget ${budgetMB}MB)`);
+            }
+            return reclaimedMB;
+        } catch (err) {
+            console.error('Error enforcing tab memory budget:', err);
+            return 0;
+        } finally {
+            this.enforcing = false;
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Hibernates one background tab                               █
+     * █ Returns the MB given back, or null if it was not hibernated █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async hibernate(tabId) {
+        const tab = this.tabs.get(tabId);
+        if (!tab || tab.hibernated || tab.hibernating || tabId === this.activeTabId ||
+            !this.mainWindow || this.mainWindow.isDestroyed()) {
+            return null;
+        }
+
+        const contents = webContents.fromId(tab.webContentsId);
+        if (!contents || contents.isDestroyed()) {
+            return null;
+        }
+
+        tab.hibernating = true;
+        try {
+            const page = await this._withTimeout(
+                contents.executeJavaScript(CAPTURE_SCRIPT, false), CAPTURE_TIMEOUT_MS
+            ).catch(() => null);
+
+            const history = this._captureHistory(contents);
+            this._writeState(tabId, {
+                v: STATE_VERSION,
+                url: history.entries[history.index].url,
+                title: contents.getTitle(),
+                ...history,
+                page: page || { scroll: [0, 0], fields: [] },
+                savedAt: Date.now()
+            });
+
+            if (!(await this._requestHibernation(tabId, contents.getTitle()))) {
+                this._deleteState(tabId);
+                return null;
+            }
+
+            tab.hibernated = true;
+            tab.savedMB = tab.memoryMB || 0;
+            this.stats.hibernations++;
+            this.stats.reclaimedMB += tab.savedMB;
+            return tab.savedMB;
+        } catch (err) {
+            console.error(`Error hibernating tab ${tabId}:`, err);
+            this.stats.failures++;
+            this._deleteState(tabId);
+            return null;
+        } finally {
+            tab.hibernating = false;
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Looks up the tab shown by a webContents                     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    findTab(webContentsId) {
+        for (const [tabId, tab] of this.tabs.entries()) {
+            if (tab.webContentsId === webContentsId && !tab.hibernated) {
+                return tabId;
+            }
+        }
+        return null;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Gets hibernation statistics                                 █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getStats() {
+        let hibernated = 0;
+        let savedMB = 0;
+        for (const tab of this.tabs.values()) {
+            if (tab.hibernated) {
+                hibernated++;
+                savedMB += tab.savedMB;
+            }
+        }
+
+        return {
+            ...this.stats,
+            tabs: this.tabs.size,
+            hibernated,
+            savedMB,
+            storeBytes: this._storeBytes()
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Disposes of the hibernator                                  █
+     * █ Drops IPC handlers and the on-disk state                    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    dispose() {
+        for (const resolve of this.pending.values()) {
+            resolve(false);
+        }
+        this.pending.clear();
+
+        ipcMain.removeHandler('restore-tab');
+        for (const channel of ['register-tab', 'tab-activated', 'tab-hibernated', 'tab-restored', 'tab-closed']) {
+            ipcMain.removeAllListeners(channel);
+        }
+
+        this._clearStore();
+        this.tabs.clear();
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Registers IPC handlers                             █
+     * █ The tab manager reports its tabs and asks for restores      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _registerIpcHandlers() {
+        // A tab's <webview> is ready (first load or after a restore)
+        ipcMain.on('register-tab', (event, { tabId, webContentsId }) => {
+            const tab = this.tabs.get(tabId) || { lastActive: Date.now(), memoryMB: 0, savedMB: 0, hibernated: false };
+            tab.webContentsId = webContentsId;
+            this.tabs.set(tabId, tab);
+
+            const contents = webContents.fromId(webContentsId);
+            if (contents) {
+                contents.once('destroyed', () => {
+                    // Renderer went away without hibernating or closing the tab
+                    const current = this.tabs.get(tabId);
+                    if (current && current.webContentsId === webContentsId &&
+                        !current.hibernating && !current.hibernated) {
+                        this.tabs.delete(tabId);
+                    }
+                });
+            }
+        });
+
+        ipcMain.on('tab-activated', (event, tabId) => {
+            const now = Date.now();
+            const previous = this.tabs.get(this.activeTabId);
+            if (previous) {
+                previous.lastActive = now;
+            }
+
+            const tab = this.tabs.get(tabId);
+            if (tab) {
+                tab.lastActive = now;
+            }
+            this.activeTabId = tabId;
+        });
+
+        // Renderer's answer to 'hibernate-tab'
+        ipcMain.on('tab-hibernated', (event, { tabId, hibernated }) => {
+            const resolve = this.pending.get(tabId);
+            if (resolve) {
+                this.pending.delete(tabId);
+                resolve(hibernated);
+            }
+        });
+
+        // Renderer is about to recreate a hibernated tab
+        ipcMain.handle('restore-tab', (event, tabId) => {
+            const tab = this.tabs.get(tabId);
+            const state = this._readState(tabId);
+            if (!tab || !state) {
+                return null;
+            }
+
+            tab.hibernated = false;
+            tab.savedMB = 0;
+            tab.restoreState = state;
+            tab.lastActive = Date.now();
+            this.stats.restores++;
+
+            return {
+                url: state.url,
+                title: state.title,
+                restoreHistory: state.entries.length > 1 && this._canRestoreHistory()
+            };
+        });
+
+        // The recreated <webview> finished its first load
+        ipcMain.on('tab-restored', (event, { tabId, webContentsId }) => {
+            const tab = this.tabs.get(tabId);
+            const contents = webContents.fromId(webContentsId);
+            if (!tab || !tab.restoreState || !contents || contents.isDestroyed()) {
+                return;
+            }
+
+            const state = tab.restoreState;
+            tab.restoreState = null;
+            this._deleteState(tabId);
+            this._applyState(contents, state).catch(err => {
+                console.error(`Error restoring state of tab ${tabId}:`, err);
+            });
+        });
+
+        ipcMain.on('tab-closed', (event, tabId) => {
+            this.tabs.delete(tabId);
+            this._deleteState(tabId);
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Ranks hibernation candidates                       █
+     * █ Coldest and largest first: idle seconds x resident MB       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _rankCandidates(metrics) {
+        const processMB = new Map(metrics.map(m => [m.pid, m.memory.workingSetSize / 1024]));
+        const tabsPerPid = new Map();
+        const live = [];
+
+        for (const [tabId, tab] of this.tabs.entries()) {
+            if (tab.hibernated || tab.hibernating) continue;
+
+            const contents = webContents.fromId(tab.webContentsId);
+            if (!contents || contents.isDestroyed()) continue;
+
+            const pid = contents.getOSProcessId();
+            tabsPerPid.set(pid, (tabsPerPid.get(pid) || 0) + 1);
+            live.push({ tabId, tab, pid, contents });
+        }
+
+        const now = Date.now();
+        const candidates = [];
+        for (const { tabId, tab, pid, contents } of live) {
+            // Tabs sharing a renderer process share its memory
+            tab.memoryMB = Math.round((processMB.get(pid) || 0) / tabsPerPid.get(pid));
+
+            const idleMs = now - tab.lastActive;
+            if (tabId === this.activeTabId || idleMs < MIN_IDLE_MS || contents.isCurrentlyAudible()) {
+                continue;
+            }
+
+            candidates.push({ tabId, score: (idleMs / 1000) * tab.memoryMB });
+        }
+
+        return candidates.sort((a, b) => b.score - a.score);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Captures a tab's navigation history                █
+     * █ Falls back to the current entry on older Electron versions  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _captureHistory(contents) {
+        const history = contents.navigationHistory;
+        if (history && typeof history.getAllEntries === 'function') {
+            const entries = history.getAllEntries().map(({ url, title }) => ({ url, title }));
+            const index = history.getActiveIndex();
+            if (entries.length > 0 && index >= 0 && index < entries.length) {
+                return { entries, index };
+            }
+        }
+
+        return { entries: [{ url: contents.getURL(), title: contents.getTitle() }], index: 0 };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Checks for navigationHistory.restore()             █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _canRestoreHistory() {
+        const contents = this.mainWindow && !this.mainWindow.isDestroyed() ? this.mainWindow.webContents : null;
+        return !!(contents && contents.navigationHistory && typeof contents.navigationHistory.restore === 'function');
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Puts history, form fields and scroll back          █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _applyState(contents, state) {
+        if (state.entries.length > 1 && contents.navigationHistory &&
+            typeof contents.navigationHistory.restore === 'function') {
+            // Navigates to the active entry, so wait for it before applying the page state
+            await contents.navigationHistory.restore({ index: state.index, entries: state.entries });
+        }
+
+        const page = state.page;
+        if (page.fields.length > 0 || page.scroll[0] !== 0 || page.scroll[1] !== 0) {
+            await contents.executeJavaScript(applyScript(page), false);
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Asks the renderer to drop a tab's <webview>        █
+     * █ Resolves false if it refuses or does not answer in time     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _requestHibernation(tabId, title) {
+        return new Promise((resolve) => {
+            const timer = setTimeout(() => {
+                this.pending.delete(tabId);
+                resolve(false);
+            }, CONFIRM_TIMEOUT_MS);
+
+            this.pending.set(tabId, (hibernated) => {
+                clearTimeout(timer);
+                resolve(!!hibernated);
+            });
+            this.mainWindow.webContents.send('hibernate-tab', { tabId, title });
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Rejects a promise that takes too long              █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _withTimeout(promise, ms) {
+        let timer;
+        const timeout = new Promise((resolve, reject) => {
+            timer = setTimeout(() => reject(new Error(`timed out after ${ms}ms`)), ms);
+        });
+        return Promise.race([promise, timeout]).finally(() => clearTimeout(timer));
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: State store helpers                                █
+     * █ One compact JSON file per tab, written atomically           █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _statePath(tabId) {
+        return path.join(this.directory, `${String(tabId).replace(/[^A-Za-z0-9_-]/g, '_')}.json`);
+    }
+
+    _writeState(tabId, state) {
+        const statePath = this._statePath(tabId);
+        const tmpPath = `${statePath}.${process.pid}.tmp`;
+        fs.writeFileSync(tmpPath, JSON.stringify(state));
+        fs.renameSync(tmpPath, statePath);
+    }
+
+    _readState(tabId) {
+        try {
+            const state = JSON.parse(fs.readFileSync(this._statePath(tabId), 'utf8'));
+            return state.v === STATE_VERSION ? state : null;
+        } catch (err) {
+            return null;
+        }
+    }
+
+    _deleteState(tabId) {
+        try {
+            fs.unlinkSync(this._statePath(tabId));
+        } catch (err) {
+            // Already gone
+        }
+    }
+
+    _storeBytes() {
+        try {
+            return fs.readdirSync(this.directory)
+                .reduce((sum, name) => sum + fs.statSync(path.join(this.directory, name)).size, 0);
+        } catch (err) {
+            return 0;
+        }
+    }
+
+    _clearStore() {
+        try {
+            for (const name of fs.readdirSync(this.directory)) {
+                fs.unlinkSync(path.join(this.directory, name));
+            }
+        } catch (err) {
+            // Nothing to clear
+        }
+    }
+}
+
+module.exports = TabHibernator;
@@ -0,0 +1,327 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Telemetry Bus
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ One publish/subscribe hub for resource telemetry             ║
+ * ║ Limiters publish one sample per tick, consumers pick the     ║
+ * ║ fields and rate they need; only changed fields cross IPC     ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Field subscriptions by path or prefix ('cpu', 'memory.total')
+ * - [+] Per-subscription rate limit, no timers while nothing changes
+ * - [+] Delta updates per subscriber, a full snapshot on subscribe
+ * - [+] Hidden and minimized windows get nothing until shown again
+ * - [+] In-process subscribers (callbacks) share the same path
+ *
+ * Updates go out on 'telemetry-update' as { id, changed, removed }:
+ * `changed` maps dotted paths to new values, `removed` lists paths a
+ * source stopped reporting. src/ui/telemetry-client.js rebuilds the
+ * nested object in the renderer.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const { ipcMain, BrowserWindow } = require('electron');
+
+// Rate limits for subscriptions, in milliseconds between updates
+const DEFAULT_INTERVAL_MS = 1000;
+const MIN_INTERVAL_MS = 100;
+
+class TelemetryBus {
+    constructor() {
+        // Latest value of every leaf, keyed 'source.path'
+        this.values = new Map();
+
+        // Subscription id -> { id, target, fields, intervalMs, sent, lastSentAt, timer, parked }
+        this.subscriptions = new Map();
+        this.nextId = 1;
+
+        // Counters
+        this.published = 0;
+        this.updatesSent = 0;
+        this.fieldsSent = 0;
+        this.suppressed = 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Registers the renderer subscribe/unsubscribe handlers       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    init() {
+        ipcMain.handle('telemetry-subscribe', (event, options = {}) => {
+            const id = this.subscribe(event.sender, options);
+            return { id, ...this._delta(this.subscriptions.get(id)) };
+        });
+
+        ipcMain.on('telemetry-unsubscribe', (event, id) => {
+            const sub = this.subscriptions.get(id);
+            if (sub && sub.target === event.sender) {
+                this.unsubscribe(id);
+            }
+        });
+        return this;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Publishes one sample; schedules subscribers that changed    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    publish(source, sample) {
+        const changed = [];
+        const seen = new Set();
+
+        flatten(sample, source, (key, value) => {
+            seen.add(key);
+            if (!sameValue(this.values.get(key), value)) {
+                this.values.set(key, copyValue(value));
+                changed.push(key);
+            }
+        });
+
+        // Fields this source no longer reports
+        const prefix = source + '.';
+        for (const key of this.values.keys()) {
+            if (key.startsWith(prefix) && !seen.has(key)) {
+                this.values.delete(key);
+                changed.push(key);
+            }
+        }
+
+        this.published++;
+        if (changed.length === 0) {
+            return;
+        }
+
+        for (const sub of this.subscriptions.values()) {
+            if (changed.some(key => matches(sub.fields, key))) {
+                this._schedule(sub);
+            }
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Subscribes a webContents or a callback to fields            █
+     * █ options: { fields: ['cpu', 'memory.total'], intervalMs }    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    subscribe(target, options = {}) {
+        const sub = {
+            id: this.nextId++,
+            target,
+            fields: Array.isArray(options.fields) && options.fields.length ? options.fields.map(String) : ['*'],
+            intervalMs: Math.max(MIN_INTERVAL_MS, options.intervalMs || DEFAULT_INTERVAL_MS),
+            sent: new Map(),
+            lastSentAt: Date.now(),
+            timer: null,
+            parked: false,
+            window: null,
+            onShown: null
+        };
+        this.subscriptions.set(sub.id, sub);
+
+        if (typeof target !== 'function') {
+            // Renderer gone: drop everything it subscribed to
+            target.once('destroyed', () => this._unsubscribeTarget(target));
+
+            // A hidden window is caught up as soon as it is shown
+            const window = BrowserWindow.fromWebContents(target);
+            if (window) {
+                sub.window = window;
+                sub.onShown = () => {
+                    if (sub.parked) {
+                        sub.parked = false;
+                        this._schedule(sub);
+                    }
+                };
+                window.on('show', sub.onShown);
+                window.on('restore', sub.onShown);
+            }
+        }
+        return sub.id;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Cancels one subscription                                    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    unsubscribe(id) {
+        const sub = this.subscriptions.get(id);
+        if (!sub) {
+            return;
+        }
+        clearTimeout(sub.timer);
+        if (sub.window && !sub.window.isDestroyed()) {
+            sub.window.removeListener('show', sub.onShown);
+            sub.window.removeListener('restore', sub.onShown);
+        }
+        this.subscriptions.delete(id);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Bus counters for diagnostics                                █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getStats() {
+        return {
+            subscriptions: this.subscriptions.size,
+            fields: this.values.size,
+            published: this.published,
+            updatesSent: this.updatesSent,
+            fieldsSent: this.fieldsSent,
+            suppressed: this.suppressed
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Cancels all subscriptions and removes the IPC handlers      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    dispose() {
+        for (const id of Array.from(this.subscriptions.keys())) {
+            this.unsubscribe(id);
+        }
+        ipcMain.removeHandler('telemetry-subscribe');
+        ipcMain.removeAllListeners('telemetry-unsubscribe');
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: One flush per interval, only after a change        █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _schedule(sub) {
+        if (sub.timer) {
+            return;
+        }
+        const wait = Math.max(0, sub.lastSentAt + sub.intervalMs - Date.now());
+        sub.timer = setTimeout(() => {
+            sub.timer = null;
+            this._flush(sub);
+        }, wait);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Sends a subscriber what changed since its last one █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _flush(sub) {
+        if (!this.subscriptions.has(sub.id)) {
+            return;
+        }
+
+        if (typeof sub.target !== 'function') {
+            if (sub.target.isDestroyed()) {
+                this.unsubscribe(sub.id);
+                return;
+            }
+            // Nothing is drawn: keep the delta for when the window is shown
+            if (sub.window && (!sub.window.isVisible() || sub.window.isMinimized())) {
+                sub.parked = true;
+                this.suppressed++;
+                return;
+            }
+        }
+
+        const delta = this._delta(sub);
+        const count = Object.keys(delta.changed).length + delta.removed.length;
+        if (count === 0) {
+            return;
+        }
+
+        if (typeof sub.target === 'function') {
+            sub.target(delta);
+        } else {
+            sub.target.send('telemetry-update', { id: sub.id, ...delta });
+        }
+        this.updatesSent++;
+        this.fieldsSent += count;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Changed and removed fields; marks them as sent     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _delta(sub) {
+        const changed = {};
+        const removed = [];
+
+        for (const [key, value] of this.values) {
+            if (matches(sub.fields, key) && !(sub.sent.has(key) && sameValue(sub.sent.get(key), value))) {
+                changed[key] = value;
+                sub.sent.set(key, value);
+            }
+        }
+        for (const key of Array.from(sub.sent.keys())) {
+            if (!this.values.has(key)) {
+                removed.push(key);
+                sub.sent.delete(key);
+            }
+        }
+
+        sub.lastSentAt = Date.now();
+        return { changed, removed };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Drops every subscription of a destroyed renderer   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _unsubscribeTarget(target) {
+        for (const sub of Array.from(this.subscriptions.values())) {
+            if (sub.target === target) {
+                this.unsubscribe(sub.id);
+            }
+        }
+    }
+}
+
+// Walks plain objects down to their leaves; arrays and null are leaves
+function flatten(value, key, visit) {
+    if (value && typeof value === 'object' && !Array.isArray(value) && Object.keys(value).length > 0) {
+        for (const [name, child] of Object.entries(value)) {
+            if (child !== undefined && typeof child !== 'function') {
+                flatten(child, `${key}.${name}`, visit);
+            }
+        }
+    } else {
+        visit(key, value);
+    }
+}
+
+// A field matches itself, its prefixes and paths inside it
+function matches(fields, key) {
+    return fields.some(field => field === '*' ||
+        key === field ||
+        key.startsWith(field + '.') ||
+        field.startsWith(key + '.'));
+}
+
+function sameValue(a, b) {
+    if (a === b) {
+        return true;
+    }
+    if (a && b && typeof a === 'object' && typeof b === 'object') {
+        return JSON.stringify(a) === JSON.stringify(b);
+    }
+    return false;
+}
+
+// Limiters reuse their history arrays; keep our own copy to diff against
+function copyValue(value) {
+    return value && typeof value === 'object' ? JSON.parse(JSON.stringify(value)) : value;
+}
+
+module.exports = TelemetryBus;
@@ -0,0 +1,141 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Telemetry Exporter
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Streams limiter status to the launcher's telemetry recorder  ║
+ * ║ One flat JSON line per status tick                           ║
+ * ║ Kept on disk so throttling can be analysed after a session   ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Flattened CPU, memory, network and pressure readings
+ * - [+] Per-instance series (fleet mode)
+ * - [+] Drops records instead of buffering when the recorder lags
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const net = require('net');
+
+// Stop queueing records once this much is waiting on the socket
+const MAX_BUFFERED_BYTES = 64 * 1024;
+
+class TelemetryExporter {
+    constructor() {
+        // Connection settings (from the launcher environment)
+        this.port = parseInt(process.env.INTERNET_SERVER_RECORDER_PORT, 10) || 0;
+        this.token = process.env.INTERNET_SERVER_RECORDER_TOKEN || '';
+        this.instance = process.env.INTERNET_SERVER_INSTANCE || 'default';
+
+        // State
+        this.socket = null;
+        this.connected = false;
+        this.dropped = 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Whether a recorder sidecar was provided by the launcher     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    isAvailable() {
+        return this.port > 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Connects to the recorder and names our series               █
+     * ███████████████████████████████████████████████████████████████
+     */
+    connect() {
+        if (!this.isAvailable() || this.socket) {
+            return;
+        }
+
+        this.socket = net.connect({ host: '127.0.0.1', port: this.port }, () => {
+            this.connected = true;
+            this.socket.write(JSON.stringify({ hello: this.instance, token: this.token }) + '\n');
+            console.log(`Telemetry recorder connected on port ${this.port}`);
+        });
+
+        this.socket.on('error', (err) => {
+            console.error('Telemetry recorder connection error:', err.message);
+        });
+
+        this.socket.on('close', () => {
+            this.connected = false;
+            this.socket = null;
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Records one LimiterManager.getStats() snapshot              █
+     * ███████████████████████████████████████████████████████████████
+     */
+    record(stats) {
+        if (!this.connected) {
+            return;
+        }
+
+        if (this.socket.writableLength > MAX_BUFFERED_BYTES) {
+            this.dropped++;
+            return;
+        }
+
+        this.socket.write(JSON.stringify(this._flatten(stats)) + '\n');
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Closes the connection to the recorder                       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    dispose() {
+        if (this.socket) {
+            this.socket.end();
+            this.socket = null;
+        }
+        this.connected = false;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Maps stats onto the recorder's columns             █
+     * █ (COLUMNS in launcher/recorder.py)                           █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _flatten(stats) {
+        const cpu = stats.cpu || {};
+        const memory = stats.memory || {};
+        const network = stats.network || {};
+        const pressure = (stats.cgroup && stats.cgroup.pressure) || {};
+        const some10 = (resource) => (pressure[resource] && pressure[resource].some)
+            ? pressure[resource].some.avg10
+            : null;
+
+        return {
+            t: Date.now() / 1000,
+            cpu: cpu.current,
+            cpu_system: cpu.system,
+            cpu_limit: cpu.enabled ? cpu.limit : null,
+            cpu_throttling: cpu.isThrottling ? 1 : 0,
+            mem_total: memory.total,
+            mem_main: memory.main,
+            mem_renderer: memory.renderer,
+            mem_limit: memory.enabled ? memory.limit : null,
+            mem_limiting: memory.isLimiting ? 1 : 0,
+            net_down: network.bytesDownloadedPerSecond,
+            net_up: network.bytesUploadedPerSecond,
+            net_connections: network.activeConnections,
+            psi_cpu: some10('cpu'),
+            psi_memory: some10('memory'),
+            psi_io: some10('io')
+        };
+    }
+}
+
+module.exports = TelemetryExporter;
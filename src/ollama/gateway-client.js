@@ -0,0 +1,199 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Ollama Gateway Client
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Connects to the launcher's Ollama gateway sidecar            ║
+ * ║ Streams generated tokens back as the model produces them     ║
+ * ║ Caching, coalescing and pooling all happen in the gateway    ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Many concurrent generations over one loopback connection
+ * - [+] Per-token callbacks plus a promise for the full response
+ * - [+] Gateway cache/latency stats on request
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const net = require('net');
+const { EventEmitter } = require('events');
+
+class OllamaGatewayClient extends EventEmitter {
+    constructor() {
+        super();
+
+        // Connection settings (from the launcher environment)
+        this.port = parseInt(process.env.INTERNET_SERVER_OLLAMA_PORT, 10) || 0;
+        this.token = process.env.INTERNET_SERVER_OLLAMA_TOKEN || '';
+
+        // State
+        this.socket = null;
+        this.connected = false;
+        this.buffer = '';
+        this.nextId = 1;
+        this.pending = new Map(); // id -> { resolve, reject, onToken }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Whether an Ollama gateway was provided by the launcher      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    isAvailable() {
+        return this.port > 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Connects to the gateway (requests queue until connected)    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    connect() {
+        if (!this.isAvailable() || this.socket) {
+            return;
+        }
+
+        this.socket = net.connect({ host: '127.0.0.1', port: this.port }, () => {
+            this.connected = true;
+            console.log(`Ollama gateway connected on port ${this.port}`);
+        });
+
+        // Written first, so it precedes any request queued before connecting
+        this.socket.write(JSON.stringify({ hello: process.pid, token: this.token }) + '\n');
+        this.socket.setEncoding('utf8');
+
+        this.socket.on('data', (chunk) => {
+            this._onData(chunk);
+        });
+
+        this.socket.on('error', (err) => {
+            console.error('Ollama gateway connection error:', err.message);
+        });
+
+        this.socket.on('close', () => {
+            this.connected = false;
+            this.socket = null;
+            this._rejectAll(new Error('Ollama gateway connection closed'));
+            this.emit('disconnected');
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Generates a completion, calling onToken for each piece      █
+     * █ Resolves with { text, cached, shared, ms }                  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    generate(prompt, options = {}, onToken = null) {
+        return this._request({
+            op: 'generate',
+            prompt,
+            model: options.model,
+            style: options.style,
+            cache: options.cache !== false
+        }, onToken);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Fetches cache hit/miss, coalescing and latency counters     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    getStats() {
+        return this._request({ op: 'stats' }).then(message => message.stats);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Closes the connection to the gateway                        █
+     * ███████████████████████████████████████████████████████████████
+     */
+    dispose() {
+        if (this.socket) {
+            this.socket.destroy();
+            this.socket = null;
+        }
+        this.connected = false;
+        this._rejectAll(new Error('Ollama gateway client disposed'));
+        this.removeAllListeners();
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Sends a request line and tracks its reply          █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _request(request, onToken = null) {
+        this.connect();
+        if (!this.socket) {
+            return Promise.reject(new Error('Ollama gateway is not running'));
+        }
+
+        const id = this.nextId++;
+        return new Promise((resolve, reject) => {
+            this.pending.set(id, { resolve, reject, onToken });
+            this.socket.write(JSON.stringify({ id, ...request }) + '\n');
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Routes reply lines to their pending requests       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _onData(chunk) {
+        this.buffer += chunk;
+
+        let newline;
+        while ((newline = this.buffer.indexOf('\n')) !== -1) {
+            const line = this.buffer.slice(0, newline);
+            this.buffer = this.buffer.slice(newline + 1);
+
+            if (!line) {
+                continue;
+            }
+
+            let message;
+            try {
+                message = JSON.parse(line);
+            } catch (err) {
+                console.error('Malformed Ollama gateway reply:', err.message);
+                continue;
+            }
+
+            const request = this.pending.get(message.id);
+            if (!request) {
+                continue;
+            }
+
+            if (message.token !== undefined) {
+                if (request.onToken) {
+                    request.onToken(message.token);
+                }
+            } else if (message.error) {
+                this.pending.delete(message.id);
+                request.reject(new Error(message.error));
+            } else {
+                this.pending.delete(message.id);
+                request.resolve(message);
+            }
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Fails every outstanding request                    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _rejectAll(error) {
+        for (const request of this.pending.values()) {
+            request.reject(error);
+        }
+        this.pending.clear();
+    }
+}
+
+module.exports = OllamaGatewayClient;
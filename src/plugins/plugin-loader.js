@@ -5,7 +5,8 @@
  * Internet Server - Plugin System
  * 
  * This module handles plugin discovery, loading, and management:
- * - Scans the plugins directory for valid plugin packages
+ * - Reads the launcher's plugin index (one file) instead of scanning
+ * - Activates plugins lazily, on first use or a declared event
  * - Registers plugin APIs with the browser
  * - Provides plugin sandboxing and security
  * - Enables/disables plugins based on user preferences
@@ -17,6 +18,13 @@ const fs = require('fs');
 const path = require('path');
 const { ipcMain } = require('electron');
 
+// Written by launcher/plugin_index.py (same version number)
+const PLUGIN_INDEX_NAME = '.plugin-index.json';
+const PLUGIN_INDEX_VERSION = 1;
+
+// Activation events a manifest may declare besides onEvent:<name>
+const ACTIVATION_EVENTS = ['onStartup', 'onToolbar', 'onSidebar', 'onSettings'];
+
 class PluginLoader {
     constructor(mainWindow) {
         // Reference to main browser window
@@ -34,15 +42,21 @@ class PluginLoader {
         // Plugin directory path
         this.pluginsDir = path.join(__dirname, '../plugins');
         
+        // Index of validated manifests, built by the launcher in preflight
+        this.indexPath = process.env.INTERNET_SERVER_PLUGIN_INDEX ||
+            path.join(__dirname, '../../', PLUGIN_INDEX_NAME);
+        
         // Register IPC handlers
         this._registerIpcHandlers();
     }
     
     /**
      * ███████████████████████████████████████████████████████████████
-     * █ Loads all available plugins from the plugins directory       █
-     * █ Validates plugin manifests and initializes enabled plugins   █
-     * █ Returns count of successfully loaded plugins                 █
+     * █ Registers all available plugins                             █
+     * █ Uses the launcher's index when current, else scans          █
+     * █ Only onStartup plugins are activated here; the rest wait    █
+     * █ for their UI or a declared event (see activatePlugin)       █
+     * █ Returns count of successfully registered plugins            █
      * ███████████████████████████████████████████████████████████████
      */
     async loadPlugins() {
@@ -50,27 +64,34 @@ class PluginLoader {
             // Load plugin settings
             await this._loadSettings();
             
-            // Get plugin directories
-            const pluginDirs = this._scanPluginDirectory();
-            
-            console.log(`Found ${pluginDirs.length} potential plugins`);
+            // One file read when the index is current
+            let plugins = this._readPluginIndex();
+            if (plugins) {
+                console.log(`Plugin index lists ${plugins.length} plugins`);
+            } else {
+                const pluginDirs = this._scanPluginDirectory();
+                console.log(`Found ${pluginDirs.length} potential plugins`);
+                plugins = [];
+                for (const pluginDir of pluginDirs) {
+                    const plugin = await this._loadPlugin(pluginDir);
+                    if (plugin) {
+                        plugins.push(plugin);
+                    }
+                }
+            }
             
-            // Load each plugin
+            // Register each plugin
             let loadedCount = 0;
-            for (const pluginDir of pluginDirs) {
+            for (const plugin of plugins) {
                 try {
-                    const plugin = await this._loadPlugin(pluginDir);
-                    if (plugin) {
-                        this.plugins.set(plugin.id, plugin);
-                        loadedCount++;
-                        
-                        // Initialize if enabled
-                        if (this.settings.enabledPlugins.includes(plugin.id)) {
-                            await this._initializePlugin(plugin);
-                        }
+                    this.plugins.set(plugin.id, plugin);
+                    loadedCount++;
+                    
+                    if (this.settings.enabledPlugins.includes(plugin.id)) {
+                        await this._enableRegisteredPlugin(plugin);
                     }
                 } catch (err) {
-                    console.error(`Failed to load plugin from ${pluginDir}:`, err);
+                    console.error(`Failed to register plugin ${plugin.id}:`, err);
                 }
             }
             
@@ -82,6 +103,71 @@ class PluginLoader {
         }
     }
     
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Activates an enabled plugin (loads and initializes main)    █
+     * █ Called on first toolbar click, sidebar open or settings     █
+     * █ Safe to call repeatedly; concurrent calls share one load    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async activatePlugin(pluginId, event = null) {
+        const plugin = this.plugins.get(pluginId);
+        if (!plugin) {
+            throw new Error(`Plugin ${pluginId} not found`);
+        }
+        
+        if (!plugin.enabled) {
+            throw new Error(`Plugin ${pluginId} is not enabled`);
+        }
+        
+        if (plugin.active) {
+            return true;
+        }
+        
+        if (!plugin.activating) {
+            plugin.activating = (async () => {
+                // The index may predate an edit to this plugin's manifest
+                let target = plugin;
+                if (this._manifestChanged(plugin)) {
+                    target = await this._loadPlugin(plugin.path);
+                    if (!target) {
+                        throw new Error(`Plugin ${pluginId} manifest is no longer valid`);
+                    }
+                    target.enabled = true;
+                    this.plugins.set(pluginId, target);
+                }
+                
+                console.log(`Activating plugin ${pluginId}${event ? ` (${event})` : ''}`);
+                return this._initializePlugin(target);
+            })().finally(() => {
+                plugin.activating = null;
+            });
+        }
+        
+        return plugin.activating;
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Activates every enabled plugin declaring onEvent:<name>     █
+     * █ Returns the IDs of the plugins that were activated          █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async activatePluginsForEvent(eventName) {
+        const activationEvent = `onEvent:${eventName}`;
+        const activated = [];
+        
+        for (const plugin of this.plugins.values()) {
+            if (plugin.enabled && !plugin.active && plugin.activationEvents.includes(activationEvent)) {
+                if (await this.activatePlugin(plugin.id, activationEvent)) {
+                    activated.push(plugin.id);
+                }
+            }
+        }
+        
+        return activated;
+    }
+    
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Enables a plugin by ID                                      █
@@ -99,8 +185,8 @@ class PluginLoader {
             return true;
         }
         
-        // Initialize plugin
-        await this._initializePlugin(plugin);
+        // Show its UI (activating it now only if it asks for onStartup)
+        await this._enableRegisteredPlugin(plugin);
         
         // Update settings
         if (!this.settings.enabledPlugins.includes(pluginId)) {
@@ -128,8 +214,9 @@ class PluginLoader {
             return true;
         }
         
-        // Unload plugin
+        // Unload plugin (removes its UI even if it was never activated)
         await this._unloadPlugin(plugin);
+        plugin.enabled = false;
         
         // Update settings
         const index = this.settings.enabledPlugins.indexOf(pluginId);
@@ -158,10 +245,13 @@ class PluginLoader {
                 description: plugin.description,
                 author: plugin.author,
                 enabled: plugin.enabled,
+                active: plugin.active,
+                activationEvents: plugin.activationEvents,
                 hasSettings: !!plugin.settingsPath,
                 hasSidebar: !!plugin.sidebarPath,
                 hasToolbar: !!plugin.toolbarPath,
-                permissions: plugin.permissions || []
+                permissions: plugin.permissions || [],
+                ...this._pluginUIPaths(plugin)
             });
         });
         
@@ -199,6 +289,7 @@ class PluginLoader {
                 const plugin = this.plugins.get(pluginId);
                 if (plugin) {
                     // Unload if enabled
+                    const wasActive = plugin.active;
                     if (plugin.enabled) {
                         await this._unloadPlugin(plugin);
                     }
@@ -210,9 +301,12 @@ class PluginLoader {
                     if (reloadedPlugin) {
                         this.plugins.set(pluginId, reloadedPlugin);
                         
-                        // Re-initialize if it was enabled
+                        // Re-enable if it was enabled, re-activating if it was in use
                         if (this.settings.enabledPlugins.includes(pluginId)) {
-                            await this._initializePlugin(reloadedPlugin);
+                            await this._enableRegisteredPlugin(reloadedPlugin);
+                            if (wasActive) {
+                                await this.activatePlugin(pluginId);
+                            }
                         }
                     }
                 }
@@ -284,6 +378,8 @@ class PluginLoader {
             const manifestPath = path.join(pluginDir, 'manifest.json');
             const manifestData = JSON.parse(fs.readFileSync(manifestPath, 'utf8'));
             
+            const manifestStat = fs.statSync(manifestPath, { bigint: true });
+            
             // Validate required fields
             if (!manifestData.id || !manifestData.name || !manifestData.version) {
                 console.error(`Invalid plugin manifest at ${pluginDir}`);
@@ -291,21 +387,15 @@ class PluginLoader {
             }
             
             // Create plugin object
-            const plugin = {
-                id: manifestData.id,
-                name: manifestData.name,
-                version: manifestData.version,
-                description: manifestData.description || '',
-                author: manifestData.author || 'Unknown',
-                permissions: manifestData.permissions || [],
-                mainPath: manifestData.main ? path.join(pluginDir, manifestData.main) : null,
-                settingsPath: manifestData.settings ? path.join(pluginDir, manifestData.settings) : null,
-                sidebarPath: manifestData.sidebar ? path.join(pluginDir, manifestData.sidebar) : null,
-                toolbarPath: manifestData.toolbar ? path.join(pluginDir, manifestData.toolbar) : null,
-                path: pluginDir,
-                enabled: false,
-                instance: null
-            };
+            const plugin = this._createPluginRecord(manifestData, pluginDir, manifestStat.mtimeNs.toString());
+            
+            // Validate activation events
+            const unknownEvent = plugin.activationEvents.find(event =>
+                !ACTIVATION_EVENTS.includes(event) && !String(event).startsWith('onEvent:'));
+            if (unknownEvent) {
+                console.error(`Unknown activation event ${unknownEvent} in ${pluginDir}`);
+                return null;
+            }
             
             // Validate paths
             if (plugin.mainPath && !fs.existsSync(plugin.mainPath)) {
@@ -321,6 +411,137 @@ class PluginLoader {
         }
     }
     
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Builds a plugin object from manifest fields        █
+     * █ Shared by the index and the directory scan                  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _createPluginRecord(manifestData, pluginDir, manifestMtimeNs) {
+        // Plugins with UI wait for it to be used; others start with the browser
+        const activationEvents = manifestData.activationEvents ||
+            ['toolbar', 'sidebar', 'settings']
+                .filter(field => manifestData[field])
+                .map(field => `on${field[0].toUpperCase()}${field.slice(1)}`);
+        
+        return {
+            id: manifestData.id,
+            name: manifestData.name,
+            version: manifestData.version,
+            description: manifestData.description || '',
+            author: manifestData.author || 'Unknown',
+            permissions: manifestData.permissions || [],
+            activationEvents: activationEvents.length ? activationEvents : ['onStartup'],
+            mainPath: manifestData.main ? path.join(pluginDir, manifestData.main) : null,
+            settingsPath: manifestData.settings ? path.join(pluginDir, manifestData.settings) : null,
+            sidebarPath: manifestData.sidebar ? path.join(pluginDir, manifestData.sidebar) : null,
+            toolbarPath: manifestData.toolbar ? path.join(pluginDir, manifestData.toolbar) : null,
+            path: pluginDir,
+            manifestMtimeNs,
+            enabled: false,
+            active: false,
+            activating: null,
+            instance: null,
+            ipcListeners: []
+        };
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Reads the plugin index written by the launcher     █
+     * █ Returns plugin objects, or null if missing or out of date   █
+     * █ (a plugin directory was added or removed since the build)   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _readPluginIndex() {
+        try {
+            const index = JSON.parse(fs.readFileSync(this.indexPath, 'utf8'));
+            if (index.version !== PLUGIN_INDEX_VERSION || path.resolve(index.pluginsDir) !== path.resolve(this.pluginsDir)) {
+                return null;
+            }
+            
+            const dirStat = fs.statSync(this.pluginsDir, { bigint: true });
+            if (dirStat.mtimeNs.toString() !== index.directoryMtimeNs) {
+                console.log('Plugin index is out of date, scanning plugins directory');
+                return null;
+            }
+            
+            for (const error of index.errors || []) {
+                console.error(`Plugin ${error.directory} skipped: ${error.error}`);
+            }
+            
+            return index.plugins.map(entry =>
+                this._createPluginRecord(entry, path.join(this.pluginsDir, entry.directory), entry.manifestMtimeNs));
+        } catch (err) {
+            if (err.code !== 'ENOENT') {
+                console.error('Error reading plugin index:', err.message);
+            }
+            return null;
+        }
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Whether a manifest changed since it was read       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _manifestChanged(plugin) {
+        try {
+            const stat = fs.statSync(path.join(plugin.path, 'manifest.json'), { bigint: true });
+            return stat.mtimeNs.toString() !== plugin.manifestMtimeNs;
+        } catch (err) {
+            return true;
+        }
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Marks a registered plugin enabled                  █
+     * █ Sends its UI to the renderer; activates onStartup plugins   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _enableRegisteredPlugin(plugin) {
+        plugin.enabled = true;
+        
+        if (plugin.activationEvents.includes('onStartup')) {
+            return this._initializePlugin(plugin);
+        }
+        
+        this._registerPluginUI(plugin);
+        return true;
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Sends a plugin's UI component paths to renderer    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _registerPluginUI(plugin) {
+        if (this.mainWindow) {
+            this.mainWindow.webContents.send('register-plugin-ui', {
+                id: plugin.id,
+                name: plugin.name,
+                active: plugin.active,
+                activationEvents: plugin.activationEvents,
+                ...this._pluginUIPaths(plugin)
+            });
+        }
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: A plugin's UI pages relative to the app root       █
+     * █ The renderer host loads them into its toolbar and sidebar   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _pluginUIPaths(plugin) {
+        return {
+            settings: plugin.settingsPath ? this._convertToRelativePath(plugin.settingsPath) : null,
+            sidebar: plugin.sidebarPath ? this._convertToRelativePath(plugin.sidebarPath) : null,
+            toolbar: plugin.toolbarPath ? this._convertToRelativePath(plugin.toolbarPath) : null
+        };
+    }
+    
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Private: Initializes a plugin                               █
@@ -330,8 +551,8 @@ class PluginLoader {
      */
     async _initializePlugin(plugin) {
         try {
-            // Skip if already enabled
-            if (plugin.enabled) {
+            // Skip if already active
+            if (plugin.active) {
                 return true;
             }
             
@@ -358,19 +579,11 @@ class PluginLoader {
                 }
             }
             
-            // Register UI components
-            if (this.mainWindow) {
-                // Send UI component paths to renderer
-                this.mainWindow.webContents.send('register-plugin-ui', {
-                    id: plugin.id,
-                    settings: plugin.settingsPath ? this._convertToRelativePath(plugin.settingsPath) : null,
-                    sidebar: plugin.sidebarPath ? this._convertToRelativePath(plugin.sidebarPath) : null,
-                    toolbar: plugin.toolbarPath ? this._convertToRelativePath(plugin.toolbarPath) : null
-                });
-            }
+            // Mark as active
+            plugin.active = true;
             
-            // Mark as enabled
-            plugin.enabled = true;
+            // Register UI components (again, now marked active)
+            this._registerPluginUI(plugin);
             
             return true;
         } catch (err) {
@@ -394,6 +607,12 @@ class PluginLoader {
                 await plugin.instance.cleanup();
             }
             
+            // Drop the message handlers it registered
+            for (const [channel, listener] of plugin.ipcListeners) {
+                ipcMain.removeListener(channel, listener);
+            }
+            plugin.ipcListeners = [];
+            
             // Remove UI components
             if (this.mainWindow) {
                 this.mainWindow.webContents.send('unregister-plugin-ui', {
@@ -402,12 +621,12 @@ class PluginLoader {
             }
             
             // Clear module cache
-            if (plugin.mainPath) {
+            if (plugin.mainPath && plugin.active) {
                 delete require.cache[require.resolve(plugin.mainPath)];
             }
             
-            // Mark as disabled
-            plugin.enabled = false;
+            // Mark as inactive
+            plugin.active = false;
             plugin.instance = null;
             
             return true;
@@ -469,7 +688,8 @@ class PluginLoader {
                     this._checkPermission(plugin, 'messaging');
                     
                     if (this.mainWindow) {
-                        this.mainWindow.webContents.send(`plugin:${plugin.id}:${channel}`, data);
+                        // One channel for every plugin; the host routes it to the plugin's frames
+                        this.mainWindow.webContents.send('plugin-message', { plugin: plugin.id, type: channel, data });
                     }
                 },
                 
@@ -478,12 +698,14 @@ class PluginLoader {
                     this._checkPermission(plugin, 'messaging');
                     
                     const fullChannel = `plugin:${plugin.id}:${channel}`;
-                    ipcMain.on(fullChannel, (event, ...args) => {
+                    const listener = (event, ...args) => {
                         // Only accept messages from our window
                         if (event.sender.id === this.mainWindow.webContents.id) {
                             callback(...args);
                         }
-                    });
+                    };
+                    ipcMain.on(fullChannel, listener);
+                    plugin.ipcListeners.push([fullChannel, listener]);
                 }
             },
             
@@ -673,6 +895,16 @@ class PluginLoader {
             return await this.disablePlugin(pluginId);
         });
         
+        // Activate a plugin on first use of its UI
+        ipcMain.handle('activate-plugin', async (event, { pluginId, event: activationEvent }) => {
+            return await this.activatePlugin(pluginId, activationEvent);
+        });
+        
+        // Activate plugins declaring onEvent:<name>
+        ipcMain.handle('plugin-event', async (event, eventName) => {
+            return await this.activatePluginsForEvent(eventName);
+        });
+        
         // Reload plugins
         ipcMain.handle('reload-plugins', async (event, pluginId) => {
             return await this.reloadPlugins(pluginId);
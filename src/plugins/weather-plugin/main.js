@@ -79,7 +79,7 @@ exports.initialize = async function(api) {
         });
         
         // Set up refresh interval
-        setInterval(() => {
+        const refreshTimer = setInterval(() => {
             refreshWeatherData(api, settings);
         }, settings.refreshInterval * 60 * 1000);
         
@@ -96,7 +96,7 @@ exports.initialize = async function(api) {
             // Cleanup function
             cleanup: () => {
                 api.logger.log('Weather plugin cleanup');
-                // Clean up any resources or event listeners
+                clearInterval(refreshTimer);
             }
         };
     } catch (error) {
@@ -0,0 +1,376 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Process Profiler
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Sampling CPU and heap profiles of every Electron process     ║
+ * ║ Enabled by the launcher's --profile mode, off otherwise      ║
+ * ║ Profiles land in the launcher's per-run directory            ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] Main process profiled in-process through the inspector module
+ * - [+] Renderers (windows and webview tabs) through webContents.debugger
+ * - [+] GPU and utility processes through a content trace
+ * - [+] CPU profiles cut into chunks, so a closed tab loses one at most
+ *
+ * Files are Chrome DevTools formats (.cpuprofile, .heapprofile, trace
+ * JSON): open them in DevTools, or rank them across processes with
+ * `python -m launcher.profiling summarize <run dir>`.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const { app, contentTracing } = require('electron');
+const inspector = require('inspector');
+const fs = require('fs');
+const path = require('path');
+
+// Per-run output directory set by the launcher
+const PROFILE_DIR_ENV = 'INTERNET_SERVER_PROFILE_DIR';
+
+// One CPU sample per millisecond, one heap sample per 32 KB allocated
+const CPU_SAMPLING_INTERVAL_US = 1000;
+const HEAP_SAMPLING_INTERVAL_BYTES = 32 * 1024;
+
+// CPU profiles are written (and restarted) this often
+const FLUSH_INTERVAL_MS = 60000;
+
+// GPU and utility processes run no JS to sample; their task slices are traced
+const TRACE_CONFIG = {
+    included_categories: ['toplevel', 'gpu', 'ipc', 'disabled-by-default-devtools.timeline'],
+    recording_mode: 'record-continuously'
+};
+
+// Closing and quitting never wait longer than this for profiles
+const COLLECT_TIMEOUT_MS = 10000;
+
+class ProcessProfiler {
+    constructor(dir) {
+        this.dir = dir;
+        this.session = null;
+        this.targets = new Map(); // webContents id -> { webContents, type, pid, chunk }
+        this.mainChunk = 0;
+        this.flushTimer = null;
+        this.tracing = false;
+        this.closedWindows = new WeakSet();
+        this.collecting = null;
+        this.collected = false;
+        this.filesWritten = 0;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Profiler for the launcher's --profile mode (null otherwise) █
+     * ███████████████████████████████████████████████████████████████
+     */
+    static fromEnvironment() {
+        const dir = process.env[PROFILE_DIR_ENV];
+        return dir ? new ProcessProfiler(dir) : null;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Starts profiling this process and every renderer it creates █
+     * ███████████████████████████████████████████████████████████████
+     */
+    start() {
+        fs.mkdirSync(this.dir, { recursive: true });
+
+        this.session = new inspector.Session();
+        this.session.connect();
+        this._startSampling((method, params) => this._post(method, params))
+            .catch(err => console.error('❌ Main process profiling failed:', err.message));
+
+        app.on('web-contents-created', (event, contents) => this.attach(contents));
+
+        // Renderer profiles are written while their window can still answer
+        app.on('browser-window-created', (event, window) => {
+            window.on('close', (closeEvent) => this._onWindowClose(window, closeEvent));
+        });
+        app.on('will-quit', (event) => this._onWillQuit(event));
+
+        app.whenReady().then(() => this._startTracing());
+        this.flushTimer = setInterval(() => this.flush(), FLUSH_INTERVAL_MS);
+
+        console.log(`Profiling enabled, writing to ${this.dir}`);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Attaches the DevTools protocol to a renderer and samples it █
+     * ███████████████████████████████████████████████████████████████
+     */
+    attach(contents) {
+        try {
+            contents.debugger.attach('1.3');
+        } catch (err) {
+            // DevTools already attached (--dev); that renderer is skipped
+            console.error(`❌ Cannot profile webContents ${contents.id}:`, err.message);
+            return;
+        }
+
+        const target = { webContents: contents, type: contents.getType(), pid: 0, chunk: 0 };
+        this.targets.set(contents.id, target);
+
+        // A cross-process navigation gets a fresh renderer, which starts unprofiled
+        contents.on('did-navigate', () => {
+            const pid = contents.getOSProcessId();
+            if (pid && pid !== target.pid) {
+                target.pid = pid;
+                this._startTarget(target);
+            }
+        });
+        contents.debugger.on('detach', () => this.targets.delete(contents.id));
+        contents.once('destroyed', () => this.targets.delete(contents.id));
+
+        this._startTarget(target);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Writes the current CPU chunk and heap profile of everything █
+     * ███████████████████████████████████████████████████████████████
+     */
+    flush(restart = true) {
+        const targets = Array.from(this.targets.values());
+        return Promise.all([
+            this._flushMain(restart),
+            ...targets.map(target => this._flushTarget(target, restart))
+        ]);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Final collection: stop every profiler and the trace         █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async collect() {
+        clearInterval(this.flushTimer);
+        this.flushTimer = null;
+
+        await this.flush(false);
+
+        if (this.tracing) {
+            this.tracing = false;
+            try {
+                await contentTracing.stopRecording(path.join(this.dir, `trace-${process.pid}.json`));
+                this.filesWritten++;
+            } catch (err) {
+                console.error('❌ Failed to write the content trace:', err.message);
+            }
+        }
+
+        for (const target of this.targets.values()) {
+            this._detach(target);
+        }
+        this.targets.clear();
+        if (this.session) {
+            this.session.disconnect();
+            this.session = null;
+        }
+
+        this.collected = true;
+        console.log(`Profiling finished: ${this.filesWritten} file(s) in ${this.dir}`);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Enables CPU and heap sampling through a protocol send fn    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _startSampling(send) {
+        await send('Profiler.enable');
+        await send('Profiler.setSamplingInterval', { interval: CPU_SAMPLING_INTERVAL_US });
+        await send('Profiler.start');
+        await send('HeapProfiler.enable');
+        await send('HeapProfiler.startSampling', { samplingInterval: HEAP_SAMPLING_INTERVAL_BYTES });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Starts sampling a renderer (after attach or a new process)  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _startTarget(target) {
+        const contents = target.webContents;
+        target.pid = target.pid || contents.getOSProcessId();
+        this._startSampling((method, params) => contents.debugger.sendCommand(method, params))
+            .catch(() => {
+                // No renderer yet: did-navigate starts it once there is one
+                target.pid = 0;
+            });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Writes the main process profiles                            █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _flushMain(restart) {
+        if (!this.session) {
+            return;
+        }
+        const label = `main-${process.pid}`;
+        await this._writeProfiles(label, this.mainChunk++, (method, params) => this._post(method, params), restart);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Writes one renderer's profiles                              █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _flushTarget(target, restart) {
+        if (!target.pid || target.webContents.isDestroyed()) {
+            return;
+        }
+        const label = `renderer-${target.pid}-${target.type}-${target.webContents.id}`;
+        const send = (method, params) => target.webContents.debugger.sendCommand(method, params);
+        await this._writeProfiles(label, target.chunk++, send, restart);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Stops a CPU chunk, snapshots the heap sample, writes both   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _writeProfiles(label, chunk, send, restart) {
+        try {
+            const { profile } = await send('Profiler.stop');
+            if (restart) {
+                await send('Profiler.start');
+            }
+            await this._write(`${label}-${chunk}.cpuprofile`, profile);
+        } catch (err) {
+            // Renderer gone or profiler not started (yet); nothing to write
+        }
+
+        try {
+            // The sampling heap profile covers the whole run; the newest replaces the last
+            const heap = await send('HeapProfiler.getSamplingProfile');
+            await this._write(`${label}.heapprofile`, heap.profile);
+        } catch (err) {
+            // As above
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Writes one profile file                                     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _write(name, profile) {
+        await fs.promises.writeFile(path.join(this.dir, name), JSON.stringify(profile));
+        this.filesWritten++;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Starts the content trace for GPU and utility processes      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _startTracing() {
+        try {
+            await contentTracing.startRecording(TRACE_CONFIG);
+            this.tracing = true;
+        } catch (err) {
+            console.error('❌ Content tracing unavailable:', err.message);
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Delays a window close until its renderers are written       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _onWindowClose(window, event) {
+        if (this.collected || this.closedWindows.has(window)) {
+            return;
+        }
+        event.preventDefault();
+        this.closedWindows.add(window);
+
+        // The window itself and the webview tabs it hosts
+        const owner = window.webContents;
+        const targets = Array.from(this.targets.values()).filter(target =>
+            target.webContents === owner || target.webContents.hostWebContents === owner);
+        const flushed = Promise.all(targets.map(target => this._flushTarget(target, true)));
+
+        this._withTimeout(flushed).then(() => {
+            if (!window.isDestroyed()) {
+                window.close();
+            }
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Delays quitting until the final collection is written       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _onWillQuit(event) {
+        if (this.collected) {
+            return;
+        }
+        event.preventDefault();
+        if (this.collecting) {
+            return;
+        }
+        this.collecting = this._withTimeout(this.collect()).then(() => {
+            this.collected = true;
+            app.quit();
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Detaches the DevTools protocol from a renderer              █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _detach(target) {
+        try {
+            if (!target.webContents.isDestroyed()) {
+                target.webContents.debugger.detach();
+            }
+        } catch (err) {
+            // Already detached
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Resolves when the promise settles or the timeout passes     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _withTimeout(promise) {
+        return new Promise((resolve) => {
+            const timer = setTimeout(resolve, COLLECT_TIMEOUT_MS);
+            promise.catch(err => console.error('❌ Profile collection failed:', err.message))
+                .then(() => {
+                    clearTimeout(timer);
+                    resolve();
+                });
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Promise wrapper around the main process inspector session   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _post(method, params = {}) {
+        return new Promise((resolve, reject) => {
+            this.session.post(method, params, (err, result) => {
+                if (err) {
+                    reject(err);
+                } else {
+                    resolve(result);
+                }
+            });
+        });
+    }
+}
+
+module.exports = ProcessProfiler;
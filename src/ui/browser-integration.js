@@ -22,9 +22,18 @@
  */
 
 const { ipcRenderer } = require('electron');
+const os = require('os');
 
 // Import UI components
 const LimiterSettingsPanel = require('./components/limiter-settings-panel');
+const TelemetryClient = require('./telemetry-client');
+
+// Only the fields the status bar shows are sent to this window
+const INDICATOR_FIELDS = [
+    'cpu.current', 'cpu.limit', 'cpu.enabled',
+    'memory.total', 'memory.limit', 'memory.enabled',
+    'network.bytesDownloadedPerSecond', 'network.bytesUploadedPerSecond', 'network.throttlingEnabled'
+];
 
 /**
  * ███████████████████████████████████████████████████████████████
@@ -50,8 +59,9 @@ class BrowserIntegration {
             network: { download: 0, upload: 0 }
         };
         
-        // Stats update interval
-        this.statsUpdateInterval = null;
+        // Telemetry bus subscription (see telemetry-client.js)
+        this.telemetry = new TelemetryClient(ipcRenderer);
+        this.unsubscribeStats = null;
         
         // Initialize
         this.init();
@@ -79,7 +89,7 @@ class BrowserIntegration {
         // Set up IPC listeners
         this._setupIpcListeners();
         
-        // Start stats update interval
+        // Subscribe to the status bar's stats
         this._startStatsUpdate();
         
         console.log('[Browser Integration] Initialized');
@@ -234,15 +244,6 @@ class BrowserIntegration {
      * ███████████████████████████████████████████████████████████████
      */
     _setupIpcListeners() {
-        // Listen for resource stats updates
-        ipcRenderer.on('resource-stats-update', (event, stats) => {
-            // Update resource stats
-            this.resourceStats = stats;
-            
-            // Update indicators
-            this._updateResourceIndicators();
-        });
-        
         // Listen for limiter settings panel toggle request
         ipcRenderer.on('toggle-limiter-settings', () => {
             this.toggleLimiterSettingsPanel();
@@ -254,32 +255,52 @@ class BrowserIntegration {
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Private: Start stats update                                 █
-     * █ Starts interval to update resource stats                    █
+     * █ Subscribes to the indicator fields on the telemetry bus     █
      * ███████████████████████████████████████████████████████████████
      */
     _startStatsUpdate() {
-        // Clear previous interval
-        if (this.statsUpdateInterval) {
-            clearInterval(this.statsUpdateInterval);
-        }
+        // At most one update a second, and none while nothing changes
+        this.telemetry.subscribe(INDICATOR_FIELDS, { intervalMs: 1000 }, (stats) => {
+            this.resourceStats = this._toIndicatorStats(stats);
+            this._updateResourceIndicators();
+        })
+            .then(unsubscribe => {
+                this.unsubscribeStats = unsubscribe;
+            })
+            .catch(error => {
+                console.error('[Browser Integration] Error subscribing to resource stats:', error);
+            });
         
-        // Start new interval
-        this.statsUpdateInterval = setInterval(() => {
-            // Request resource stats from main process
-            ipcRenderer.invoke('get-resource-stats')
-                .then(stats => {
-                    // Update resource stats
-                    this.resourceStats = stats;
-                    
-                    // Update indicators
-                    this._updateResourceIndicators();
-                })
-                .catch(error => {
-                    console.error('[Browser Integration] Error getting resource stats:', error);
-                });
-        }, 1000); // Update every second
+        console.log('[Browser Integration] Subscribed to resource stats');
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Maps limiter stats onto the indicators' shape      █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _toIndicatorStats(stats) {
+        const cpu = stats.cpu || {};
+        const memory = stats.memory || {};
+        const network = stats.network || {};
+        const totalMemoryMB = Math.round(os.totalmem() / (1024 * 1024));
         
-        console.log('[Browser Integration] Started stats update interval');
+        return {
+            cpu: {
+                usage: cpu.current || 0,
+                limit: cpu.enabled ? cpu.limit : 100
+            },
+            memory: {
+                usage: memory.total || 0,
+                limit: memory.enabled ? memory.limit : totalMemoryMB,
+                total: totalMemoryMB
+            },
+            network: {
+                download: network.bytesDownloadedPerSecond || 0,
+                upload: network.bytesUploadedPerSecond || 0,
+                isThrottled: !!network.throttlingEnabled
+            }
+        };
     }
     
     /**
@@ -439,11 +460,9 @@ class BrowserIntegration {
      * ███████████████████████████████████████████████████████████████
      */
     dispose() {
-        // Clear stats update interval
-        if (this.statsUpdateInterval) {
-            clearInterval(this.statsUpdateInterval);
-            this.statsUpdateInterval = null;
-        }
+        // Cancel the stats subscription
+        this.telemetry.dispose();
+        this.unsubscribeStats = null;
         
         // Dispose limiter settings panel
         if (this.limiterSettingsPanel) {
@@ -452,7 +471,6 @@ class BrowserIntegration {
         }
         
         // Remove IPC listeners
-        ipcRenderer.removeAllListeners('resource-stats-update');
         ipcRenderer.removeAllListeners('toggle-limiter-settings');
         
         console.log('[Browser Integration] Disposed');
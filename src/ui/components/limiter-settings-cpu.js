@@ -19,6 +19,7 @@
  */
 
 const { ipcRenderer } = require('electron');
+const TelemetryClient = require('../telemetry-client');
 
 /**
  * ███████████████████████████████████████████████████████████████
@@ -250,19 +251,14 @@ class CpuLimiterSettings {
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Private: Start CPU stats updates                            █
-     * █ Sets up IPC listener for resource stats updates             █
+     * █ Subscribes to the CPU fields on the telemetry bus           █
      * ███████████████████████████████████████████████████████████████
      */
     _startStatsUpdates() {
-        // Listen for resource stats updates from main process
-        ipcRenderer.on('resource-stats-update', (event, stats) => {
-            this.updateStats(stats);
-        });
-        
-        // Request initial stats
-        ipcRenderer.invoke('get-resource-stats')
-            .then(stats => this.updateStats(stats))
-            .catch(error => console.error('[CPU Settings] Error getting initial stats:', error));
+        // The first update is the full snapshot, later ones only what changed
+        this.telemetry = new TelemetryClient(ipcRenderer);
+        this.telemetry.subscribe(['cpu'], { intervalMs: 1000 }, stats => this.updateStats(stats))
+            .catch(error => console.error('[CPU Settings] Error subscribing to stats:', error));
     }
     
     /**
@@ -272,8 +268,11 @@ class CpuLimiterSettings {
      * ███████████████████████████████████████████████████████████████
      */
     dispose() {
-        // Remove IPC listener
-        ipcRenderer.removeAllListeners('resource-stats-update');
+        // Cancel the stats subscription
+        if (this.telemetry) {
+            this.telemetry.dispose();
+            this.telemetry = null;
+        }
         
         console.log('[CPU Settings] Disposed');
     }
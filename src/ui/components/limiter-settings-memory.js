@@ -20,6 +20,7 @@
  */
 
 const { ipcRenderer } = require('electron');
+const TelemetryClient = require('../telemetry-client');
 
 /**
  * ███████████████████████████████████████████████████████████████
@@ -428,19 +429,14 @@ class MemoryLimiterSettings {
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Private: Start memory stats updates                         █
-     * █ Sets up IPC listener for resource stats updates             █
+     * █ Subscribes to the memory fields on the telemetry bus        █
      * ███████████████████████████████████████████████████████████████
      */
     _startStatsUpdates() {
-        // Listen for resource stats updates from main process
-        ipcRenderer.on('resource-stats-update', (event, stats) => {
-            this.updateStats(stats);
-        });
-        
-        // Request initial stats
-        ipcRenderer.invoke('get-resource-stats')
-            .then(stats => this.updateStats(stats))
-            .catch(error => console.error('[Memory Settings] Error getting initial stats:', error));
+        // The first update is the full snapshot, later ones only what changed
+        this.telemetry = new TelemetryClient(ipcRenderer);
+        this.telemetry.subscribe(['memory'], { intervalMs: 1000 }, stats => this.updateStats(stats))
+            .catch(error => console.error('[Memory Settings] Error subscribing to stats:', error));
     }
     
     /**
@@ -450,8 +446,11 @@ class MemoryLimiterSettings {
      * ███████████████████████████████████████████████████████████████
      */
     dispose() {
-        // Remove IPC listener
-        ipcRenderer.removeAllListeners('resource-stats-update');
+        // Cancel the stats subscription
+        if (this.telemetry) {
+            this.telemetry.dispose();
+            this.telemetry = null;
+        }
         
         console.log('[Memory Settings] Disposed');
     }
@@ -21,6 +21,7 @@
  */
 
 const { ipcRenderer } = require('electron');
+const TelemetryClient = require('../telemetry-client');
 
 /**
  * ███████████████████████████████████████████████████████████████
@@ -533,19 +534,14 @@ class NetworkLimiterSettings {
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Private: Start network stats updates                        █
-     * █ Sets up IPC listener for resource stats updates             █
+     * █ Subscribes to the network fields on the telemetry bus       █
      * ███████████████████████████████████████████████████████████████
      */
     _startStatsUpdates() {
-        // Listen for resource stats updates from main process
-        ipcRenderer.on('resource-stats-update', (event, stats) => {
-            this.updateStats(stats);
-        });
-        
-        // Request initial stats
-        ipcRenderer.invoke('get-resource-stats')
-            .then(stats => this.updateStats(stats))
-            .catch(error => console.error('[Network Settings] Error getting initial stats:', error));
+        // The first update is the full snapshot, later ones only what changed
+        this.telemetry = new TelemetryClient(ipcRenderer);
+        this.telemetry.subscribe(['network'], { intervalMs: 1000 }, stats => this.updateStats(stats))
+            .catch(error => console.error('[Network Settings] Error subscribing to stats:', error));
     }
     
     /**
@@ -555,8 +551,11 @@ class NetworkLimiterSettings {
      * ███████████████████████████████████████████████████████████████
      */
     dispose() {
-        // Remove IPC listener
-        ipcRenderer.removeAllListeners('resource-stats-update');
+        // Cancel the stats subscription
+        if (this.telemetry) {
+            this.telemetry.dispose();
+            this.telemetry = null;
+        }
         
         console.log('[Network Settings] Disposed');
     }
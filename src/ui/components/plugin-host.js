@@ -0,0 +1,369 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Plugin Host Component
+ *
+ * This class hosts the UI of enabled plugins in the browser window:
+ * - Toolbar pages next to the address bar
+ * - Sidebar and settings pages in the plugin sidebar
+ * - The Tools > Plugins dialog (enable, disable, open)
+ * - Message routing between plugin pages and their main module
+ *
+ * Plugins are loaded lazily: an inactive plugin shows a placeholder
+ * toolbar button, and its main module is only activated when that
+ * button is clicked or its sidebar or settings page is opened.
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+class PluginHost {
+    constructor() {
+        // Registered UI of enabled plugins by ID
+        this.plugins = new Map();
+
+        // Plugin page iframes by plugin ID
+        this.frames = new Map();
+
+        // DOM elements
+        this.toolbar = null;
+        this.sidebar = null;
+        this.sidebarTitle = null;
+        this.sidebarFrame = null;
+        this.pluginList = null;
+
+        // Plugin currently shown in the sidebar
+        this.sidebarPlugin = null;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Initializes the plugin host                                 █
+     * █ Listens for plugin UI from the main process and shows the   █
+     * █ plugins that were enabled before this page loaded           █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async init() {
+        this.toolbar = document.getElementById('plugin-toolbar');
+        this.sidebar = document.getElementById('plugin-sidebar');
+        this.sidebarTitle = document.getElementById('plugin-sidebar-title');
+        this.sidebarFrame = document.getElementById('plugin-sidebar-frame');
+        this.pluginList = document.getElementById('plugin-list');
+
+        window.electronAPI.onRegisterPluginUI((plugin) => this.register(plugin));
+        window.electronAPI.onUnregisterPluginUI((plugin) => this.unregister(plugin.id));
+        window.electronAPI.onPluginMessage((message) => this._deliver(message));
+        window.addEventListener('message', (event) => this._handleFrameMessage(event));
+
+        document.getElementById('plugin-sidebar-close').addEventListener('click', () => this.closeSidebar());
+        document.getElementById('plugins-btn').addEventListener('click', () => this.showPluginsDialog());
+
+        try {
+            const plugins = await window.electronAPI.getPlugins();
+            plugins.filter(plugin => plugin.enabled).forEach(plugin => this.register(plugin));
+        } catch (err) {
+            console.error('❌ Failed to load plugin list:', err);
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Shows (or refreshes) an enabled plugin's UI                 █
+     * █ Sent again by the main process once the plugin is active    █
+     * ███████████████████████████████████████████████████████████████
+     */
+    register(plugin) {
+        this.plugins.set(plugin.id, plugin);
+        this._renderToolbar(plugin);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Removes a disabled plugin's toolbar and sidebar pages       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    unregister(pluginId) {
+        if (this.sidebarPlugin === pluginId) {
+            this.closeSidebar();
+        }
+
+        const item = this._toolbarItem(pluginId);
+        if (item) {
+            item.remove();
+        }
+
+        this.frames.delete(pluginId);
+        this.plugins.delete(pluginId);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Activates a plugin before its UI talks to it                █
+     * █ Resolves false (and reports why) if it cannot be loaded     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async activate(pluginId, event) {
+        try {
+            return await window.electronAPI.activatePlugin(pluginId, event);
+        } catch (err) {
+            console.error(`❌ Failed to activate plugin ${pluginId}:`, err);
+            updateStatusBar(`Plugin ${pluginId} could not be loaded`);
+            return false;
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Opens a plugin's sidebar or settings page in the sidebar    █
+     * █ Activates the plugin (onSidebar / onSettings) first         █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async openSidebar(pluginId, page = 'sidebar') {
+        const plugin = this.plugins.get(pluginId);
+        if (!plugin || !plugin[page]) {
+            return false;
+        }
+
+        if (!await this.activate(pluginId, page === 'settings' ? 'onSettings' : 'onSidebar')) {
+            return false;
+        }
+
+        if (this.sidebarPlugin && this.sidebarPlugin !== pluginId) {
+            this._forgetFrame(this.sidebarPlugin, this.sidebarFrame);
+        }
+
+        this.sidebarPlugin = pluginId;
+        this.sidebarTitle.textContent = plugin.name || plugin.id;
+        this.sidebarFrame.src = this._pageUrl(plugin[page]);
+        this._trackFrame(pluginId, this.sidebarFrame);
+        this.sidebar.classList.add('active');
+        playUISound('dialog-open');
+        return true;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Closes the plugin sidebar                                   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    closeSidebar() {
+        if (!this.sidebarPlugin) {
+            return;
+        }
+
+        this._forgetFrame(this.sidebarPlugin, this.sidebarFrame);
+        this.sidebarPlugin = null;
+        this.sidebarFrame.src = 'about:blank';
+        this.sidebar.classList.remove('active');
+        playUISound('dialog-close');
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Opens a plugin's sidebar, or closes it if already shown     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    toggleSidebar(pluginId) {
+        if (this.sidebarPlugin === pluginId) {
+            this.closeSidebar();
+            return;
+        }
+        this.openSidebar(pluginId);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Shows the Tools > Plugins dialog                            █
+     * █ Lists every installed plugin with enable and open controls  █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async showPluginsDialog() {
+        await this._renderPluginList();
+        showDialog('plugins-dialog');
+        playUISound('dialog-open');
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Toolbar page (active) or placeholder button        █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _renderToolbar(plugin) {
+        const existing = this._toolbarItem(plugin.id);
+        if (existing) {
+            this._forgetFrame(plugin.id, existing);
+            existing.remove();
+        }
+
+        if (!plugin.toolbar) {
+            return;
+        }
+
+        let item;
+        if (plugin.active) {
+            item = document.createElement('iframe');
+            item.className = 'plugin-toolbar-frame';
+            item.src = this._pageUrl(plugin.toolbar);
+            this._trackFrame(plugin.id, item);
+        } else {
+            // The first click loads the plugin; it then re-registers as active
+            item = document.createElement('button');
+            item.className = 'xp-button toolbar-button plugin-toolbar-button';
+            item.textContent = (plugin.name || plugin.id).charAt(0).toUpperCase();
+            item.addEventListener('click', () => this.activate(plugin.id, 'onToolbar'));
+        }
+
+        item.dataset.pluginId = plugin.id;
+        item.title = plugin.name || plugin.id;
+        this.toolbar.appendChild(item);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Fills the plugins dialog from the main process     █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _renderPluginList() {
+        let plugins = [];
+        try {
+            plugins = await window.electronAPI.getPlugins();
+        } catch (err) {
+            console.error('❌ Failed to load plugin list:', err);
+        }
+
+        this.pluginList.textContent = '';
+        if (plugins.length === 0) {
+            this.pluginList.textContent = 'No plugins installed.';
+            return;
+        }
+
+        plugins.forEach(plugin => {
+            const row = document.createElement('div');
+            row.className = 'plugin-row';
+
+            const label = document.createElement('label');
+            const checkbox = document.createElement('input');
+            checkbox.type = 'checkbox';
+            checkbox.checked = plugin.enabled;
+            checkbox.addEventListener('change', () => this._setEnabled(plugin.id, checkbox.checked));
+            label.append(checkbox, ` ${plugin.name} v${plugin.version}`);
+
+            const description = document.createElement('div');
+            description.className = 'plugin-description';
+            description.textContent = plugin.description;
+
+            row.append(label, description);
+
+            [['sidebar', 'Open'], ['settings', 'Settings']].forEach(([page, text]) => {
+                if (!plugin[page]) {
+                    return;
+                }
+                const button = document.createElement('button');
+                button.className = 'xp-button';
+                button.textContent = text;
+                button.disabled = !plugin.enabled;
+                button.addEventListener('click', () => {
+                    closeDialog('plugins-dialog');
+                    this.openSidebar(plugin.id, page);
+                });
+                row.appendChild(button);
+            });
+
+            this.pluginList.appendChild(row);
+        });
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Enables or disables a plugin from the dialog       █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async _setEnabled(pluginId, enabled) {
+        try {
+            if (enabled) {
+                await window.electronAPI.enablePlugin(pluginId);
+            } else {
+                await window.electronAPI.disablePlugin(pluginId);
+            }
+        } catch (err) {
+            console.error(`❌ Failed to ${enabled ? 'enable' : 'disable'} plugin ${pluginId}:`, err);
+        }
+        await this._renderPluginList();
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Routes a message from a plugin page                █
+     * █ The sender frame decides the plugin, not the message body   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _handleFrameMessage(event) {
+        const pluginId = this._frameOwner(event.source);
+        const message = event.data;
+        if (!pluginId || !message || typeof message.type !== 'string') {
+            return;
+        }
+
+        if (message.type === 'toggleSidebar') {
+            this.toggleSidebar(pluginId);
+            return;
+        }
+
+        window.electronAPI.sendPluginMessage(pluginId, message.type, message.data);
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Passes a main-module message to the plugin pages   █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _deliver(message) {
+        const frames = this.frames.get(message.plugin);
+        if (!frames) {
+            return;
+        }
+
+        frames.forEach(frame => {
+            if (frame.contentWindow) {
+                frame.contentWindow.postMessage(message, '*');
+            }
+        });
+    }
+
+    _trackFrame(pluginId, frame) {
+        if (!this.frames.has(pluginId)) {
+            this.frames.set(pluginId, new Set());
+        }
+        this.frames.get(pluginId).add(frame);
+    }
+
+    _forgetFrame(pluginId, frame) {
+        const frames = this.frames.get(pluginId);
+        if (frames) {
+            frames.delete(frame);
+        }
+    }
+
+    _frameOwner(source) {
+        for (const [pluginId, frames] of this.frames) {
+            for (const frame of frames) {
+                if (frame.contentWindow === source) {
+                    return pluginId;
+                }
+            }
+        }
+        return null;
+    }
+
+    _toolbarItem(pluginId) {
+        return Array.from(this.toolbar.children).find(item => item.dataset.pluginId === pluginId) || null;
+    }
+
+    _pageUrl(relativePath) {
+        // Plugin paths are relative to the app root; this page is src/ui/index.html
+        return `../../${relativePath}`;
+    }
+}
+
+// Make PluginHost globally available
+window.pluginHost = window.pluginHost || new PluginHost();
@@ -10,9 +10,15 @@
  * - Network bandwidth tracking
  * - Visual meter displays and updates
  * 
+ * Readings come from the main process telemetry bus; only the fields
+ * shown here are subscribed to, and only when they change.
+ * 
  * Copyright (c) 2025 ZARI CORP
  */
 
+// Process CPU %, total MB, download bytes/s
+const MONITOR_FIELDS = ['cpu.current', 'memory.total', 'network.bytesDownloadedPerSecond'];
+
 class ResourceMonitor {
     constructor() {
         // Initialize resource usage values
@@ -38,16 +44,16 @@ class ResourceMonitor {
         this.ramHistory = new Array(60).fill(0);
         this.networkHistory = new Array(60).fill(0);
         
-        // Update interval in ms
+        // Fastest update rate in ms
         this.updateInterval = 2000;
-        this.updateTimer = null;
+        this.unsubscribe = null;
     }
     
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Initializes the resource monitor                            █
      * █ Gets reference to DOM elements and sets up event listeners  █
-     * █ Starts the update timer for real-time monitoring            █
+     * █ Subscribes to the meters' fields on the telemetry bus       █
      * ███████████████████████████████████████████████████████████████
      */
     init() {
@@ -59,25 +65,28 @@ class ResourceMonitor {
         this.ramValue = document.getElementById('ram-value');
         this.networkValue = document.getElementById('network-value');
         
-        // Set up event listeners for resource updates from main process
-        window.electronAPI.onCpuUsageUpdate((usage) => {
-            this.updateCpuUsage(usage);
-        });
-        
-        window.electronAPI.onRamUsageUpdate((usage) => {
-            this.updateRamUsage(usage);
-        });
+        // Resource updates from main process, only for meters whose reading changed
+        window.electronAPI.subscribeTelemetry(MONITOR_FIELDS, { intervalMs: this.updateInterval }, (stats, changed) => {
+            if (changed.includes('cpu.current')) {
+                this.updateCpuUsage(stats.cpu.current);
+            }
+            if (changed.includes('memory.total')) {
+                this.updateRamUsage(stats.memory.total);
+            }
+            if (changed.includes('network.bytesDownloadedPerSecond')) {
+                this.updateNetworkUsage(stats.network.bytesDownloadedPerSecond / 1024);
+            }
+        })
+            .then(unsubscribe => {
+                this.unsubscribe = unsubscribe;
+            })
+            .catch(error => console.error('Failed to subscribe to resource usage:', error));
         
         // Load configuration
         this.loadConfig();
         
         // Initialize limiters in dialog
         this.initLimiterControls();
-        
-        // Start update timer for network usage (simulated in renderer for demo)
-        this.updateTimer = setInterval(() => {
-            this.simulateNetworkUsage();
-        }, this.updateInterval);
     }
     
     /**
@@ -255,37 +264,12 @@ class ResourceMonitor {
     
     /**
      * ███████████████████████████████████████████████████████████████
-     * █ Simulates network usage for demonstration                    █
-     * █ In a production app, this would receive data from main process █
-     * █ Updates based on active browsing activity                    █
+     * █ Updates network usage display                                █
+     * █ Called with the proxy's download rate in KB/s                █
+     * █ Updates meter and numerical value                            █
      * ███████████████████████████████████████████████████████████████
      */
-    simulateNetworkUsage() {
-        // Generate somewhat realistic network usage pattern
-        // In a real implementation, this would come from the main process
-        
-        // Base usage - random low value
-        let usage = Math.random() * 20;
-        
-        // Check if any webviews are loading content
-        const activeTab = window.tabManager && window.tabManager.activeTabId;
-        if (activeTab) {
-            const tab = window.tabManager.tabs.get(activeTab);
-            if (tab && tab.webview) {
-                // Check if webview is loading (very simplified)
-                const isLoading = tab.webview.isLoading && tab.webview.isLoading();
-                if (isLoading) {
-                    // Simulate higher network usage during page load
-                    usage += Math.random() * 200 + 100;
-                }
-            }
-        }
-        
-        // Apply network limit if configured
-        if (this.networkLimit > 0 && usage > this.networkLimit) {
-            usage = this.networkLimit;
-        }
-        
+    updateNetworkUsage(usage) {
         this.networkUsage = usage;
         
         // Update history array
@@ -294,15 +278,15 @@ class ResourceMonitor {
         
         // Update meter display
         if (this.networkMeterFill && this.networkValue) {
-            // Calculate percentage (if limit is 0, use 1000 as reference)
-            const referenceLimit = this.networkLimit > 0 ? this.networkLimit : 1000;
+            // Calculate percentage (the limit is in kbps; if it is 0, use 1000 KB/s as reference)
+            const referenceLimit = this.networkLimit > 0 ? this.networkLimit / 8 : 1000;
             const percentOfLimit = Math.min(100, (usage / referenceLimit) * 100);
             
             // Set meter fill
             this.networkMeterFill.style.width = `${percentOfLimit}%`;
             
             // Set color based on usage
-            if (this.networkLimit > 0 && usage > this.networkLimit * 0.8) {
+            if (this.networkLimit > 0 && usage > referenceLimit * 0.8) {
                 this.networkMeterFill.style.backgroundColor = '#FFAA00';
             } else {
                 this.networkMeterFill.style.backgroundColor = '#44AAFF';
@@ -320,15 +304,15 @@ class ResourceMonitor {
     /**
      * ███████████████████████████████████████████████████████████████
      * █ Cleans up resources used by the monitor                      █
-     * █ Clears timers and event listeners                            █
+     * █ Cancels the telemetry subscription                           █
      * █ Called when component is being destroyed                     █
      * ███████████████████████████████████████████████████████████████
      */
     dispose() {
-        // Clear update timer
-        if (this.updateTimer) {
-            clearInterval(this.updateTimer);
-            this.updateTimer = null;
+        // Stop resource updates
+        if (this.unsubscribe) {
+            this.unsubscribe();
+            this.unsubscribe = null;
         }
     }
 }
@@ -9,6 +9,7 @@
  * - Navigation within tabs (back, forward, refresh)
  * - Tab content loading and URL handling
  * - Tab state management and persistence
+ * - Hibernation: the main process destroys cold tabs, we restore them
  * 
  * Copyright (c) 2025 ZARI CORP
  */
@@ -32,6 +33,11 @@ class TabManager {
         window.electronAPI.onSuspendInactiveTabs(() => {
             this._suspendInactiveTabs();
         });
+        
+        // Register for tab hibernation requests from the memory limiter
+        window.electronAPI.onHibernateTab(({ tabId }) => {
+            this._hibernateTab(tabId);
+        });
     }
     
     /**
@@ -65,12 +71,7 @@ class TabManager {
         viewElement.id = `${tabId}-view`;
         
         // Create webview for this tab
-        const webview = document.createElement('webview');
-        webview.id = `webview-${tabId}`;
-        webview.className = 'browser-webview';
-        webview.src = url;
-        webview.setAttribute('webpreferences', 'contextIsolation=yes, javascript=yes');
-        webview.setAttribute('allowpopups', 'yes');
+        const webview = this._createWebview(tabId, url);
         
         // Add to browser container
         viewElement.appendChild(webview);
@@ -85,11 +86,13 @@ class TabManager {
             title: 'New Tab',
             url: url,
             favicon: null,
-            isSuspended: false
+            isSuspended: false,
+            isHibernated: false
         });
         
         // Set up event listeners for this tab
         this._setupTabEventListeners(tabId);
+        this._setupWebviewEventListeners(tabId);
         
         // Switch to this new tab
         this.switchToTab(tabId);
@@ -122,6 +125,11 @@ class TabManager {
         // Update address bar with tab URL
         this.urlInput.value = tab.url;
         
+        // Recreate tab if it was hibernated
+        if (tab.isHibernated) {
+            this._restoreHibernatedTab(tabId);
+        }
+        
         // Resume tab if it was suspended
         if (tab.isSuspended) {
             this._resumeTab(tabId);
@@ -129,6 +137,7 @@ class TabManager {
         
         // Update active tab reference
         this.activeTabId = tabId;
+        window.electronAPI.tabActivated(tabId);
         
         // Update window title with tab title
         document.title = `${tab.title} - Internet Server`;
@@ -198,6 +207,7 @@ class TabManager {
         
         // Remove from tabs collection
         this.tabs.delete(tabId);
+        window.electronAPI.tabClosed(tabId);
     }
     
     /**
@@ -291,11 +301,29 @@ class TabManager {
         });
     }
     
+    /**
+     * ███████████████████████████████████████████████████
+     * █ Private: Creates the webview element of a tab  █
+     * █ Used for new tabs and hibernated tab restores  █
+     * ███████████████████████████████████████████████████
+     */
+    _createWebview(tabId, url) {
+        const webview = document.createElement('webview');
+        webview.id = `webview-${tabId}`;
+        webview.className = 'browser-webview';
+        if (url) {
+            webview.src = url;
+        }
+        webview.setAttribute('webpreferences', 'contextIsolation=yes, javascript=yes');
+        webview.setAttribute('allowpopups', 'yes');
+        
+        return webview;
+    }
+    
     /**
      * ███████████████████████████████████████████████████
      * █ Private: Sets up event listeners for tabs      █
-     * █ Handles webview navigation events              █
-     * █ Updates tab UI based on content loading        █
+     * █ Handles tab bar clicks and the close button    █
      * ███████████████████████████████████████████████████
      */
     _setupTabEventListeners(tabId) {
@@ -319,6 +347,22 @@ class TabManager {
                 window.soundManager.play('tab-close');
             }
         });
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████
+     * █ Private: Sets up event listeners for webviews  █
+     * █ Handles webview navigation events              █
+     * █ Updates tab UI based on content loading        █
+     * ███████████████████████████████████████████████████
+     */
+    _setupWebviewEventListeners(tabId) {
+        const tab = this.tabs.get(tabId);
+        
+        // Let the memory limiter know which WebContents shows this tab
+        tab.webview.addEventListener('dom-ready', () => {
+            window.electronAPI.registerTab(tabId, tab.webview.getWebContentsId());
+        }, { once: true });
         
         // Webview events
         tab.webview.addEventListener('did-start-loading', () => {
@@ -404,7 +448,7 @@ class TabManager {
     _suspendInactiveTabs() {
         // Skip active tab, suspend all others
         for (const [tabId, tab] of this.tabs.entries()) {
-            if (tabId !== this.activeTabId && !tab.isSuspended) {
+            if (tabId !== this.activeTabId && !tab.isSuspended && !tab.isHibernated) {
                 // Store current tab state
                 tab.suspendedUrl = tab.webview.getURL();
                 
@@ -442,6 +486,68 @@ class TabManager {
         }
     }
     
+    /**
+     * ███████████████████████████████████████████████████
+     * █ Private: Hibernates a background tab           █
+     * █ Removing the webview destroys its WebContents  █
+     * █ The main process has already saved its state   █
+     * ███████████████████████████████████████████████████
+     */
+    _hibernateTab(tabId) {
+        const tab = this.tabs.get(tabId);
+        
+        // The user may have switched to the tab since the request was sent
+        if (!tab || tabId === this.activeTabId || tab.isHibernated || tab.isSuspended) {
+            window.electronAPI.tabHibernated(tabId, false);
+            return;
+        }
+        
+        tab.webview.remove();
+        tab.webview = null;
+        tab.isHibernated = true;
+        
+        // Add visual indicator that tab is hibernated
+        tab.element.classList.add('hibernated');
+        
+        window.electronAPI.tabHibernated(tabId, true);
+        console.log(`Hibernated tab: ${tabId} (${tab.title})`);
+    }
+    
+    /**
+     * ███████████████████████████████████████████████████
+     * █ Private: Restores a hibernated tab             █
+     * █ Recreates the webview at the saved URL         █
+     * █ Main process reapplies history, scroll, forms  █
+     * ███████████████████████████████████████████████████
+     */
+    _restoreHibernatedTab(tabId) {
+        const tab = this.tabs.get(tabId);
+        
+        // Webview exists right away; it starts loading once the state is back
+        tab.webview = this._createWebview(tabId, null);
+        tab.view.appendChild(tab.webview);
+        tab.isHibernated = false;
+        tab.element.classList.remove('hibernated');
+        this._setupWebviewEventListeners(tabId);
+        
+        const webview = tab.webview;
+        window.electronAPI.restoreTab(tabId).then(state => {
+            // Navigating in the meantime wins over the saved state
+            if (webview.getAttribute('src')) return;
+            
+            if (state) {
+                webview.addEventListener('did-finish-load', () => {
+                    window.electronAPI.tabRestored(tabId, webview.getWebContentsId());
+                }, { once: true });
+            }
+            
+            // History restore loads the saved entries itself
+            webview.src = state ? (state.restoreHistory ? 'about:blank' : state.url) : tab.url;
+            
+            console.log(`Restored tab: ${tabId} (${tab.title})`);
+        });
+    }
+    
     /**
      * ███████████████████████████████████████████████████
      * █ Private: Binds global events for tab management█
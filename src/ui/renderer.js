@@ -52,6 +52,9 @@ document.addEventListener('DOMContentLoaded', async () => {
         soundManager.play('startup');
     }
     
+    // Show enabled plugins' toolbar and sidebar pages
+    window.pluginHost.init();
+    
     // Register event handlers for auto-updater
     registerUpdateHandlers();
     
@@ -0,0 +1,135 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Telemetry Client
+ *
+ * ╔══════════════════════════════════════════════════════════════╗
+ * ║ Renderer side of the main process telemetry bus              ║
+ * ║ Subscribes to fields and rebuilds them from delta updates    ║
+ * ╚══════════════════════════════════════════════════════════════╝
+ *
+ * FEATURES:
+ * - [+] One IPC listener per renderer, any number of subscriptions
+ * - [+] Nested stats object kept up to date from changed fields
+ * - [+] Callbacks get the full state and the paths that changed
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+class TelemetryClient {
+    constructor(ipcRenderer) {
+        this.ipcRenderer = ipcRenderer;
+
+        // Subscription id -> { state, callback }
+        this.subscriptions = new Map();
+
+        this.listener = (event, update) => this._onUpdate(update);
+        this.listening = false;
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Subscribes to fields ('cpu', 'network.activeConnections')   █
+     * █ Resolves to a function that cancels the subscription        █
+     * ███████████████████████████████████████████████████████████████
+     */
+    async subscribe(fields, options, callback) {
+        if (!this.listening) {
+            this.ipcRenderer.on('telemetry-update', this.listener);
+            this.listening = true;
+        }
+
+        const { id, changed, removed } = await this.ipcRenderer.invoke('telemetry-subscribe', {
+            fields,
+            intervalMs: options && options.intervalMs
+        });
+
+        const subscription = { state: {}, callback };
+        this.subscriptions.set(id, subscription);
+        this._apply(subscription, changed, removed);
+
+        return () => {
+            if (this.subscriptions.delete(id)) {
+                this.ipcRenderer.send('telemetry-unsubscribe', id);
+            }
+        };
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Cancels every subscription and stops listening              █
+     * ███████████████████████████████████████████████████████████████
+     */
+    dispose() {
+        for (const id of this.subscriptions.keys()) {
+            this.ipcRenderer.send('telemetry-unsubscribe', id);
+        }
+        this.subscriptions.clear();
+
+        if (this.listening) {
+            this.ipcRenderer.removeListener('telemetry-update', this.listener);
+            this.listening = false;
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Routes an update to its subscription               █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _onUpdate(update) {
+        const subscription = this.subscriptions.get(update.id);
+        if (subscription) {
+            this._apply(subscription, update.changed, update.removed);
+        }
+    }
+
+    /**
+     * ███████████████████████████████████████████████████████████████
+     * █ Private: Applies a delta and notifies the subscriber        █
+     * ███████████████████████████████████████████████████████████████
+     */
+    _apply(subscription, changed = {}, removed = []) {
+        for (const key of removed) {
+            unsetPath(subscription.state, key.split('.'));
+        }
+        for (const [key, value] of Object.entries(changed)) {
+            setPath(subscription.state, key.split('.'), value);
+        }
+
+        const paths = removed.concat(Object.keys(changed));
+        if (paths.length > 0) {
+            try {
+                subscription.callback(subscription.state, paths);
+            } catch (error) {
+                console.error('❌ Telemetry subscriber failed:', error);
+            }
+        }
+    }
+}
+
+function setPath(state, parts, value) {
+    let node = state;
+    for (const part of parts.slice(0, -1)) {
+        // A leaf (e.g. null) that now has fields becomes an object
+        if (!node[part] || typeof node[part] !== 'object' || Array.isArray(node[part])) {
+            node[part] = {};
+        }
+        node = node[part];
+    }
+    node[parts[parts.length - 1]] = value;
+}
+
+function unsetPath(state, parts) {
+    let node = state;
+    for (const part of parts.slice(0, -1)) {
+        if (!node[part] || typeof node[part] !== 'object') {
+            return;
+        }
+        node = node[part];
+    }
+    delete node[parts[parts.length - 1]];
+}
+
+module.exports = TelemetryClient;
@@ -0,0 +1,147 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Bandwidth Scheduler Tests
+ *
+ * - [+] Many streams on one scheduler share the configured rate
+ * - [+] Weights split the budget proportionally
+ * - [+] Limits set while a stream is open apply to it
+ * - [+] dispose() releases every waiting stream
+ *
+ * Run with: node --test tests/
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const test = require('node:test');
+const assert = require('node:assert');
+const BandwidthScheduler = require('../src/limiters/bandwidth-scheduler');
+
+const CHUNK_BYTES = 16 * 1024;
+
+// Rates are measured over this window; short bursts at the start wash out
+const WINDOW_MS = 1500;
+
+// Timer-driven rates on a busy CI box are only approximately exact
+const TOLERANCE = 0.15;
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Keeps a metered stream's input full and counts the bytes it releases
+function saturate(stream) {
+    const counter = { bytes: 0, stream };
+    const chunk = Buffer.alloc(CHUNK_BYTES);
+
+    stream.on('data', (data) => {
+        counter.bytes += data.length;
+    });
+    stream.on('error', () => {});
+
+    // One chunk per turn of the event loop until the stream asks us to wait
+    // (unlimited streams never do, and would otherwise starve the timers)
+    const fill = () => {
+        if (!stream.destroyed && stream.write(chunk)) {
+            setImmediate(fill);
+        }
+    };
+    stream.on('drain', fill);
+    fill();
+    return counter;
+}
+
+// Stops the timer and the writers, which would otherwise keep the test alive
+function stop(scheduler, counters) {
+    scheduler.dispose();
+    counters.forEach(counter => counter.stream.destroy());
+}
+
+function assertNear(actual, expected, message) {
+    const error = Math.abs(actual - expected) / expected;
+    assert.ok(error <= TOLERANCE, `${message}: ${Math.round(actual)} vs ${Math.round(expected)}`);
+}
+
+test('streams on one scheduler share the global rate', async () => {
+    const rate = 200 * 1024;
+    const scheduler = new BandwidthScheduler('test');
+    scheduler.configure({ rate });
+
+    const counters = Array.from({ length: 6 }, () => saturate(scheduler.createStream()));
+    await sleep(WINDOW_MS);
+    const total = counters.reduce((sum, counter) => sum + counter.bytes, 0);
+    stop(scheduler, counters);
+
+    assertNear(total / (WINDOW_MS / 1000), rate, 'aggregate bytes/s');
+
+    // Equal weights: no stream is starved by the others
+    for (const counter of counters) {
+        assertNear(counter.bytes, total / counters.length, 'per-stream share');
+    }
+});
+
+test('weights split the budget proportionally', async () => {
+    const scheduler = new BandwidthScheduler('test');
+    scheduler.configure({ rate: 150 * 1024 });
+
+    const heavy = saturate(scheduler.createStream({ weight: 2 }));
+    const light = saturate(scheduler.createStream({ weight: 1 }));
+    await sleep(WINDOW_MS);
+    stop(scheduler, [heavy, light]);
+
+    assertNear(heavy.bytes / light.bytes, 2, 'weight 2:1 split');
+});
+
+test('domain buckets cap their streams under the global rate', async () => {
+    const scheduler = new BandwidthScheduler('test');
+    scheduler.configure({ rate: 200 * 1024, domainRates: { 'example.com': 50 * 1024 } });
+
+    const capped = saturate(scheduler.createStream({ domain: 'example.com' }));
+    const other = saturate(scheduler.createStream());
+    await sleep(WINDOW_MS);
+    stop(scheduler, [capped, other]);
+
+    const seconds = WINDOW_MS / 1000;
+    assertNear(capped.bytes / seconds, 50 * 1024, 'domain bytes/s');
+    assertNear((capped.bytes + other.bytes) / seconds, 200 * 1024, 'aggregate bytes/s');
+});
+
+test('a limit set after the stream opened applies to it', async () => {
+    const scheduler = new BandwidthScheduler('test');
+    const stream = scheduler.createStream();
+    const counter = saturate(stream);
+
+    // Unlimited: chunks pass straight through
+    await sleep(50);
+    assert.ok(counter.bytes > 1024 * 1024, `unlimited stream moved only ${counter.bytes} bytes`);
+    assert.strictEqual(scheduler.getStats().activeStreams, 0);
+
+    scheduler.configure({ rate: 100 * 1024 });
+    await sleep(200);
+    const start = counter.bytes;
+    await sleep(WINDOW_MS);
+    stop(scheduler, [counter]);
+
+    assertNear((counter.bytes - start) / (WINDOW_MS / 1000), 100 * 1024, 'limited bytes/s');
+});
+
+test('dispose releases waiting streams', async () => {
+    const scheduler = new BandwidthScheduler('test');
+    scheduler.configure({ rate: 1024 });
+
+    const streams = [scheduler.createStream(), scheduler.createStream({ weight: 4 })];
+    const closed = streams.map(stream => new Promise(resolve => stream.on('close', resolve)));
+    streams.forEach(stream => stream.resume().write(Buffer.alloc(64 * 1024)));
+
+    await sleep(20);
+    assert.strictEqual(scheduler.getStats().activeStreams, 2);
+    assert.strictEqual(scheduler.getStats().global.queueDepth, 2);
+
+    scheduler.dispose();
+    await Promise.all(closed);
+
+    const stats = scheduler.getStats();
+    assert.strictEqual(stats.activeStreams, 0);
+    assert.strictEqual(stats.global.queueDepth, 0);
+    assert.strictEqual(scheduler.timer, null);
+    assert.ok(streams.every(stream => stream.destroyed));
+});
@@ -0,0 +1,153 @@
+/**
+ * █▀▀ █▀█ █▀▄ █▀▀ ▀▄▀
+ * █▄▄ █▄█ █▄▀ ██▄ █░█
+ *
+ * Internet Server - Domain Policy Tests
+ *
+ * - [+] Exact rules beat wildcards; the longest wildcard wins
+ * - [+] '*.example.com' does not match 'example.com'
+ * - [+] Hot-host cache is dropped whenever the rules are recompiled
+ * - [+] Rules file reloads keep hit counters and the last good rules
+ *
+ * Run with: node --test tests/
+ *
+ * Copyright (c) 2025 ZARI CORP
+ */
+
+const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const DomainPolicy = require('../src/limiters/domain-policy');
+
+// Debounce plus inotify delivery, with room for a slow CI box
+const RELOAD_TIMEOUT_MS = 5000;
+
+function tempRulesFile(rules) {
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'domain-rules-'));
+    const file = path.join(dir, 'rules.json');
+    fs.writeFileSync(file, JSON.stringify(rules));
+    return file;
+}
+
+// Saved the way editors do: a new file renamed over the old one
+function replaceFile(file, contents) {
+    const next = `${file}.tmp`;
+    fs.writeFileSync(next, contents);
+    fs.renameSync(next, file);
+}
+
+function reloaded(policy) {
+    return new Promise((resolve, reject) => {
+        const timer = setTimeout(() => reject(new Error('rules file was not reloaded')), RELOAD_TIMEOUT_MS);
+        policy.onReload = () => {
+            clearTimeout(timer);
+            resolve();
+        };
+    });
+}
+
+async function waitFor(condition, message) {
+    const deadline = Date.now() + RELOAD_TIMEOUT_MS;
+    while (!condition()) {
+        assert.ok(Date.now() < deadline, message);
+        await new Promise(resolve => setTimeout(resolve, 20));
+    }
+}
+
+function patternFor(policy, hostname) {
+    const rule = policy.lookup(hostname);
+    return rule ? rule.pattern : null;
+}
+
+test('exact rules beat wildcards and the longest wildcard wins', () => {
+    const policy = new DomainPolicy();
+    policy.configure({
+        rules: [
+            { pattern: '*.example.com', kbps: 100 },
+            { pattern: '*.cdn.example.com', kbps: 200 },
+            { pattern: 'static.cdn.example.com', exclude: true },
+            { pattern: 'WWW.Example.com.', priority: 'high' }
+        ]
+    });
+
+    assert.strictEqual(patternFor(policy, 'static.cdn.example.com'), 'static.cdn.example.com');
+    assert.strictEqual(patternFor(policy, 'img.cdn.example.com'), '*.cdn.example.com');
+    assert.strictEqual(patternFor(policy, 'a.b.cdn.example.com'), '*.cdn.example.com');
+    assert.strictEqual(patternFor(policy, 'cdn.example.com'), '*.example.com');
+    assert.strictEqual(patternFor(policy, 'mail.example.com'), '*.example.com');
+
+    // Patterns and hostnames compare case-insensitively, without the root dot
+    const www = policy.lookup('www.EXAMPLE.com');
+    assert.strictEqual(www.pattern, 'www.example.com');
+    assert.strictEqual(www.weight, DomainPolicy.PRIORITY_WEIGHTS.high);
+});
+
+test('a wildcard does not match its own domain', () => {
+    const policy = new DomainPolicy();
+    policy.configure({ rules: [{ pattern: '*.example.com', exclude: true }] });
+
+    assert.strictEqual(patternFor(policy, 'example.com'), null);
+    assert.strictEqual(patternFor(policy, 'notexample.com'), null);
+    assert.strictEqual(patternFor(policy, 'www.example.com'), '*.example.com');
+});
+
+test('recompiling drops hosts cached in the hot LRU', () => {
+    const policy = new DomainPolicy();
+    policy.configure({ rules: [{ pattern: '*.example.com', kbps: 100 }] });
+
+    assert.strictEqual(patternFor(policy, 'www.example.com'), '*.example.com');
+    assert.strictEqual(patternFor(policy, 'www.example.com'), '*.example.com');
+    assert.strictEqual(policy.getStats().hotHits, 1);
+
+    policy.configure({ rules: [{ pattern: '*.example.com', kbps: 100 }, { pattern: 'www.example.com', exclude: true }] });
+    assert.strictEqual(policy.getStats().hotHosts, 0);
+    assert.strictEqual(patternFor(policy, 'www.example.com'), 'www.example.com');
+    assert.strictEqual(policy.getStats().hotHits, 1);
+});
+
+test('rules file reloads keep hit counters and the last good rules', async (t) => {
+    const file = tempRulesFile({ rules: [{ pattern: '*.example.com', kbps: 100 }] });
+    const policy = new DomainPolicy();
+    t.after(() => {
+        policy.dispose();
+        fs.rmSync(path.dirname(file), { recursive: true, force: true });
+    });
+    policy.configure({ file });
+
+    for (const host of ['a.example.com', 'b.example.com', 'a.example.com']) {
+        policy.lookup(host);
+    }
+    assert.deepStrictEqual(policy.getRuleHits(), { '*.example.com': 3 });
+
+    // A changed file is recompiled: counters carry over and cached hosts are dropped
+    let reload = reloaded(policy);
+    replaceFile(file, JSON.stringify([
+        { pattern: '*.example.com', kbps: 50 },
+        { pattern: 'a.example.com', exclude: true }
+    ]));
+    await reload;
+    assert.deepStrictEqual(policy.getRuleHits(), { '*.example.com': 3, 'a.example.com': 0 });
+    assert.strictEqual(patternFor(policy, 'a.example.com'), 'a.example.com');
+    assert.strictEqual(policy.domainRates('download')['*.example.com'], 50 * 1024 / 8);
+    assert.strictEqual(policy.getStats().reloads, 1);
+
+    // Broken JSON and an invalid rule both leave the last good rules in place
+    const good = Object.keys(policy.getRuleHits());
+    for (const contents of ['[{"pattern": "*.example.com", ', JSON.stringify([{ pattern: 'a.*.com' }])]) {
+        policy.stats.lastError = null;
+        fs.writeFileSync(file, contents);
+        await waitFor(() => policy.stats.lastError !== null, 'bad rules file was not noticed');
+        assert.deepStrictEqual(Object.keys(policy.getRuleHits()), good);
+        assert.strictEqual(patternFor(policy, 'a.example.com'), 'a.example.com');
+        assert.strictEqual(policy.getStats().reloads, 1);
+    }
+
+    // Once fixed, the file applies again
+    reload = reloaded(policy);
+    replaceFile(file, JSON.stringify([{ pattern: '*.example.com', kbps: 50 }]));
+    await reload;
+    assert.strictEqual(patternFor(policy, 'a.example.com'), '*.example.com');
+    assert.strictEqual(policy.getStats().lastError, null);
+});
@@ -0,0 +1,161 @@
+"""
+cgroup v2 enforcement tests for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] A tmp dir stands in for the cgroupfs; no real cgroups are touched
+[+] cpu.max / memory.* formatting and PSI parsing
+[+] Subtree setup, per-profile limits and removal of the browser cgroup
+"""
+
+import threading
+import time
+
+import pytest
+
+from launcher import cgroups
+from launcher.cgroups import (LIMITER_PROFILES, CgroupController, cpu_max_value, memory_values, own_cgroup,
+                              parse_pressure)
+
+PARENT = "user.slice/user-1000.slice/launcher.scope"
+
+@pytest.fixture
+def cgroupfs(tmp_path):
+    """A delegated parent cgroup holding the launcher and one other process"""
+    (tmp_path / "cgroup.controllers").write_text("cpuset cpu io memory pids\n")
+    parent = tmp_path / PARENT
+    parent.mkdir(parents=True)
+    (parent / "cgroup.controllers").write_text("cpu io memory pids\n")
+    (parent / "cgroup.subtree_control").write_text("\n")
+    (parent / "cgroup.procs").write_text("4100\n4101\n")
+    return tmp_path
+
+@pytest.fixture
+def controller(cgroupfs, monkeypatch):
+    """A controller whose interface writes are recorded as well as made"""
+    controller = CgroupController(root=cgroupfs, parent=PARENT)
+    controller.writes = []
+    write = controller._write
+
+    def recording_write(path, value):
+        controller.writes.append((path.relative_to(cgroupfs).as_posix(), value))
+        write(path, value)
+
+    monkeypatch.setattr(controller, "_write", recording_write)
+    monkeypatch.setattr(cgroups.os, "cpu_count", lambda: 4)
+    return controller
+
+def test_cpu_max_value():
+    assert cpu_max_value(50, cpu_count=4) == "200000 100000"
+    assert cpu_max_value(30, cpu_count=1) == "30000 100000"
+    assert cpu_max_value(0.001, cpu_count=1) == "1000 100000"
+    assert cpu_max_value(100, cpu_count=4) == "max 100000"
+    assert cpu_max_value(None) == "max 100000"
+    assert cpu_max_value(25, cpu_count=2, period_us=50000) == "25000 50000"
+
+def test_memory_values():
+    assert memory_values(1024) == (str(int(1024 * 1024 * 1024 * 0.9)), str(1024 * 1024 * 1024))
+    assert memory_values("512") == (str(int(512 * 1024 * 1024 * 0.9)), str(512 * 1024 * 1024))
+    assert memory_values(None) == ("max", "max")
+    assert memory_values(0) == ("max", "max")
+
+def test_parse_pressure():
+    text = ("some avg10=1.50 avg60=0.75 avg300=0.10 total=123456\n"
+            "full avg10=0.00 avg60=0.00 avg300=0.00 total=42\n\n")
+    assert parse_pressure(text) == {
+        "some": {"avg10": 1.5, "avg60": 0.75, "avg300": 0.1, "total": 123456},
+        "full": {"avg10": 0.0, "avg60": 0.0, "avg300": 0.0, "total": 42},
+    }
+    assert parse_pressure("some avg10=bad total=7\n") == {"some": {"total": 7}}
+    assert parse_pressure("") == {}
+
+def test_own_cgroup(tmp_path):
+    proc_file = tmp_path / "cgroup"
+    proc_file.write_text(f"0::/{PARENT}\n")
+    assert own_cgroup(proc_file) == PARENT
+    proc_file.write_text("12:cpu,cpuacct:/legacy\n")
+    assert own_cgroup(proc_file) is None
+    assert own_cgroup(tmp_path / "missing") is None
+
+def test_available(cgroupfs):
+    assert CgroupController(root=cgroupfs, parent=PARENT).available()
+
+    (cgroupfs / PARENT / "cgroup.controllers").write_text("io pids\n")
+    controller = CgroupController(root=cgroupfs, parent=PARENT)
+    assert not controller.available()
+    assert "cpu, memory" in controller.error
+
+    controller = CgroupController(root=cgroupfs / "nowhere", parent=PARENT)
+    assert not controller.available()
+    assert "no cgroup v2 hierarchy" in controller.error
+
+def test_setup_moves_procs_to_a_leaf_and_enables_controllers(controller, cgroupfs):
+    assert controller.setup(), controller.error
+
+    parent = cgroupfs / PARENT
+    assert (parent / "launcher").is_dir()
+    assert (parent / "internet-server").is_dir()
+    assert controller.path == parent / "internet-server"
+    assert controller.writes == [
+        (f"{PARENT}/launcher/cgroup.procs", "4100"),
+        (f"{PARENT}/launcher/cgroup.procs", "4101"),
+        (f"{PARENT}/cgroup.subtree_control", "+cpu +memory"),
+    ]
+
+    # Already enabled controllers are not written again
+    (parent / "cgroup.procs").write_text("")
+    (parent / "cgroup.subtree_control").write_text("cpu memory\n")
+    controller.writes.clear()
+    assert controller.setup()
+    assert controller.writes == []
+
+@pytest.mark.parametrize("name", sorted(LIMITER_PROFILES))
+def test_apply_profile(controller, name):
+    assert controller.setup()
+    controller.writes.clear()
+    profile = LIMITER_PROFILES[name]
+    assert controller.apply_profile(profile)
+
+    cpu, memory = profile["cpu"], profile["memory"]
+    expected_cpu = cpu_max_value(cpu["maxCpuPercent"] if cpu["enabled"] else None, cpu_count=4)
+    expected_high, expected_max = memory_values(memory["maxMemoryMB"] if memory["enabled"] else None)
+    path = f"{PARENT}/internet-server"
+    assert controller.writes == [
+        (f"{path}/cpu.max", expected_cpu),
+        (f"{path}/memory.high", expected_high),
+        (f"{path}/memory.max", expected_max),
+    ]
+    assert (controller.path / "cpu.max").read_text() == expected_cpu
+    assert (controller.path / "memory.max").read_text() == expected_max
+
+def test_gaming_profile_values(controller):
+    assert controller.setup()
+    assert controller.apply_profile(LIMITER_PROFILES["gaming"])
+    assert (controller.path / "cpu.max").read_text() == "120000 100000"
+    assert (controller.path / "memory.max").read_text() == str(512 * 1024 * 1024)
+
+def test_apply_profile_reports_write_errors(cgroupfs):
+    controller = CgroupController(root=cgroupfs, parent=PARENT)
+    assert not controller.apply_profile(LIMITER_PROFILES["balanced"])
+    assert controller.error
+
+def test_remove_when_not_populated(controller):
+    controller.path.mkdir()
+    assert not controller.populated()
+    assert controller.remove()
+    assert not controller.path.exists()
+
+def test_remove_when_populated(controller):
+    controller.path.mkdir()
+    events = controller.path / "cgroup.events"
+    events.write_text("populated 1\nfrozen 0\n")
+    assert controller.populated()
+
+    started = time.monotonic()
+    assert not controller.remove(timeout=0.2)
+    assert time.monotonic() - started >= 0.2
+    assert controller.path.exists()
+
+    # The last process leaves while remove() waits (the fake has no interface files then)
+    threading.Timer(0.1, events.unlink).start()
+    assert controller.remove(timeout=2.0)
+    assert not controller.path.exists()
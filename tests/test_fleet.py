@@ -0,0 +1,56 @@
+"""
+Fleet supervisor tests for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Each instance is started with its own limiter profile
+[+] The supervisor checks the profile an instance reports in its stats
+"""
+
+import json
+import time
+
+import pytest
+
+from launcher.fleet import PROFILE_ENV, Fleet, FleetInstance
+
+@pytest.fixture
+def fleet(tmp_path):
+    instances = [FleetInstance(i, tmp_path / f"instance-{i}", 9000 + i, profile)
+                 for i, profile in enumerate(("gaming", "efficiency"))]
+    fleet = Fleet(["true"], tmp_path, instances, base_env={})
+    yield fleet
+    fleet.server.close()
+
+def _connect(fleet, instance):
+    """A connection state as _poll_sockets keeps it, after the ready message"""
+    instance.started_at = time.monotonic()
+    state = [b"", None]
+    line = json.dumps({"event": "ready", "token": instance.token}).encode("utf-8")
+    assert fleet._handle_message(None, state, line)
+    assert state[1] is instance
+    return state
+
+def _stats(fleet, state, profile):
+    line = json.dumps({"event": "stats", "profile": profile, "network": {"totalBytesDownloaded": 1}})
+    assert fleet._handle_message(None, state, line.encode("utf-8"))
+
+def test_instances_get_their_own_profile(fleet):
+    profiles = [instance.env({}, fleet.port, 1000)[PROFILE_ENV] for instance in fleet.instances]
+    assert profiles == ["gaming", "efficiency"]
+
+def test_reported_profile_is_checked(fleet, capsys):
+    gaming, efficiency = fleet.instances
+    _stats(fleet, _connect(fleet, gaming), "gaming")
+    state = _connect(fleet, efficiency)
+    _stats(fleet, state, "custom")
+    _stats(fleet, state, "custom")
+
+    output = capsys.readouterr().out
+    assert "Instance 0 reports" not in output
+    assert output.count("Instance 1 reports limiter profile custom, expected efficiency") == 1
+    assert (gaming.reported_profile, efficiency.reported_profile) == ("gaming", "custom")
+    assert efficiency.network == {"totalBytesDownloaded": 1}
+
+def test_stats_before_ready_drop_the_connection(fleet):
+    line = json.dumps({"event": "stats", "profile": "gaming"}).encode("utf-8")
+    assert not fleet._handle_message(None, [b"", None], line)
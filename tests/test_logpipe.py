@@ -0,0 +1,60 @@
+"""
+Log relay tests for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] A child that fails on its own leaves a crash report
+[+] A SIGTERM or SIGHUP sent to the relay stops the child without one
+[+] So does a SIGTERM sent to the whole process group (fleet stop)
+"""
+
+import os
+import platform
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from launcher.logpipe import logged_command
+
+pytestmark = pytest.mark.skipif(platform.system() == "Windows", reason="relay signals are POSIX only")
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Prints once it is running, then waits to be stopped
+CHILD = "import sys, time; print('ready', flush=True); time.sleep(30); sys.exit(3)"
+
+def _start_relay(tmp_path, code):
+    cmd = logged_command([sys.executable, "-c", code], "test", tmp_path)
+    return subprocess.Popen(cmd, cwd=BASE_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            start_new_session=True)
+
+def _wait_ready(relay):
+    assert relay.stdout.readline().strip() == b"ready"
+    # The relay installs its handlers before it starts reading the child
+    time.sleep(0.2)
+
+def _crash_reports(tmp_path):
+    return list(tmp_path.glob("test-crash-*.json"))
+
+def test_failed_child_leaves_crash_report(tmp_path):
+    relay = _start_relay(tmp_path, "import sys; print('boom'); sys.exit(3)")
+    assert relay.wait(10) == 3
+    assert len(_crash_reports(tmp_path)) == 1
+
+@pytest.mark.parametrize("signum", [signal.SIGTERM, signal.SIGHUP])
+def test_signal_to_relay_is_a_requested_stop(tmp_path, signum):
+    relay = _start_relay(tmp_path, CHILD)
+    _wait_ready(relay)
+    relay.send_signal(signum)
+    assert relay.wait(10) == -signum
+    assert _crash_reports(tmp_path) == []
+
+def test_group_sigterm_is_a_requested_stop(tmp_path):
+    relay = _start_relay(tmp_path, CHILD)
+    _wait_ready(relay)
+    os.killpg(relay.pid, signal.SIGTERM)
+    assert relay.wait(10) == -signal.SIGTERM
+    assert _crash_reports(tmp_path) == []
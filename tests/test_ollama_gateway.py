@@ -0,0 +1,148 @@
+"""
+Ollama gateway tests for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] A stub HTTP server on localhost stands in for Ollama
+[+] Duplicate in-flight prompts share one upstream generation, then hit the cache
+[+] Upstream failures reach every follower and never leave a flight behind
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from launcher.ollama_gateway import OllamaGateway
+
+# Long enough for a slow CI box, short enough that a hang fails the test
+WAIT_S = 5
+
+class StubOllama(ThreadingHTTPServer):
+    """Streams canned /api/generate chunks, held until release is set"""
+
+    daemon_threads = True
+
+    def __init__(self, lines, status=200):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.lines = lines
+        self.status = status
+        self.calls = 0
+        self.release = threading.Event()
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.calls += 1
+        self.server.release.wait(WAIT_S)
+        body = b"".join(line + b"\n" for line in self.server.lines)
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stub(request):
+    server = StubOllama(**request.param)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def gateway(stub, tmp_path):
+    settings = tmp_path / "runtime-settings.json"
+    settings.write_text(json.dumps({"ollama": {"ip": "127.0.0.1", "port": str(stub.server_address[1])}}))
+    return OllamaGateway(settings)
+
+def _chunks(*tokens):
+    lines = [json.dumps({"response": token, "done": False}).encode("utf-8") for token in tokens]
+    return lines + [json.dumps({"response": "", "done": True}).encode("utf-8")]
+
+def _start(gateway, count, prompt="Why is the sky blue?"):
+    """Run `count` identical generate requests; returns (threads, replies per request)"""
+    replies = [[] for _ in range(count)]
+    threads = [threading.Thread(target=gateway.generate, args=({"prompt": prompt}, replies[i].append), daemon=True)
+               for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, replies
+
+def _wait_for(condition):
+    deadline = time.monotonic() + WAIT_S
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def _join(threads):
+    for thread in threads:
+        thread.join(WAIT_S)
+        assert not thread.is_alive(), "a request never finished"
+
+@pytest.mark.parametrize("stub", [{"lines": _chunks("Rayleigh", " scattering")}], indirect=True)
+def test_duplicate_prompts_share_one_generation(stub, gateway):
+    threads, replies = _start(gateway, 3)
+    _wait_for(lambda: gateway.counters["coalesced"] == 2)
+    stub.release.set()
+    _join(threads)
+
+    assert stub.calls == 1
+    finals = [messages[-1] for messages in replies]
+    assert all(final["done"] and final["text"] == "Rayleigh scattering" for final in finals)
+    assert sorted(final["shared"] for final in finals) == [False, True, True]
+    assert all([m["token"] for m in messages[:-1]] == ["Rayleigh", " scattering"] for messages in replies)
+
+    # The finished generation is now served from the cache
+    threads, replies = _start(gateway, 1)
+    _join(threads)
+    assert stub.calls == 1
+    assert replies[0][-1]["cached"] and replies[0][-1]["text"] == "Rayleigh scattering"
+
+    stats = gateway.stats()
+    assert (stats["requests"], stats["cache_hits"], stats["upstream_requests"], stats["in_flight"]) == (4, 1, 1, 0)
+
+@pytest.mark.parametrize("stub", [
+    {"lines": _chunks("partial") + [b"[1, 2]"]},
+    {"lines": [b'{"error": "model not found"}']},
+    {"lines": [b"overloaded"], "status": 503},
+], indirect=True)
+def test_upstream_failure_reaches_every_follower(stub, gateway):
+    threads, replies = _start(gateway, 3)
+    _wait_for(lambda: gateway.counters["coalesced"] == 2)
+    stub.release.set()
+    _join(threads)
+
+    assert stub.calls == 1
+    assert all("error" in messages[-1] for messages in replies)
+    stats = gateway.stats()
+    assert (stats["upstream_errors"], stats["in_flight"], stats["cache_entries"]) == (1, 0, 0)
+
+    # Nothing was cached or left in flight, so a retry goes upstream again
+    threads, replies = _start(gateway, 1)
+    _join(threads)
+    assert stub.calls == 2
+
+@pytest.mark.parametrize("stub", [{"lines": _chunks("unused")}], indirect=True)
+def test_unexpected_exception_finishes_the_flight(stub, gateway, monkeypatch):
+    entered = threading.Event()
+
+    def broken_session():
+        entered.wait(WAIT_S)
+        raise RuntimeError("session exploded")
+
+    monkeypatch.setattr(gateway, "session", broken_session)
+    threads, replies = _start(gateway, 2)
+    _wait_for(lambda: gateway.counters["coalesced"] == 1)
+    entered.set()
+    _join(threads)
+
+    assert all(messages[-1] == {"error": "Ollama gateway error: session exploded"} for messages in replies)
+    assert gateway.stats()["in_flight"] == 0
@@ -0,0 +1,58 @@
+"""
+Profiling session tests for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Worker threads are profiled along with the thread that started profiling
+[+] pstats dumps are read back per function and ranked by the summariser
+"""
+
+import threading
+
+from launcher.profiling import PythonProfiler, read_pstats, summarize
+
+def _spin(n=200000):
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+def _worker_task():
+    return _spin()
+
+def _main_task():
+    return _spin()
+
+def _entry(times, name):
+    return next(value for key, value in times.items() if key.startswith(f"{name} "))
+
+def test_profiles_worker_thread(tmp_path):
+    profiler = PythonProfiler()
+    profiler.start()
+    try:
+        worker = threading.Thread(target=_worker_task)
+        worker.start()
+        worker.join()
+        _main_task()
+    finally:
+        path = tmp_path / "python-launcher-1.pstats"
+        assert profiler.dump(path)
+
+    times = read_pstats(path)
+    for name in ("_worker_task", "_main_task"):
+        self_ms, total_ms = _entry(times, name)
+        assert self_ms >= 0
+        assert total_ms > 0
+    spin_self_ms, _ = _entry(times, "_spin")
+    assert spin_self_ms > 0
+
+    summary = summarize(tmp_path)
+    assert list(summary["processes"]) == ["python-launcher-1"]
+    assert summary["functions"][0]["function"].startswith("_spin ")
+
+def test_profiler_can_run_twice(tmp_path):
+    # The second session must not trip over the first one's profiler
+    for run in range(2):
+        profiler = PythonProfiler()
+        profiler.start()
+        _main_task()
+        assert profiler.dump(tmp_path / f"python-run-{run}.pstats")
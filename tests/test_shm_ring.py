@@ -0,0 +1,153 @@
+"""
+Shared memory ring tests for Internet Server Browser
+Copyright (c) 2025 ZARI CORP - All Rights Reserved
+
+[+] Samples written by launcher/shm_ring.py read back by Ring.read()
+[+] The same records read by src/limiters/shm-ring.js in a node process
+[+] Wrap-around at capacity, the full-ring dropped count, lazy READ_SEQ release
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from launcher import shm_ring
+from launcher.shm_ring import HEADER_SIZE, KIND_PROC, KIND_TREE, PROCESS_TYPES, READ_SEQ, SEQ, VALUES, ShmChannel
+
+pytestmark = pytest.mark.skipif(not shm_ring.available(), reason="needs /dev/shm on little-endian Linux")
+
+NODE = shutil.which("node")
+SHM_RING_JS = Path(__file__).resolve().parent.parent / "src" / "limiters" / "shm-ring.js"
+
+# Attaches as the Electron side; each stdin line drains ring 0 and prints what it saw
+NODE_READER = """
+const fs = require('fs');
+const readline = require('readline');
+const ShmChannel = require(process.argv[1]);
+const channel = ShmChannel.attach(process.argv[2]);
+const word = Buffer.alloc(8);
+readline.createInterface({ input: process.stdin }).on('line', () => {
+    const records = [];
+    channel.inbound.receive((r) => records.push([r.kind, r.code, r.pid, r.t, Array.from(r.values)]));
+    fs.readSync(channel.fd, word, 0, 8, %d);
+    const released = Number(word.readBigUInt64LE(0));
+    console.log(JSON.stringify({ records, released, dropped: channel.inbound.dropped() }));
+});
+""" % (HEADER_SIZE + READ_SEQ)
+
+def _sample(n, procs=2):
+    """A TreeSampler record with exactly representable values"""
+    return {
+        "t": 1000.0 + n, "pid": 4000 + n, "cpu": 12.5 + n, "sys": 3.25, "rss": 512.0 * (n + 1),
+        "ior": 1.5, "iow": 0.75, "thr": 9.0, "n": float(procs),
+        "procs": [(5000 + n * 10 + i, PROCESS_TYPES[i % 3], 1.25 * i, 64.0 + i) for i in range(procs)],
+    }
+
+def _records(sample):
+    """The (kind, code, pid, t, values) records a sample is written as"""
+    tree = [sample[field] for field in ("cpu", "sys", "rss", "ior", "iow", "thr", "n")]
+    records = [(KIND_TREE, 0, sample["pid"], sample["t"], tree + [0.0] * (VALUES - len(tree)))]
+    for pid, ptype, cpu, rss in sample["procs"]:
+        records.append((KIND_PROC, PROCESS_TYPES.index(ptype), pid, sample["t"], [cpu, rss] + [0.0] * (VALUES - 2)))
+    return records
+
+def _released(channel):
+    """READ_SEQ of ring 0 as stored in the file"""
+    return SEQ.unpack_from(channel.mm, HEADER_SIZE + READ_SEQ)[0]
+
+@pytest.fixture
+def channel():
+    channel = ShmChannel.create("test", capacity=8)
+    yield channel
+    channel.close()
+
+def test_python_round_trip_wraps_at_capacity(channel):
+    peer = ShmChannel.attach(channel.path)
+    try:
+        # 3 records per sample on 8 slots: the third and fifth samples wrap
+        for n in range(6):
+            sample = _sample(n)
+            assert channel.outbound.write_sample(sample)
+            assert [tuple(record) for record in peer.inbound.read()] == _records(sample)
+            assert _released(channel) == 3 * (n + 1)
+        assert channel.outbound.dropped() == 0
+    finally:
+        peer.close()
+
+def test_full_ring_counts_dropped(channel):
+    peer = ShmChannel.attach(channel.path)
+    try:
+        assert channel.outbound.write_sample(_sample(0))
+        assert channel.outbound.write_sample(_sample(1))
+        assert channel.outbound.free() == 2
+
+        # A sample never goes in partly
+        assert not channel.outbound.write_sample(_sample(2))
+        assert channel.outbound.write(KIND_TREE, pid=1)
+        assert channel.outbound.write(KIND_TREE, pid=2)
+        assert not channel.outbound.write(KIND_TREE, pid=3)
+        assert channel.outbound.dropped() == 2
+        assert peer.inbound.dropped() == 2
+
+        records = list(peer.inbound.read())
+        assert [pid for _, _, pid, _, _ in records[-2:]] == [1, 2]
+        assert len(records) == 8
+        assert channel.outbound.write_sample(_sample(3))
+    finally:
+        peer.close()
+
+@pytest.mark.skipif(NODE is None, reason="needs node")
+def test_node_reads_python_records():
+    channel = ShmChannel.create("test", capacity=16)
+    reader = subprocess.Popen([NODE, "-e", NODE_READER, str(SHM_RING_JS), channel.path],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+
+    def receive():
+        reader.stdin.write("\n")
+        reader.stdin.flush()
+        reply = json.loads(reader.stdout.readline())
+        reply["records"] = [tuple(record) for record in reply["records"]]
+        return reply
+
+    try:
+        # 3 records are under a quarter of the ring: read, but not released yet
+        expected = _records(_sample(0))
+        assert channel.outbound.write_sample(_sample(0))
+        reply = receive()
+        assert reply["records"] == expected
+        assert reply["released"] == 0
+        assert channel.outbound.free() == 13
+
+        # 9 read in total: the read seq is released and the writer sees all slots free
+        expected = _records(_sample(1)) + _records(_sample(2))
+        assert channel.outbound.write_sample(_sample(1))
+        assert channel.outbound.write_sample(_sample(2))
+        reply = receive()
+        assert reply["records"] == expected
+        assert reply["released"] == 9
+        assert channel.outbound.free() == 16
+
+        # Slots 9..17 wrap past the end of the ring
+        samples = [_sample(n, procs=n - 2) for n in range(3, 6)]
+        for sample in samples:
+            assert channel.outbound.write_sample(sample)
+        reply = receive()
+        assert reply["records"] == [record for sample in samples for record in _records(sample)]
+        assert reply["released"] == 18
+
+        # Full ring: the sample that does not fit is counted, not written
+        samples = [_sample(n) for n in range(6, 11)]
+        for sample in samples:
+            assert channel.outbound.write_sample(sample)
+        assert not channel.outbound.write_sample(_sample(11))
+        reply = receive()
+        assert reply["dropped"] == 1
+        assert reply["records"] == [record for sample in samples for record in _records(sample)]
+        assert reply["released"] == 18 + 15
+    finally:
+        reader.stdin.close()
+        reader.wait(5)
+        channel.close()